@@ -13,17 +13,53 @@ File purpose:
 from __future__ import annotations
 
 # Built-Ins
+import uuid
 import threading
+import dataclasses
 from multiprocessing import shared_memory
 
+from typing import Any
+from typing import Tuple
 from typing import Callable
 
 # Third Party
 import numpy as np
+import pandas as pd
 
 # Local Imports
 
 
+@dataclasses.dataclass(frozen=True)
+class SharedArrayInfo:
+    """Picklable description of an array in shared memory
+
+    Can be sent to other processes in place of the array itself, and used
+    to attach to the same block of memory with
+    `SharedNumpyArrayHelper.attach()`.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    dtype: Any
+
+
+@dataclasses.dataclass(frozen=True)
+class SharedDataFrameInfo:
+    """Picklable description of a numeric DataFrame in shared memory
+
+    The values of the DataFrame are held in shared memory, while the
+    (much smaller) index and columns are copied with this object.
+    """
+    array_info: SharedArrayInfo
+    index: pd.Index
+    columns: pd.Index
+
+
+def unique_shared_memory_name(prefix: str = "nd") -> str:
+    """Generates a name for a new block of shared memory"""
+    # Kept short as some platforms limit names to 31 characters
+    return "%s_%s" % (prefix, uuid.uuid4().hex[:16])
+
+
 class SharedNumpyArrayHelper:
     """Shared numpy array to allow threads/processes to communicate"""
 
@@ -79,6 +115,45 @@ class SharedNumpyArrayHelper:
     def shared_memory(self):
         return self._shm
 
+    @property
+    def info(self) -> SharedArrayInfo:
+        """A picklable description that can be passed to `attach()`"""
+        return SharedArrayInfo(name=self._name, shape=self._shape, dtype=self._dtype)
+
+    @classmethod
+    def attach(
+        cls,
+        info: SharedArrayInfo,
+        lock: threading.Lock = None,
+    ) -> SharedNumpyArrayHelper:
+        """Attaches to an existing shared array without copying any data
+
+        Parameters
+        ----------
+        info:
+            The description of the existing shared array. Usually retrieved
+            from `SharedNumpyArrayHelper.info` in the creating process.
+
+        lock:
+            The lock to use when writing to the shared array. If left as
+            None, a new lock is created.
+
+        Returns
+        -------
+        shared_array_helper:
+            A helper around the existing shared array. Call
+            `close_shared_array()` once finished with it, only the creating
+            process should call `unlink_shared_array()`.
+        """
+        helper = cls.__new__(cls)
+        helper._name = info.name
+        helper._lock = threading.Lock() if lock is None else lock
+        helper._dtype = np.dtype(info.dtype)
+        helper._shape = tuple(info.shape)
+        helper._nbytes = int(np.prod(helper._shape)) * helper._dtype.itemsize
+        helper._shm = shared_memory.SharedMemory(name=info.name, create=False)
+        return helper
+
     def __enter__(self) -> SharedNumpyArrayHelper:
         return self
 
@@ -127,3 +202,79 @@ class SharedNumpyArrayHelper:
         with self._lock:
             shared_array = self.get_shared_array()
             shared_array[:] = np.full_like(shared_array, fill_value=fill_value)
+
+
+def dataframe_to_shared_memory(
+    df: pd.DataFrame,
+    name: str = None,
+) -> Tuple[SharedNumpyArrayHelper, SharedDataFrameInfo]:
+    """Copies the values of a numeric DataFrame into shared memory
+
+    Parameters
+    ----------
+    df:
+        The DataFrame to copy. All columns must share a single numeric
+        dtype.
+
+    name:
+        The name to give the shared memory. If left as None, a unique
+        name is generated.
+
+    Returns
+    -------
+    shared_array_helper:
+        The helper that owns the shared memory. The caller is responsible
+        for calling `unlink_shared_array()` once all processes are done.
+
+    shared_df_info:
+        A picklable description of the DataFrame, to be passed to
+        `attach_shared_dataframe()` in other processes.
+
+    Raises
+    ------
+    ValueError:
+        If the values of df are not numeric.
+    """
+    values = df.to_numpy()
+    if not np.issubdtype(values.dtype, np.number):
+        raise ValueError(
+            "Only numeric DataFrames can be placed in shared memory. Got "
+            "values of dtype %s." % values.dtype
+        )
+
+    name = unique_shared_memory_name() if name is None else name
+    helper = SharedNumpyArrayHelper(name=name, data=values)
+    info = SharedDataFrameInfo(
+        array_info=helper.info,
+        index=df.index,
+        columns=df.columns,
+    )
+    return helper, info
+
+
+def attach_shared_dataframe(
+    info: SharedDataFrameInfo,
+) -> Tuple[SharedNumpyArrayHelper, pd.DataFrame]:
+    """Builds a read-only DataFrame on top of existing shared memory
+
+    No data is copied. The returned helper must be kept alive for as long
+    as the DataFrame is in use, and closed once it is no longer needed.
+
+    Parameters
+    ----------
+    info:
+        The description returned by `dataframe_to_shared_memory()`.
+
+    Returns
+    -------
+    shared_array_helper:
+        A helper attached to the shared memory.
+
+    df:
+        A DataFrame whose values are a read-only view of the shared memory.
+    """
+    helper = SharedNumpyArrayHelper.attach(info.array_info)
+    values = helper.get_shared_array()
+    values.flags.writeable = False
+    df = pd.DataFrame(values, index=info.index, columns=info.columns, copy=False)
+    return helper, df
@@ -9,10 +9,21 @@ from normits_demand.core.zoning import ZoningSystem, BalancingZones
 
 from normits_demand.core.data_structures import DVector
 from normits_demand.core.data_structures import TimeFormat
+from normits_demand.core.data_structures import ChunkedExecution
+from normits_demand.core.data_structures import LazyDVector
 
 # ## EXPOSE GETTER FUNCTIONS ## #
 from normits_demand.core.zoning import get_zoning_system
 from normits_demand.core.segments import get_segmentation_level
+from normits_demand.core.zoning import clear_zoning_system_cache
+from normits_demand.core.segments import clear_segmentation_cache
+
+# ## DEFINITIONS BUNDLE ## #
+from normits_demand.core.registry import build_definitions_bundle
+from normits_demand.core.registry import load_definitions_bundle
+from normits_demand.core import registry as _registry
+
+_registry.load_bundle_from_env()
 
 # ## ENUMERATIONS ## #
 from normits_demand.core.enumerations import *
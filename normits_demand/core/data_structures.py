@@ -17,26 +17,29 @@ from __future__ import annotations
 import os
 import math
 import enum
-import copy
 import pickle
 import pathlib
+import tempfile
 import warnings
+import collections.abc
 import operator
-import itertools
 
 from os import PathLike
 
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
 from typing import Callable
+from typing import Iterator
 from typing import Optional
+from typing import NamedTuple
 
 # Third Party
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
+from scipy import sparse
 
 # Local Imports
 import normits_demand as nd
@@ -45,13 +48,10 @@ from normits_demand import core
 from normits_demand import logging as nd_log
 
 from normits_demand.utils import general as du
-from normits_demand.utils import pandas_utils as pd_utils
 
 from normits_demand.utils import file_ops
 from normits_demand.utils import compress
 
-from normits_demand.concurrency import multiprocessing
-
 
 # ## CONSTANTS ## #
 LOG = nd_log.get_logger(__name__)
@@ -243,6 +243,275 @@ class TimeFormat(enum.Enum):
         return factors_fn()
 
 
+class SegmentStore(collections.abc.MutableMapping):
+    """Contiguous, optionally memory-mapped, storage for DVector data.
+
+    Lays all segments out as a single (n_segments, n_zones) array, with a
+    segment_name -> row index on top. Behaves like a DVector.data
+    dictionary, so can be passed anywhere one would be used, but avoids
+    the overhead of a separate array per segment. If a path is given the
+    array is backed by a numpy memmap (.npy format) so segments are only
+    read from disk when they are accessed.
+
+    If no zoning system is being used, the array is one dimensional and
+    holds a single value per segment.
+
+    Attributes
+    ----------
+    array:
+        The underlying (n_segments, n_zones) array. Rows are in the same
+        order as segment_names.
+
+    segment_names:
+        The names of the segments, in row order.
+
+    path:
+        The path to the memmap file backing this store. None if the data
+        is held in memory.
+    """
+
+    def __init__(self,
+                 array: np.ndarray,
+                 segment_names: List[str],
+                 path: Optional[nd.PathLike] = None,
+                 ) -> None:
+        """
+        Parameters
+        ----------
+        array:
+            The data to store. The first axis must be the same length as
+            segment_names.
+
+        segment_names:
+            The name of the segment in each row of array.
+
+        path:
+            The path to the file backing array, if it is a memmap.
+        """
+        segment_names = list(segment_names)
+        if array.shape[0] != len(segment_names):
+            raise ValueError(
+                "Got %s segment names for an array with %s rows."
+                % (len(segment_names), array.shape[0])
+            )
+
+        self._array = array
+        self._segment_names = segment_names
+        self._index = {name: i for i, name in enumerate(segment_names)}
+        self._path = None if path is None else pathlib.Path(path)
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    @property
+    def segment_names(self) -> List[str]:
+        return self._segment_names.copy()
+
+    @property
+    def path(self) -> Optional[pathlib.Path]:
+        return self._path
+
+    @property
+    def is_memmap(self) -> bool:
+        return isinstance(self._array, np.memmap)
+
+    @classmethod
+    def empty(cls,
+              segment_names: List[str],
+              n_zones: Optional[int] = None,
+              dtype: np.dtype = np.float64,
+              path: Optional[nd.PathLike] = None,
+              ) -> SegmentStore:
+        """Creates a new zero filled SegmentStore
+
+        Parameters
+        ----------
+        segment_names:
+            The names of the segments to store, in row order.
+
+        n_zones:
+            The number of zones in each segment. If None, a single value
+            is stored per segment.
+
+        dtype:
+            The datatype of the array to create.
+
+        path:
+            If set, the array is created as a memmap at this path,
+            overwriting any existing file.
+
+        Returns
+        -------
+        segment_store:
+            A new SegmentStore filled with zeros.
+        """
+        shape = (len(segment_names), )
+        if n_zones is not None:
+            shape += (n_zones, )
+
+        if path is None:
+            array = np.zeros(shape, dtype=dtype)
+        else:
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+        return cls(array=array, segment_names=segment_names, path=path)
+
+    @classmethod
+    def from_dict(cls,
+                  data: nd.DVectorData,
+                  segment_names: Optional[List[str]] = None,
+                  n_zones: Optional[int] = None,
+                  path: Optional[nd.PathLike] = None,
+                  ) -> SegmentStore:
+        """Creates a SegmentStore from a DVector.data dictionary
+
+        Parameters
+        ----------
+        data:
+            The DVector.data dictionary to copy into the store.
+
+        segment_names:
+            The order to lay the segments out in. If left as None, the
+            order of data is used.
+
+        n_zones:
+            The number of zones in each segment. If None, a single value
+            is stored per segment.
+
+        path:
+            If set, the array is created as a memmap at this path,
+            overwriting any existing file.
+
+        Returns
+        -------
+        segment_store:
+            A new SegmentStore containing the values of data.
+        """
+        if segment_names is None:
+            segment_names = list(data.keys())
+
+        # Integer data is promoted so later float values aren't truncated
+        dtype = np.result_type(*[np.asarray(data[x]).dtype for x in segment_names])
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+
+        store = cls.empty(
+            segment_names=segment_names,
+            n_zones=n_zones,
+            dtype=dtype,
+            path=path,
+        )
+        for i, name in enumerate(segment_names):
+            store._array[i] = np.asarray(data[name]).flatten() if n_zones else data[name]
+
+        store.flush()
+        return store
+
+    @classmethod
+    def open(cls,
+             path: nd.PathLike,
+             segment_names: List[str],
+             mode: str = 'r+',
+             ) -> SegmentStore:
+        """Opens a SegmentStore previously written to path
+
+        Parameters
+        ----------
+        path:
+            The path to the .npy memmap file to open.
+
+        segment_names:
+            The name of the segment in each row of the file. This should be
+            the segment_names of the SegmentationLevel the data was
+            written with.
+
+        mode:
+            The mode to open the memmap in. See `numpy.memmap`.
+
+        Returns
+        -------
+        segment_store:
+            A SegmentStore backed by the memmap at path.
+        """
+        array = np.lib.format.open_memmap(path, mode=mode)
+        return cls(array=array, segment_names=segment_names, path=path)
+
+    def has_layout(self, segment_names: List[str]) -> bool:
+        """Checks whether the rows of this store are in segment_names order"""
+        return self._segment_names == list(segment_names)
+
+    def flush(self) -> None:
+        """Writes any changes to the memmap file to disk, if there is one"""
+        if self.is_memmap:
+            self._array.flush()
+
+    def to_dict(self) -> nd.DVectorData:
+        """Copies the data in this store into a DVector.data dictionary"""
+        return {name: self._array[i].copy() for name, i in self._index.items()}
+
+    def __getitem__(self, segment_name: str) -> Union[np.ndarray, int, float]:
+        return self._array[self._index[segment_name]]
+
+    def __setitem__(self, segment_name: str, value: Union[np.ndarray, int, float]) -> None:
+        if segment_name not in self._index:
+            raise KeyError(
+                "Cannot add segment %s to a SegmentStore. The segments are "
+                "fixed when the store is created." % segment_name
+            )
+        self._array[self._index[segment_name]] = value
+
+    def __delitem__(self, segment_name: str) -> None:
+        raise TypeError("Segments cannot be removed from a SegmentStore.")
+
+    def __iter__(self):
+        return iter(self._segment_names)
+
+    def __len__(self) -> int:
+        return len(self._segment_names)
+
+    def __contains__(self, segment_name: Any) -> bool:
+        return segment_name in self._index
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Memmaps are read into memory when pickled, so drop the path
+        state = self.__dict__.copy()
+        state['_array'] = np.array(self._array)
+        state['_path'] = None
+        return state
+
+
+class ChunkedExecution(NamedTuple):
+    """Settings for running DVector operations out of core
+
+    When a DVector is given these settings its data is memory-mapped to a
+    file in folder. Operations on it then stream over blocks of segments,
+    writing the results straight into new memory-mapped files, so no more
+    than roughly max_chunk_bytes of data is held in memory at once. Every
+    DVector created by an operation inherits the same settings.
+
+    Attributes
+    ----------
+    folder:
+        The folder to write the memory-mapped files to. Files are not
+        removed automatically, so this should be a temporary folder that
+        can be deleted once the DVectors are no longer needed.
+
+    max_chunk_bytes:
+        The approximate peak memory, in bytes, to use for the data of
+        each operation.
+    """
+    folder: pathlib.Path
+    max_chunk_bytes: int = 2 ** 28
+
+    def new_path(self) -> pathlib.Path:
+        """Creates a new, uniquely named, file in folder to memory-map to"""
+        pathlib.Path(self.folder).mkdir(parents=True, exist_ok=True)
+        handle, path = tempfile.mkstemp(suffix=".npy", prefix="dvec_", dir=self.folder)
+        os.close(handle)
+        return pathlib.Path(path)
+
+
 class DVector:
     """One dimensional, segmentation and zoning flexible, heterogeneous data.
 
@@ -285,8 +554,12 @@ class DVector:
     # Default chunk sizes for multiprocessing
     # Chosen through best guesses and tests
     _chunk_size = 100000
-    _to_df_min_chunk_size = 400
-    _translate_zoning_min_chunk_size = 700
+
+    # Maximum number of values to create at once when multiplying blocks
+    _block_chunk_size = int(1e7)
+
+    # Out of core settings, see ChunkedExecution
+    _chunked = None
 
     # Use for getting a bunch of progress bars for mp code
     _debugging_mp_code = False
@@ -302,6 +575,8 @@ class DVector:
                  df_chunk_size: Optional[int] = None,
                  infill: Optional[Any] = 0,
                  process_count: Optional[int] = consts.PROCESS_COUNT,
+                 memmap_path: Optional[nd.PathLike] = None,
+                 chunked: Optional[ChunkedExecution] = None,
                  ) -> None:
         """
         Validates the input arguments and creates a DVector
@@ -319,7 +594,7 @@ class DVector:
         import_data:
             The data to become the DVector data. Can take either a
             dictionary in the DVector.data format (usually used internally),
-            or a pandas DataFrame.
+            a SegmentStore, or a pandas DataFrame.
 
         time_format:
             The time_format that the import_data represents. Must be one of:
@@ -343,12 +618,8 @@ class DVector:
             {segment_name: column_name}
 
         df_chunk_size:
-            Only used when import_data is a pandas.DataFrame.
-            The size of each chunk when processing a large pandas.DataFrame
-            into a DVector. Often, the size of the DataFrame can be the
-            primary cause of slowdown. By processing in chunks, the conversion
-            runs much faster. By default, set to DVector._chunk_size. Play
-            with different values to get speedup.
+            No longer used, DataFrames are converted in a single vectorised
+            step. Kept for backwards compatibility.
 
         infill:
             If there are any missing segmentation/zone combinations this value
@@ -361,6 +632,19 @@ class DVector:
             would be os.cpu_count() - 2. If set to zero, multiprocessing
             will not be used.
             Defaults to consts.PROCESS_COUNT.
+
+        memmap_path:
+            If set, the DVector data is laid out in a single contiguous
+            SegmentStore, backed by a numpy memmap at this path. Any
+            existing file at this path will be overwritten. Useful for
+            large DVectors that would otherwise not fit in memory.
+            If the data is already memory-mapped this is ignored.
+
+        chunked:
+            If set, the DVector data is memory-mapped to a new file in
+            chunked.folder (unless memmap_path is given) and operations
+            are run out of core, a block of segments at a time. See
+            `ChunkedExecution` for more details.
         """
         # Validate arguments
         if zoning_system is not None:
@@ -386,11 +670,7 @@ class DVector:
 
         # Define multiprocessing arguments
         self.process_count = process_count
-
-        if self.process_count == 0:
-            self._chunk_divider = 1
-        else:
-            self._chunk_divider = self.process_count * 3
+        self._chunked = chunked
 
         # Set defaults if args not set
         val_col = self._val_col if val_col is None else val_col
@@ -407,7 +687,7 @@ class DVector:
                 segment_naming_conversion=df_naming_conversion,
                 infill=infill,
             )
-        elif isinstance(import_data, dict):
+        elif isinstance(import_data, (dict, SegmentStore)):
             self._data = self._dict_to_dvec(
                 import_data=import_data,
                 infill=infill,
@@ -415,7 +695,19 @@ class DVector:
         else:
             raise NotImplementedError(
                 "Don't know how to deal with anything other than: "
-                "pandas DF, or dict"
+                "pandas DF, dict, or SegmentStore"
+            )
+
+        # Lay the data out on disk if asked to
+        if memmap_path is None and chunked is not None and not self.is_memmap:
+            memmap_path = chunked.new_path()
+
+        if memmap_path is not None and not self.is_memmap:
+            self._data = SegmentStore.from_dict(
+                data=self._data,
+                segment_names=self.segmentation.segment_names,
+                n_zones=self._n_zones,
+                path=memmap_path,
             )
 
     # SETTERS AND GETTERS
@@ -454,6 +746,20 @@ class DVector:
         else:
             self._process_count = a
 
+    @property
+    def is_memmap(self) -> bool:
+        return isinstance(self._data, SegmentStore) and self._data.is_memmap
+
+    @property
+    def chunked(self) -> Optional[ChunkedExecution]:
+        return self._chunked
+
+    @property
+    def _n_zones(self) -> Optional[int]:
+        if self.zoning_system is None:
+            return None
+        return self.zoning_system.n_zones
+
     @property
     def time_format(self):
         if self._time_format is None:
@@ -489,6 +795,149 @@ class DVector:
             % (method, self.zoning_system.name, other.zoning_system.name)
         )
 
+    def _to_block(self, segment_names: List[str] = None) -> np.ndarray:
+        """Returns the data of this DVector as a single 2D block
+
+        Parameters
+        ----------
+        segment_names:
+            The order to put the segments in. If left as None,
+            self.segmentation.segment_names is used.
+
+        Returns
+        -------
+        block:
+            A (n_segments, n_zones) array of this DVector's data, with
+            the rows in segment_names order. If there is no zoning system
+            this is a (n_segments, ) array. If the data is already laid
+            out in this order, a view of the data is returned rather than
+            a copy.
+        """
+        if segment_names is None:
+            segment_names = self.segmentation.segment_names
+
+        if isinstance(self._data, SegmentStore) and self._data.has_layout(segment_names):
+            return np.asarray(self._data.array)
+
+        if self.zoning_system is None:
+            return np.array([self._data[x] for x in segment_names])
+        return np.stack([np.ravel(self._data[x]) for x in segment_names])
+
+    @staticmethod
+    def _broadcast_blocks(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Adds a zone axis to a or b if only one of them has zoning"""
+        if a.ndim < b.ndim:
+            a = a[:, np.newaxis]
+        elif b.ndim < a.ndim:
+            b = b[:, np.newaxis]
+        return a, b
+
+    def _row_chunks(self,
+                    n_rows: int,
+                    row_size: Optional[int],
+                    n_arrays: int = 3,
+                    ) -> Iterator[slice]:
+        """Splits n_rows into chunks that fit in self.chunked.max_chunk_bytes
+
+        Parameters
+        ----------
+        n_rows:
+            The number of rows to split.
+
+        row_size:
+            The number of values in each row. None if there is no zoning.
+
+        n_arrays:
+            The number of row sized arrays that exist at once while
+            processing a chunk.
+
+        Yields
+        ------
+        rows:
+            A slice of the next chunk of rows. Only a single slice of all
+            rows is yielded when not running chunked.
+        """
+        if self._chunked is None:
+            yield slice(0, n_rows)
+            return
+
+        row_bytes = np.dtype(np.float64).itemsize * (row_size or 1) * n_arrays
+        rows_per_chunk = max(1, self._chunked.max_chunk_bytes // row_bytes)
+        for start in range(0, n_rows, rows_per_chunk):
+            yield slice(start, min(start + rows_per_chunk, n_rows))
+
+    def _build_store(self,
+                     segment_names: List[str],
+                     fill_fn: Callable[[slice], np.ndarray],
+                     n_zones: Optional[int] = -1,
+                     n_arrays: int = 3,
+                     ) -> SegmentStore:
+        """Builds a SegmentStore of segment_names, a chunk of rows at a time
+
+        When running chunked, the store is memory-mapped to a new file in
+        self.chunked.folder and filled one chunk at a time. Otherwise,
+        fill_fn is called once for all rows.
+
+        Parameters
+        ----------
+        segment_names:
+            The names of the segments, in row order, of the new store.
+
+        fill_fn:
+            A function taking a slice of rows and returning the data for
+            those rows.
+
+        n_zones:
+            The number of zones in each row. Defaults to the number of
+            zones in this DVector.
+
+        n_arrays:
+            The number of row sized arrays that exist at once while
+            fill_fn is running. Used to size the chunks.
+
+        Returns
+        -------
+        store:
+            The new SegmentStore.
+        """
+        if n_zones == -1:
+            n_zones = self._n_zones
+
+        if self._chunked is None:
+            return SegmentStore(
+                array=np.asarray(fill_fn(slice(0, len(segment_names)))),
+                segment_names=segment_names,
+            )
+
+        store = SegmentStore.empty(
+            segment_names=segment_names,
+            n_zones=n_zones,
+            path=self._chunked.new_path(),
+        )
+        for rows in self._row_chunks(len(segment_names), n_zones, n_arrays):
+            store.array[rows] = fill_fn(rows)
+        store.flush()
+        return store
+
+    def _chunked_matmul(self,
+                        matrix: sparse.spmatrix,
+                        block: np.ndarray,
+                        rows: slice,
+                        ) -> np.ndarray:
+        """Calculates (matrix @ block)[rows], reading in only the rows of block needed"""
+        matrix = sparse.csr_matrix(matrix)[rows]
+        if self._chunked is None:
+            return matrix @ block
+
+        # Only read in the rows of block that are used, a chunk at a time
+        used = np.unique(matrix.indices)
+        matrix = matrix.tocsc()
+        result = np.zeros((matrix.shape[0], ) + block.shape[1:])
+        for chunk in self._row_chunks(len(used), int(np.prod(block.shape[1:]))):
+            cols = used[chunk]
+            result += matrix[:, cols] @ block[cols]
+        return result
+
     # BUILT IN METHODS
     def __mul__(self: DVector, other: DVector) -> DVector:
         """
@@ -517,12 +966,17 @@ class DVector:
 
         # ## DO MULTIPLICATION ## #
         # Use the segmentations to figure out what to multiply
-        multiply_dict, return_segmentation = self.segmentation * other.segmentation
+        self_idx, other_idx, return_segmentation = self.segmentation.multiply_indices(
+            other.segmentation
+        )
 
-        # Build the dvec data here with multiplication
-        dvec_data = dict.fromkeys(multiply_dict.keys())
-        for final_seg, (self_key, other_key) in multiply_dict.items():
-            dvec_data[final_seg] = self._data[self_key] * other._data[other_key]
+        # Multiply all segments at once
+        self_block, other_block = self._broadcast_blocks(self._to_block(), other._to_block())
+        dvec_data = self._build_store(
+            segment_names=return_segmentation.segment_names,
+            fill_fn=lambda rows: self_block[self_idx[rows]] * other_block[other_idx[rows]],
+            n_zones=None if return_zoning_system is None else return_zoning_system.n_zones,
+        )
 
         return DVector(
             zoning_system=return_zoning_system,
@@ -530,6 +984,7 @@ class DVector:
             time_format=self._choose_time_format(other),
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def __truediv__(self: DVector, other: DVector) -> DVector:
@@ -558,13 +1013,18 @@ class DVector:
         return_zoning_system = self._check_other(other, "divide")
 
         # ## DO DIVISION ## #
-        # Use the segmentations to figure out what to multiply
-        division_dict, return_segmentation = self.segmentation / other.segmentation
+        # Use the segmentations to figure out what to divide
+        self_idx, other_idx, return_segmentation = self.segmentation.divide_indices(
+            other.segmentation
+        )
 
-        # Build the dvec data here with division
-        dvec_data = dict.fromkeys(division_dict.keys())
-        for final_seg, (self_key, other_key) in division_dict.items():
-            dvec_data[final_seg] = self._data[self_key] / other._data[other_key]
+        # Divide all segments at once
+        self_block, other_block = self._broadcast_blocks(self._to_block(), other._to_block())
+        dvec_data = self._build_store(
+            segment_names=return_segmentation.segment_names,
+            fill_fn=lambda rows: self_block[self_idx[rows]] / other_block[other_idx[rows]],
+            n_zones=None if return_zoning_system is None else return_zoning_system.n_zones,
+        )
 
         return DVector(
             zoning_system=return_zoning_system,
@@ -572,6 +1032,7 @@ class DVector:
             time_format=self._choose_time_format(other),
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def __add__(self, other: DVector) -> DVector:
@@ -610,9 +1071,15 @@ class DVector:
             )
 
         # Perform addition
-        dvec_data = {}
-        for segment in self.segmentation.segment_names:
-            dvec_data[segment] = self._data[segment] + other._data[segment]
+        segment_names = self.segmentation.segment_names
+        self_block, other_block = self._broadcast_blocks(
+            self._to_block(segment_names), other._to_block(segment_names)
+        )
+        dvec_data = self._build_store(
+            segment_names=segment_names,
+            fill_fn=lambda rows: self_block[rows] + other_block[rows],
+            n_zones=None if return_zoning_system is None else return_zoning_system.n_zones,
+        )
 
         return DVector(
             zoning_system=return_zoning_system,
@@ -620,6 +1087,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
     def __sub__(self,other: DVector) -> DVector:
         """
@@ -653,10 +1121,16 @@ class DVector:
                 "Cannot subtract 2 DVectors with different time_format"
             )
 
-        # Perform addition
-        dvec_data = {}
-        for segment in self.segmentation.segment_names:
-            dvec_data[segment] = self._data[segment] - other._data[segment]
+        # Perform subtraction
+        segment_names = self.segmentation.segment_names
+        self_block, other_block = self._broadcast_blocks(
+            self._to_block(segment_names), other._to_block(segment_names)
+        )
+        dvec_data = self._build_store(
+            segment_names=segment_names,
+            fill_fn=lambda rows: self_block[rows] - other_block[rows],
+            n_zones=None if return_zoning_system is None else return_zoning_system.n_zones,
+        )
 
         return DVector(
             zoning_system=return_zoning_system,
@@ -664,6 +1138,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def __abs__(self) -> DVector:
@@ -673,16 +1148,19 @@ class DVector:
         Returns:
             DVector: All positive DVector
         """
-        dvec_data = {}
-        for segment in self.segmentation.segment_names:
-            dvec_data[segment] = np.absolute(self._data[segment])
-        
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=self.segmentation.segment_names,
+            fill_fn=lambda rows: np.absolute(block[rows]),
+        )
+
         return DVector(
             zoning_system=self.zoning_system,
             segmentation=self.segmentation,
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def copy(self) -> DVector:
@@ -693,8 +1171,82 @@ class DVector:
             time_format=self._time_format,
             import_data=self._data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
+    def to_memmap(self, path: nd.PathLike) -> DVector:
+        """Returns a copy of this DVector, with data memory-mapped to path
+
+        Parameters
+        ----------
+        path:
+            The path to write the memmap file to. Conventionally should
+            end in .npy. Any existing file at this path will be overwritten.
+
+        Returns
+        -------
+        dvec:
+            A copy of this DVector, with its data laid out in a single
+            contiguous SegmentStore backed by a numpy memmap at path.
+            Use `SegmentStore.open()` with this DVector's segment_names to
+            re-open the data later.
+        """
+        data = self._data
+        if isinstance(data, SegmentStore):
+            data = {k: data[k] for k in data}
+
+        return DVector(
+            zoning_system=self.zoning_system,
+            segmentation=self.segmentation,
+            time_format=self._time_format,
+            import_data=data,
+            process_count=self.process_count,
+            memmap_path=path,
+            chunked=self._chunked,
+        )
+
+    def to_chunked(self, chunked: Optional[ChunkedExecution]) -> DVector:
+        """Returns a copy of this DVector, running operations out of core
+
+        Parameters
+        ----------
+        chunked:
+            The settings to use when running out of core. See
+            `ChunkedExecution` for more details. If None, a copy of this
+            DVector running operations in memory is returned.
+
+        Returns
+        -------
+        dvec:
+            A copy of this DVector. If chunked is set, the data is
+            memory-mapped to a new file in chunked.folder, and all
+            DVectors created from it will be too.
+        """
+        data = self._data
+        if chunked is None and isinstance(data, SegmentStore) and data.is_memmap:
+            data = SegmentStore(
+                array=np.array(data.array),
+                segment_names=data.segment_names,
+            )
+
+        return DVector(
+            zoning_system=self.zoning_system,
+            segmentation=self.segmentation,
+            time_format=self._time_format,
+            import_data=data,
+            process_count=self.process_count,
+            chunked=chunked,
+        )
+
+    def lazy(self) -> LazyDVector:
+        """Returns a LazyDVector to record operations on this DVector
+
+        Operations on the returned LazyDVector are not carried out until
+        `LazyDVector.evaluate()` is called, when they are all evaluated
+        in a single fused pass. See `LazyDVector` for more details.
+        """
+        return LazyDVector(self)
+
     # CUSTOM METHODS
     def _validate_time_format(self,
                               time_format: Union[str, TimeFormat],
@@ -851,112 +1403,35 @@ class DVector:
         #  We can trust these conditions are met in this environment.
         return import_data
 
-    def _dataframe_to_dvec_internal(self,
-                                    df_chunk,
-                                    ) -> nd.DVectorData:
-        """
-        The internal function of _dataframe_to_dvec - for multiprocessing
-        """
-        if self.zoning_system is None:
-            # Make sure only one value exists for each segment
-            segments = df_chunk[self._segment_col].tolist()
-            segment_set = set(segments)
-            if len(segment_set) != len(segments):
-                raise ValueError(
-                    "The given DataFrame has one or more repeated values "
-                    "for some of the segments. Found %s segments, but only "
-                    "%s of them are unique."
-                    % (len(segments), len(segment_set))
-                )
-
-            # Can use 1 to 1 connection to speed this up
-            vals = df_chunk[self._val_col].to_list()
-            dvec_chunk = {s: v for s, v, in zip(segments, vals)}
-
-        else:
-            # Generate the data on a per segment basis
-            dvec_chunk = dict.fromkeys(df_chunk[self._segment_col].tolist())
-
-            for segment in df_chunk['segment'].unique():
-                # Get all available pop for this segment
-                seg_data = df_chunk[df_chunk[self._segment_col] == segment].copy()
-
-                # Check that it's a valid segment_name
-                if segment not in self.segmentation.segment_names:
-                    raise ValueError(
-                        "%s is not a valid segment name for a Dvector using %s "
-                        "segmentation.\n Data with segment:\n%s"
-                        % (segment, self.segmentation.name, seg_data)
-                    )
-
-                # TODO(BT): There's a VERY slight chance that duplicate zones
-                #  could be split across processes. Need to add a check for
-                #  this on the calling function.
-                # Make sure there are no duplicate zones
-                seg_zones = seg_data[self._zone_col].tolist()
-                seg_zones_set = set(seg_zones)
-                if len(seg_zones_set) != len(seg_zones):
-                    raise ValueError(
-                        "The given DataFrame has one or more repeated values "
-                        "for some of the zones in segment %s. Found %s "
-                        "segments, but only %s of them are unique."
-                        % (segment, len(seg_zones), len(seg_zones_set))
-                    )
-
-                # Make sure zones that don't exist in this zoning system are found
-                zoning_system_zones = set(self.zoning_system.unique_zones)
-                extra_zones = seg_zones_set - zoning_system_zones
-                if len(extra_zones) > 0:
-                    # Shortern the error message if long
-                    if len(extra_zones) > 10:
-                        extra_zones = list(extra_zones)
-                        extra_zones_str = (
-                            f"{extra_zones[:10]} plus {len(extra_zones) - 10} more"
-                        )
-                    else:
-                        extra_zones_str = f"{extra_zones}"
-
-                    raise ValueError(
-                        f"Found zones that don't exist in {self.zoning_system.name} "
-                        f"zoning in the given DataFrame.\n"
-                        f"For segment {segment}, the following zones do not "
-                        f"belong to this zoning system:\n"
-                        f"{extra_zones_str}"
-                    )
-
-                # Filter down to just data as values, and zoning system as the index
-                seg_data = seg_data.reindex(columns=[self._zone_col, self._val_col])
-                seg_data = seg_data.set_index(self._zone_col)
-
-                # Infill any missing zones as 0
-                seg_data = seg_data.reindex(self.zoning_system.unique_zones, fill_value=0)
-                dvec_chunk[segment] = seg_data.values.flatten()
-
-        return dvec_chunk
-
     def _dataframe_to_dvec(self,
                            df: pd.DataFrame,
                            zone_col: str,
                            val_col: str,
                            segment_naming_conversion: str,
                            infill: Any,
-                           ) -> nd.DVectorData:
+                           ) -> SegmentStore:
         """
         Converts a pandas dataframe into dvec.data internal structure
 
         While converting, will:
         - Make sure that any missing segment/zone combinations are infilled
-          with infill
+          with infill. Zones missing from a segment that is in df are
+          infilled with 0.
         - Make sure only one value exist for each segment/zone combination
         """
+        # The data is stored in a numeric array, so can't be infilled with None
+        if infill is None:
+            raise ValueError(
+                "Cannot infill a DVector built from a DataFrame with None. "
+                "infill must be a number, such as 0 or np.nan."
+            )
+
         # Init columns depending on if we have zones
         required_cols = self.segmentation.naming_order + [self._val_col]
-        sort_cols = [self._segment_col]
 
         # Add zoning if we need it
         if self.zoning_system is not None:
             required_cols += [self._zone_col]
-            sort_cols += [self._zone_col]
 
         # ## VALIDATE AND CONVERT THE GIVEN DATAFRAME ## #
         # Rename import_data columns to internal names
@@ -966,8 +1441,6 @@ class DVector:
         # Rename the segment columns if needed
         if segment_naming_conversion is not None:
             df = self.segmentation.rename_segment_cols(df, segment_naming_conversion)
-            # Set to None so the columns aren't renamed again in `create_segement_col`
-            segment_naming_conversion = None
 
         # Make sure we don't have any extra columns
         extra_cols = set(list(df)) - set(required_cols)
@@ -981,61 +1454,60 @@ class DVector:
                 % (required_cols, extra_cols)
             )
 
-        # Add the segment column - drop the individual cols
-        df[self._segment_col] = self.segmentation.create_segment_col(
-            df=df,
-            naming_conversion=segment_naming_conversion
-        )
-        df = df.drop(columns=self.segmentation.naming_order)
-
-        # Sort by the segment columns for MP speed
-        df = df.sort_values(by=sort_cols)
+        # ## CONVERT TO SEGMENT AND ZONE POSITIONS ## #
+        segment_ids = self.segmentation.create_segment_id_col(df)
+        values = df[self._val_col].to_numpy()
 
-        # ## MULTIPROCESSING SETUP ## #
-        # If the dataframe is smaller than the chunk size, evenly split across cores
-        if len(df) < self._df_chunk_size * self.process_count:
-            chunk_size = math.ceil(len(df) / self.process_count)
+        n_segments = len(self.segmentation)
+        if self.zoning_system is None:
+            positions = segment_ids
+            shape = (n_segments, )
         else:
-            chunk_size = self._df_chunk_size
-
-        # setup a pbar
-        pbar_kwargs = {
-            'desc': "Converting df to dvec",
-            'unit': "segment",
-            'disable': (not self._debugging_mp_code),
-            'total': math.ceil(len(df) / chunk_size),
-        }
+            zones = pd.Index(self.zoning_system.unique_zones)
+            zone_ids = zones.get_indexer(df[self._zone_col])
 
-        # ## MULTIPROCESS THE DATA CONVERSION ## #
-        # Build a list of arguments
-        kwarg_list = list()
-        for df_chunk in pd_utils.chunk_df(df, chunk_size):
-            kwarg_list.append({'df_chunk': df_chunk})
+            # Make sure zones that don't exist in this zoning system are found
+            if np.any(zone_ids == -1):
+                extra_zones = pd.unique(df[self._zone_col].to_numpy()[zone_ids == -1])
 
-        # Call across multiple threads
-        data_chunks = multiprocessing.multiprocess(
-            fn=self._dataframe_to_dvec_internal,
-            kwargs=kwarg_list,
-            process_count=self.process_count,
-            pbar_kwargs=pbar_kwargs,
-        )
-        data = du.sum_dict_list(data_chunks)
+                # Shorten the error message if long
+                if len(extra_zones) > 10:
+                    extra_zones_str = (
+                        f"{list(extra_zones[:10])} plus {len(extra_zones) - 10} more"
+                    )
+                else:
+                    extra_zones_str = f"{set(extra_zones)}"
 
-        # ## MAKE SURE DATA CONTAINS ALL SEGMENTS ##
-        # find the segments which arent in there
-        not_in = set(self.segmentation.segment_names) - data.keys()
+                raise ValueError(
+                    f"Found zones that don't exist in {self.zoning_system.name} "
+                    f"zoning in the given DataFrame.\n"
+                    f"The following zones do not belong to this zoning "
+                    f"system:\n{extra_zones_str}"
+                )
 
-        # Figure out what the default value should be
-        if self.zoning_system is None:
-            default_val = infill
-        else:
-            default_val = np.array([infill] * self.zoning_system.n_zones)
+            positions = segment_ids * len(zones) + zone_ids
+            shape = (n_segments, len(zones))
 
-        # Infill the missing segments
-        for name in not_in:
-            data[name] = copy.copy(default_val)
+        # Make sure only one value exists for each segment / zone
+        n_unique = len(np.unique(positions))
+        if n_unique != len(positions):
+            raise ValueError(
+                "The given DataFrame has one or more repeated values "
+                "for some of the segments and zones. Found %s rows, but only "
+                "%s of them are unique."
+                % (len(positions), n_unique)
+            )
+
+        # ## BUILD THE DATA BLOCK ## #
+        dtype = np.result_type(values.dtype, np.float64)
+        array = np.full(shape, infill, dtype=dtype)
 
-        return data
+        # Missing zones of given segments are 0, missing segments are infill
+        if self.zoning_system is not None:
+            array[np.unique(segment_ids)] = 0
+        array.reshape(-1)[positions] = values
+
+        return SegmentStore(array=array, segment_names=self.segmentation.segment_names)
 
     def get_segment_data(self,
                          segment_name: str = None,
@@ -1080,116 +1552,40 @@ class DVector:
                 "segment_name"
             )
 
-        if segment_name not in self.segmentation.segment_names:
+        if not self.segmentation.is_valid_segment_name(segment_name):
             raise ValueError(
                 "%s is not a valid segment name for a Dvector using %s "
-                "segmentation." % self.segmentation.name
+                "segmentation." % (segment_name, self.segmentation.name)
             )
 
         # Get data and covert to zoning system
         return self._data[segment_name]
 
-    @staticmethod
-    def _to_df_internal(self_data: nd.DVectorData,
-                        self_zoning_system: core.ZoningSystem,
-                        self_segmentation: core.SegmentationLevel,
-                        col_names: List[str],
-                        val_col: str,
-                        zone_col: str,
-                        ) -> pd.DataFrame:
-        """
-        Internal function of self.to_df(). For multiprocessing
-        """
-        # Init
-        # index_cols = du.list_safe_remove(col_names, [val_col])
-        concat_ph = list()
-
-        # Convert all given data into dataframes
-        for segment_name, data in self_data.items():
-            # Add the zoning system back in
-            if self_zoning_system is None:
-                df = pd.DataFrame([{val_col: data}])
-            else:
-                index = pd.Index(self_zoning_system.unique_zones, name=zone_col)
-                data = {val_col: data.flatten()}
-                df = pd.DataFrame(index=index, data=data).reset_index()
-
-            # Add all segments into the df
-            seg_dict = self_segmentation.get_seg_dict(segment_name)
-            for col_name, col_val in seg_dict.items():
-                # Set column values
-                df[col_name] = col_val
-
-                # Set column type
-                col_type = self_segmentation.segment_types[col_name]
-                df[col_name] = df[col_name].astype(col_type)
-
-            # Make sure all dfs are in the same format
-            df = df.reindex(columns=col_names)
-            concat_ph.append(df)
-
-        return pd.concat(concat_ph, ignore_index=True)
-
     def to_df(self) -> pd.DataFrame:
         """
         Convert this DVector into a pandas dataframe with the segmentation
         as the index
         """
         # Init
-        col_names = list(self.segmentation.get_seg_dict(list(self._data.keys())[0]).keys())
-        col_names = col_names + [self._val_col]
-        if self.zoning_system is not None:
-            zone_col = self.zoning_system.col_name
-            col_names = [zone_col] + col_names
-        else:
-            zone_col = None
-
-        # ## MULTIPROCESS ## #
-        # Define chunk size
-        total = len(self._data)
-        chunk_size = math.ceil(total / self._chunk_divider)
-
-        # Make sure the chunks aren't too small
-        if chunk_size < self._to_df_min_chunk_size:
-            chunk_size = self._to_df_min_chunk_size
+        block = self._to_block()
+        n_segments = len(self.segmentation)
+        n_zones = 1 if self.zoning_system is None else self.zoning_system.n_zones
 
-        # Define the kwargs
-        kwarg_list = list()
-        for keys_chunk in du.chunk_list(self._data.keys(), chunk_size):
-            # Calculate subsets of self.data to avoid locks between processes
-            self_data_subset = {k: self._data[k] for k in keys_chunk}
-
-            if self.zoning_system is not None:
-                self_zoning_system = self.zoning_system.copy()
-            else:
-                self_zoning_system = None
-
-            # Assign to a process
-            kwarg_list.append({
-                'self_data': self_data_subset,
-                'self_zoning_system': self_zoning_system,
-                'self_segmentation': self.segmentation.copy(),
-                'col_names': col_names.copy(),
-                'val_col': self._val_col,
-                'zone_col': zone_col,
-            })
-
-        # Define pbar
-        pbar_kwargs = {
-            'desc': "Converting DVector to dataframe",
-            'disable': not self._debugging_mp_code,
-        }
-
-        # Run across processes
-        dataframe_chunks = multiprocessing.multiprocess(
-            fn=self._to_df_internal,
-            kwargs=kwarg_list,
-            process_count=self.process_count,
-            pbar_kwargs=pbar_kwargs,
-        )
+        # Zones vary fastest, segments repeat for each zone
+        data = dict()
+        if self.zoning_system is not None:
+            data[self.zoning_system.col_name] = np.tile(
+                self.zoning_system.unique_zones, n_segments
+            )
 
-        # Join all the dataframe chunks together
-        return pd.concat(dataframe_chunks, ignore_index=True)
+        segment_params = self.segmentation.segment_params
+        for col_name in self.segmentation.naming_order:
+            col_type = self.segmentation.segment_types[col_name]
+            col = np.repeat(segment_params[col_name], n_zones)
+            data[col_name] = pd.Series(col, copy=False).astype(col_type)
+
+        data[self._val_col] = block.reshape(-1)
+        return pd.DataFrame(data)
 
     def compress_out(self, path: nd.PathLike) -> pathlib.Path:
         """
@@ -1222,33 +1618,6 @@ class DVector:
 
         return compress.write_out(self, path, overwrite_suffix=False)
 
-    @staticmethod
-    def _multiply_and_aggregate_internal(aggregation_keys_chunk,
-                                         aggregation_dict,
-                                         multiply_dict,
-                                         self_data,
-                                         other_data,
-                                         ):
-        """
-        Internal function of self.multiply_and_aggregate. For multiprocessing
-        """
-        # Init
-        dvec_data = dict.fromkeys(aggregation_keys_chunk)
-
-        # Multiply and aggregate in chunks
-        for out_seg_name in aggregation_keys_chunk:
-            # Calculate all the segments to aggregate
-            inter_segs = list()
-            for segment_name in aggregation_dict[out_seg_name]:
-                self_key, other_key = multiply_dict[segment_name]
-                result = (self_data[self_key] * other_data[other_key]).flatten()
-                inter_segs.append(result)
-
-            # Aggregate!
-            dvec_data[out_seg_name] = np.sum(inter_segs, axis=0)
-
-        return dvec_data
-
     def reduce(self,
                out_segmentation: nd.core.segments.SegmentationLevel,
                check_same: bool = True,
@@ -1291,15 +1660,15 @@ class DVector:
                 % type(out_segmentation)
             )
 
-        # Get the reduction dictionary
-        reduce_dict = self.segmentation.reduce(out_segmentation)
+        # Get the reduction matrix
+        reduce_mat = self.segmentation.reduce_matrix(out_segmentation)
 
         # Reduce!
-        # TODO(BT): Add optional multiprocessing if reduce_dict is big enough
-        dvec_data = dict.fromkeys(reduce_dict.keys())
-        for out_seg_name, in_seg_names in reduce_dict.items():
-            in_lst = [self._data[x].flatten() for x in in_seg_names]
-            dvec_data[out_seg_name] = np.sum(in_lst, axis=0)
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=out_segmentation.segment_names,
+            fill_fn=lambda rows: self._chunked_matmul(reduce_mat, block, rows),
+        )
 
         reduced_dvec = DVector(
             zoning_system=self.zoning_system,
@@ -1307,6 +1676,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
         if not check_same:
@@ -1371,18 +1741,21 @@ class DVector:
                 % type(out_segmentation)
             )
 
-        # Get the aggregation dict
+        # Get the aggregation matrix
         if split_tfntt_segmentation:
-            aggregation_dict = self.segmentation.split_tfntt_segmentation(out_segmentation)
+            aggregation_mat = self.segmentation.grouping_matrix(
+                out_segmentation,
+                self.segmentation.split_tfntt_segmentation(out_segmentation),
+            )
         else:
-            aggregation_dict = self.segmentation.aggregate(out_segmentation)
+            aggregation_mat = self.segmentation.aggregation_matrix(out_segmentation)
 
         # Aggregate!
-        # TODO(BT): Add optional multiprocessing if aggregation_dict is big enough
-        dvec_data = dict.fromkeys(aggregation_dict.keys())
-        for out_seg_name, in_seg_names in aggregation_dict.items():
-            in_lst = [self._data[x].flatten() for x in in_seg_names]
-            dvec_data[out_seg_name] = np.sum(in_lst, axis=0)
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=out_segmentation.segment_names,
+            fill_fn=lambda rows: self._chunked_matmul(aggregation_mat, block, rows),
+        )
 
         aggregated_dvec = DVector(
             zoning_system=self.zoning_system,
@@ -1390,6 +1763,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
         if not check_same:
@@ -1448,55 +1822,32 @@ class DVector:
                 % type(out_segmentation)
             )
 
-        # Get the aggregation and multiplication dictionaries
-        multiply_dict, mult_return_seg = self.segmentation * other.segmentation
-        aggregation_dict = mult_return_seg.aggregate(out_segmentation)
-
-        # ## MULTIPROCESS ## #
-        # Define the chunk size
-        total = len(aggregation_dict)
-        chunk_size = math.ceil(total / self._chunk_divider)
-
-        # Define the kwargs
-        kwarg_list = list()
-        for keys_chunk in du.chunk_list(aggregation_dict.keys(), chunk_size):
-            # Calculate subsets of keys to avoid locks between processes
-            agg_dict_subset = {k: aggregation_dict[k] for k in keys_chunk}
-            
-            key_subset = itertools.chain.from_iterable(agg_dict_subset.values())
-            mult_dict_subset = {k: multiply_dict[k] for k in key_subset}
-
-            self_keys, other_keys = zip(*mult_dict_subset.values())
-            self_data = {k: self._data[k] for k in self_keys}
-            other_data = {k: other._data[k] for k in other_keys}
-
-            # Assign to a process
-            kwarg_list.append({
-                'aggregation_keys_chunk': keys_chunk,
-                'aggregation_dict': agg_dict_subset,
-                'multiply_dict': mult_dict_subset,
-                'self_data': self_data,
-                'other_data': other_data,
-            })
-
-        # Define pbar
-        pbar_kwargs = {
-            'desc': "Multiplying and aggregating",
-            'disable': not self._debugging_mp_code,
-        }
-
-        # Run across processes
-        data_chunks = multiprocessing.multiprocess(
-            fn=self._multiply_and_aggregate_internal,
-            kwargs=kwarg_list,
-            process_count=self.process_count,
-            pbar_kwargs=pbar_kwargs,
+        # Get the multiplication indices and aggregation matrix
+        self_idx, other_idx, mult_return_seg = self.segmentation.multiply_indices(
+            other.segmentation
         )
-
-        # Combine all computation chunks into one
-        dvec_data = dict.fromkeys(aggregation_dict.keys())
-        for chunk in data_chunks:
-            dvec_data.update(chunk)
+        aggregation_mat = mult_return_seg.aggregation_matrix(out_segmentation).tocsc()
+
+        # Multiply and aggregate in chunks, to avoid building the full
+        # multiplied block in memory
+        self_block, other_block = self._broadcast_blocks(self._to_block(), other._to_block())
+        row_size = max(int(np.prod(x.shape[1:])) for x in (self_block, other_block))
+        rows_per_chunk = max(1, self._block_chunk_size // row_size)
+
+        # Accumulate into a zero filled store, memory-mapped if running chunked
+        row_shape = np.broadcast_shapes(self_block.shape[1:], other_block.shape[1:])
+        dvec_data = self._build_store(
+            segment_names=out_segmentation.segment_names,
+            fill_fn=lambda rows: np.zeros((rows.stop - rows.start, ) + row_shape),
+            n_zones=row_shape[0] if row_shape else None,
+            n_arrays=1,
+        )
+        result = dvec_data.array
+        for chunk_start in range(0, len(self_idx), rows_per_chunk):
+            chunk = slice(chunk_start, chunk_start + rows_per_chunk)
+            product = self_block[self_idx[chunk]] * other_block[other_idx[chunk]]
+            result += aggregation_mat[:, chunk] @ product
+        dvec_data.flush()
 
         return DVector(
             zoning_system=self.zoning_system,
@@ -1504,6 +1855,7 @@ class DVector:
             time_format=self._choose_time_format(other),
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def sum_is_close(self,
@@ -1554,26 +1906,7 @@ class DVector:
         sum:
             The total sum of all values
         """
-        return np.sum([x.flatten() for x in self._data.values()])
-
-    @staticmethod
-    def _translate_zoning_internal(self_data: nd.DVectorData,
-                                   translation: np.array,
-                                   ) -> nd.DVectorData:
-        """
-        Internal function of self.translate_zoning. For multiprocessing
-        """
-        # Init
-        dvec_data = dict.fromkeys(self_data.keys())
-
-        # Translate zoning in chunks
-        for key, value in self_data.items():
-            value = value.flatten()
-            temp = np.broadcast_to(np.expand_dims(value, axis=1), translation.shape)
-            temp = temp * translation
-            dvec_data[key] = temp.sum(axis=0)
-
-        return dvec_data
+        return np.sum(self._to_block())
 
     def translate_zoning(self,
                          new_zoning: core.ZoningSystem,
@@ -1617,54 +1950,23 @@ class DVector:
             return self.copy()
 
         # Get translation
-        translation = self.zoning_system.translate(new_zoning, weighting)
-
-        # ## MULTIPROCESS ## #
-        # Define the chunk size
-        total = len(self._data)
-        chunk_size = math.ceil(total / self._chunk_divider)
-
-        # Make sure the chunks aren't too small
-        if chunk_size < self._translate_zoning_min_chunk_size:
-            chunk_size = self._translate_zoning_min_chunk_size
-
-        # Define the kwargs
-        kwarg_list = list()
-        for keys_chunk in du.chunk_list(self._data.keys(), chunk_size):
-            # Calculate subsets of self.data to avoid locks between processes
-            self_data_subset = {k: self._data[k] for k in keys_chunk}
-
-            # Assign to a process
-            kwarg_list.append({
-                'self_data': self_data_subset,
-                'translation': translation.copy(),
-            })
-
-        # Define pbar
-        pbar_kwargs = {
-            'desc': "Translating",
-            'disable': not self._debugging_mp_code,
-        }
-
-        # Run across processes
-        data_chunks = multiprocessing.multiprocess(
-            fn=self._translate_zoning_internal,
-            kwargs=kwarg_list,
-            process_count=self.process_count,
-            pbar_kwargs=pbar_kwargs,
+        translation = self.zoning_system.translate_sparse(new_zoning, weighting)
+
+        # Translate all segments at once
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=self.segmentation.segment_names,
+            fill_fn=lambda rows: np.asarray(block[rows] @ translation),
+            n_zones=new_zoning.n_zones,
         )
 
-        # Combine all computation chunks into one
-        dvec_data = dict.fromkeys(self._data.keys())
-        for chunk in data_chunks:
-            dvec_data.update(chunk)
-
         return DVector(
             zoning_system=new_zoning,
             segmentation=self.segmentation,
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def expand_segmentation(self,
@@ -1712,18 +2014,25 @@ class DVector:
                 )
 
         # ## EXPAND ## #
-        expand_dict, return_seg = self.segmentation.expand(expansion_dvec.segmentation)
+        self_idx, other_idx, return_seg = self.segmentation.expand_indices(
+            expansion_dvec.segmentation
+        )
 
         # Build the new DVec data from the expansion
-        dvec_data = dict.fromkeys(expand_dict.keys())
-        for final_seg, (self_key, other_key) in expand_dict.items():
-            dvec_data[final_seg] = self._data[self_key] * expansion_dvec._data[other_key]
+        self_block, other_block = self._broadcast_blocks(
+            self._to_block(), expansion_dvec._to_block()
+        )
+        dvec_data = self._build_store(
+            segment_names=return_seg.segment_names,
+            fill_fn=lambda rows: self_block[self_idx[rows]] * other_block[other_idx[rows]],
+        )
 
         expanded_dvec = DVector(
             zoning_system=self.zoning_system,
             segmentation=return_seg,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
         # Make sure we're not dropping any demand
@@ -1775,12 +2084,14 @@ class DVector:
             return self.copy()
 
         # Get the subset definition
-        subset_list = self.segmentation.subset(out_segmentation)
+        subset_idx = self.segmentation.subset_indices(out_segmentation)
 
         # Keep just the subset
-        dvec_data = dict.fromkeys(subset_list)
-        for segment in subset_list:
-            dvec_data[segment] = self._data[segment]
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=out_segmentation.segment_names,
+            fill_fn=lambda rows: block[subset_idx[rows]],
+        )
 
         return DVector(
             zoning_system=self.zoning_system,
@@ -1788,6 +2099,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def split_tfntt_segmentation(self,
@@ -1842,15 +2154,18 @@ class DVector:
                 % self.segmentation.naming_order
             )
 
-        # Get the aggregation dict
-        aggregation_dict = self.segmentation.split_tfntt_segmentation(out_segmentation)
+        # Get the aggregation matrix
+        aggregation_mat = self.segmentation.grouping_matrix(
+            out_segmentation,
+            self.segmentation.split_tfntt_segmentation(out_segmentation),
+        )
 
         # Aggregate!
-        # TODO(BT): Add optional multiprocessing if aggregation_dict is big enough
-        dvec_data = dict()
-        for out_seg_name, in_seg_names in aggregation_dict.items():
-            in_lst = [self._data[x].flatten() for x in in_seg_names]
-            dvec_data[out_seg_name] = np.sum(in_lst, axis=0)
+        block = self._to_block()
+        dvec_data = self._build_store(
+            segment_names=out_segmentation.segment_names,
+            fill_fn=lambda rows: self._chunked_matmul(aggregation_mat, block, rows),
+        )
 
         return DVector(
             zoning_system=self.zoning_system,
@@ -1858,6 +2173,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def duplicate_segment_like(self,
@@ -1925,6 +2241,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def split_segmentation_like(self,
@@ -1981,44 +2298,51 @@ class DVector:
         # Get the dictionary defining how to split
         split_dict = self.segmentation.split(other.segmentation)
 
+        # The segment of self that each segment of other is split from
+        out_names = other.segmentation.segment_names
+        in_lookup = {o: i for i, o_names in split_dict.items() for o in o_names}
+        in_idx = self.segmentation.get_segment_ids(in_lookup[x] for x in out_names)
+        n_splits = np.bincount(in_idx, minlength=len(self.segmentation))
+
         # Split!
-        # TODO(BT): Add optional multiprocessing if split_dict is big enough
-        dvec_data = dict.fromkeys(other.segmentation.segment_names)
-        for in_seg_name, out_seg_names in split_dict.items():
-            # Calculate the splitting factors
-            if zonal_average:
-                other_segs = [np.mean(other._data[s]) for s in out_seg_names]
-                split_factors = other_segs / np.sum(other_segs)
-
-                # If 0 total split evenly
-                if np.sum(other_segs) == 0:
-                    split_factors = np.ones_like(other_segs) / len(other_segs)
-                else:
-                    split_factors = other_segs / np.sum(other_segs)
-            else:
-                other_segs = np.array([other._data[s] for s in out_seg_names])
-                zonal_sums = np.sum(other_segs, axis=0)
-                with np.errstate(all='ignore'):
-                    split_factors = other_segs / zonal_sums
-
-                # If any divide by 0s, split evenly
-                zero_sums = (zonal_sums == 0)
-                if np.count_nonzero(zero_sums) > 0:
-                    # Get even split
-                    n_segs = len(other_segs)
-                    even_split = np.ones((n_segs, 1)) * (1 / n_segs)
-
-                    # Infill the NaNs
-                    zero_loc = zero_sums.nonzero()
-                    for loc in zero_loc:
-                        split_factors[:, loc] = even_split
-
-            # Get the original value
-            self_seg = self._data[in_seg_name]
-
-            # Split
-            for name, factor in zip(out_seg_names, split_factors):
-                dvec_data[name] = self_seg * factor
+        self_block = self._to_block()
+        other_block = other._to_block(out_names)
+        if zonal_average:
+            # A single splitting factor for each segment, split evenly if 0
+            other_means = other_block.reshape(len(out_names), -1).mean(axis=1)
+            split_totals = np.bincount(in_idx, weights=other_means, minlength=len(n_splits))
+            split_factors = 1 / n_splits[in_idx]
+            np.divide(
+                other_means,
+                split_totals[in_idx],
+                out=split_factors,
+                where=split_totals[in_idx] != 0,
+            )
+
+            def split_rows(rows: slice) -> np.ndarray:
+                factors = split_factors[rows]
+                if self_block.ndim > 1:
+                    factors = factors[:, np.newaxis]
+                return self_block[in_idx[rows]] * factors
+
+        else:
+            # Splitting factors for each zone, split evenly where 0
+            grouping = sparse.csr_matrix(
+                (np.ones(len(in_idx)), (in_idx, np.arange(len(in_idx)))),
+                shape=(len(n_splits), len(in_idx)),
+            )
+            zonal_sums = self._build_store(
+                segment_names=self.segmentation.segment_names,
+                fill_fn=lambda rows: self._chunked_matmul(grouping, other_block, rows),
+            ).array
+
+            def split_rows(rows: slice) -> np.ndarray:
+                sums = zonal_sums[in_idx[rows]]
+                factors = np.broadcast_to(1 / n_splits[in_idx[rows]], sums.shape[::-1]).T.copy()
+                np.divide(other_block[rows], sums, out=factors, where=sums != 0)
+                return self_block[in_idx[rows]] * factors
+
+        dvec_data = self._build_store(segment_names=out_names, fill_fn=split_rows)
 
         split_dvec = DVector(
             zoning_system=self.zoning_system,
@@ -2026,6 +2350,7 @@ class DVector:
             time_format=self._choose_time_format(other),
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
         # Check that we haven't dropped anything
@@ -2040,143 +2365,98 @@ class DVector:
 
         return split_dvec
 
-    def _balance_at_segments_internal(self,
-                                      other: DVector,
-                                      zone_mask: np.ndarray,
-                                      segment_names: List[str],
-                                      split_weekday_weekend: bool = False,
-                                      show_pbar: bool = True,
-                                      ):
-        """Internal balancing function of self.balance_at_segments()"""
-        # Init
-        dvec_data = dict.fromkeys(segment_names)
-        pbar = tqdm(
-            desc="Balancing segments",
-            total=len(segment_names),
-            dynamic_ncols=True,
-            leave=False,
-            disable=not show_pbar
-        )
-
-        if split_weekday_weekend:
-            # Get the grouped segment lists
-            wk_day_segs = self.segmentation.get_grouped_weekday_segments()
-            wk_end_segs = self.segmentation.get_grouped_weekend_segments()
-
-            # Control by weekday and weekend separately
-            for split_wk_segs in [wk_day_segs, wk_end_segs]:
-                for segment_group in split_wk_segs:
-                    # Get data and infill zeros
-                    self_data_lst = list()
-                    other_data_lst = list()
-                    zero_mask_lst = list()
-                    for segment in segment_group:
-                        # Only perform balancing for given segments
-                        if segment not in segment_names:
-                            continue
-                        # Get data
-                        self_data = self._data[segment]
-                        other_data = other._data[segment]
-
-                        # Infill zeros for balance
-                        zero_mask = self_data <= 0
-                        self_data = np.where(self_data <= 0, self._zero_infill, self_data)
-                        other_data = np.where(other_data <= 0, self._zero_infill, other_data)
-
-                        # Remove the zones we don't care about
-                        self_data *= zone_mask
-                        other_data *= zone_mask
-
-                        # Append
-                        self_data_lst.append(self_data)
-                        other_data_lst.append(other_data)
-                        zero_mask_lst.append(zero_mask)
-
-                    # Get the control factor
-                    if np.sum(self_data_lst) == 0:
-                        factor = 1
-                    else:
-                        factor = np.sum(other_data_lst) / np.sum(self_data_lst)
-
-                    # Balance each segment
-                    iterator = zip(segment_group, self_data_lst, zero_mask_lst)
-                    for segment, self_data, zero_mask in iterator:
-                        # Only perform balancing for given segments
-                        if segment not in segment_names:
-                            continue
-                        dvec_data[segment] = self_data * factor * ~zero_mask
-                        pbar.update()
+    def _balance_segment_groups(self,
+                                segment_names: List[str],
+                                split_weekday_weekend: bool,
+                                ) -> np.ndarray:
+        """Gets the balancing group id of each of segment_names
+
+        Segments in the same group are balanced together, with a single
+        factor. Without split_weekday_weekend, each segment is its own
+        group.
+        """
+        if not split_weekday_weekend:
+            return np.arange(len(segment_names))
+
+        # Segments only differing by weekday, or weekend, tp are grouped
+        position = {name: i for i, name in enumerate(segment_names)}
+        segment_groups = np.full(len(segment_names), -1)
+        n_groups = 0
+        tp_groups = (
+            self.segmentation.get_grouped_weekday_segments()
+            + self.segmentation.get_grouped_weekend_segments()
+        )
+        for group in tp_groups:
+            idx = [position[x] for x in group if x in position]
+            if len(idx) > 0:
+                segment_groups[idx] = n_groups
+                n_groups += 1
 
-        else:
-            # Control given segments as normal
-            for segment in segment_names:
-                # Get data
-                self_data = self._data[segment]
-                other_data = other._data[segment]
-
-                # Infill zeros for balance
-                zero_mask = self_data <= 0
-                self_data = np.where(self_data <= 0, self._zero_infill, self_data)
-                other_data = np.where(other_data <= 0, self._zero_infill, other_data)
-
-                # Remove the zones we don't care about
-                self_data *= zone_mask
-                other_data *= zone_mask
-
-                # Balance
-                if np.sum(self_data) == 0:
-                    factor = 1
-                else:
-                    factor = np.sum(other_data) / np.sum(self_data)
-                dvec_data[segment] = self_data * factor * ~zero_mask
-                pbar.update()
-        pbar.close()
-        return dvec_data
+        # Any segments not in a tp group are balanced on their own
+        ungrouped = segment_groups == -1
+        segment_groups[ungrouped] = np.arange(ungrouped.sum()) + n_groups
+        return segment_groups
 
-    def balance_at_segments(self,
-                            other: DVector,
-                            split_weekday_weekend: bool = False,
-                            balance_zoning: Optional[nd.BalancingZones] = None,
-                            ) -> DVector:
-        """
-        Balance segment totals to other, ignoring zoning splits.
+    def _balance_at_segments_internal(self,
+                                      self_block: np.ndarray,
+                                      other_block: np.ndarray,
+                                      translation: sparse.spmatrix,
+                                      segment_groups: np.ndarray,
+                                      ) -> np.ndarray:
+        """Internal balancing function of self.balance_at_segments()
 
-        Essentially does
-        self[segment] *= other[segment].sum() / self[segment].sum()
-        for all segments.
+        Balances all segments across all zone groups at once.
 
         Parameters
         ----------
-        other:
-            The DVector to control this one to. Must have the same segmentation
-            as this DVector
+        self_block:
+            The (n_segments, n_zones) block of data to balance.
 
-        split_weekday_weekend:
-            Whether to control the time periods as weekday and weekend splits
-            instead of each individual time period. If set to True,
-            each DVector must be at a segmentation with a 'tp' segment.
+        other_block:
+            The (n_segments, n_zones) block of data to balance to.
 
+        translation:
+            A (n_zones, n_zone_groups) matrix defining the zone groups to
+            balance within. Each column is the weight of each zone in that
+            zone group.
 
-        balance_zoning:
-            The zoning systems to balance at per segment. If not given, the
-            balance will ignore all zones and just balance segments. If given,
-            a translation needs to exist between the given DVectors zoning
-            systems, and the zoning we are balancing at.
+        segment_groups:
+            The balancing group id of each segment. Segments with the same
+            id are balanced together.
 
         Returns
         -------
-        controlled_dvector:
-            A copy of this DVector, controlled to other. The total of each
-            segment should be equal across self and other.
-
-        Raises
-        ------
-        ValueError:
-            If the given parameters are not the correct types.
-
-        ValueError:
-            If self and other do not have the same segmentation.
-        """
+        balanced_block:
+            self_block balanced to other_block. Zones where self_block
+            is less than or equal to 0 are set to 0.
+        """
+        # Infill zeros for balance
+        zero_mask = self_block <= 0
+        self_block = np.where(zero_mask, self._zero_infill, self_block)
+        other_block = np.where(other_block <= 0, self._zero_infill, other_block)
+
+        # Total for each segment group in each zone group
+        n_segments = len(segment_groups)
+        grouping = sparse.csr_matrix(
+            (np.ones(n_segments), (segment_groups, np.arange(n_segments))),
+            shape=(segment_groups.max() + 1, n_segments),
+        )
+        self_totals = np.asarray(grouping @ np.asarray(self_block @ translation))
+        other_totals = np.asarray(grouping @ np.asarray(other_block @ translation))
+
+        # Get the control factors, leave groups without data alone
+        factors = np.ones_like(self_totals)
+        np.divide(other_totals, self_totals, out=factors, where=self_totals != 0)
+
+        # Spread the zone group factors back across the zones
+        zone_factors = np.asarray(translation @ factors[segment_groups].T).T
+        return self_block * zone_factors * ~zero_mask
+
+    def _check_balance_inputs(self,
+                              other: DVector,
+                              balance_zoning: Optional[nd.BalancingZones],
+                              ) -> None:
+        """Checks self can be balanced to other, raising a ValueError if not"""
         # Validate inputs
         if not isinstance(other, DVector):
             raise ValueError(
@@ -2219,55 +2499,109 @@ class DVector:
                 % (self.segmentation.name, other.segmentation.name)
             )
 
-        # Loop through each segment and control
+    def _balance_blocks(self,
+                        self_block: np.ndarray,
+                        other_block: np.ndarray,
+                        split_weekday_weekend: bool,
+                        balance_zoning: Optional[nd.BalancingZones],
+                        ) -> np.ndarray:
+        """Balances self_block to other_block, see self.balance_at_segments()
+
+        Both blocks must be laid out in self.segmentation.segment_names
+        order, with self.zoning_system zones.
+        """
+        # Balance all the segments at once
+        segment_names = self.segmentation.segment_names
         if balance_zoning is None:
-            # Ignore all zoning and balance=
-            dvec_data = self._balance_at_segments_internal(
-                other=other,
-                zone_mask=np.ones(self.zoning_system.unique_zones.shape),
-                segment_names=self.segmentation.segment_names,
-                split_weekday_weekend=split_weekday_weekend,
-                show_pbar=True,
+            # Ignore all zoning and balance
+            balanced = self._balance_at_segments_internal(
+                self_block=self_block,
+                other_block=other_block,
+                translation=sparse.csr_matrix(np.ones((self._n_zones, 1))),
+                segment_groups=self._balance_segment_groups(
+                    segment_names, split_weekday_weekend
+                ),
             )
 
         else:
-            data_list = list()
-            pbar = tqdm(
-                desc=f"Balancing segments",
-                total=len(self.segmentation.segment_names),
-                dynamic_ncols=True,
-            )
-            # Loop through balancing zone groups
-            # TODO Add multiprocessing?
+            # Balance the segments of each zoning group separately, any
+            # segments not in a group are left as they are
+            balanced = self_block.astype(np.float64, copy=True)
             for zoning, segments in balance_zoning:
-                # Figure out the masks for zone groups
-                translation = self.zoning_system.translate(zoning)
-
-                # Balance at each group
-                for zone_mask in translation.T:
-                    # Skip this if no zones translate
-                    if zone_mask.sum() == 0:
-                        continue
-
-                    adjusted = self._balance_at_segments_internal(
-                        other=other,
-                        zone_mask=zone_mask,
-                        segment_names=segments,
-                        split_weekday_weekend=split_weekday_weekend,
-                        show_pbar=False,
-                    )
-                    data_list.append(adjusted)
-                pbar.update(len(segments))
-            pbar.close()
-            # Sum the zone groups together
-            dvec_data = du.combine_dict_list(data_list, operator.add)
+                if len(segments) == 0:
+                    continue
+                idx = self.segmentation.get_segment_ids(segments)
+                balanced[idx] = self._balance_at_segments_internal(
+                    self_block=self_block[idx],
+                    other_block=other_block[idx],
+                    translation=self.zoning_system.translate_sparse(zoning),
+                    segment_groups=self._balance_segment_groups(
+                        segments, split_weekday_weekend
+                    ),
+                )
+        return balanced
+
+    def balance_at_segments(self,
+                            other: DVector,
+                            split_weekday_weekend: bool = False,
+                            balance_zoning: Optional[nd.BalancingZones] = None,
+                            ) -> DVector:
+        """
+        Balance segment totals to other, ignoring zoning splits.
+
+        Essentially does
+        self[segment] *= other[segment].sum() / self[segment].sum()
+        for all segments.
+
+        Parameters
+        ----------
+        other:
+            The DVector to control this one to. Must have the same segmentation
+            as this DVector
+
+        split_weekday_weekend:
+            Whether to control the time periods as weekday and weekend splits
+            instead of each individual time period. If set to True,
+            each DVector must be at a segmentation with a 'tp' segment.
+
+
+        balance_zoning:
+            The zoning systems to balance at per segment. If not given, the
+            balance will ignore all zones and just balance segments. If given,
+            a translation needs to exist between the given DVectors zoning
+            systems, and the zoning we are balancing at.
+
+        Returns
+        -------
+        controlled_dvector:
+            A copy of this DVector, controlled to other. The total of each
+            segment should be equal across self and other.
+
+        Raises
+        ------
+        ValueError:
+            If the given parameters are not the correct types.
+
+        ValueError:
+            If self and other do not have the same segmentation.
+        """
+        self._check_balance_inputs(other, balance_zoning)
+        balanced = self._balance_blocks(
+            self_block=self._to_block(),
+            other_block=other._to_block(),
+            split_weekday_weekend=split_weekday_weekend,
+            balance_zoning=balance_zoning,
+        )
 
+        segment_names = self.segmentation.segment_names
+        dvec_data = SegmentStore(array=balanced, segment_names=segment_names)
         return DVector(
             zoning_system=self.zoning_system,
             segmentation=other.segmentation,
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def sum_zoning(self) -> DVector:
@@ -2319,6 +2653,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dict(zip(keys, values)),
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def convert_time_format(self,
@@ -2383,6 +2718,7 @@ class DVector:
             time_format=new_time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def write_sector_reports(self,
@@ -2499,6 +2835,7 @@ class DVector:
             time_format=self.time_format,
             import_data=dvec_data,
             process_count=self.process_count,
+            chunked=self._chunked,
         )
 
     def save(self, path: PathLike = None) -> Union[None, Dict[str, Any]]:
@@ -2529,6 +2866,10 @@ class DVector:
             "data": self._data,
         }
 
+        # Keep the saved format the same, whatever the storage
+        if isinstance(self._data, SegmentStore):
+            instance_dict["data"] = self._data.to_dict()
+
         # Write out to disk and compress
         if path is not None:
             with open(path, 'wb') as f:
@@ -2576,6 +2917,349 @@ class DVector:
         )
 
 
+class _LazyOperation(NamedTuple):
+    """A single operation recorded by a LazyDVector"""
+    # One of "multiply", "segments", "zoning" or "balance"
+    kind: str
+    args: Tuple[Any, ...]
+
+
+class LazyDVector:
+    """Records DVector operations, to be evaluated in a single fused pass
+
+    Built by calling `DVector.lazy()`. Each operation returns a new
+    LazyDVector, recording the operation in an expression graph rather
+    than building a new DVector. Calling `evaluate()` carries out all of
+    the recorded operations and returns the final DVector.
+
+    When evaluating, consecutive aggregations are combined into a single
+    segment matrix, and consecutive zone translations into a single
+    translation. These are then fused with the multiplication either
+    side of them, so the (often very large) result of a multiplication
+    is only ever built a chunk of rows at a time, in the same way as
+    `DVector.multiply_and_aggregate()`. Balancing needs the whole
+    DVector, so is the only operation that builds a full intermediate
+    array.
+
+    Inputs are validated as each operation is recorded, so errors are
+    raised in the same place they would be for a DVector. Unlike the
+    DVector methods, no checks are made on the totals before and after
+    aggregation.
+    """
+
+    def __init__(self,
+                 source: DVector,
+                 segmentation: core.SegmentationLevel = None,
+                 zoning_system: core.ZoningSystem = None,
+                 time_format: Optional[TimeFormat] = None,
+                 operations: Tuple[_LazyOperation, ...] = (),
+                 ) -> None:
+        """
+        Parameters
+        ----------
+        source:
+            The DVector to apply the operations to.
+
+        segmentation:
+            The segmentation of the result of operations. Defaults to
+            source.segmentation.
+
+        zoning_system:
+            The zoning system of the result of operations. Defaults to
+            source.zoning_system.
+
+        time_format:
+            The time format of the result of operations. Defaults to
+            the time format of source.
+
+        operations:
+            The operations to apply to source, in order.
+        """
+        # pylint: disable=protected-access
+        self._source = source
+        self._operations = operations
+        if len(operations) == 0:
+            segmentation = source.segmentation
+            zoning_system = source.zoning_system
+            time_format = source._time_format
+
+        self._segmentation = segmentation
+        self._zoning_system = zoning_system
+        self._time_format = time_format
+
+    @property
+    def segmentation(self) -> core.SegmentationLevel:
+        return self._segmentation
+
+    @property
+    def zoning_system(self) -> core.ZoningSystem:
+        return self._zoning_system
+
+    @property
+    def time_format(self) -> Optional[str]:
+        if self._time_format is None:
+            return None
+        return self._time_format.name
+
+    @property
+    def operations(self) -> List[str]:
+        """The kinds of operation recorded, in the order they are applied"""
+        return [x.kind for x in self._operations]
+
+    def _record(self,
+                operation: _LazyOperation,
+                segmentation: core.SegmentationLevel = None,
+                zoning_system: core.ZoningSystem = None,
+                time_format: Optional[TimeFormat] = None,
+                ) -> LazyDVector:
+        """Returns a new LazyDVector with operation recorded after self's"""
+        return LazyDVector(
+            source=self._source,
+            segmentation=self._segmentation if segmentation is None else segmentation,
+            zoning_system=self._zoning_system if zoning_system is None else zoning_system,
+            time_format=self._time_format if time_format is None else time_format,
+            operations=self._operations + (operation, ),
+        )
+
+    @staticmethod
+    def _as_dvector(other: Union[DVector, LazyDVector]) -> DVector:
+        """Evaluates other if it is a LazyDVector"""
+        if isinstance(other, LazyDVector):
+            return other.evaluate()
+        return other
+
+    def __mul__(self, other: Union[DVector, LazyDVector]) -> LazyDVector:
+        """Records multiplying by other, see `DVector.__mul__()`"""
+        other = self._as_dvector(other)
+
+        # The checks only use the segmentation, zoning and time format
+        # pylint: disable=protected-access
+        return_zoning_system = DVector._check_other(self, other, "multiply")
+        self_idx, other_idx, return_segmentation = self._segmentation.multiply_indices(
+            other.segmentation
+        )
+        return self._record(
+            _LazyOperation("multiply", (self_idx, other_idx, other)),
+            segmentation=return_segmentation,
+            zoning_system=return_zoning_system,
+            time_format=DVector._choose_time_format(self, other),
+        )
+
+    def aggregate(self,
+                  out_segmentation: core.SegmentationLevel,
+                  split_tfntt_segmentation: bool = False,
+                  ) -> LazyDVector:
+        """Records aggregating into out_segmentation, see `DVector.aggregate()`"""
+        if not isinstance(out_segmentation, core.SegmentationLevel):
+            raise ValueError(
+                "out_segmentation is not the correct type. "
+                "Expected SegmentationLevel, got %s"
+                % type(out_segmentation)
+            )
+
+        if split_tfntt_segmentation:
+            aggregation_mat = self._segmentation.grouping_matrix(
+                out_segmentation,
+                self._segmentation.split_tfntt_segmentation(out_segmentation),
+            )
+        else:
+            aggregation_mat = self._segmentation.aggregation_matrix(out_segmentation)
+
+        return self._record(
+            _LazyOperation("segments", (sparse.csr_matrix(aggregation_mat), )),
+            segmentation=out_segmentation,
+        )
+
+    def translate_zoning(self,
+                         new_zoning: core.ZoningSystem,
+                         weighting: str = None,
+                         ) -> LazyDVector:
+        """Records translating into new_zoning, see `DVector.translate_zoning()`"""
+        if not isinstance(new_zoning, core.ZoningSystem):
+            raise ValueError(
+                "new_zoning is not the correct type. "
+                "Expected ZoningSystem, got %s"
+                % type(new_zoning)
+            )
+
+        if self._zoning_system is None:
+            raise nd.NormitsDemandError(
+                "Cannot translate the zoning system of a DVector that does "
+                "not have a zoning system to begin with."
+            )
+
+        if self._zoning_system == new_zoning:
+            return self
+
+        translation = self._zoning_system.translate_sparse(new_zoning, weighting)
+        return self._record(
+            _LazyOperation("zoning", (sparse.csr_matrix(translation), )),
+            zoning_system=new_zoning,
+        )
+
+    def balance_at_segments(self,
+                            other: Union[DVector, LazyDVector],
+                            split_weekday_weekend: bool = False,
+                            balance_zoning: Optional[nd.BalancingZones] = None,
+                            ) -> LazyDVector:
+        """Records balancing to other, see `DVector.balance_at_segments()`"""
+        other = self._as_dvector(other)
+
+        # pylint: disable=protected-access
+        DVector._check_balance_inputs(self, other, balance_zoning)
+        return self._record(
+            _LazyOperation("balance", (other, split_weekday_weekend, balance_zoning)),
+            segmentation=other.segmentation,
+        )
+
+    def evaluate(self) -> DVector:
+        """Evaluates all the recorded operations
+
+        Returns
+        -------
+        dvector:
+            A new DVector, the same as if all the operations had been
+            applied to the source DVector one after another.
+        """
+        # pylint: disable=protected-access
+        evaluator = _LazyEvaluator(self._source)
+        for operation in self._operations:
+            evaluator.apply(operation)
+
+        dvec_data = SegmentStore(
+            array=evaluator.materialise(),
+            segment_names=self._segmentation.segment_names,
+        )
+        return DVector(
+            zoning_system=self._zoning_system,
+            segmentation=self._segmentation,
+            time_format=self._time_format,
+            import_data=dvec_data,
+            process_count=self._source.process_count,
+            chunked=self._source.chunked,
+        )
+
+    def __repr__(self) -> str:
+        return "%s(source=%r, segmentation=%s, operations=%s)" % (
+            self.__class__.__name__,
+            self._source,
+            self._segmentation.name,
+            self.operations,
+        )
+
+
+class _LazyEvaluator:
+    """Evaluates the operations recorded by a LazyDVector
+
+    The state is a base block, with any pending segment matrix and zone
+    translation still to be applied to it. If a multiplication is
+    pending, the rows of the base block are instead the product of the
+    multiplication, built a chunk at a time when materialised.
+    """
+
+    def __init__(self, source: DVector) -> None:
+        # pylint: disable=protected-access
+        self._chunk_size = source._block_chunk_size
+        self._block = source._to_block()
+
+        # Segment matrix and zone translation to apply after the base block
+        self._segments: Optional[sparse.csr_matrix] = None
+        self._zoning: Optional[sparse.csr_matrix] = None
+
+        # Pending multiplication, and the segment matrix and zone
+        # translation to apply to self._block before multiplying
+        self._multiply: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self._pre_segments: Optional[sparse.csr_matrix] = None
+        self._pre_zoning: Optional[sparse.csr_matrix] = None
+
+    def apply(self, operation: _LazyOperation) -> None:
+        """Adds operation to the pending state"""
+        # pylint: disable=protected-access
+        if operation.kind == "segments":
+            matrix, = operation.args
+            self._segments = matrix if self._segments is None else matrix @ self._segments
+
+        elif operation.kind == "zoning":
+            translation, = operation.args
+            self._zoning = translation if self._zoning is None else self._zoning @ translation
+
+        elif operation.kind == "multiply":
+            self_idx, other_idx, other = operation.args
+            if self._multiply is not None:
+                self._block = self.materialise()
+                self._segments = self._zoning = None
+
+            self._multiply = (self_idx, other_idx, other._to_block())
+            self._pre_segments, self._segments = self._segments, None
+            self._pre_zoning, self._zoning = self._zoning, None
+
+        elif operation.kind == "balance":
+            other, split_weekday_weekend, balance_zoning = operation.args
+
+            # other has the same segmentation and zoning as the block
+            self._block = other._balance_blocks(
+                self_block=self.materialise(),
+                other_block=other._to_block(),
+                split_weekday_weekend=split_weekday_weekend,
+                balance_zoning=balance_zoning,
+            )
+            self._segments = self._zoning = self._multiply = None
+
+        else:
+            raise ValueError("Unknown lazy operation %s" % operation.kind)
+
+    @staticmethod
+    def _transform(block: np.ndarray,
+                   segments: Optional[sparse.csr_matrix],
+                   zoning: Optional[sparse.csr_matrix],
+                   rows: Union[slice, np.ndarray] = slice(None),
+                   ) -> np.ndarray:
+        """Returns (segments @ block @ zoning)[rows], skipping any None matrix"""
+        if segments is None:
+            block = block[rows]
+        else:
+            block = segments[rows] @ block
+        if zoning is not None:
+            block = np.asarray(block @ zoning)
+        return block
+
+    def materialise(self) -> np.ndarray:
+        """Applies all pending operations to build the current block"""
+        if self._multiply is None:
+            return self._transform(self._block, self._segments, self._zoning)
+
+        # Build the product a chunk at a time, aggregating as it goes
+        self_idx, other_idx, other_block = self._multiply
+        width = max(
+            int(np.prod(self._block.shape[1:])),
+            int(np.prod(other_block.shape[1:])),
+        )
+        rows_per_chunk = max(1, self._chunk_size // width)
+        segments = None if self._segments is None else self._segments.tocsc()
+
+        result = list()
+        for chunk_start in range(0, len(self_idx), rows_per_chunk):
+            chunk = slice(chunk_start, chunk_start + rows_per_chunk)
+            left = self._transform(
+                self._block, self._pre_segments, self._pre_zoning, self_idx[chunk]
+            )
+            left, right = DVector._broadcast_blocks(left, other_block[other_idx[chunk]])
+            product = left * right
+
+            if segments is None:
+                result.append(product)
+            elif len(result) == 0:
+                result.append(segments[:, chunk] @ product)
+            else:
+                result[0] += segments[:, chunk] @ product
+
+        if segments is None:
+            result = np.concatenate(result)
+        else:
+            result = result[0]
+        return self._transform(result, None, self._zoning)
+
+
 class DVectorError(nd.NormitsDemandError):
     """
     Exception for all errors that occur around DVector management
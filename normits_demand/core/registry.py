@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Process wide caches of the core definitions (zoning systems and
+segmentation levels), and an optional precompiled bundle of definitions
+to fill them from.
+"""
+from __future__ import annotations
+
+# Built-Ins
+import os
+import threading
+
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Generic
+from typing import TypeVar
+from typing import Callable
+from typing import Optional
+from typing import Iterable
+
+# Third Party
+import pandas as pd
+
+# Local Imports
+import normits_demand as nd
+from normits_demand import logging as nd_log
+from normits_demand.utils import compress
+
+# ## CONSTANTS ## #
+LOG = nd_log.get_logger(__name__)
+
+# If set, the bundle at this path is loaded into the caches on import
+BUNDLE_ENV_VAR = "NORMITS_DEFINITIONS_BUNDLE"
+
+T = TypeVar("T")
+
+
+# ## CLASSES ## #
+class DefinitionCache(Generic[T]):
+    """Process wide, thread safe, cache of definitions keyed by name
+
+    The first request for a name calls loader to build the definition,
+    every request after that returns the same object. Cached objects are
+    shared, so must be treated as immutable.
+    """
+
+    def __init__(self, loader: Callable[[str], T]) -> None:
+        """
+        Parameters
+        ----------
+        loader:
+            Function to build the definition for a name, when it isn't
+            in the cache.
+        """
+        self._loader = loader
+        self._cache: Dict[str, T] = dict()
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> T:
+        """Gets the definition for name, loading it if not cached"""
+        # Dictionary lookups are atomic, so only lock when loading
+        value = self._cache.get(name)
+        if value is not None:
+            return value
+
+        with self._lock:
+            if name not in self._cache:
+                self._cache[name] = self._loader(name)
+            return self._cache[name]
+
+    def add(self, name: str, value: T) -> None:
+        """Adds value to the cache as the definition of name"""
+        with self._lock:
+            self._cache[name] = value
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Removes name from the cache. Clears the whole cache if None"""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Returns the names of all the cached definitions"""
+        return list(self._cache.keys())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._cache
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+# ## FUNCTIONS ## #
+def build_definitions_bundle(
+    path: nd.PathLike,
+    zoning_names: Optional[Iterable[str]] = None,
+    segmentation_names: Optional[Iterable[str]] = None,
+) -> None:
+    """Precompiles zoning and segmentation definitions into a single file
+
+    Reading the bundle back in with `load_definitions_bundle()` is much
+    faster than reading each of the definition files in the definitions
+    folder.
+
+    Parameters
+    ----------
+    path:
+        The path to write the bundle to.
+
+    zoning_names:
+        The names of the zoning systems to include. If left as None,
+        all zoning systems in the definitions folder are included.
+
+    segmentation_names:
+        The names of the segmentations to include. If left as None,
+        all segmentations in the definitions folder are included.
+    """
+    # pylint: disable=import-outside-toplevel
+    from normits_demand.core import zoning
+    from normits_demand.core import segments
+
+    if zoning_names is None:
+        zoning_names = zoning.list_zoning_systems()
+    if segmentation_names is None:
+        segmentation_names = segments.list_segmentations()
+
+    bundle = {
+        "version": nd.__version__,
+        "pandas_version": pd.__version__,
+        "zoning_systems": {x: zoning.get_zoning_system(x) for x in zoning_names},
+        "segmentations": {x: segments.get_segmentation_level(x) for x in segmentation_names},
+    }
+    compress.write_out(bundle, path, overwrite_suffix=False)
+
+
+def load_definitions_bundle(path: nd.PathLike) -> bool:
+    """Loads a bundle written by `build_definitions_bundle()` into the caches
+
+    Bundles written by a different version of normits_demand or pandas
+    are ignored, as the definitions may have changed.
+
+    Parameters
+    ----------
+    path:
+        The path to the bundle to load.
+
+    Returns
+    -------
+    loaded:
+        True if the bundle was loaded, False if it was ignored.
+    """
+    # pylint: disable=import-outside-toplevel
+    from normits_demand.core import zoning
+    from normits_demand.core import segments
+
+    bundle: Dict[str, Any] = compress.read_in(path)
+    versions = (bundle.get("version"), bundle.get("pandas_version"))
+    if versions != (nd.__version__, pd.__version__):
+        LOG.warning(
+            "Ignoring definitions bundle %s, it was built with normits_demand "
+            "%s and pandas %s",
+            path,
+            *versions,
+        )
+        return False
+
+    for name, zoning_system in bundle["zoning_systems"].items():
+        zoning.ZONING_SYSTEM_CACHE.add(name, zoning_system)
+    for name, segmentation in bundle["segmentations"].items():
+        segments.SEGMENTATION_CACHE.add(name, segmentation)
+
+    LOG.debug(
+        "Loaded %s zoning systems and %s segmentations from %s",
+        len(bundle["zoning_systems"]),
+        len(bundle["segmentations"]),
+        path,
+    )
+    return True
+
+
+def load_bundle_from_env() -> bool:
+    """Loads the definitions bundle set in BUNDLE_ENV_VAR, if there is one"""
+    path = os.environ.get(BUNDLE_ENV_VAR)
+    if path is None:
+        return False
+
+    if not os.path.isfile(path):
+        LOG.warning("%s is set, but %s does not exist", BUNDLE_ENV_VAR, path)
+        return False
+
+    return load_definitions_bundle(path)
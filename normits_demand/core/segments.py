@@ -19,6 +19,7 @@ import os
 import math
 import pathlib
 import itertools
+import functools
 import collections
 import pathlib
 
@@ -30,11 +31,13 @@ from typing import Dict
 from typing import Tuple
 from typing import Union
 from typing import Optional
+from typing import Callable
 from typing import Iterable
 
 # Third Party
 import pandas as pd
 import numpy as np
+from scipy import sparse
 
 # Local Imports
 import normits_demand as nd
@@ -48,11 +51,44 @@ from normits_demand.utils import general as du
 from normits_demand.utils import math_utils
 from normits_demand.utils import pandas_utils as pd_utils
 from normits_demand import logging as nd_log
+from normits_demand.core import registry
 
 
 LOG = nd_log.get_logger(__name__)
 
 
+def _memoise_plan(method: Callable) -> Callable:
+    """Caches the result of a SegmentationLevel method against other
+
+    Operation plans (how to reduce, aggregate, multiply, etc. one
+    segmentation into another) only depend on the two segmentations
+    involved, so they only need to be built once per pair. The cache is
+    stored on the instance and keyed by the method and other.name. The
+    cached result is shared between calls, so must not be modified.
+    """
+    @functools.wraps(method)
+    def wrapper(self: SegmentationLevel, other: SegmentationLevel):
+        if not isinstance(other, SegmentationLevel):
+            return method(self, other)
+
+        key = (method.__name__, other.name)
+        cached = self._plan_cache.get(key)
+        if cached is not None and (cached[0] is other or cached[0] == other):
+            return cached[1]
+
+        plan = method(self, other)
+        self._plan_cache[key] = (other, plan)
+        return plan
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=None)
+def _read_definitions_csv(path: str) -> pd.DataFrame:
+    """Reads in one of the segment definitions files, caching the result"""
+    return pd.read_csv(path)
+
+
 # ## CLASSES ## #
 class SegmentationLevel:
     """Segmentation definitions to provide common interface
@@ -214,6 +250,24 @@ class SegmentationLevel:
         )
         self._segments_and_names = segments_and_names
         self._segment_names = segments_and_names['name'].to_list()
+        self._build_segment_ids()
+
+        # Operation plans built against other segmentations
+        self._plan_cache = dict()
+
+    def _build_segment_ids(self) -> None:
+        """Builds the lookups between segment ids, names and params
+
+        A segment's id is its position in `segment_names`.
+        """
+        self._segment_id_lookup = {n: i for i, n in enumerate(self._segment_names)}
+
+        seg_params = list(self._segments.itertuples(index=False, name=None))
+        self._params_id_lookup = {p: i for i, p in enumerate(seg_params)}
+        self._seg_dicts = [dict(zip(self.naming_order, p)) for p in seg_params]
+
+        self._segment_params = self._segments.to_records(index=False)
+        self._segment_params.flags.writeable = False
 
     @property
     def name(self):
@@ -239,6 +293,16 @@ class SegmentationLevel:
     def segments_and_names(self):
         return self._segments_and_names
 
+    @property
+    def segment_ids(self) -> np.ndarray:
+        """The integer id of each segment, in segment_names order"""
+        return np.arange(len(self._segment_names))
+
+    @property
+    def segment_params(self) -> np.recarray:
+        """A read only record array of the segment values, indexed by segment id"""
+        return self._segment_params
+
     def __copy__(self):
         """Returns a copy of this class"""
         return self.copy()
@@ -272,6 +336,23 @@ class SegmentationLevel:
         """Overrides the default implementation"""
         return self._segments.to_dict(orient='records').__iter__()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Drops the operation plan cache when pickling"""
+        state = self.__dict__.copy()
+        state['_plan_cache'] = dict()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Rebuilds any lookups missing from state
+
+        Segmentations pickled by older versions will not contain the
+        segment id lookups, or the operation plan cache.
+        """
+        state.setdefault('_plan_cache', dict())
+        self.__dict__.update(state)
+        if '_segment_id_lookup' not in state:
+            self._build_segment_ids()
+
 
     def _mul_div_segmentation(self,
                               other: SegmentationLevel,
@@ -331,6 +412,7 @@ class SegmentationLevel:
 
         return multiply_dict, return_seg
 
+    @_memoise_plan
     def __mul__(self, other) -> Tuple[nd.SegmentMultiplyDict, SegmentationLevel]:
         """
         Multiply two SegmentationLevel objects
@@ -363,6 +445,7 @@ class SegmentationLevel:
         return_seg_name, join_cols = self._get_multiply_definition(other)
         return self._mul_div_segmentation(other, return_seg_name, join_cols)
 
+    @_memoise_plan
     def __truediv__(self, other) -> Tuple[nd.SegmentMultiplyDict, SegmentationLevel]:
         """
         Divide two SegmentationLevel objects
@@ -399,19 +482,19 @@ class SegmentationLevel:
         """
         Returns the multiplication definitions for segments as a pd.DataFrame
         """
-        return pd.read_csv(self._multiply_definitions_path)
+        return _read_definitions_csv(str(self._multiply_definitions_path)).copy()
 
     def _read_expand_definitions(self) -> pd.DataFrame:
         """
         Returns the expansion definitions for segments as a pd.DataFrame
         """
-        return pd.read_csv(self._expand_definitions_path)
+        return _read_definitions_csv(str(self._expand_definitions_path)).copy()
 
     def _read_subset_definitions(self) -> pd.DataFrame:
         """
         Returns the expansion definitions for segments as a pd.DataFrame
         """
-        return pd.read_csv(self._subset_definitions_path)
+        return _read_definitions_csv(str(self._subset_definitions_path)).copy()
 
     def _get_multiply_definition(self,
                                  other: SegmentationLevel,
@@ -540,13 +623,13 @@ class SegmentationLevel:
         """
         Returns the multiplication definitions for segments as a pd.DataFrame
         """
-        return pd.read_csv(self._reduce_definitions_path)
+        return _read_definitions_csv(str(self._reduce_definitions_path)).copy()
 
     def _read_aggregation_definitions(self) -> pd.DataFrame:
         """
         Returns the multiplication definitions for segments as a pd.DataFrame
         """
-        return pd.read_csv(self._aggregation_definitions_path)
+        return _read_definitions_csv(str(self._aggregation_definitions_path)).copy()
 
     def _get_tfn_tt_expansion(self) -> pd.DataFrame:
         """
@@ -936,6 +1019,126 @@ class SegmentationLevel:
 
         return segment_col
 
+    def create_segment_id_col(self,
+                              df: pd.DataFrame,
+                              naming_conversion: Dict[str, str] = None,
+                              ) -> np.ndarray:
+        """
+        Creates an array of segment ids based on columns in df
+
+        The vectorised equivalent of `create_segment_col()`, returning
+        segment ids rather than segment names. Segment values in df are
+        cast to the segment types before being looked up.
+
+        Parameters
+        ----------
+        df:
+            The dataframe containing the segmentation columns to use when
+            generating the segment ids.
+
+        naming_conversion:
+            A dictionary mapping segment names in self.naming order into
+            df columns names. e.g.
+            {segment_name: column_name}
+
+        Returns
+        -------
+        segment_ids:
+            An array of segment ids, in the same order as df.
+
+        Raises
+        ------
+        ValueError:
+            If any of the segment columns cannot be found in df.
+
+        ValueError:
+            If any rows of df are not a valid segment of this segmentation.
+        """
+        # Init
+        if naming_conversion is None:
+            naming_conversion = {x: x for x in self.naming_order}
+
+        missing_cols = [naming_conversion.get(x, x) for x in self.naming_order]
+        missing_cols = [x for x in missing_cols if x not in df]
+        if len(missing_cols) > 0:
+            raise ValueError(
+                "Cannot find all segment columns in the given df. "
+                "Missing columns: %s"
+                % missing_cols
+            )
+
+        # Cast to segment types, the same way as the valid segments
+        seg_arrays = list()
+        for seg in self.naming_order:
+            col = df[naming_conversion.get(seg, seg)]
+            col_type = self._segment_types[seg]
+            if col_type in (int, float):
+                seg_arrays.append(pd.to_numeric(col))
+            else:
+                seg_arrays.append(col.astype(col_type))
+
+        segments_index = pd.MultiIndex.from_frame(self.segments)
+        segment_ids = segments_index.get_indexer(
+            pd.MultiIndex.from_arrays(seg_arrays, names=self.naming_order)
+        )
+
+        # Make sure every row was found
+        invalid_mask = segment_ids == -1
+        if invalid_mask.any():
+            invalid = pd.DataFrame(
+                {seg: np.asarray(x)[invalid_mask] for seg, x in zip(self.naming_order, seg_arrays)}
+            ).drop_duplicates()
+            raise ValueError(
+                "Found %s segments that are not valid for segmentation level "
+                "%s:\n%s"
+                % (len(invalid), self.name, invalid.head(10))
+            )
+
+        return segment_ids
+
+    def get_segment_id(self, segment_name: str) -> int:
+        """
+        Converts the given segment_name into its segment id
+        """
+        try:
+            return self._segment_id_lookup[segment_name]
+        except KeyError as err:
+            raise ValueError(
+                "'%s' is not a valid segment name for segmentation level %s."
+                % (segment_name, self.name)
+            ) from err
+
+    def get_segment_ids(self, segment_names: Iterable[str]) -> np.ndarray:
+        """
+        Converts the given segment_names into an array of segment ids
+
+        Raises
+        ------
+        ValueError:
+            If any of segment_names are not valid segment names.
+        """
+        segment_names = list(segment_names)
+        lookup = self._segment_id_lookup
+        missing = -1
+        ids = np.fromiter(
+            (lookup.get(x, missing) for x in segment_names),
+            dtype=np.intp,
+            count=len(segment_names),
+        )
+        if np.any(ids == missing):
+            invalid = [x for x in segment_names if x not in lookup]
+            raise ValueError(
+                "Some segment names are not valid for segmentation level %s: %s"
+                % (self.name, invalid)
+            )
+        return ids
+
+    def get_segment_names(self, segment_ids: Iterable[int]) -> List[str]:
+        """
+        Converts the given segment_ids into a list of segment names
+        """
+        return [self._segment_names[i] for i in segment_ids]
+
     def get_segment_name(self, segment_params: Dict[str, Any]):
         """
         Converts the given {seg_name: seg_val} dict into a segment_name
@@ -950,7 +1153,11 @@ class SegmentationLevel:
                 % (self.name, missing_segments)
             )
 
-        # Generate the name
+        # Look up valid segments, otherwise generate the name
+        seg_id = self._params_id_lookup.get(tuple(segment_params[s] for s in self.naming_order))
+        if seg_id is not None:
+            return self._segment_names[seg_id]
+
         name_parts = [str(segment_params[s]) for s in self.naming_order]
         return self._segment_name_separator.join(name_parts)
 
@@ -958,31 +1165,14 @@ class SegmentationLevel:
         """
         Converts the given segment_name into a {seg_name: seg_val} dict
         """
-        if not self.is_valid_segment_name(segment_name):
-            raise ValueError(
-                "'%s' is not a valid segment name for segmentation level %s."
-                % (segment_name, self.name)
-            )
-
-        name_parts = segment_name.split(self._segment_name_separator)
-
-        # Convert parameters to specific types if given
-        segment_parameters: dict[str, Any] = {}
-        for n, s in zip(self.naming_order, name_parts):
-            cast = self._segment_types.get(n)
-            if cast is not None:
-                segment_parameters[n] = cast(s)
-            else:
-                segment_parameters[n] = s
-
-        return segment_parameters
+        return self._seg_dicts[self.get_segment_id(segment_name)].copy()
 
     def is_valid_segment_name(self, segment_name: str) -> bool:
         """
         Checks whether the given segment_name is a valid name for this
         SegmentationLevel
         """
-        return segment_name in self.segment_names
+        return segment_name in self._segment_id_lookup
 
     def is_valid_segment_params(self, segment_params: Dict[str, Any]) -> bool:
         """Check if segment params are valid for this segment"""
@@ -993,16 +1183,10 @@ class SegmentationLevel:
             return False
 
         # Check that the values produce a segment
-        mask = np.ones(len(self.segments)).astype(bool)
-        for seg_name, seg_val in segment_params.items():
-            mask = mask & (self.segments[seg_name] == seg_val)
-        valid_segs = self.segments[mask]
-
-        if len(valid_segs) != 1:
-            return False
-
-        return True
+        seg_params = tuple(segment_params[s] for s in self.naming_order)
+        return seg_params in self._params_id_lookup
 
+    @_memoise_plan
     def reduce(self,
                other: SegmentationLevel,
                ) -> Dict[str, List[str]]:
@@ -1070,6 +1254,7 @@ class SegmentationLevel:
 
         return reduce_dict
 
+    @_memoise_plan
     def aggregate(self,
                   other: SegmentationLevel,
                   ) -> Dict[str, List[str]]:
@@ -1235,6 +1420,7 @@ class SegmentationLevel:
 
         return agg_dict
 
+    @_memoise_plan
     def split_tfntt_segmentation(self,
                                  other: SegmentationLevel
                                  ) -> Dict[str, List[str]]:
@@ -1430,6 +1616,7 @@ class SegmentationLevel:
 
         return dupe_dict
 
+    @_memoise_plan
     def split(self, other: SegmentationLevel) -> Dict[str, List[str]]:
         """
         Generates a dict defining how to split this segmentation into other.
@@ -1506,6 +1693,7 @@ class SegmentationLevel:
 
         return split_dict
 
+    @_memoise_plan
     def expand(self,
                other: SegmentationLevel,
                ) -> Tuple[nd.SegmentMultiplyDict, SegmentationLevel]:
@@ -1616,6 +1804,7 @@ class SegmentationLevel:
 
         return expand_dict, return_seg
 
+    @_memoise_plan
     def subset(self, other: SegmentationLevel) -> List[str]:
         """Generates a list defining which segments to keep when subset-ing to other
 
@@ -1673,6 +1862,157 @@ class SegmentationLevel:
 
         return keep_segments
 
+    def _mul_div_indices(self,
+                         other: SegmentationLevel,
+                         multiply_dict: nd.SegmentMultiplyDict,
+                         return_seg: SegmentationLevel,
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+        """Converts a multiply_dict into gather indices for self and other"""
+        pairs = [multiply_dict[name] for name in return_seg.segment_names]
+        self_idx = self.get_segment_ids(s for s, _ in pairs)
+        other_idx = other.get_segment_ids(o for _, o in pairs)
+
+        # These are cached, so stop them being edited in place
+        self_idx.setflags(write=False)
+        other_idx.setflags(write=False)
+        return self_idx, other_idx
+
+    @_memoise_plan
+    def multiply_indices(self,
+                         other: SegmentationLevel,
+                         ) -> Tuple[np.ndarray, np.ndarray, SegmentationLevel]:
+        """Generates index arrays defining how to multiply this segmentation with other
+
+        The vectorised equivalent of `self * other`. If data for self and
+        other are held in (n_segments, n_zones) blocks, ordered by
+        `segment_names`, the multiplied block is
+        `self_block[self_idx] * other_block[other_idx]`.
+
+        Parameters
+        ----------
+        other:
+            The SegmentationLevel to multiply with.
+
+        Returns
+        -------
+        self_idx:
+            For each segment of return_seg, in `return_seg.segment_names`
+            order, the index of the segment in self to use.
+
+        other_idx:
+            For each segment of return_seg, in `return_seg.segment_names`
+            order, the index of the segment in other to use.
+
+        return_seg:
+            A SegmentationLevel object defining the return segmentation
+            of the multiplication.
+        """
+        multiply_dict, return_seg = self * other
+        self_idx, other_idx = self._mul_div_indices(other, multiply_dict, return_seg)
+        return self_idx, other_idx, return_seg
+
+    @_memoise_plan
+    def divide_indices(self,
+                       other: SegmentationLevel,
+                       ) -> Tuple[np.ndarray, np.ndarray, SegmentationLevel]:
+        """Generates index arrays defining how to divide this segmentation by other
+
+        The vectorised equivalent of `self / other`. See
+        `multiply_indices()` for a full description of the return values.
+        """
+        division_dict, return_seg = self / other
+        self_idx, other_idx = self._mul_div_indices(other, division_dict, return_seg)
+        return self_idx, other_idx, return_seg
+
+    @_memoise_plan
+    def expand_indices(self,
+                       other: SegmentationLevel,
+                       ) -> Tuple[np.ndarray, np.ndarray, SegmentationLevel]:
+        """Generates index arrays defining how to expand this segmentation with other
+
+        The vectorised equivalent of `self.expand(other)`. See
+        `multiply_indices()` for a full description of the return values.
+        """
+        expand_dict, return_seg = self.expand(other)
+        self_idx, other_idx = self._mul_div_indices(other, expand_dict, return_seg)
+        return self_idx, other_idx, return_seg
+
+    @_memoise_plan
+    def subset_indices(self, other: SegmentationLevel) -> np.ndarray:
+        """Generates an index array defining which segments to keep when subset-ing to other
+
+        The vectorised equivalent of `self.subset(other)`.
+
+        Parameters
+        ----------
+        other:
+            The segmentation to subset to
+
+        Returns
+        -------
+        subset_idx:
+            For each segment of other, in `other.segment_names` order, the
+            index of the segment in self to keep.
+        """
+        # subset() checks the kept segments match other
+        self.subset(other)
+        subset_idx = self.get_segment_ids(other.segment_names)
+        subset_idx.setflags(write=False)
+        return subset_idx
+
+    def grouping_matrix(self,
+                        other: SegmentationLevel,
+                        grouping: Dict[str, List[str]],
+                        ) -> sparse.csr_matrix:
+        """Converts a {out_seg: [in_seg]} dictionary into a summation matrix
+
+        Parameters
+        ----------
+        other:
+            The SegmentationLevel the grouping sums into.
+
+        grouping:
+            A dictionary in the form of {out_seg: [in_seg]}, where out_seg
+            is a segment name of other and in_seg is a list of segment
+            names from self. As returned by `aggregate()` or `reduce()`.
+
+        Returns
+        -------
+        grouping_matrix:
+            A sparse (len(other), len(self)) matrix of ones and zeroes.
+            Pre-multiplying a (n_segments, n_zones) block of self data,
+            ordered by `segment_names`, gives the grouped block of other.
+        """
+        rows = list()
+        in_names = list()
+        for i, out_name in enumerate(other.segment_names):
+            rows += [i] * len(grouping[out_name])
+            in_names += grouping[out_name]
+        cols = self.get_segment_ids(in_names)
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)),
+            shape=(len(other.segment_names), len(self.segment_names)),
+        )
+
+    @_memoise_plan
+    def aggregation_matrix(self, other: SegmentationLevel) -> sparse.csr_matrix:
+        """Generates a sparse matrix defining how to aggregate this segmentation into other
+
+        The vectorised equivalent of `aggregate()`. See `grouping_matrix()`
+        for a full description of the return value.
+        """
+        return self.grouping_matrix(other, self.aggregate(other))
+
+    @_memoise_plan
+    def reduce_matrix(self, other: SegmentationLevel) -> sparse.csr_matrix:
+        """Generates a sparse matrix defining how to reduce this segmentation into other
+
+        The vectorised equivalent of `reduce()`. See `grouping_matrix()`
+        for a full description of the return value.
+        """
+        return self.grouping_matrix(other, self.reduce(other))
+
     def is_correct_naming(self, lst: List[str]) -> bool:
         """
         Checks whether lst is a complete list of all names of this segmentation.
@@ -2392,9 +2732,30 @@ def _get_valid_segments(name: str) -> pd.DataFrame:
     return df, naming_order, segment_types
 
 
+def _load_segmentation_level(name: str) -> SegmentationLevel:
+    """Reads in the segment definitions for name and creates a SegmentationLevel"""
+    # TODO(BT): Add some validation on the segmentation name
+    valid_segments, naming_order, segment_types = _get_valid_segments(name)
+
+    # Create the SegmentationLevel object and return
+    return SegmentationLevel(
+        name=name,
+        naming_order=naming_order,
+        segment_types=segment_types,
+        valid_segments=valid_segments,
+    )
+
+
+SEGMENTATION_CACHE = registry.DefinitionCache(_load_segmentation_level)
+
+
 def get_segmentation_level(name: str) -> SegmentationLevel:
     """
-    Creates a SegmentationLevel for segmentation with name.
+    Gets the SegmentationLevel for segmentation with name.
+
+    Segmentations are only read in from the definitions folder the first
+    time they are requested, after that the same cached object is
+    returned. The returned object should not be modified.
 
     Parameters
     ----------
@@ -2406,17 +2767,19 @@ def get_segmentation_level(name: str) -> SegmentationLevel:
     segmentation_level:
         A SegmentationLevel object for segmentation with name
     """
-    # TODO(BT): Add some validation on the segmentation name
-    # TODO(BT): Add some caching to this function!
-    valid_segments, naming_order, segment_types = _get_valid_segments(name)
+    return SEGMENTATION_CACHE.get(name)
+
+
+def clear_segmentation_cache(name: Optional[str] = None) -> None:
+    """Removes name from the segmentation cache, or all if name is None
+
+    Clearing the whole cache also clears any cached segment definitions
+    files, such as the multiply and aggregation definitions.
+    """
+    SEGMENTATION_CACHE.invalidate(name)
+    if name is None:
+        _read_definitions_csv.cache_clear()
 
-    # Create the SegmentationLevel object and return
-    return SegmentationLevel(
-        name=name,
-        naming_order=naming_order,
-        segment_types=segment_types,
-        valid_segments=valid_segments,
-    )
 
 def list_segmentations() -> List[str]:
     """List names of all available segmentations.
@@ -2514,4 +2877,7 @@ def create_segmentation_level(
         with open(folder / seg_level.segment_type_fname, "wt", encoding="utf-8") as file:
             file.write("\n".join(f"{k},{v}" for k, v in segment_types.items()) + "\n")
 
+    # Make sure the new definition is used from now on
+    SEGMENTATION_CACHE.invalidate(name)
+    SEGMENTATION_CACHE.add(name, seg_level)
     return seg_level
@@ -28,10 +28,12 @@ from typing import Any, Dict, List, Tuple, Union, Optional
 # Third Party
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 # Local Imports
 import normits_demand as nd
 from normits_demand import logging as nd_log
+from normits_demand.core import registry
 
 from normits_demand.utils import file_ops
 from normits_demand.utils import compress
@@ -102,6 +104,9 @@ class ZoningSystem:
 
     possible_weightings = list(_weighting_suffix.keys()) + [None]
 
+    # Translations built so far, keyed by (from_name, to_name, weighting)
+    _translation_cache: Dict[Tuple[str, str, Optional[str]], sparse.csr_matrix] = dict()
+
     def __init__(self,
                  name: str,
                  unique_zones: np.ndarray,
@@ -348,6 +353,87 @@ class ZoningSystem:
             unique_zones=self.unique_zones.copy(),
         )
 
+    def _validate_translate_args(self,
+                                 other: ZoningSystem,
+                                 weighting: Optional[str],
+                                 ) -> None:
+        """Checks the arguments given to translate() are valid"""
+        if not isinstance(other, ZoningSystem):
+            raise ValueError(
+                f"other is not the correct type. Expected ZoningSystem, got "
+                f"{type(other)}"
+            )
+
+        if weighting not in self.possible_weightings:
+            raise ValueError(
+                f"{weighting} is not a valid weighting for a translation. "
+                f"Expected one of: {self.possible_weightings}"
+            )
+
+    @classmethod
+    def clear_translation_cache(cls) -> None:
+        """Removes all cached translations, forcing them to be re-read"""
+        cls._translation_cache.clear()
+
+    def translate_sparse(self,
+                         other: ZoningSystem,
+                         weighting: str = None,
+                         ) -> sparse.csr_matrix:
+        """
+        Returns a sparse matrix defining the translation of self to other
+
+        The translation definition is only read in and built once for each
+        (self.name, other.name, weighting) combination. Subsequent calls
+        return the cached matrix, so it should not be modified in place.
+
+        Parameters
+        ----------
+        other:
+            The zoning system to translate this zoning system into
+
+        weighting:
+            The weighting to use when building the translation. Must be None,
+            or one of ZoningSystem.possible_weightings
+
+        Returns
+        -------
+        translation:
+            A scipy.sparse.csr_matrix defining the weights to use for the
+            translation.
+            The rows correspond to self.unique_zones
+            The columns correspond to other.unique_zones
+
+        Raises
+        ------
+        ZoningError:
+            If a translation definition between self and other cannot be found
+        """
+        self._validate_translate_args(other, weighting)
+
+        # Use the cached version if we have it
+        key = (self.name, other.name, weighting)
+        shape = (self.n_zones, other.n_zones)
+        translation = self._translation_cache.get(key)
+        if translation is not None and translation.shape == shape:
+            return translation
+
+        # Convert the long definition into zone positions
+        translation_df = self._get_translation_definition(other, weighting)
+        self_col = self._translate_base_zone_col % self.name
+        other_col = self._translate_base_zone_col % other.name
+        trans_col = self._translate_base_trans_col % (self.name, other.name)
+
+        rows = pd.Index(self.unique_zones).get_indexer(translation_df[self_col])
+        cols = pd.Index(other.unique_zones).get_indexer(translation_df[other_col])
+        mask = (rows >= 0) & (cols >= 0)
+
+        translation = sparse.csr_matrix(
+            (translation_df[trans_col].values[mask], (rows[mask], cols[mask])),
+            shape=shape,
+        )
+        self._translation_cache[key] = translation
+        return translation
+
     def translate(self,
                   other: ZoningSystem,
                   weighting: str = None,
@@ -375,33 +461,13 @@ class ZoningSystem:
         ------
         ZoningError:
             If a translation definition between self and other cannot be found
-        """
-        # Validate input
-        if not isinstance(other, ZoningSystem):
-            raise ValueError(
-                f"other is not the correct type. Expected ZoningSystem, got "
-                f"{type(other)}"
-            )
-
-        if weighting not in self.possible_weightings:
-            raise ValueError(
-                f"{weighting} is not a valid weighting for a translation. "
-                f"Expected one of: {self.possible_weightings}"
-            )
 
-        # Get a numpy array to define the translation
-        translation_df = self._get_translation_definition(other, weighting)
-        translation = pd_utils.long_to_wide_infill(
-            df=translation_df,
-            index_col=self._translate_base_zone_col % self.name,
-            columns_col=self._translate_base_zone_col % other.name,
-            values_col=self._translate_base_trans_col % (self.name, other.name),
-            index_vals=self.unique_zones,
-            column_vals=other.unique_zones,
-            infill=self._translate_infill
-        )
-
-        return translation.values
+        See Also
+        --------
+        translate_sparse:
+            For the cached, sparse, version of this translation.
+        """
+        return self.translate_sparse(other, weighting).toarray()
 
     def save(self, path: PathLike = None) -> Union[None, Dict[str, Any]]:
         """Converts ZoningSystem into an instance dict and saves to disk
@@ -566,7 +632,7 @@ class BalancingZones:
         """
         segments = {}
         for nm, zoning in segment_zoning.items():
-            if nm not in self._segmentation.segment_names:
+            if not self._segmentation.is_valid_segment_name(nm):
                 self._logger.warning(
                     "%r not a segment in %s segmentation, ignoring",
                     nm,
@@ -885,9 +951,32 @@ def _get_zones(name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarra
     return zone_names, zone_descs, internal_zones, external_zones
 
 
+def _load_zoning_system(name: str) -> ZoningSystem:
+    """Reads in the zone definitions for name and creates a ZoningSystem"""
+    # TODO(BT): Add some validation on the zone name
+    # Look for zone definitions
+    zone_names, zone_desc, internal, external = _get_zones(name)
+
+    # Create the ZoningSystem object and return
+    return ZoningSystem(
+        name=name,
+        unique_zones=zone_names,
+        zone_descriptions=zone_desc,
+        internal_zones=internal,
+        external_zones=external,
+    )
+
+
+ZONING_SYSTEM_CACHE = registry.DefinitionCache(_load_zoning_system)
+
+
 def get_zoning_system(name: str) -> ZoningSystem:
     """
-    Creates a ZoningSystem for zoning with name.
+    Gets the ZoningSystem for zoning with name.
+
+    Zoning systems are only read in from the definitions folder the first
+    time they are requested, after that the same cached object is
+    returned. The returned object should not be modified.
 
     Parameters
     ----------
@@ -899,19 +988,32 @@ def get_zoning_system(name: str) -> ZoningSystem:
     zoning_system:
         A ZoningSystem object for zoning system with name
     """
-    # TODO(BT): Add some validation on the zone name
-    # TODO(BT): Add some caching to this function!
-    # Look for zone definitions
-    zone_names, zone_desc, internal, external = _get_zones(name)
+    return ZONING_SYSTEM_CACHE.get(name)
+
+
+def clear_zoning_system_cache(name: Optional[str] = None) -> None:
+    """Removes name from the zoning system cache, or all if name is None"""
+    ZONING_SYSTEM_CACHE.invalidate(name)
+
+
+def list_zoning_systems() -> List[str]:
+    """List names of all available zoning systems.
+
+    Returns
+    -------
+    List[str]
+        Names of all zoning systems found in NorMITs demand
+        zoning systems folder.
+    """
+    zoning_folder = Path(ZoningSystem._zoning_definitions_path)
+
+    zoning_systems = []
+    for path in zoning_folder.iterdir():
+        if path.is_dir() and not path.name.startswith("_"):
+            zoning_systems.append(path.name)
+
+    return zoning_systems
 
-    # Create the ZoningSystem object and return
-    return ZoningSystem(
-        name=name,
-        unique_zones=zone_names,
-        zone_descriptions=zone_desc,
-        internal_zones=internal,
-        external_zones=external,
-    )
 
 class ZoningSystemMetaData(BaseConfig):
     """
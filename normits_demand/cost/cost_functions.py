@@ -39,11 +39,13 @@ class BuiltInCostFunction(enum.Enum):
             params = {"alpha": [-5, 5], "beta": [-5, 5]}
             default = {"alpha": 1, "beta": 1}
             function = tanner
+            log_gradient = tanner_log_gradient
 
         elif self == BuiltInCostFunction.LOG_NORMAL:
             params = {"sigma": [0, 5], "mu": [0, 10]}
             default = {"sigma": 1, "mu": 2}
             function = log_normal
+            log_gradient = log_normal_log_gradient
 
         else:
             raise nd.NormitsDemandError(
@@ -51,7 +53,11 @@ class BuiltInCostFunction(enum.Enum):
             )
 
         return CostFunction(
-            name=self.name, params=params, function=function, default_params=default,
+            name=self.name,
+            params=params,
+            function=function,
+            default_params=default,
+            log_gradient=log_gradient,
         )
 
 
@@ -70,9 +76,11 @@ class CostFunction:
         params: Dict[str, Tuple[float, float]],
         function: Callable,
         default_params: Dict[str, float] = None,
+        log_gradient: Callable = None,
     ):
         self.name = name
         self.function = function
+        self.log_gradient = log_gradient
 
         # Split params
         self.param_names = list(params.keys())
@@ -103,6 +111,11 @@ class CostFunction:
         """Return the key-word names of the cost function params"""
         return self.kw_order
 
+    @property
+    def has_log_gradient(self) -> bool:
+        """Whether this cost function has a closed form log gradient"""
+        return self.log_gradient is not None
+
     def validate_params(self, param_dict: Dict[str, Any]) -> None:
         """Validates that the given values are valid and within min/max ranges
 
@@ -179,6 +192,55 @@ class CostFunction:
         self.validate_params(kwargs)
         return self.function(base_cost, **kwargs)
 
+    def calculate_log_gradient(
+        self, base_cost: np.ndarray, param_name: str, **kwargs,
+    ) -> np.ndarray:
+        """
+        Calculates the gradient of log(self.function) for one parameter
+
+        Parameters
+        ----------
+        base_cost:
+            Array of the base costs.
+
+        param_name:
+            The name of the cost function parameter to differentiate with
+            respect to.
+
+        kwargs:
+        Parameters of the cost function to pass to self.log_gradient.
+
+        Returns
+        -------
+        log_gradient:
+            The partial derivative of log(self.function) with respect to
+            `param_name`, same shape as `base_cost`.
+
+        Raises
+        ------
+        NotImplementedError:
+            If this cost function was not given a log_gradient function.
+
+        ValueError:
+            If `param_name` is not a parameter of this cost function, or the
+            given cost function params are outside the min/max range for
+            this class.
+        """
+        if not self.has_log_gradient:
+            raise NotImplementedError(
+                "CostFunction %s does not have a closed form log gradient."
+                % self.name
+            )
+
+        if param_name not in self.param_names:
+            raise ValueError(
+                "Parameter '%s' is not a valid parameter for "
+                "CostFunction %s" % (param_name, self.name)
+            )
+
+        self.validate_params(kwargs)
+        return self.log_gradient(base_cost, param_name, **kwargs)
+
 
 def tanner(
     base_cost: np.ndarray, alpha: float, beta: float, min_return_val: float = 1e-150,
@@ -282,3 +344,116 @@ def log_normal(
     exp = np.exp(-exp_numerator / exp_denominator)
 
     return np.maximum(frac * exp, min_return_val)
+
+
+def tanner_log_gradient(
+    base_cost: np.ndarray, param_name: str, alpha: float, beta: float,
+) -> np.ndarray:
+    r"""Gradient of the log of the tanner cost function.
+
+    Parameters
+    ----------
+    base_cost : np.ndarray
+        Array of the base costs.
+
+    param_name : str
+        The parameter to differentiate with respect to. One of "alpha"
+        or "beta".
+
+    alpha, beta : float
+        Parameters of the tanner cost function, see `tanner`.
+
+    Returns
+    -------
+    log_gradient:
+        The partial derivative of :math:`\ln f(C_{ij})` with respect to
+        `param_name`, same shape as `base_cost`.
+
+    Notes
+    -----
+    .. math::
+
+        \frac{\partial \ln f}{\partial \alpha} = \ln C_{ij},
+        \qquad
+        \frac{\partial \ln f}{\partial \beta} = C_{ij}
+
+    Costs of 0 give a gradient of 0, as the cost function is 0 there.
+    """
+    math_utils.check_numeric({"alpha": alpha, "beta": beta})
+
+    if param_name == "alpha":
+        return np.log(
+            base_cost, where=base_cost > 0, out=np.zeros_like(base_cost, dtype=float),
+        )
+
+    if param_name == "beta":
+        return np.where(base_cost != 0, base_cost, 0).astype(float)
+
+    raise ValueError(
+        "Parameter '%s' is not a valid parameter for the tanner cost function."
+        % param_name
+    )
+
+
+def log_normal_log_gradient(
+    base_cost: np.ndarray, param_name: str, sigma: float, mu: float,
+) -> np.ndarray:
+    r"""Gradient of the log of the log normal cost function.
+
+    Parameters
+    ----------
+    base_cost : np.ndarray
+        Array of the base costs.
+
+    param_name : str
+        The parameter to differentiate with respect to. One of "sigma"
+        or "mu".
+
+    sigma, mu : float
+        Parameters of the log normal cost function, see `log_normal`.
+
+    Returns
+    -------
+    log_gradient:
+        The partial derivative of :math:`\ln f(C_{ij})` with respect to
+        `param_name`, same shape as `base_cost`.
+
+    Notes
+    -----
+    .. math::
+
+        \frac{\partial \ln f}{\partial \sigma}
+        = \frac{(\ln C_{ij} - \mu)^2}{\sigma^3} - \frac{1}{\sigma},
+        \qquad
+        \frac{\partial \ln f}{\partial \mu}
+        = \frac{\ln C_{ij} - \mu}{\sigma^2}
+
+    Costs of 0 give a gradient of 0, as the cost function is 0 there.
+    """
+    # Init
+    math_utils.check_numeric({"sigma": sigma, "mu": mu})
+    sigma = float(sigma)
+    mu = float(mu)
+
+    # Work in place on a single array to keep memory down
+    gradient = np.log(
+        base_cost, where=base_cost > 0, out=np.zeros_like(base_cost, dtype=float),
+    )
+    gradient -= mu
+
+    if param_name == "mu":
+        gradient /= sigma ** 2
+
+    elif param_name == "sigma":
+        gradient **= 2
+        gradient /= sigma ** 3
+        gradient -= 1 / sigma
+
+    else:
+        raise ValueError(
+            "Parameter '%s' is not a valid parameter for the log normal cost "
+            "function." % param_name
+        )
+
+    gradient[base_cost <= 0] = 0
+    return gradient
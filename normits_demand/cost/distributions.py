@@ -16,6 +16,7 @@ from __future__ import annotations
 import os
 
 from typing import Any
+from typing import Optional
 
 # Third Party
 import numpy as np
@@ -425,15 +426,16 @@ class CostDistribution:
         min_bounds: np.ndarray,
         max_bounds: np.ndarray,
         cost_units: nd_core.CostUnits,
+        band_index: Optional[cost_utils.CostBandIndex] = None,
     ) -> CostDistribution:
         # TODO Add docstring
         return CostDistribution(
             edges=np.array([min_bounds[0]] + max_bounds.tolist()),
             band_trips=cost_utils.cost_distribution(
-                trips, cost_matrix, min_bounds, max_bounds
+                trips, cost_matrix, min_bounds, max_bounds, band_index=band_index
             ),
             cost_units=cost_units,
             band_mean_cost=cost_utils.calculate_average_cost_in_bounds(
-                min_bounds, max_bounds, cost_matrix, trips
+                min_bounds, max_bounds, cost_matrix, trips, band_index=band_index
             ),
         )
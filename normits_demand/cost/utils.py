@@ -82,6 +82,184 @@ class PlotData:
     label: str
 
 
+class CostBandIndex:
+    """Pre-binned index of the cost band each cell of a cost matrix is in
+
+    Finding which band each cell is in only needs doing once for a cost
+    matrix and set of bands. After that, the trips and average costs in
+    each band are a single `np.bincount()` over the index, rather than a
+    pass over the full cost matrix for each band.
+
+    Each band covers min_bound <= cost < max_bound, the same as
+    `calculate_average_cost_in_bounds()`. The bands must not overlap.
+    Cells outside of all bands aren't in any band.
+    When calculating band trips, cells exactly on the final max bound can
+    optionally be included in the final band, matching `np.histogram()`.
+
+    Attributes
+    ----------
+    min_bounds:
+        The minimum bounds of each band.
+
+    max_bounds:
+        The maximum bounds of each band.
+
+    shape:
+        The shape of the cost matrix the index was built for.
+
+    band_ids:
+        The flat band id of each cell in the cost matrix. Cells not in
+        any band are set to n_bands. Stored in the smallest unsigned
+        integer type that can hold n_bands.
+    """
+
+    def __init__(
+        self,
+        cost_matrix: np.ndarray,
+        min_bounds: Union[List[float], np.ndarray] = None,
+        max_bounds: Union[List[float], np.ndarray] = None,
+        bin_edges: Union[List[float], np.ndarray] = None,
+    ):
+        """
+        Parameters
+        ----------
+        cost_matrix:
+            The matrix of costs to index.
+
+        min_bounds:
+            The minimum bounds of each band. Corresponds to max_bounds.
+
+        max_bounds:
+            The maximum bounds of each band. Corresponds to min_bounds.
+
+        bin_edges:
+            A monotonically increasing array of band edges, including the
+            rightmost edge. If given, min_bounds and max_bounds are
+            ignored.
+        """
+        if bin_edges is not None:
+            bin_edges = np.asarray(bin_edges, dtype=float)
+            min_bounds, max_bounds = bin_edges[:-1], bin_edges[1:]
+
+        if min_bounds is None or max_bounds is None:
+            raise ValueError(
+                "Either bin_edges needs to be set, or both min_bounds and "
+                "max_bounds needs to be set."
+            )
+
+        self.min_bounds = np.asarray(min_bounds, dtype=float)
+        self.max_bounds = np.asarray(max_bounds, dtype=float)
+        if np.any(np.diff(self.min_bounds) < 0):
+            raise ValueError("min_bounds must be in increasing order")
+
+        self.shape = cost_matrix.shape
+        self._cost = np.ravel(cost_matrix)
+
+        # Find the band each cell might be in, then check it's under the max
+        band_ids = np.searchsorted(self.min_bounds, self._cost, side="right") - 1
+        in_band = (band_ids >= 0) & (self._cost < self.max_bounds[band_ids])
+
+        self.band_ids = np.where(in_band, band_ids, self.n_bands)
+        self.band_ids = self.band_ids.astype(np.min_scalar_type(self.n_bands))
+
+        # Cells np.histogram() would include in the final band
+        self._last_edge_cells = np.flatnonzero(self._cost == self.max_bounds[-1])
+
+    @property
+    def n_bands(self) -> int:
+        """The number of cost bands"""
+        return len(self.min_bounds)
+
+    def _band_sums(self, values: np.ndarray) -> np.ndarray:
+        """Sums values, the same shape as the cost matrix, by band"""
+        if values.shape != self.shape:
+            raise ValueError(
+                "Expected an array of shape %s to match the cost matrix, "
+                "got %s"
+                % (self.shape, values.shape)
+            )
+        band_sums = np.bincount(
+            self.band_ids,
+            weights=np.ravel(values),
+            minlength=self.n_bands + 1,
+        )
+        return band_sums[:self.n_bands]
+
+    def cell_counts(self) -> np.ndarray:
+        """Returns the number of cells in each band"""
+        return np.bincount(self.band_ids, minlength=self.n_bands + 1)[:self.n_bands]
+
+    def band_trips(self,
+                   trips: np.ndarray,
+                   include_last_edge: bool = True,
+                   ) -> np.ndarray:
+        """Calculates the total trips in each band
+
+        Parameters
+        ----------
+        trips:
+            A matrix of trips, the same shape as the cost matrix.
+
+        include_last_edge:
+            Whether to include cells exactly on the final max bound in
+            the final band, as `np.histogram()` does.
+
+        Returns
+        -------
+        band_trips:
+            The total trips in each band.
+        """
+        band_trips = self._band_sums(trips)
+        if include_last_edge and len(self._last_edge_cells) > 0:
+            band_trips[-1] += np.ravel(trips)[self._last_edge_cells].sum()
+        return band_trips
+
+    def band_mean_costs(self, trips: np.ndarray) -> np.ndarray:
+        """Calculates the trip weighted average cost in each band
+
+        Bands without any trips are given their min bound, the same as
+        `calculate_average_cost_in_bounds()`.
+
+        Parameters
+        ----------
+        trips:
+            A matrix of trips, the same shape as the cost matrix.
+
+        Returns
+        -------
+        band_mean_costs:
+            The average cost in each band.
+        """
+        band_trips = self._band_sums(trips)
+        band_costs = self._band_sums(trips * self._cost.reshape(self.shape))
+        return np.divide(
+            band_costs,
+            band_trips,
+            out=self.min_bounds.copy(),
+            where=band_trips != 0,
+        )
+
+    def spread(self, band_values: np.ndarray, fill_value: float = 0) -> np.ndarray:
+        """Spreads a value per band back across the cells of the cost matrix
+
+        Parameters
+        ----------
+        band_values:
+            The value for each band.
+
+        fill_value:
+            The value to give cells that aren't in any band.
+
+        Returns
+        -------
+        cell_values:
+            An array, the same shape as the cost matrix, of the value of
+            the band each cell is in.
+        """
+        values = np.append(np.asarray(band_values, dtype=float), fill_value)
+        return values[self.band_ids].reshape(self.shape)
+
+
 def cells_in_bounds(
     min_bounds: np.ndarray,
     max_bounds: np.ndarray,
@@ -148,6 +326,7 @@ def normalised_cost_distribution(
     min_bounds: Union[List[float], np.ndarray] = None,
     max_bounds: Union[List[float], np.ndarray] = None,
     bin_edges: Union[List[float], np.ndarray] = None,
+    band_index: CostBandIndex = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Calculates the normalised distribution of costs across a matrix.
@@ -175,6 +354,12 @@ def normalised_cost_distribution(
         rightmost edge, allowing for non-uniform bin widths. This argument
         is passed straight into `numpy.histogram`
 
+    band_index:
+        A CostBandIndex of cost_matrix. If given, cost_matrix, min_bounds,
+        max_bounds and bin_edges are ignored and the index is used
+        instead. Much faster when calculating the distribution of many
+        matrices with the same costs and bands.
+
     Returns
     -------
     cost_distribution:
@@ -195,6 +380,7 @@ def normalised_cost_distribution(
         min_bounds=min_bounds,
         max_bounds=max_bounds,
         bin_edges=bin_edges,
+        band_index=band_index,
     )
 
     # Normalise
@@ -212,6 +398,7 @@ def cost_distribution(
     min_bounds: Union[List[float], np.ndarray] = None,
     max_bounds: Union[List[float], np.ndarray] = None,
     bin_edges: Union[List[float], np.ndarray] = None,
+    band_index: CostBandIndex = None,
 ) -> np.ndarray:
     """
     Calculates the distribution of costs across a matrix.
@@ -239,6 +426,12 @@ def cost_distribution(
         rightmost edge, allowing for non-uniform bin widths. This argument
         is passed straight into `numpy.histogram`
 
+    band_index:
+        A CostBandIndex of cost_matrix. If given, cost_matrix, min_bounds,
+        max_bounds and bin_edges are ignored and the index is used
+        instead. Much faster when calculating the distribution of many
+        matrices with the same costs and bands.
+
     Returns
     -------
     distribution:
@@ -252,6 +445,9 @@ def cost_distribution(
     --------
     `numpy.histogram`
     """
+    if band_index is not None:
+        return band_index.band_trips(matrix)
+
     # Use bounds to calculate bin edges
     if bin_edges is None:
         if min_bounds is None or max_bounds is None:
@@ -427,6 +623,7 @@ def calculate_average_cost_in_bounds(
     max_bounds: np.ndarray,
     cost_matrix: np.ndarray,
     trips: np.ndarray,
+    band_index: CostBandIndex = None,
 ) -> np.ndarray:
     """Calculates the average cost between each bounds pair
 
@@ -445,11 +642,19 @@ def calculate_average_cost_in_bounds(
         A matrix of trip counts from each point to point. Corresponds to
         cost_matrix.
 
+    band_index:
+        A CostBandIndex of cost_matrix, built with min_bounds and
+        max_bounds. If given, it is used instead of building a mask for
+        each band.
+
     Returns
     -------
     average_costs:
          An array of the average cost between each bounds pair
     """
+    if band_index is not None:
+        return band_index.band_mean_costs(trips)
+
     average_costs = list()
     for min_val, max_val in zip(min_bounds, max_bounds):
         band_mask = (cost_matrix >= min_val) & (cost_matrix < max_val)
@@ -44,6 +44,7 @@ from normits_demand.distribution import furness
 
 from normits_demand.validation import checks
 from normits_demand.concurrency import multiprocessing
+from normits_demand.concurrency import communication
 
 from normits_demand.pathing.distribution_model import DistributorExportPaths
 
@@ -218,6 +219,61 @@ class AbstractDistributor(abc.ABC, DistributorExportPaths):
                            ):
         pass
 
+    @staticmethod
+    def _matrices_to_shared_memory(
+        matrices: Dict[Any, pd.DataFrame],
+    ) -> Tuple[List[communication.SharedNumpyArrayHelper],
+               Dict[Any, communication.SharedDataFrameInfo]]:
+        """Copies each unique matrix into shared memory once
+
+        Matrices are considered the same if they are the same object, so
+        segments that were given the same DataFrame share the same memory.
+        """
+        helpers = list()
+        infos_by_id = dict()
+        shared_infos = dict()
+        try:
+            for key, matrix in matrices.items():
+                if id(matrix) not in infos_by_id:
+                    helper, info = communication.dataframe_to_shared_memory(matrix)
+                    helpers.append(helper)
+                    infos_by_id[id(matrix)] = info
+                shared_infos[key] = infos_by_id[id(matrix)]
+
+        except BaseException:
+            for helper in helpers:
+                helper.unlink_shared_array()
+            raise
+
+        return helpers, shared_infos
+
+    def _distribute_segment_from_shared_memory(
+        self,
+        cost_matrix: communication.SharedDataFrameInfo,
+        calibration_matrix: communication.SharedDataFrameInfo,
+        **kwargs,
+    ):
+        """Attaches to matrices in shared memory, then calls distribute_segment"""
+        cost_helper, cost_df = communication.attach_shared_dataframe(cost_matrix)
+        calib_helper, calib_df = communication.attach_shared_dataframe(calibration_matrix)
+
+        try:
+            return self.distribute_segment(
+                cost_matrix=cost_df,
+                calibration_matrix=calib_df,
+                **kwargs,
+            )
+
+        finally:
+            del cost_df, calib_df
+            for helper in (cost_helper, calib_helper):
+                try:
+                    helper.close_shared_array()
+                except BufferError:
+                    # Views can outlive us in tracebacks. The memory is
+                    # released with the process instead
+                    pass
+
     def distribute(self,
                    productions: pd.DataFrame,
                    attractions: pd.DataFrame,
@@ -228,8 +284,61 @@ class AbstractDistributor(abc.ABC, DistributorExportPaths):
                    calibration_naming: Dict[Any, Any],
                    pa_val_col: str = 'val',
                    by_segment_kwargs: Dict[str, Dict[str, Any]] = None,
+                   use_shared_memory: bool = False,
                    **kwargs,
                    ):
+        """Distributes productions and attractions for every segment
+
+        Segments are distributed in parallel over self.process_count
+        processes, using self.distribute_segment().
+
+        Parameters
+        ----------
+        productions:
+            The productions to distribute, for all segments in
+            running_segmentation.
+
+        attractions:
+            The attractions to distribute, for all segments in
+            running_segmentation.
+
+        running_segmentation:
+            The segmentation of productions and attractions. One distribution
+            is run per segment.
+
+        cost_matrices:
+            A cost matrix for each segment. Keys are the segment names.
+
+        calibration_matrix:
+            A matrix of calibration area keys, used by every segment.
+
+        target_cost_distributions:
+            The target cost distributions for each calibration area key,
+            then each segment name.
+
+        calibration_naming:
+            A name for each calibration area key. Missing keys are named
+            after the key.
+
+        pa_val_col:
+            The name of the column containing the values in productions
+            and attractions.
+
+        by_segment_kwargs:
+            Any extra keyword arguments to pass to self.distribute_segment()
+            for each segment. Keys are the segment names.
+
+        use_shared_memory:
+            Whether to place the cost and calibration matrices in shared
+            memory before handing the segments out to processes. Each
+            unique matrix is then stored once, rather than once per segment
+            waiting to run, and read in place by the processes. Useful
+            when many segments share the same cost matrix.
+
+        **kwargs:
+            Any other keyword arguments to pass to every call of
+            self.distribute_segment().
+        """
         # Validate inputs
         self._check_segment_keys(
             running_segmentation,
@@ -263,61 +372,78 @@ class AbstractDistributor(abc.ABC, DistributorExportPaths):
 
         # Set defaults
         by_segment_kwargs = dict() if by_segment_kwargs is None else by_segment_kwargs
-
-        # ## MULTIPROCESS ACROSS SEGMENTS ## #
-        unchanging_kwargs = kwargs.copy()
-        unchanging_kwargs.update({
-            'running_segmentation': running_segmentation,
-            'calibration_matrix': calibration_matrix,
-            'calibration_naming': calibration_naming,
-        })
-
-        pbar_kwargs = {
-            'desc': self.name,
-            'unit': 'segment',
-        }
-
-        # Build a list of kwargs - one for each segment
-        kwarg_list = list()
-        for segment_params in running_segmentation:
-            segment_name = running_segmentation.get_segment_name(segment_params)
-
-            # Get productions, attractions
-            seg_productions, seg_attractions = self._filter_productions_attractions(
-                segment_params=segment_params,
-                productions=productions,
-                attractions=attractions,
-                pa_val_col=pa_val_col,
-            )
-
-            # Get the cost distributions for this segment
-            segment_target_costs = dict.fromkeys(calib_keys)
-            for key in calib_keys:
-                segment_target_costs[key] = target_cost_distributions[key][segment_name]
-
-            # Build the kwargs for this segment
-            segment_kwargs = unchanging_kwargs.copy()
-            segment_kwargs.update({
-                'segment_params': segment_params,
-                'productions': seg_productions,
-                'attractions': seg_attractions,
-                'cost_matrix': cost_matrices[segment_name],
-                'target_cost_distributions': segment_target_costs,
+        distribute_fn = self.distribute_segment
+
+        # ## OPTIONALLY SHARE THE MATRICES ## #
+        shared_helpers = list()
+        try:
+            if use_shared_memory:
+                shared_helpers, shared_infos = self._matrices_to_shared_memory(
+                    {'calibration_matrix': calibration_matrix}
+                )
+                calibration_matrix = shared_infos['calibration_matrix']
+
+                cost_helpers, cost_matrices = self._matrices_to_shared_memory(cost_matrices)
+                shared_helpers += cost_helpers
+                distribute_fn = self._distribute_segment_from_shared_memory
+
+            # ## MULTIPROCESS ACROSS SEGMENTS ## #
+            unchanging_kwargs = kwargs.copy()
+            unchanging_kwargs.update({
+                'running_segmentation': running_segmentation,
+                'calibration_matrix': calibration_matrix,
+                'calibration_naming': calibration_naming,
             })
 
-            # Get any other by_segment kwargs passed in
-            segment_kwargs.update(by_segment_kwargs.get(segment_name, dict()))
-
-            kwarg_list.append(segment_kwargs)
-
-        # Multiprocess
-        multiprocessing.multiprocess(
-            fn=self.distribute_segment,
-            kwargs=kwarg_list,
-            pbar_kwargs=pbar_kwargs,
-            # process_count=0,
-            process_count=self.process_count,
-        )
+            pbar_kwargs = {
+                'desc': self.name,
+                'unit': 'segment',
+            }
+
+            # Build a list of kwargs - one for each segment
+            kwarg_list = list()
+            for segment_params in running_segmentation:
+                segment_name = running_segmentation.get_segment_name(segment_params)
+
+                # Get productions, attractions
+                seg_productions, seg_attractions = self._filter_productions_attractions(
+                    segment_params=segment_params,
+                    productions=productions,
+                    attractions=attractions,
+                    pa_val_col=pa_val_col,
+                )
+
+                # Get the cost distributions for this segment
+                segment_target_costs = dict.fromkeys(calib_keys)
+                for key in calib_keys:
+                    segment_target_costs[key] = target_cost_distributions[key][segment_name]
+
+                # Build the kwargs for this segment
+                segment_kwargs = unchanging_kwargs.copy()
+                segment_kwargs.update({
+                    'segment_params': segment_params,
+                    'productions': seg_productions,
+                    'attractions': seg_attractions,
+                    'cost_matrix': cost_matrices[segment_name],
+                    'target_cost_distributions': segment_target_costs,
+                })
+
+                # Get any other by_segment kwargs passed in
+                segment_kwargs.update(by_segment_kwargs.get(segment_name, dict()))
+
+                kwarg_list.append(segment_kwargs)
+
+            # Multiprocess
+            multiprocessing.multiprocess(
+                fn=distribute_fn,
+                kwargs=kwarg_list,
+                pbar_kwargs=pbar_kwargs,
+                # process_count=0,
+                process_count=self.process_count,
+            )
+        finally:
+            for helper in shared_helpers:
+                helper.unlink_shared_array()
 
     def generate_cost_distribution_report(
         self,
@@ -805,6 +931,10 @@ class GravityDistributor(AbstractDistributor):
             furness_max_iters=kwargs.get('furness_max_iters'),
             furness_tol=kwargs.get('furness_tol'),
             use_perceived_factors=kwargs.get('use_perceived_factors'),
+            use_sparse_furness=kwargs.get('use_sparse_furness', False),
+            use_accelerated_furness=kwargs.get('use_accelerated_furness', False),
+            use_warm_start_furness=kwargs.get('use_warm_start_furness', True),
+            use_analytic_jacobian=kwargs.get('use_analytic_jacobian', False),
         )
 
         optimal_cost_params = calib.calibrate(
@@ -875,6 +1005,9 @@ class GravityDistributor(AbstractDistributor):
             furness_tol=kwargs.get('furness_tol'),
             use_perceived_factors=kwargs.get('use_perceived_factors'),
             memory_optimised=kwargs.get('memory_optimised'),
+            use_sparse_furness=kwargs.get('use_sparse_furness', False),
+            use_accelerated_furness=kwargs.get('use_accelerated_furness', False),
+            use_warm_start_furness=kwargs.get('use_warm_start_furness', True),
         )
 
         optimal_cost_params = calib.calibrate(
@@ -1181,6 +1314,8 @@ class Furness3dDistributor(AbstractDistributor):
             target_convergence=kwargs.get('target_convergence'),
             furness_max_iters=kwargs.get('furness_max_iters'),
             furness_tol=kwargs.get('furness_tol'),
+            use_sparse_furness=kwargs.get('use_sparse_furness', False),
+            use_accelerated_furness=kwargs.get('use_accelerated_furness', False),
         )
 
         # Run
@@ -16,11 +16,13 @@ import warnings
 import pandas as pd
 import numpy as np
 from numpy.testing import assert_approx_equal
+from scipy import sparse
 
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Tuple
+from typing import Union
 from typing import Callable
 
 # self imports
@@ -56,6 +58,8 @@ class Furness3D:
                  furness_tol: float,
                  calibration_ignore_val: Any = -1,
                  running_log_path: nd.PathLike = None,
+                 use_sparse_furness: bool = False,
+                 use_accelerated_furness: bool = False,
                  ):
 
         # TODO(BT): Write Furness3D __init__ docs
@@ -97,9 +101,21 @@ class Furness3D:
         self.furness_max_iters = furness_max_iters
         self.furness_tol = furness_tol
         self.running_log_path = running_log_path
+        self.use_sparse_furness = use_sparse_furness
+        self.use_accelerated_furness = use_accelerated_furness
 
         self.target_convergence = target_convergence
 
+        # The costs and bands don't change, so only bin the costs once
+        self._band_indices = {
+            key: cost_utils.CostBandIndex(
+                cost_matrix,
+                min_bounds=target_cost_distributions[key]['min'].values,
+                max_bounds=target_cost_distributions[key]['max'].values,
+            )
+            for key in calib_keys
+        }
+
         # Additional attributes
         self.initial_convergences = None
         self.achieved_band_shares = None
@@ -123,41 +139,42 @@ class Furness3D:
             # Filter down to this area
             area_mask = (self.calibration_matrix == calib_key)
             area_tcd = self.target_cost_distributions[calib_key]
+            band_index = self._band_indices[calib_key]
 
             area_matrix_values = matrix * area_mask
             area_total = area_matrix_values.sum()
-            area_cost = self.cost_matrix * area_mask
-
-            # Adjust bands one at a time
-            for _, row in area_tcd.iterrows():
-                # Get proportion of all trips that should be in this band
-                target_band_share = row['band_share']
-                min_val = float(row['min'])
-                max_val = float(row['max'])
-
-                # Get proportion of all trips that are in this band
-                distance_mask = (area_cost >= min_val) & (area_cost < max_val)
-                band_trips = area_matrix_values * distance_mask
-
-                # Figure out the target and achieved
-                target_band_total = area_total * target_band_share
-                ach_band_total = band_trips.sum()
 
-                # We can't adjust if there are no trips in this band
-                if ach_band_total <= 0:
-                    adj_mat = band_trips
-
-                elif target_band_total <= 0:
-                    # Set to a really small value so furness can use still
-                    adj_mat = np.where(band_trips != 0, 1e-7, 0)
+            # Get the target and achieved trips in each band
+            target_band_totals = area_total * area_tcd['band_share'].values
+            ach_band_totals = band_index.band_trips(
+                area_matrix_values,
+                include_last_edge=False,
+            )
 
-                else:
-                    # Adjust the matrix towards target
-                    adjustment = target_band_total / ach_band_total
-                    adj_mat = band_trips * adjustment
+            # Adjust the matrix towards target, we can't adjust if
+            # there are no trips in a band
+            adjustment = np.ones_like(ach_band_totals)
+            np.divide(
+                target_band_totals,
+                ach_band_totals,
+                out=adjustment,
+                where=(ach_band_totals > 0) & (target_band_totals > 0),
+            )
+            adj_mat = area_matrix_values * band_index.spread(adjustment)
+
+            # Set bands with no target to a really small value so
+            # furness can still use them
+            no_target = (ach_band_totals > 0) & (target_band_totals <= 0)
+            if no_target.any():
+                no_target_cells = band_index.spread(no_target) > 0
+                adj_mat = np.where(
+                    no_target_cells,
+                    np.where(area_matrix_values != 0, 1e-7, 0),
+                    adj_mat,
+                )
 
-                # Add into the return matrix
-                out_matrix += adj_mat
+            # Add into the return matrix
+            out_matrix += adj_mat
 
         return out_matrix
 
@@ -180,7 +197,11 @@ class Furness3D:
             matrix = self._correct_band_share(matrix=matrix)
 
             # Furness across the other 2 dimensions
-            matrix, furn_iters, furn_rmse = doubly_constrained_furness(
+            furness_fn = get_furness_function(
+                use_sparse=self.use_sparse_furness,
+                use_accelerated=self.use_accelerated_furness,
+            )
+            matrix, furn_iters, furn_rmse = furness_fn(
                 seed_vals=matrix,
                 row_targets=self.row_targets,
                 col_targets=self.col_targets,
@@ -209,14 +230,12 @@ class Furness3D:
                 area_tcd = self.target_cost_distributions[calib_key]
 
                 area_matrix_values = matrix * area_mask
-                area_cost = self.cost_matrix * area_mask
 
                 # Calculate the convergence of this area
                 _, achieved_band_shares = cost_utils.normalised_cost_distribution(
                     matrix=area_matrix_values,
-                    cost_matrix=area_cost,
-                    min_bounds=area_tcd['min'].tolist(),
-                    max_bounds=area_tcd['max'].tolist(),
+                    cost_matrix=self.cost_matrix,
+                    band_index=self._band_indices[calib_key],
                 )
                 area_convergence = math_utils.curve_convergence(
                     area_tcd['band_share'].values,
@@ -260,12 +279,18 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
                                tol: float = 1e-9,
                                max_iters: int = 5000,
                                warning: bool = True,
+                               check_every: int = 1,
                                ) -> Tuple[np.ndarray, int, float]:
     """
     Performs a doubly constrained furness for max_iters or until tol is met
 
     Controls numpy warnings to warn of any overflow errors encountered
 
+    The column sums calculated for the convergence check are reused to
+    constrain the columns on the next iteration, and all marginals are
+    written into preallocated buffers. This gives the same results as a
+    naive implementation, with fewer passes over the matrix.
+
     Parameters
     ----------
     seed_vals:
@@ -292,6 +317,13 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
         Whether to print a warning or not when the tol cannot be met before
         max_iters.
 
+    check_every:
+        How often, in iterations, to calculate the RMSE and check for
+        convergence. Checking costs an extra pass over the matrix, so
+        setting this above 1 makes each iteration cheaper, at the cost of
+        possibly running up to `check_every - 1` more iterations than needed.
+        Convergence is always checked on the final iteration.
+
     Returns
     -------
     furnessed_matrix:
@@ -311,6 +343,11 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
             % (str(seed_vals.shape), len(row_targets), len(col_targets))
         )
 
+    if check_every < 1:
+        raise ValueError(
+            "check_every must be a positive integer. Got %s." % check_every
+        )
+
     # Init
     furnessed_mat = seed_vals.copy()
     early_exit = False
@@ -323,13 +360,193 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
         warnings.warn("Furness given targets of 0. Returning all 0's")
         return np.zeros(seed_vals.shape), iter_num, cur_rmse
 
+    # Preallocate all the buffers used in the loop
+    row_ach = np.empty(len(row_targets), dtype=furnessed_mat.dtype)
+    col_ach = np.empty(len(col_targets), dtype=furnessed_mat.dtype)
+    row_factor = np.empty_like(row_targets, dtype=float)
+    col_factor = np.empty_like(col_targets, dtype=float)
+    row_diff = np.empty_like(row_targets, dtype=float)
+    col_diff = np.empty_like(col_targets, dtype=float)
+
     # Set up numpy overflow errors
     with np.errstate(over='raise'):
 
+        # The col sums are carried between iterations
+        np.sum(furnessed_mat, axis=0, out=col_ach)
+
+        for iter_num in range(max_iters):
+            # ## COL CONSTRAIN ## #
+            # Calculate difference factor
+            col_factor.fill(1)
+            np.divide(col_targets, col_ach, where=col_ach != 0, out=col_factor)
+
+            # adjust cols
+            furnessed_mat *= col_factor
+
+            # ## ROW CONSTRAIN ## #
+            # Calculate difference factor
+            np.sum(furnessed_mat, axis=1, out=row_ach)
+            row_factor.fill(1)
+            np.divide(row_targets, row_ach, where=row_ach != 0, out=row_factor)
+
+            # adjust rows
+            furnessed_mat *= row_factor[:, np.newaxis]
+
+            # Needed for the next col constrain, and to check convergence
+            np.sum(furnessed_mat, axis=0, out=col_ach)
+
+            # Only check for convergence when asked
+            check_iter = (iter_num + 1) % check_every == 0
+            if not check_iter and iter_num != max_iters - 1:
+                continue
+
+            # Calculate the diff - leave early if met
+            np.sum(furnessed_mat, axis=1, out=row_ach)
+            np.square(np.subtract(row_targets, row_ach, out=row_diff), out=row_diff)
+            np.square(np.subtract(col_targets, col_ach, out=col_diff), out=col_diff)
+            cur_rmse = (np.sum(np.add(row_diff, col_diff, out=row_diff)) / n_vals) ** 0.5
+            if cur_rmse < tol:
+                early_exit = True
+                break
+
+            # We got a NaN! Make sure to point out we didn't converge
+            if np.isnan(cur_rmse):
+                return np.zeros(furnessed_mat.shape), iter_num, np.inf
+
+    # Warn the user if we exhausted our number of loops
+    if not early_exit and warning:
+        print("WARNING! The doubly constrained furness exhausted its max "
+              "number of loops (%d), while achieving an RMSE difference of "
+              "%f. The values returned may not be accurate."
+              % (max_iters, cur_rmse))
+
+    return furnessed_mat, iter_num + 1, cur_rmse
+
+
+def sparse_doubly_constrained_furness(seed_vals: Union[np.ndarray, sparse.spmatrix],
+                                      row_targets: np.ndarray,
+                                      col_targets: np.ndarray,
+                                      tol: float = 1e-9,
+                                      max_iters: int = 5000,
+                                      warning: bool = True,
+                                      check_every: int = 1,
+                                      ) -> Tuple[Union[np.ndarray, sparse.csr_matrix], int, float]:
+    """
+    Performs a doubly constrained furness on a sparse seed matrix
+
+    Works in the same way as doubly_constrained_furness(), but internally
+    stores the matrix in CSR format and only ever touches the non-zero
+    cells. Rows and columns are scaled in place on the CSR data array, so
+    no dense temporaries are created while furnessing. This is much more
+    memory efficient for seeds that are mostly zeros, such as those built
+    from observed or census data at a fine zoning.
+
+    Cells which are 0 in the seed will always be 0 in the output (the same
+    is true of doubly_constrained_furness()), therefore the returned values
+    match the dense furness up to floating point summation order.
+
+    Parameters
+    ----------
+    seed_vals:
+        Initial values for the furness. Must be of shape
+        (len(n_rows), len(n_cols)). Can be a dense numpy array or any
+        scipy.sparse matrix.
+
+    row_targets:
+        The target values for the sum of each row.
+        i.e np.sum(matrix, axis=1)
+
+    col_targets:
+        The target values for the sum of each column
+        i.e np.sum(matrix, axis=0)
+
+    tol:
+        The maximum difference between the achieved and the target values
+        to tolerate before exiting early. R^2 is used to calculate the
+        difference.
+
+    max_iters:
+        The maximum number of iterations to complete before exiting.
+
+    warning:
+        Whether to print a warning or not when the tol cannot be met before
+        max_iters.
+
+    check_every:
+        How often, in iterations, to calculate the RMSE and check for
+        convergence. Checking costs an extra pass over the matrix, so
+        setting this above 1 makes each iteration cheaper, at the cost of
+        possibly running up to `check_every - 1` more iterations than needed.
+        Convergence is always checked on the final iteration.
+
+    Returns
+    -------
+    furnessed_matrix:
+        The final furnessed matrix. If seed_vals was a scipy.sparse matrix
+        this will be a scipy.sparse.csr_matrix, otherwise a dense
+        numpy array.
+
+    completed_iters:
+        The number of completed iterations before exiting
+
+    achieved_rmse:
+        The Root Mean Squared Error difference achieved before exiting
+
+    See Also
+    --------
+    doubly_constrained_furness()
+    """
+    # Error check
+    if seed_vals.shape != (len(row_targets), len(col_targets)):
+        raise ValueError(
+            "The shape of the seed values given does not match the row "
+            "and col targets. Seed_vals are shape %s. Expected shape (%d, %d)."
+            % (str(seed_vals.shape), len(row_targets), len(col_targets))
+        )
+
+    if check_every < 1:
+        raise ValueError(
+            "check_every must be a positive integer. Got %s." % check_every
+        )
+
+    # Init
+    return_sparse = sparse.issparse(seed_vals)
+    early_exit = False
+    cur_rmse = np.inf
+    iter_num = 0
+    n_rows, n_cols = seed_vals.shape
+    n_vals = len(row_targets)
+
+    def to_return_format(csr_mat: sparse.csr_matrix):
+        if return_sparse:
+            return csr_mat
+        return csr_mat.toarray()
+
+    # Can return early if all 0 - probably shouldn't happen!
+    if row_targets.sum() == 0 or col_targets.sum() == 0:
+        warnings.warn("Furness given targets of 0. Returning all 0's")
+        return to_return_format(sparse.csr_matrix(seed_vals.shape)), iter_num, cur_rmse
+
+    # Build the CSR matrix and the index of each value
+    furnessed_mat = sparse.csr_matrix(seed_vals, dtype=float, copy=True)
+    furnessed_mat.eliminate_zeros()
+    furnessed_mat.sort_indices()
+    data = furnessed_mat.data
+    col_idx = furnessed_mat.indices
+    row_idx = np.repeat(
+        np.arange(n_rows, dtype=col_idx.dtype),
+        np.diff(furnessed_mat.indptr),
+    )
+
+    # Set up numpy overflow errors
+    with np.errstate(over='raise'):
+
+        # The col sums are carried between iterations
+        col_ach = np.bincount(col_idx, weights=data, minlength=n_cols)
+
         for iter_num in range(max_iters):
             # ## COL CONSTRAIN ## #
             # Calculate difference factor
-            col_ach = np.sum(furnessed_mat, axis=0)
             diff_factor = np.divide(
                 col_targets,
                 col_ach,
@@ -338,11 +555,11 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
             )
 
             # adjust cols
-            furnessed_mat *= diff_factor
+            data *= diff_factor[col_idx]
 
             # ## ROW CONSTRAIN ## #
             # Calculate difference factor
-            row_ach = np.sum(furnessed_mat, axis=1)
+            row_ach = np.bincount(row_idx, weights=data, minlength=n_rows)
             diff_factor = np.divide(
                 row_targets,
                 row_ach,
@@ -351,11 +568,20 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
             )
 
             # adjust rows
-            furnessed_mat *= np.atleast_2d(diff_factor).T
+            data *= diff_factor[row_idx]
+
+            # Needed for the next col constrain, and to check convergence
+            col_ach = np.bincount(col_idx, weights=data, minlength=n_cols)
+
+            # Only check for convergence when asked
+            check_iter = (iter_num + 1) % check_every == 0
+            if not check_iter and iter_num != max_iters - 1:
+                continue
 
             # Calculate the diff - leave early if met
-            row_diff = (row_targets - np.sum(furnessed_mat, axis=1)) ** 2
-            col_diff = (col_targets - np.sum(furnessed_mat, axis=0)) ** 2
+            row_ach = np.bincount(row_idx, weights=data, minlength=n_rows)
+            row_diff = (row_targets - row_ach) ** 2
+            col_diff = (col_targets - col_ach) ** 2
             cur_rmse = (np.sum(row_diff + col_diff) / n_vals) ** 0.5
             if cur_rmse < tol:
                 early_exit = True
@@ -363,16 +589,702 @@ def doubly_constrained_furness(seed_vals: np.ndarray,
 
             # We got a NaN! Make sure to point out we didn't converge
             if np.isnan(cur_rmse):
-                return np.zeros(furnessed_mat.shape), iter_num, np.inf
+                return (
+                    to_return_format(sparse.csr_matrix(seed_vals.shape)),
+                    iter_num,
+                    np.inf,
+                )
 
     # Warn the user if we exhausted our number of loops
     if not early_exit and warning:
-        print("WARNING! The doubly constrained furness exhausted its max "
-              "number of loops (%d), while achieving an RMSE difference of "
-              "%f. The values returned may not be accurate."
+        print("WARNING! The sparse doubly constrained furness exhausted its "
+              "max number of loops (%d), while achieving an RMSE difference "
+              "of %f. The values returned may not be accurate."
               % (max_iters, cur_rmse))
 
-    return furnessed_mat, iter_num + 1, cur_rmse
+    return to_return_format(furnessed_mat), iter_num + 1, cur_rmse
+
+
+def batched_doubly_constrained_furness(seed_vals: np.ndarray,
+                                       row_targets: np.ndarray,
+                                       col_targets: np.ndarray,
+                                       tol: float = 1e-9,
+                                       max_iters: int = 5000,
+                                       warning: bool = True,
+                                       check_every: int = 1,
+                                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Performs a doubly constrained furness on a stack of segment matrices
+
+    Each segment is furnessed independently, in the same way as
+    doubly_constrained_furness(), but all segments are balanced together
+    in each iteration so numpy overheads are shared across all segments.
+    Segments are dropped from the stack as soon as they converge, so
+    segments that are slow to converge do not cost anything for those that
+    have finished.
+
+    Parameters
+    ----------
+    seed_vals:
+        Initial values for the furness. Must be of shape
+        (n_segments, n_rows, n_cols).
+
+    row_targets:
+        The target values for the sum of each row, in each segment.
+        Must be of shape (n_segments, n_rows).
+        i.e np.sum(matrix, axis=2)
+
+    col_targets:
+        The target values for the sum of each column, in each segment.
+        Must be of shape (n_segments, n_cols).
+        i.e np.sum(matrix, axis=1)
+
+    tol:
+        The maximum difference between the achieved and the target values
+        to tolerate before a segment exits early. R^2 is used to calculate
+        the difference.
+
+    max_iters:
+        The maximum number of iterations to complete before exiting.
+
+    warning:
+        Whether to print a warning or not when the tol cannot be met before
+        max_iters.
+
+    check_every:
+        How often, in iterations, to calculate the RMSE and check each
+        segment for convergence. Convergence is always checked on the final
+        iteration.
+
+    Returns
+    -------
+    furnessed_matrices:
+        The final furnessed matrices, of shape (n_segments, n_rows, n_cols).
+
+    completed_iters:
+        An array of shape (n_segments, ). The number of completed
+        iterations for each segment before exiting.
+
+    achieved_rmse:
+        An array of shape (n_segments, ). The Root Mean Squared Error
+        difference achieved for each segment before exiting.
+
+    See Also
+    --------
+    doubly_constrained_furness()
+    """
+    # Error check
+    if seed_vals.ndim != 3:
+        raise ValueError(
+            "Expected seed_vals to be a 3D array of shape "
+            "(n_segments, n_rows, n_cols). Got an array of shape %s."
+            % str(seed_vals.shape)
+        )
+
+    n_segs, n_rows, n_cols = seed_vals.shape
+    if row_targets.shape != (n_segs, n_rows) or col_targets.shape != (n_segs, n_cols):
+        raise ValueError(
+            "The shape of the seed values given does not match the row "
+            "and col targets. Seed_vals are shape %s. Expected row targets "
+            "of shape %s and col targets of shape %s. Got %s and %s."
+            % (
+                str(seed_vals.shape),
+                str((n_segs, n_rows)),
+                str((n_segs, n_cols)),
+                str(row_targets.shape),
+                str(col_targets.shape),
+            )
+        )
+
+    if check_every < 1:
+        raise ValueError(
+            "check_every must be a positive integer. Got %s." % check_every
+        )
+
+    # Init
+    furnessed_mats = seed_vals.copy()
+    completed_iters = np.zeros(n_segs, dtype=int)
+    achieved_rmse = np.full(n_segs, np.inf)
+
+    # Can drop any segments with 0 targets - probably shouldn't happen!
+    zero_targets = (row_targets.sum(axis=1) == 0) | (col_targets.sum(axis=1) == 0)
+    if zero_targets.any():
+        warnings.warn(
+            "Furness given targets of 0 for %d segments. Returning all 0's "
+            "for these segments." % zero_targets.sum()
+        )
+        furnessed_mats[zero_targets] = 0
+
+    # Only work on the segments which have not converged
+    active = np.flatnonzero(~zero_targets)
+    if len(active) == n_segs:
+        work = furnessed_mats
+    else:
+        work = furnessed_mats[active]
+    seg_row_targets = row_targets[active]
+    seg_col_targets = col_targets[active]
+
+    # Set up numpy overflow errors
+    with np.errstate(over='raise'):
+
+        # The col sums are carried between iterations
+        col_ach = np.sum(work, axis=1)
+
+        for iter_num in range(max_iters):
+            if len(active) == 0:
+                break
+
+            # ## COL CONSTRAIN ## #
+            col_factor = np.divide(
+                seg_col_targets,
+                col_ach,
+                where=col_ach != 0,
+                out=np.ones_like(seg_col_targets, dtype=float),
+            )
+            work *= col_factor[:, np.newaxis, :]
+
+            # ## ROW CONSTRAIN ## #
+            row_ach = np.sum(work, axis=2)
+            row_factor = np.divide(
+                seg_row_targets,
+                row_ach,
+                where=row_ach != 0,
+                out=np.ones_like(seg_row_targets, dtype=float),
+            )
+            work *= row_factor[:, :, np.newaxis]
+
+            # Needed for the next col constrain, and to check convergence
+            col_ach = np.sum(work, axis=1)
+
+            # Only check for convergence when asked
+            check_iter = (iter_num + 1) % check_every == 0
+            if not check_iter and iter_num != max_iters - 1:
+                continue
+
+            # Calculate the diff for each segment
+            row_ach = np.sum(work, axis=2)
+            row_diff = np.sum((seg_row_targets - row_ach) ** 2, axis=1)
+            col_diff = np.sum((seg_col_targets - col_ach) ** 2, axis=1)
+            cur_rmse = ((row_diff + col_diff) / n_rows) ** 0.5
+
+            completed_iters[active] = iter_num + 1
+            achieved_rmse[active] = cur_rmse
+
+            # We got a NaN! Make sure to point out we didn't converge
+            is_nan = np.isnan(cur_rmse)
+            if is_nan.any():
+                work[is_nan] = 0
+                achieved_rmse[active[is_nan]] = np.inf
+                completed_iters[active[is_nan]] = iter_num
+
+            # Drop any finished segments from the working stack
+            done = (cur_rmse < tol) | is_nan
+            if not done.any():
+                continue
+
+            furnessed_mats[active[done]] = work[done]
+            keep = ~done
+            active = active[keep]
+            work = work[keep]
+            col_ach = col_ach[keep]
+            seg_row_targets = seg_row_targets[keep]
+            seg_col_targets = seg_col_targets[keep]
+
+    # Put back anything that did not converge
+    if len(active) > 0:
+        furnessed_mats[active] = work
+
+        # Warn the user if we exhausted our number of loops
+        if warning:
+            print("WARNING! The batched doubly constrained furness exhausted "
+                  "its max number of loops (%d) for %d segments, while "
+                  "achieving a max RMSE difference of %f. The values "
+                  "returned may not be accurate."
+                  % (max_iters, len(active), np.max(achieved_rmse[active])))
+
+    return furnessed_mats, completed_iters, achieved_rmse
+
+
+def accelerated_doubly_constrained_furness(seed_vals: Union[np.ndarray, sparse.spmatrix],
+                                           row_targets: np.ndarray,
+                                           col_targets: np.ndarray,
+                                           tol: float = 1e-9,
+                                           max_iters: int = 5000,
+                                           warning: bool = True,
+                                           anderson_memory: int = 5,
+                                           ) -> Tuple[Union[np.ndarray, sparse.csr_matrix], int, float]:
+    """
+    Performs an Anderson accelerated doubly constrained furness
+
+    Rather than repeatedly scaling the whole matrix, this furness works on
+    the (log) row and column balancing factors. Each iteration is a plain
+    furness iteration applied to the factors - costing two matrix-vector
+    products - which is then extrapolated using Anderson mixing of the last
+    `anderson_memory` iterations. This can cut the number of iterations
+    needed by an order of magnitude on seeds that are slow to converge,
+    such as high-spread gravity model seeds.
+
+    If an accelerated step makes the achieved RMSE worse, the mixing
+    history is dropped and a plain furness step is taken instead.
+
+    Parameters
+    ----------
+    seed_vals:
+        Initial values for the furness. Must be of shape
+        (len(n_rows), len(n_cols)). Can be a dense numpy array or any
+        scipy.sparse matrix.
+
+    row_targets:
+        The target values for the sum of each row.
+        i.e np.sum(matrix, axis=1)
+
+    col_targets:
+        The target values for the sum of each column
+        i.e np.sum(matrix, axis=0)
+
+    tol:
+        The maximum difference between the achieved and the target values
+        to tolerate before exiting early. R^2 is used to calculate the
+        difference.
+
+    max_iters:
+        The maximum number of iterations to complete before exiting.
+
+    warning:
+        Whether to print a warning or not when the tol cannot be met before
+        max_iters.
+
+    anderson_memory:
+        The number of previous iterations to use when mixing. If set to 0,
+        no mixing is done and this acts as a normal furness.
+
+    Returns
+    -------
+    furnessed_matrix:
+        The final furnessed matrix. If seed_vals was a scipy.sparse matrix
+        this will be a scipy.sparse.csr_matrix, otherwise a dense
+        numpy array.
+
+    completed_iters:
+        The number of completed iterations before exiting
+
+    achieved_rmse:
+        The Root Mean Squared Error difference achieved before exiting
+
+    See Also
+    --------
+    doubly_constrained_furness()
+    """
+    # Error check
+    if seed_vals.shape != (len(row_targets), len(col_targets)):
+        raise ValueError(
+            "The shape of the seed values given does not match the row "
+            "and col targets. Seed_vals are shape %s. Expected shape (%d, %d)."
+            % (str(seed_vals.shape), len(row_targets), len(col_targets))
+        )
+
+    # Init
+    is_sparse = sparse.issparse(seed_vals)
+    early_exit = False
+    cur_rmse = np.inf
+    iter_num = 0
+    n_vals = len(row_targets)
+
+    def build_matrix(row_factors: np.ndarray, col_factors: np.ndarray):
+        if is_sparse:
+            mat = sparse.diags(row_factors) @ seed_vals @ sparse.diags(col_factors)
+            return sparse.csr_matrix(mat)
+        return seed_vals * row_factors[:, np.newaxis] * col_factors
+
+    def empty_matrix():
+        if is_sparse:
+            return sparse.csr_matrix(seed_vals.shape)
+        return np.zeros(seed_vals.shape)
+
+    # Can return early if all 0 - probably shouldn't happen!
+    if row_targets.sum() == 0 or col_targets.sum() == 0:
+        warnings.warn("Furness given targets of 0. Returning all 0's")
+        return empty_matrix(), iter_num, cur_rmse
+
+    # Work with log factors. Zero targets have a factor of 0 (log of -inf)
+    row_targets = np.asarray(row_targets, dtype=float)
+    col_targets = np.asarray(col_targets, dtype=float)
+    log_row_targets = np.log(row_targets, where=row_targets > 0, out=np.full(n_vals, -np.inf))
+    log_col_targets = np.log(
+        col_targets,
+        where=col_targets > 0,
+        out=np.full(len(col_targets), -np.inf),
+    )
+
+    # Only factors with a target can be mixed
+    mix_mask = np.isfinite(log_col_targets)
+
+    def log_factor(targets_log: np.ndarray, achieved: np.ndarray) -> np.ndarray:
+        """Log of targets / achieved, where achieved is non-zero. Else 0"""
+        return np.subtract(
+            targets_log,
+            np.log(achieved, where=achieved > 0, out=np.zeros_like(achieved)),
+            where=achieved > 0,
+            out=np.zeros_like(achieved),
+        )
+
+    # Anderson mixing history. Mixed steps can't move a factor more than
+    # exp(max_log_step) away from a plain furness step
+    max_log_step = 20
+    delta_residuals: List[np.ndarray] = list()
+    delta_updates: List[np.ndarray] = list()
+    prev_residual = None
+    prev_update = None
+    prev_rmse = np.inf
+
+    log_col_factors = np.zeros(len(col_targets))
+    row_factors = np.ones(n_vals)
+    col_factors = np.ones(len(col_targets))
+    completed_iters = 0
+    with np.errstate(over='raise'):
+        for iter_num in range(max_iters):
+            completed_iters = iter_num + 1
+
+            # ## A PLAIN FURNESS ITERATION ON THE FACTORS ## #
+            col_factors = np.exp(log_col_factors)
+            row_ach = seed_vals @ col_factors
+            row_factors = np.exp(log_factor(log_row_targets, row_ach))
+
+            col_ach_raw = seed_vals.T @ row_factors
+            col_ach = col_factors * col_ach_raw
+            new_log_col_factors = log_factor(log_col_targets, col_ach_raw)
+
+            # Rows with no seed values can't meet their targets
+            row_diff = np.sum((row_targets - row_factors * row_ach) ** 2)
+            col_diff = np.sum((col_targets - col_ach) ** 2)
+            cur_rmse = ((row_diff + col_diff) / n_vals) ** 0.5
+            if cur_rmse < tol:
+                early_exit = True
+                break
+
+            # We got a NaN! Make sure to point out we didn't converge
+            if np.isnan(cur_rmse):
+                return empty_matrix(), iter_num, np.inf
+
+            # Restart the mixing if it's making things worse
+            if cur_rmse > prev_rmse:
+                delta_residuals.clear()
+                delta_updates.clear()
+                prev_residual = None
+            prev_rmse = cur_rmse
+
+            # ## ANDERSON MIXING ## #
+            update = new_log_col_factors[mix_mask]
+            residual = update - log_col_factors[mix_mask]
+
+            if prev_residual is not None and anderson_memory > 0:
+                delta_residuals.append(residual - prev_residual)
+                delta_updates.append(update - prev_update)
+                if len(delta_residuals) > anderson_memory:
+                    delta_residuals.pop(0)
+                    delta_updates.pop(0)
+            prev_residual = residual
+            prev_update = update
+
+            if len(delta_residuals) > 0:
+                gamma, *_ = np.linalg.lstsq(
+                    np.column_stack(delta_residuals),
+                    residual,
+                    rcond=None,
+                )
+                mixed = update - np.column_stack(delta_updates) @ gamma
+
+                # Don't take wild steps, fall back to plain furness
+                if np.all(np.abs(mixed - update) < max_log_step):
+                    update = mixed
+                else:
+                    delta_residuals.clear()
+                    delta_updates.clear()
+                    prev_residual = None
+
+            log_col_factors = new_log_col_factors
+            log_col_factors[mix_mask] = update
+
+    # Warn the user if we exhausted our number of loops
+    if not early_exit and warning:
+        print("WARNING! The accelerated doubly constrained furness exhausted "
+              "its max number of loops (%d), while achieving an RMSE "
+              "difference of %f. The values returned may not be accurate."
+              % (max_iters, cur_rmse))
+
+    return build_matrix(row_factors, col_factors), completed_iters, cur_rmse
+
+
+def get_furness_function(use_sparse: bool = False,
+                         use_accelerated: bool = False,
+                         ) -> Callable:
+    """Gets the doubly constrained furness function to use
+
+    Parameters
+    ----------
+    use_sparse:
+        Whether to use the sparse furness or not.
+
+    use_accelerated:
+        Whether to use the Anderson accelerated furness or not. The
+        accelerated furness works natively on both dense and sparse seeds,
+        so takes priority over use_sparse.
+
+    Returns
+    -------
+    furness_function:
+        One of doubly_constrained_furness(),
+        sparse_doubly_constrained_furness() or
+        accelerated_doubly_constrained_furness(). All accept the seed_vals,
+        row_targets, col_targets, tol, max_iters and warning arguments.
+    """
+    if use_accelerated:
+        return accelerated_doubly_constrained_furness
+    if use_sparse:
+        return sparse_doubly_constrained_furness
+    return doubly_constrained_furness
+
+
+def estimate_balancing_factors(seed_vals: np.ndarray,
+                               furnessed_vals: np.ndarray,
+                               ) -> Tuple[np.ndarray, np.ndarray]:
+    """Estimates the row and column factors a furness applied to a seed
+
+    A doubly constrained furness only ever scales the rows and columns of
+    its seed, so furnessed_vals / seed_vals is an outer product of row and
+    column factors. These are recovered with a log-space mean over the
+    cells where both matrices are positive. Rows and columns without any
+    positive cells, including those that sum to 0 after the furness, are
+    given a factor of 1.
+
+    Parameters
+    ----------
+    seed_vals:
+        The seed matrix that was given to the furness.
+
+    furnessed_vals:
+        The matrix returned by the furness.
+
+    Returns
+    -------
+    row_factors:
+        The estimated factors applied to each row of seed_vals.
+
+    col_factors:
+        The estimated factors applied to each column of seed_vals.
+
+    See Also
+    --------
+    BalancingFactorCache
+    """
+    # Init
+    if seed_vals.shape != furnessed_vals.shape:
+        raise ValueError(
+            "The shape of the seed values and furnessed values do not "
+            "match. Got %s and %s."
+            % (seed_vals.shape, furnessed_vals.shape)
+        )
+    mask = (seed_vals > 0) & (furnessed_vals > 0) & np.isfinite(furnessed_vals)
+
+    # Only take logs where both values exist
+    log_ratio = np.divide(
+        furnessed_vals,
+        seed_vals,
+        where=mask,
+        out=np.ones_like(seed_vals, dtype=float),
+    )
+    np.log(log_ratio, out=log_ratio)
+
+    # Row means first, then what is left over for the columns
+    row_counts = np.maximum(mask.sum(axis=1), 1)
+    log_row_factors = log_ratio.sum(axis=1) / row_counts
+
+    log_ratio -= log_row_factors[:, np.newaxis]
+    log_ratio *= mask
+    col_counts = np.maximum(mask.sum(axis=0), 1)
+    log_col_factors = log_ratio.sum(axis=0) / col_counts
+
+    row_factors = np.exp(log_row_factors)
+    col_factors = np.exp(log_col_factors)
+
+    # Leave rows and columns that were furnessed away unscaled. The next
+    # furness zeroes them again if it needs to, but a factor of 0 would
+    # stop it from ever filling them back in
+    row_factors[np.nansum(furnessed_vals, axis=1) == 0] = 1
+    col_factors[np.nansum(furnessed_vals, axis=0) == 0] = 1
+
+    return row_factors, col_factors
+
+
+class BalancingFactorCache:
+    """Warm starts a furness with the factors of a previous run
+
+    Repeated furnesses of similar seeds against the same targets, such as
+    those made while calibrating a gravity model, end with similar row and
+    column balancing factors. Applying the previous factors to the next
+    seed before the furness starts it much closer to the targets.
+
+    As the furness only scales the rows and columns of its seed, the
+    furnessed result is unchanged by the warm start, to within the
+    furness tolerance.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Parameters
+        ----------
+        enabled:
+            Whether to warm start the seed matrices or not. If False,
+            warm_start() always returns the seed unchanged and nothing is
+            cached.
+        """
+        self.enabled = enabled
+        self.row_factors: np.ndarray = None
+        self.col_factors: np.ndarray = None
+
+    def reset(self) -> None:
+        """Forgets any cached balancing factors"""
+        self.row_factors = None
+        self.col_factors = None
+
+    def warm_start(self, seed_vals: np.ndarray) -> np.ndarray:
+        """Applies the cached balancing factors to a seed matrix
+
+        Parameters
+        ----------
+        seed_vals:
+            The seed matrix about to be furnessed. This is not altered.
+
+        Returns
+        -------
+        warm_seed_vals:
+            seed_vals scaled by the cached row and column factors. If
+            there are no cached factors, or they don't fit seed_vals,
+            seed_vals is returned as is.
+        """
+        if not self.enabled or self.row_factors is None:
+            return seed_vals
+
+        if sparse.issparse(seed_vals):
+            return seed_vals
+
+        if seed_vals.shape != (len(self.row_factors), len(self.col_factors)):
+            return seed_vals
+
+        return seed_vals * self.row_factors[:, np.newaxis] * self.col_factors
+
+    def update(self,
+               seed_vals: np.ndarray,
+               furnessed_vals: np.ndarray,
+               converged: bool = True,
+               ) -> None:
+        """Caches the balancing factors from a completed furness
+
+        Only converged furnesses are cached. If the furness failed, any
+        cached factors are forgotten so the next seed isn't warm started
+        from a bad result.
+
+        Parameters
+        ----------
+        seed_vals:
+            The original seed matrix, before warm_start() was applied.
+
+        furnessed_vals:
+            The matrix returned by the furness.
+
+        converged:
+            Whether the furness met its tolerance.
+        """
+        if not self.enabled:
+            return
+
+        if sparse.issparse(seed_vals) or sparse.issparse(furnessed_vals):
+            return
+
+        valid = (
+            converged
+            and np.all(np.isfinite(furnessed_vals))
+            and np.sum(furnessed_vals) > 0
+        )
+        if not valid:
+            self.reset()
+            return
+
+        self.row_factors, self.col_factors = estimate_balancing_factors(
+            seed_vals=seed_vals,
+            furnessed_vals=furnessed_vals,
+        )
+
+
+def furness_sensitivity(furnessed_vals: np.ndarray,
+                        log_gradient: np.ndarray,
+                        tol: float = 1e-6,
+                        max_iters: int = 20,
+                        ) -> np.ndarray:
+    """Calculates the first order change of a furness to a change in its seed
+
+    If every seed value is scaled by exp(eps * log_gradient), the furnessed
+    matrix changes by approximately eps * sensitivity. This is found by
+    running a linearised furness: log_gradient has its matrix weighted row
+    means and column means removed, alternately, until both are within tol
+    of 0. No copies of the seed or adjusted seeds are needed, and the only
+    extra memory used is the returned matrix.
+
+    Parameters
+    ----------
+    furnessed_vals:
+        The matrix returned by a completed furness.
+
+    log_gradient:
+        The partial derivative of the log of each seed value with respect
+        to the parameter being changed. This array is overwritten and
+        returned, pass a copy if it needs to be kept.
+
+    tol:
+        The largest row or column adjustment to tolerate before exiting
+        early.
+
+    max_iters:
+        The maximum number of row and column adjustments to make.
+
+    Returns
+    -------
+    sensitivity:
+        The derivative of furnessed_vals with respect to the parameter
+        being changed. This is log_gradient, updated in place.
+    """
+    # Init
+    if furnessed_vals.shape != log_gradient.shape:
+        raise ValueError(
+            "The shape of the furnessed values and log gradient do not "
+            "match. Got %s and %s."
+            % (furnessed_vals.shape, log_gradient.shape)
+        )
+    gradient = log_gradient
+    gradient[~np.isfinite(gradient)] = 0
+    row_totals = furnessed_vals.sum(axis=1)
+    col_totals = furnessed_vals.sum(axis=0)
+
+    def weighted_mean(axis_str: str, totals: np.ndarray) -> np.ndarray:
+        return np.divide(
+            np.einsum('ij,ij->%s' % axis_str, furnessed_vals, gradient),
+            totals,
+            where=totals != 0,
+            out=np.zeros_like(totals, dtype=float),
+        )
+
+    for _ in range(max_iters):
+        row_adj = weighted_mean('i', row_totals)
+        gradient -= row_adj[:, np.newaxis]
+
+        col_adj = weighted_mean('j', col_totals)
+        gradient -= col_adj
+
+        if max(np.abs(row_adj).max(), np.abs(col_adj).max()) < tol:
+            break
+
+    gradient *= furnessed_vals
+    return gradient
 
 
 def _distribute_pa_internal(productions,
@@ -912,6 +1824,8 @@ def furness_pandas_wrapper(seed_values: pd.DataFrame,
                            round_dp: int = consts.DEFAULT_ROUNDING,
                            unique_zones: List[int] = None,
                            unique_zones_join_fn: Callable = operator.and_,
+                           use_sparse: bool = False,
+                           use_accelerated: bool = False,
                            ) -> Tuple[pd.DataFrame, int, float]:
     """
     Wrapper around doubly_constrained_furness() to handle pandas in/out
@@ -973,6 +1887,17 @@ def furness_pandas_wrapper(seed_values: pd.DataFrame,
         the seed matrices. By default, a bitwise and is used. See pythons
         builtin operator library for more options.
 
+    use_sparse:
+        Whether to run the furness using sparse_doubly_constrained_furness()
+        instead of doubly_constrained_furness(). Only beneficial when the
+        seed contains many zeros, i.e. when seed_infill is 0 or unique_zones
+        limits the seed to a subset of zones.
+
+    use_accelerated:
+        Whether to run the furness using
+        accelerated_doubly_constrained_furness() instead of
+        doubly_constrained_furness(). Takes priority over use_sparse.
+
     Returns
     -------
     furnessed_matrix:
@@ -1034,7 +1959,8 @@ def furness_pandas_wrapper(seed_values: pd.DataFrame,
     col_targets = col_targets.values.flatten()
     seed_values = seed_values.values
 
-    furnessed_mat, n_iters, achieved_rmse = doubly_constrained_furness(
+    furness_fn = get_furness_function(use_sparse, use_accelerated)
+    furnessed_mat, n_iters, achieved_rmse = furness_fn(
         seed_vals=seed_values,
         row_targets=row_targets,
         col_targets=col_targets,
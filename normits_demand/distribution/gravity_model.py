@@ -119,6 +119,8 @@ class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
                  furness_max_iters: int,
                  warning: bool,
                  *args,
+                 use_sparse_furness: bool = False,
+                 use_accelerated_furness: bool = False,
                  **kwargs,
                  ):
         """
@@ -144,6 +146,15 @@ class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
         furness_dtype:
             The datatype being used by the furness. Assumed np.float64 by
             default.
+
+        use_sparse_furness:
+            Whether to use furness.sparse_doubly_constrained_furness()
+            rather than furness.doubly_constrained_furness().
+
+        use_accelerated_furness:
+            Whether to use furness.accelerated_doubly_constrained_furness()
+            rather than furness.doubly_constrained_furness(). Takes priority
+            over use_sparse_furness.
         """
         multithreading.ReturnOrErrorThread.__init__(self, *args, **kwargs)
 
@@ -152,6 +163,10 @@ class FurnessThreadBase(abc.ABC, multithreading.ReturnOrErrorThread):
         self.furness_max_iters = furness_max_iters
         self.warning = warning
         self.calib_area_keys = area_mats.keys()
+        self.furness_fn = furness.get_furness_function(
+            use_sparse=use_sparse_furness,
+            use_accelerated=use_accelerated_furness,
+        )
 
     @abc.abstractmethod
     def run_furness(self):
@@ -195,6 +210,8 @@ class GravityModelBase(abc.ABC):
                  target_cost_distribution: pd.DataFrame,
                  running_log_path: os.PathLike,
                  cost_min_max_buf: float = 0.1,
+                 use_warm_start_furness: bool = True,
+                 use_analytic_jacobian: bool = False,
                  ):
         # Validate attributes
         target_cost_distribution = pd_utils.reindex_cols(
@@ -202,6 +219,13 @@ class GravityModelBase(abc.ABC):
             self._target_cost_distribution_cols,
         )
 
+        if use_analytic_jacobian and not cost_function.has_log_gradient:
+            raise ValueError(
+                "Cannot use an analytic jacobian with CostFunction %s as it "
+                "does not have a closed form log gradient."
+                % cost_function.name
+            )
+
         if running_log_path is not None:
             dir_name, _ = os.path.split(running_log_path)
             if not os.path.exists(dir_name):
@@ -225,6 +249,7 @@ class GravityModelBase(abc.ABC):
         self.target_cost_distribution = self._update_tcd(target_cost_distribution)
         self.tcd_bin_edges = self._get_tcd_bin_edges(target_cost_distribution)
         self.running_log_path = running_log_path
+        self.use_analytic_jacobian = use_analytic_jacobian
 
         # Running attributes
         self._loop_num: int = -1
@@ -232,6 +257,8 @@ class GravityModelBase(abc.ABC):
         self._loop_end_time: float = -1.0
         self._jacobian_mats: Dict[str, np.ndarray] = dict()
         self._perceived_factors: np.ndarray = np.ones_like(self.cost_matrix)
+        self._balancing_factors = furness.BalancingFactorCache(use_warm_start_furness)
+        self._band_indices: Dict[Tuple[float, ...], cost_utils.CostBandIndex] = dict()
 
         # Additional attributes
         self.initial_cost_params: Dict[str, Any] = dict()
@@ -311,6 +338,19 @@ class GravityModelBase(abc.ABC):
 
         return min_vals, max_vals
 
+    def _get_band_index(self, tcd_bin_edges: List[float]) -> cost_utils.CostBandIndex:
+        """Returns the CostBandIndex of self.cost_matrix and tcd_bin_edges
+
+        The cost matrix doesn't change during calibration, so the index
+        is only built the first time each set of edges is used.
+        """
+        key = tuple(tcd_bin_edges)
+        if key not in self._band_indices:
+            self._band_indices[key] = cost_utils.CostBandIndex(
+                self.cost_matrix, bin_edges=tcd_bin_edges
+            )
+        return self._band_indices[key]
+
     def _cost_distribution(self,
                            matrix: np.ndarray,
                            tcd_bin_edges: List[float],
@@ -319,7 +359,7 @@ class GravityModelBase(abc.ABC):
         _, normalised = cost_utils.normalised_cost_distribution(
             matrix=matrix,
             cost_matrix=self.cost_matrix,
-            bin_edges=tcd_bin_edges,
+            band_index=self._get_band_index(tcd_bin_edges),
         )
         return normalised
 
@@ -453,22 +493,36 @@ class GravityModelBase(abc.ABC):
         # TODO(BT): Move this into the Jacobian function. We don't need it here
         #  and it's just using it memory before we need to. Could single loop it
         #  too, so that only one extra cost matrix is needed. NOT n_cost_params
-        self._jacobian_mats = {'base': init_matrix.copy()}
-        for cost_param in self.cost_function.kw_order:
-            # Adjust cost slightly
-            adj_cost_kwargs = cost_kwargs.copy()
-            adj_cost_kwargs[cost_param] += adj_cost_kwargs[cost_param] * diff_step
-
-            # Calculate adjusted cost
-            adj_cost = self.cost_function.calculate(cost_matrix, **adj_cost_kwargs)
-
-            self._jacobian_mats[cost_param] = adj_cost
-
-        # Furness trips to trip ends
-        matrix, iters, rmse = self.gravity_furness(seed_matrix=init_matrix)
+        # The analytic jacobian only needs the final matrix
+        self._jacobian_mats = dict()
+        if not self.use_analytic_jacobian:
+            self._jacobian_mats['base'] = init_matrix.copy()
+            for cost_param in self.cost_function.kw_order:
+                # Adjust cost slightly
+                adj_cost_kwargs = cost_kwargs.copy()
+                adj_cost_kwargs[cost_param] += adj_cost_kwargs[cost_param] * diff_step
+
+                # Calculate adjusted cost
+                adj_cost = self.cost_function.calculate(cost_matrix, **adj_cost_kwargs)
+
+                self._jacobian_mats[cost_param] = adj_cost
+
+        # Furness trips to trip ends, starting from the last balancing factors
+        matrix, iters, rmse = self.gravity_furness(
+            seed_matrix=self._balancing_factors.warm_start(init_matrix),
+        )
+        # Not all subclasses furness themselves, so only those that cache
+        # balancing factors need a furness_tol
+        if self._balancing_factors.enabled:
+            self._balancing_factors.update(
+                init_matrix,
+                matrix,
+                converged=rmse < self.furness_tol,
+            )
 
         # Store for the jacobian calculations
-        self._jacobian_mats['final'] = matrix.copy()
+        if not self.use_analytic_jacobian:
+            self._jacobian_mats['final'] = matrix.copy()
 
         # Convert matrix into an achieved distribution curve
         achieved_band_shares = self._cost_distribution(matrix, self.tcd_bin_edges)
@@ -594,6 +648,66 @@ class GravityModelBase(abc.ABC):
 
         return jacobian
 
+    def _analytic_jacobian_function(
+            self,
+            cost_args: List[float],
+            diff_step: float,
+            ignore_result: bool = False,
+    ):
+        """Returns the Jacobian for _gravity_function, analytically
+
+        An alternative to _jacobian_function for cost functions with a
+        closed form log gradient. Uses the matrix from the previous call to
+        self._gravity_function, and furness.furness_sensitivity(), to
+        calculate how the band shares change with each cost parameter.
+        Only one extra matrix is held at a time, and no adjusted cost
+        matrices or furnesses are needed.
+
+        diff_step and ignore_result are accepted to match
+        _jacobian_function, but are not used.
+
+        Used by the `optimize.least_squares` function.
+        """
+        # Init
+        n_bands = len(self.target_cost_distribution['band_share'].values)
+        n_cost_params = len(cost_args)
+        jacobian = np.zeros((n_bands, n_cost_params))
+
+        cost_kwargs = self._cost_params_to_kwargs(cost_args)
+        cost_matrix = self._apply_perceived_factors(self.cost_matrix)
+        matrix = self.achieved_distribution
+        matrix_total = matrix.sum()
+        if matrix_total == 0:
+            raise ValueError("furnessed matrix total is 0")
+
+        for i, cost_param in enumerate(self.cost_function.kw_order):
+            # How the log of the seed changes with this param
+            log_gradient = self.cost_function.calculate_log_gradient(
+                cost_matrix,
+                cost_param,
+                **cost_kwargs,
+            )
+
+            # How the furnessed matrix changes with this param
+            sensitivity = furness.furness_sensitivity(
+                furnessed_vals=matrix,
+                log_gradient=log_gradient,
+            )
+
+            # Turn into band share changes
+            band_changes = cost_utils.cost_distribution(
+                matrix=sensitivity,
+                cost_matrix=self.cost_matrix,
+                band_index=self._get_band_index(self.tcd_bin_edges),
+            )
+            band_changes -= self.achieved_band_share * sensitivity.sum()
+            band_changes /= matrix_total
+
+            # Residuals are target - achieved
+            jacobian[:, i] = -band_changes
+
+        return jacobian
+
     def _calibrate(self,
                    init_params: Dict[str, Any],
                    calibrate_params: bool = True,
@@ -620,7 +734,11 @@ class GravityModelBase(abc.ABC):
                 "fun": self._gravity_function,
                 "method": self._least_squares_method,
                 "bounds": self._order_bounds(),
-                "jac": self._jacobian_function,
+                "jac": (
+                    self._analytic_jacobian_function
+                    if self.use_analytic_jacobian
+                    else self._jacobian_function
+                ),
                 "verbose": verbose,
                 "ftol": ftol,
                 "xtol": xtol,
@@ -765,6 +883,10 @@ class GravityModelCalibrator(GravityModelBase):
                  furness_tol: float,
                  running_log_path: os.PathLike,
                  use_perceived_factors: bool = True,
+                 use_sparse_furness: bool = False,
+                 use_accelerated_furness: bool = False,
+                 use_warm_start_furness: bool = True,
+                 use_analytic_jacobian: bool = False,
                  ):
         # TODO(BT): Write GravityModelCalibrator __init__ docs
         super().__init__(
@@ -772,6 +894,8 @@ class GravityModelCalibrator(GravityModelBase):
             cost_matrix=cost_matrix,
             target_cost_distribution=target_cost_distribution,
             running_log_path=running_log_path,
+            use_warm_start_furness=use_warm_start_furness,
+            use_analytic_jacobian=use_analytic_jacobian,
         )
 
         # Set attributes
@@ -780,6 +904,10 @@ class GravityModelCalibrator(GravityModelBase):
         self.furness_max_iters = furness_max_iters
         self.furness_tol = furness_tol
         self.use_perceived_factors = use_perceived_factors
+        self.furness_fn = furness.get_furness_function(
+            use_sparse=use_sparse_furness,
+            use_accelerated=use_accelerated_furness,
+        )
 
         self.target_convergence = target_convergence
 
@@ -807,7 +935,7 @@ class GravityModelCalibrator(GravityModelBase):
         achieved_rmse:
             The Root Mean Squared Error difference achieved before exiting
         """
-        return furness.doubly_constrained_furness(
+        return self.furness_fn(
             seed_vals=seed_matrix,
             row_targets=self.row_targets,
             col_targets=self.col_targets,
@@ -858,7 +986,7 @@ class GravityModelCalibrator(GravityModelBase):
         """
         return_dict = dict.fromkeys(seed_matrices.keys())
         for cost_param, seed_matrix in seed_matrices.items():
-            return_dict[cost_param], *_ = furness.doubly_constrained_furness(
+            return_dict[cost_param], *_ = self.furness_fn(
                 seed_vals=seed_matrix,
                 row_targets=row_targets,
                 col_targets=col_targets,
@@ -1603,6 +1731,7 @@ class GravityFurnessThreadSharedArrays(FurnessThreadBase):
                  getter_array: communication.SharedNumpyArrayHelper,
                  putter_array: communication.SharedNumpyArrayHelper,
                  *args,
+                 use_warm_start_furness: bool = True,
                  **kwargs,
                  ):
         """
@@ -1632,6 +1761,10 @@ class GravityFurnessThreadSharedArrays(FurnessThreadBase):
             A shared array where the furness will place its completed furnessed
             matrix.
 
+        use_warm_start_furness:
+            Whether to start each furness from the balancing factors of the
+            previous one.
+
         *args, **kwargs:
             Arguments to be passed to parent FurnessThreadBase class
 
@@ -1649,6 +1782,7 @@ class GravityFurnessThreadSharedArrays(FurnessThreadBase):
         self.col_targets = col_targets
         self.getter_qs = getter_qs
         self.putter_qs = putter_qs
+        self.balancing_factors = furness.BalancingFactorCache(use_warm_start_furness)
         self._array_in = getter_array
         self._array_out = putter_array
 
@@ -1680,14 +1814,19 @@ class GravityFurnessThreadSharedArrays(FurnessThreadBase):
         self._array_in.reset_zeros()
 
         # ## FURNESS ## #
-        furnessed_mat, iters, rmse = furness.doubly_constrained_furness(
-            seed_vals=seed_mat,
+        furnessed_mat, iters, rmse = self.furness_fn(
+            seed_vals=self.balancing_factors.warm_start(seed_mat),
             row_targets=self.row_targets,
             col_targets=self.col_targets,
             tol=self.furness_tol,
             max_iters=self.furness_max_iters,
             warning=self.warning,
         )
+        self.balancing_factors.update(
+            seed_mat,
+            furnessed_mat,
+            converged=rmse < self.furness_tol,
+        )
 
         # ## RETURN RESULTS ## #
         # Put the furnessed matrix in the return array
@@ -1718,6 +1857,7 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
         getter_qs: Dict[Any, queue.Queue],
         putter_qs: Dict[Any, queue.Queue],
         *args,
+        use_warm_start_furness: bool = True,
         **kwargs,
     ):
         """
@@ -1739,6 +1879,10 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
             A dictionary of Queues for each area_id. Queues are used to pass
             info back on the completed furness.
 
+        use_warm_start_furness:
+            Whether to start each furness from the balancing factors of the
+            previous one.
+
         *args, **kwargs:
             Arguments to be passed to parent FurnessThreadBase class
 
@@ -1756,6 +1900,7 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
         self.col_targets = col_targets
         self.getter_qs = getter_qs
         self.putter_qs = putter_qs
+        self.balancing_factors = furness.BalancingFactorCache(use_warm_start_furness)
 
     def run_furness(self) -> None:
         """Runs a furness once all data received, and passes data back
@@ -1772,14 +1917,19 @@ class GravityFurnessThreadQueues(FurnessThreadBase):
         seed_mat = functools.reduce(operator.add, seed_mat_dict.values())
 
         # ## FURNESS ## #
-        furnessed_mat, iters, rmse = furness.doubly_constrained_furness(
-            seed_vals=seed_mat,
+        furnessed_mat, iters, rmse = self.furness_fn(
+            seed_vals=self.balancing_factors.warm_start(seed_mat),
             row_targets=self.row_targets,
             col_targets=self.col_targets,
             tol=self.furness_tol,
             max_iters=self.furness_max_iters,
             warning=self.warning,
         )
+        self.balancing_factors.update(
+            seed_mat,
+            furnessed_mat,
+            converged=rmse < self.furness_tol,
+        )
 
         # ## RETURN RESULTS ## #
         # Split back out into areas and return
@@ -1917,7 +2067,7 @@ class JacobianFurnessThreadSharedArrays(FurnessThreadBase):
         if not all_ignore:
             # ## FURNESS ## #
             for key, seed_matrix in seed_mats.items():
-                furnessed_mat, *_ = furness.doubly_constrained_furness(
+                furnessed_mat, *_ = self.furness_fn(
                     seed_vals=seed_matrix,
                     row_targets=row_targets,
                     col_targets=col_targets,
@@ -2047,7 +2197,7 @@ class JacobianFurnessThreadQueues(FurnessThreadBase):
         # Only run and return data if any threads care about the result
         if not all(ignore_threads.values()):
             # ## FURNESS ## #
-            furnessed_mat, iters, rmse = furness.doubly_constrained_furness(
+            furnessed_mat, iters, rmse = self.furness_fn(
                 seed_vals=seed_mat,
                 row_targets=row_targets,
                 col_targets=col_targets,
@@ -2109,12 +2259,15 @@ class SingleTLDCalibratorThreadBase(multithreading.ReturnOrErrorThread, GravityM
         )
         # row and col targets aren't used in this implementation. See
         # self.gravity_furness for more info.
+        # Each thread only sees its own area of the furness, so any warm
+        # starting is done by the gravity furness thread instead.
         GravityModelBase.__init__(
             self,
             cost_function=cost_function,
             cost_matrix=cost_matrix,
             target_cost_distribution=target_cost_distribution,
             running_log_path=running_log_path,
+            use_warm_start_furness=False,
         )
 
         # Assign other attributes
@@ -2619,6 +2772,9 @@ class MultiAreaGravityModelCalibrator:
                  running_log_path: os.PathLike,
                  use_perceived_factors: bool = True,
                  memory_optimised: bool = True,
+                 use_sparse_furness: bool = False,
+                 use_accelerated_furness: bool = False,
+                 use_warm_start_furness: bool = True,
                  ):
         # TODO(BT): Write MultiAreaGravityModelCalibrator __init__ docs
         # Set up logging
@@ -2648,6 +2804,9 @@ class MultiAreaGravityModelCalibrator:
         self.use_perceived_factors = use_perceived_factors
         self.running_log_path = running_log_path
         self.memory_optimised = memory_optimised
+        self.use_sparse_furness = use_sparse_furness
+        self.use_accelerated_furness = use_accelerated_furness
+        self.use_warm_start_furness = use_warm_start_furness
 
         self.target_convergence = target_convergence
 
@@ -2673,6 +2832,10 @@ class MultiAreaGravityModelCalibrator:
         self.calibration_naming = calibration_naming
         self.target_cost_distributions = self._update_tcds(target_cost_distributions)
         self.tcd_bin_edges = self._get_tcd_bin_edges(target_cost_distributions)
+        self._band_indices = {
+            area_id: cost_utils.CostBandIndex(self.cost_matrix, bin_edges=edges)
+            for area_id, edges in self.tcd_bin_edges.items()
+        }
 
         # Additional attributes
         self.initial_cost_params = dict.fromkeys(self.calib_areas)
@@ -2802,6 +2965,9 @@ class MultiAreaGravityModelCalibrator:
             furness_tol=self.furness_tol,
             furness_max_iters=self.furness_max_iters,
             warning=True,
+            use_sparse_furness=self.use_sparse_furness,
+            use_accelerated_furness=self.use_accelerated_furness,
+            use_warm_start_furness=self.use_warm_start_furness,
         )
         gravity_furness.start()
 
@@ -2817,6 +2983,8 @@ class MultiAreaGravityModelCalibrator:
             furness_tol=1e-6,
             furness_max_iters=50,
             warning=False,
+            use_sparse_furness=self.use_sparse_furness,
+            use_accelerated_furness=self.use_accelerated_furness,
         )
         jacobian_furness.start()
 
@@ -2893,6 +3061,9 @@ class MultiAreaGravityModelCalibrator:
             furness_tol=self.furness_tol,
             furness_max_iters=self.furness_max_iters,
             warning=True,
+            use_sparse_furness=self.use_sparse_furness,
+            use_accelerated_furness=self.use_accelerated_furness,
+            use_warm_start_furness=self.use_warm_start_furness,
         )
         gravity_furness.start()
 
@@ -2906,6 +3077,8 @@ class MultiAreaGravityModelCalibrator:
             furness_tol=1e-6,
             furness_max_iters=50,
             warning=False,
+            use_sparse_furness=self.use_sparse_furness,
+            use_accelerated_furness=self.use_accelerated_furness,
         )
         jacobian_furness.start()
 
@@ -3013,7 +3186,11 @@ class MultiAreaGravityModelCalibrator:
             seed_matrix += self.cost_function.calculate(area_cost, **cost_params)
 
         # Furness trips to trip ends
-        furnessed_matrix, iters, rmse = furness.doubly_constrained_furness(
+        furness_fn = furness.get_furness_function(
+            use_sparse=self.use_sparse_furness,
+            use_accelerated=self.use_accelerated_furness,
+        )
+        furnessed_matrix, iters, rmse = furness_fn(
             seed_vals=seed_matrix,
             row_targets=self.row_targets,
             col_targets=self.col_targets,
@@ -3027,13 +3204,14 @@ class MultiAreaGravityModelCalibrator:
             # Extract this area
             area_bool = self.calibration_matrix == area_id
             area_matrix = furnessed_matrix * area_bool
-            area_cost = self.cost_matrix * area_bool
 
             # Convert matrix into an achieved distribution curve
+            # Cells outside the area have no trips, so the full cost
+            # matrix can be indexed
             _, achieved_band_shares = cost_utils.normalised_cost_distribution(
                 matrix=area_matrix,
-                cost_matrix=area_cost,
-                bin_edges=self.tcd_bin_edges[area_id],
+                cost_matrix=self.cost_matrix,
+                band_index=self._band_indices[area_id],
             )
 
             # Evaluate this run
@@ -757,12 +757,21 @@ def _dissag_seg(
     # seg_x = 0,prod_list[0]
     summary_results: list[DisaggregationSummaryResults] = []
     seg_audit = []
+    band_indices: dict[tuple, cost_utils.CostBandIndex] = {}
     for i, (target_p, target_a, target_tld, segmentation) in enumerate(
         zip(prod_list, attr_list, tld_list, segmentation_list)
     ):
         # Build audit dict
         audit_dict = {"segmentation": segmentation}
 
+        # Only bin the costs once for each set of bands
+        bands_key = (tuple(target_tld.min_bounds), tuple(target_tld.max_bounds))
+        if bands_key not in band_indices:
+            band_indices[bands_key] = cost_utils.CostBandIndex(
+                costs, target_tld.min_bounds, target_tld.max_bounds
+            )
+        band_index = band_indices[bands_key]
+
         # Convert to arrays because all the matrix calculations
         # are done as arrays instead of DataFrames
         target_p = np.array(target_p)
@@ -787,6 +796,7 @@ def _dissag_seg(
             target_tld.min_bounds,
             target_tld.max_bounds,
             target_tld.cost_units,
+            band_index=band_index,
         )
         audit_dict["cost_tld"] = cost.CostDistribution.from_trips(
             np.ones_like(costs),
@@ -794,6 +804,7 @@ def _dissag_seg(
             target_tld.min_bounds,
             target_tld.max_bounds,
             target_tld.cost_units,
+            band_index=band_index,
         )
         matrix_tld = cost.CostDistribution.from_trips(
             new_mat,
@@ -801,6 +812,7 @@ def _dissag_seg(
             target_tld.min_bounds,
             target_tld.max_bounds,
             target_tld.cost_units,
+            band_index=band_index,
         )
         # Calculate the band share convergence
         bs_con = _calculate_bandshare_convergence(matrix_tld, target_tld)
@@ -840,21 +852,20 @@ def _dissag_seg(
             while bs_con < bs_con_crit:
 
                 # Calculating K factors for cells based on which distance band they're in
-                k_factors = np.ones_like(costs)
-                for min_, max_, obs, mat in zip(
-                    target_tld.min_bounds,
-                    target_tld.max_bounds,
+                # Leave K factor as 1 if there aren't any matrix trips
+                band_k_factors = np.ones_like(matrix_tld.band_shares)
+                np.divide(
                     target_tld.band_shares,
                     matrix_tld.band_shares,
-                ):
-                    if mat <= 0:
-                        continue  # Leave K factor as 1 if there aren't any matrix trips
-
-                    k_factors = np.where(
-                        (costs >= min_) & (costs < max_),
-                        np.clip(obs / mat, 0.001, 10),
-                        k_factors,
-                    )
+                    out=band_k_factors,
+                    where=matrix_tld.band_shares > 0,
+                )
+                band_k_factors = np.where(
+                    matrix_tld.band_shares > 0,
+                    np.clip(band_k_factors, 0.001, 10),
+                    1,
+                )
+                k_factors = band_index.spread(band_k_factors, fill_value=1)
 
                 new_mat = k_factors * new_mat
 
@@ -899,6 +910,7 @@ def _dissag_seg(
                     target_tld.min_bounds,
                     target_tld.max_bounds,
                     target_tld.cost_units,
+                    band_index=band_index,
                 )
                 bs_con = _calculate_bandshare_convergence(matrix_tld, target_tld)
 
@@ -966,6 +978,7 @@ def _dissag_seg(
             target_tld.min_bounds,
             target_tld.max_bounds,
             target_tld.cost_units,
+            band_index=band_index,
         )
         bs_con = _calculate_bandshare_convergence(matrix_tld, target_tld)
 
@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing a vectorised engine for applying all of the cost
+    changes for a segment to its demand at once.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import dataclasses
+
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Union
+
+# Third party imports
+import numpy as np
+import pandas as pd
+
+# Local imports
+import normits_demand as nd
+from normits_demand.elasticity import constants as ec
+from normits_demand.elasticity import generalised_costs as gc
+
+
+##### CLASSES #####
+@dataclasses.dataclass
+class CompiledCostChanges:
+    """All the cost changes for a segment, compiled into arrays.
+
+    Attributes
+    ----------
+    changing_modes:
+        The mode each cost change is applied to.
+
+    changes:
+        The cost change factor for each cost change.
+
+    gc_ratios:
+        The ratio of adjusted to base year generalised cost for each cost
+        change, with shape (changes, zones, zones).
+
+    elasticities:
+        The generalised cost elasticity of each affected mode to each
+        cost change, with shape (changes, affected_modes).
+
+    affected_modes:
+        The modes affected by at least one of the cost changes, in the
+        order of `elasticities` columns.
+    """
+    changing_modes: List[str]
+    changes: np.ndarray
+    gc_ratios: np.ndarray
+    elasticities: np.ndarray
+    affected_modes: List[str]
+
+
+class ElasticityEngine:
+    """Applies all the cost changes for a segment in one vectorised pass.
+
+    The base costs are converted into square matrices once, and each cost
+    change is compiled into a generalised cost ratio and a row of GC
+    elasticities for each affected mode. The demand adjustment for every
+    affected mode is then the product of each ratio raised to its
+    elasticity, calculated for all modes at once as
+    exp(elasticities.T @ log(gc_ratios)).
+
+    Gives the same adjustments as applying `calculate_own_cost_adjustment`
+    for each cost change and multiplying the results together.
+    """
+
+    _matrix_modes = list(ec.MODE_ZONE_SYSTEM.keys())
+
+    def __init__(self,
+                 demand: Dict[str, Union[pd.DataFrame, float]],
+                 base_costs: Dict[str, Union[pd.DataFrame, float]],
+                 base_year_gc: Dict[str, Union[np.ndarray, float]],
+                 future_gc_params: Dict[str, Dict[str, float]],
+                 ):
+        """
+        Parameters
+        ----------
+        demand:
+            Base demand for each mode, square matrices for car and rail and
+            scalars for the other modes. Used to weight the average GC.
+
+        base_costs:
+            Base costs for each mode, as returned from
+            `ElasticityModel._get_costs`.
+
+        base_year_gc:
+            Base year generalised cost for each mode, as returned from
+            `gc.calculate_gen_costs`.
+
+        future_gc_params:
+            Parameters used in the future year generalised cost
+            calculations, for each mode.
+        """
+        self.demand = demand
+        self.base_costs = base_costs
+        self.base_year_gc = base_year_gc
+        self.future_gc_params = future_gc_params
+
+        # Convert the costs to square matrices once
+        self._cost_matrices = dict()
+        self._int_costs = dict()
+        self._future_gc = dict()
+        for m in self._matrix_modes:
+            costs = base_costs[m]
+            cost_cols = [c for c in costs.columns if c not in ("origin", "destination")]
+            wide = costs.pivot(index="origin", columns="destination", values=cost_cols)
+            self._cost_matrices[m] = {c: wide[c].values for c in cost_cols}
+            self._int_costs[m] = {
+                c: pd.api.types.is_integer_dtype(costs[c]) for c in cost_cols
+            }
+            self._future_gc[m] = self._gen_cost(m, self._cost_matrices[m])
+
+    def _gen_cost(self, mode: str, matrices: Dict[str, np.ndarray]) -> np.ndarray:
+        """Calculate the future year GC from square cost matrices."""
+        params = self.future_gc_params.get(mode, {})
+        if mode == "car":
+            return gc.gen_cost_car_mins(matrices, **params)
+        return gc.gen_cost_rail_mins(matrices, **params)
+
+    def _gc_factors(self, mode: str, cost: str) -> Tuple[float, float]:
+        """Get the GC coefficient and cost factor for a change in `cost`.
+
+        Follows `_elasticity_gc_factors`, but for the square matrices.
+
+        Returns
+        -------
+        gc_coefficient:
+            The change in GC (minutes) per unit change in `cost`.
+
+        cost_factor:
+            Factor to convert `cost` into minutes.
+
+        Raises
+        ------
+        KeyError
+            If `cost` isn't in the base costs of `mode`.
+
+        ValueError
+            If the elasticity can't be calculated for `mode` and `cost`.
+        """
+        if cost not in self._cost_matrices[mode]:
+            raise KeyError(
+                f"Cost type to be changed ({cost}) isn't present "
+                f"in the base_costs or gc_params for {mode}"
+            )
+
+        params = self.future_gc_params.get(mode, {})
+        if mode == "car" and cost == "time":
+            return 1.0, 1.0
+
+        if mode == "rail" and cost == "ride":
+            return 1.0, 1.0
+
+        if mode == "rail" and cost == "walk":
+            factors = params.get("factors")
+            factors = ec.RAIL_GC_FACTORS if factors is None else factors
+            return factors.get(cost, ec.RAIL_GC_FACTORS[cost]), 1.0
+
+        if mode == "rail" and cost == "fare":
+            return 1 / params["vot"], 1 / params["vot"]
+
+        raise ValueError(
+            f"Unknown changing_cost/changing_mode combination: {cost}, "
+            f"{mode} not sure what factors are required for GC "
+            f"elasticity calculation"
+        )
+
+    def _matrix_mode_ratios(self,
+                            mode: str,
+                            costs: List[str],
+                            changes: np.ndarray,
+                            constraints: np.ndarray,
+                            ) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate the GC ratios and elasticity scales for car or rail.
+
+        Parameters
+        ----------
+        mode:
+            The changing mode, either car or rail.
+
+        costs:
+            The cost component changed by each cost change.
+
+        changes:
+            The change factor for each cost change.
+
+        constraints:
+            Stack of constraint matrices, one for each cost change.
+
+        Returns
+        -------
+        gc_ratios:
+            Stack of GC ratios, one for each cost change.
+
+        elasticity_scales:
+            The factor to convert cost elasticities into GC elasticities
+            for each cost change.
+        """
+        factors = np.array([self._gc_factors(mode, c) for c in costs])
+        base = np.stack([self._cost_matrices[mode][c] for c in costs])
+        is_int = np.array([self._int_costs[mode][c] for c in costs])
+
+        # Adjust the costs where constrained, ints are truncated like
+        # adjusting the integer cost columns in place
+        adj_cost = base * changes[:, np.newaxis, np.newaxis]
+        adj_cost = np.where(is_int[:, np.newaxis, np.newaxis], np.trunc(adj_cost), adj_cost)
+        adj_cost = np.where(constraints == 1, adj_cost, base)
+
+        # GC is linear in each cost, so only the changed cost needs updating
+        gc_coefficients = factors[:, 0, np.newaxis, np.newaxis]
+        adj_gc = self._future_gc[mode] + gc_coefficients * (adj_cost - base)
+
+        base_gc = self.base_year_gc[mode]
+        gc_ratios = np.divide(
+            adj_gc,
+            base_gc,
+            where=base_gc > 0,
+            out=np.ones_like(adj_gc),
+        )
+        gc_ratios[gc_ratios <= 0] = 1
+
+        # Demand weighted average GC and cost for each change
+        weights = np.asarray(self.demand[mode], dtype=float).ravel()
+        n_changes = len(costs)
+        avg_gc = adj_gc.reshape(n_changes, -1) @ weights / weights.sum()
+        avg_cost = adj_cost.reshape(n_changes, -1) @ weights / weights.sum()
+
+        return gc_ratios, avg_gc / (avg_cost * factors[:, 1])
+
+    def compile(self,
+                cost_changes: pd.DataFrame,
+                elasticities: pd.DataFrame,
+                constraint_mats: Dict[str, np.ndarray],
+                ) -> CompiledCostChanges:
+        """Compile the cost changes into GC ratios and elasticities.
+
+        Parameters
+        ----------
+        cost_changes:
+            The cost changes to apply, expects the following columns:
+            mode, cost_component, e_type, adj_type and change.
+
+        elasticities:
+            The elasticity values for this segment, as returned from
+            `eu.read_elasticity_file`.
+
+        constraint_mats:
+            The constraint matrices named in the adj_type column.
+
+        Returns
+        -------
+        compiled_cost_changes:
+            The cost changes compiled into arrays.
+
+        Raises
+        ------
+        ElasticityError
+            If any of the cost changes are to vot or voc.
+        """
+        cols = ["mode", "cost_component", "e_type", "adj_type", "change"]
+        changes_df = cost_changes[cols].reset_index(drop=True)
+        changes = changes_df["change"].to_numpy(dtype=float)
+
+        if changes_df.empty:
+            raise ValueError("No cost changes given to compile")
+
+        unknown = set(changes_df["mode"]) - set(self._matrix_modes + ec.OTHER_MODES)
+        if unknown:
+            raise KeyError(f"No base costs for changing modes: {sorted(unknown)}")
+
+        if changes_df["cost_component"].isin(["vot", "voc"]).any():
+            # WE SHOULD NEVER ADJUST THESE OTHERWISE DOUBLE COUNTING LATER ON!
+            raise nd.ElasticityError(
+                "Scalar generalised cost parameters (vot/voc) should not be "
+                "adjusted in the elasticity! DOUBLE COUNTING!!!"
+            )
+
+        constraints = np.stack(
+            [np.asarray(constraint_mats[x], dtype=float) for x in changes_df["adj_type"]]
+        )
+        gc_ratios = np.ones_like(constraints)
+        scales = np.ones(len(changes_df))
+
+        # GC changes are applied directly where constrained
+        is_gc = (changes_df["cost_component"] == "gc").to_numpy()
+        gc_ratios[is_gc] = np.where(
+            constraints[is_gc] == 1,
+            changes[is_gc, np.newaxis, np.newaxis],
+            1.0,
+        )
+
+        # Other modes have scalar costs, which are also their GC
+        is_other = (changes_df["mode"].isin(ec.OTHER_MODES)).to_numpy() & ~is_gc
+        other_modes = changes_df["mode"].loc[is_other]
+        base_cost = np.array([self.base_costs[m] for m in other_modes], dtype=float)
+        base_gc = np.array([self.base_year_gc[m] for m in other_modes], dtype=float)
+        adj_gc = (
+            (base_cost * changes[is_other])[:, np.newaxis, np.newaxis]
+            * constraints[is_other]
+        )
+        scales[is_other] = adj_gc.mean(axis=(1, 2))
+
+        other_ratios = np.ones_like(adj_gc)
+        positive = base_gc > 0
+        other_ratios[positive] = adj_gc[positive] / base_gc[positive, np.newaxis, np.newaxis]
+        other_ratios[other_ratios <= 0] = 1
+        gc_ratios[is_other] = other_ratios
+
+        # Car and rail costs are adjusted together for each mode
+        for mode in self._matrix_modes:
+            idx = np.flatnonzero((changes_df["mode"] == mode).to_numpy() & ~is_gc)
+            if len(idx) == 0:
+                continue
+            gc_ratios[idx], scales[idx] = self._matrix_mode_ratios(
+                mode,
+                changes_df["cost_component"].iloc[idx].tolist(),
+                changes[idx],
+                constraints[idx],
+            )
+
+        # Build the elasticity of each affected mode to each cost change
+        types = elasticities["type"].to_numpy()
+        lower_types = elasticities["type"].str.lower().to_numpy()
+        changing = elasticities["changing_mode"].str.lower().to_numpy()
+        affected = elasticities["affected_mode"].str.lower().to_numpy()
+        values = elasticities["elast_value"].to_numpy(dtype=float)
+
+        affected_modes = list()
+        elasticity_rows = list()
+        iterator = changes_df[["mode", "e_type"]].itertuples(index=False, name=None)
+        for (mode, e_type), scale in zip(iterator, scales):
+            mask = (types == e_type) & (lower_types == e_type) & (changing == mode)
+            row = dict()
+            for aff_mode, value in zip(affected[mask], values[mask]):
+                if aff_mode not in self.demand:
+                    raise KeyError(f"No demand for affected mode: {aff_mode}")
+                if aff_mode not in affected_modes:
+                    affected_modes.append(aff_mode)
+                row[aff_mode] = row.get(aff_mode, 0.0) + value * scale
+            elasticity_rows.append(row)
+
+        elasticity_array = np.zeros((len(changes_df), len(affected_modes)))
+        for i, row in enumerate(elasticity_rows):
+            for aff_mode, value in row.items():
+                elasticity_array[i, affected_modes.index(aff_mode)] = value
+
+        return CompiledCostChanges(
+            changing_modes=changes_df["mode"].tolist(),
+            changes=changes,
+            gc_ratios=gc_ratios,
+            elasticities=elasticity_array,
+            affected_modes=affected_modes,
+        )
+
+    @staticmethod
+    def demand_adjustments(compiled: CompiledCostChanges) -> Dict[str, np.ndarray]:
+        """Calculate the demand adjustment for each affected mode.
+
+        GC ratios <= 0 aren't adjusted, the same as when applying
+        each cost change separately.
+
+        Parameters
+        ----------
+        compiled:
+            The compiled cost changes.
+
+        Returns
+        -------
+        demand_adjustments:
+            Factors to multiply the base demand by for each affected mode,
+            views of a single (modes, zones, zones) array.
+        """
+        ratios = compiled.gc_ratios
+        n_changes, *shape = ratios.shape
+        log_ratios = np.log(ratios, out=np.zeros_like(ratios), where=ratios > 0)
+
+        adjustments = compiled.elasticities.T @ log_ratios.reshape(n_changes, -1)
+        np.exp(adjustments, out=adjustments)
+        adjustments = adjustments.reshape(len(compiled.affected_modes), *shape)
+
+        return dict(zip(compiled.affected_modes, adjustments))
+
+    def adjust_demand(self,
+                      cost_changes: pd.DataFrame,
+                      elasticities: pd.DataFrame,
+                      constraint_mats: Dict[str, np.ndarray],
+                      ) -> Dict[str, np.ndarray]:
+        """Compile the cost changes and calculate the demand adjustments.
+
+        See `compile` and `demand_adjustments` for details.
+        """
+        compiled = self.compile(cost_changes, elasticities, constraint_mats)
+        return self.demand_adjustments(compiled)
@@ -605,6 +605,115 @@ def gen_cost_elasticity_mins(elasticity: float,
     return elasticity * (averages["gc"] / (averages["cost"] * cost_factor))
 
 
+def read_costs(cost_file: Path, mode: str) -> pd.DataFrame:
+    """Reads the given cost file, expected columns are in `COST_LOOKUP`.
+
+    The costs are returned in the zone system of the file, see
+    `translate_costs` for converting them to the `COMMON_ZONE_SYSTEM`.
+
+    Parameters
+    ----------
+    cost_file : Path
+        Path to the CSV file containing cost data.
+
+    mode : str
+        The mode of the costs, either rail or car.
+
+    Returns
+    -------
+    pd.DataFrame
+        Costs using the expected columns in `COST_LOOKUP`, sorted
+        by origin and destination.
+
+    Raises
+    ------
+    ValueError
+        If any expected columns are missing.
+    """
+    # Init
+    mode = mode.lower()
+
+    # Try to load costs - let user know which columns are missing if cant
+    try:
+        costs = pd.read_csv(cost_file, usecols=ec.COST_LOOKUP[mode].values())
+    except ValueError as e:
+        loc = str(e).find("columns expected")
+        e_str = str(e)[loc:] if loc != -1 else str(e)
+        raise ValueError(f"Columns missing from {mode} cost, {e_str}") from e
+
+    # Rename columns to standard format across modes
+    costs.rename(
+        columns={v: k for k, v in ec.COST_LOOKUP[mode].items()},
+        inplace=True,
+    )
+
+    return _sort_costs(costs)
+
+
+def translate_costs(costs: pd.DataFrame,
+                    zone_system: str,
+                    lookup: pd.DataFrame,
+                    translation_weights: pd.DataFrame,
+                    ) -> pd.DataFrame:
+    """Translates costs to the `COMMON_ZONE_SYSTEM` with a weighted average.
+
+    Parameters
+    ----------
+    costs : pd.DataFrame
+        Costs in `zone_system`, as returned from `read_costs`.
+
+    zone_system : str
+        The zone system of the costs.
+
+    lookup : pd.DataFrame
+        Zone translation from `zone_system` to the `COMMON_ZONE_SYSTEM`,
+        as returned from `du.get_zone_translation` with
+        `return_dataframe=True`.
+
+    translation_weights : pd.DataFrame
+        Relevant demand matrix (square format) for calculating
+        weight average cost when converting between zone systems.
+
+    Returns
+    -------
+    pd.DataFrame
+        Costs in the `COMMON_ZONE_SYSTEM`, sorted by origin and destination.
+
+    Raises
+    ------
+    TypeError
+        If `translation_weights` isn't a DataFrame.
+    """
+    # Check that weights are the right type
+    if not isinstance(translation_weights, pd.DataFrame):
+        raise TypeError(
+            "'demand' is '%s', expected 'DataFrame'"
+            % type(translation_weights).__name__
+        )
+
+    # Translate with weights!
+    zone_systems = [zone_system, ec.COMMON_ZONE_SYSTEM]
+    zone_cols = ["%s_zone_id" % x for x in zone_systems]
+    costs, _ = zt.translate_matrix(
+        matrix=costs,
+        lookup=lookup,
+        lookup_cols=zone_cols,
+        square_format=False,
+        zone_cols=["origin", "destination"],
+        aggregation_method="weighted_average",
+        weights=zt.square_to_list(translation_weights),
+    )
+    return _sort_costs(costs)
+
+
+def _sort_costs(costs: pd.DataFrame) -> pd.DataFrame:
+    """Converts origin/destination columns to integers and sorts by them."""
+    for c in ("origin", "destination"):
+        costs[c] = pd.to_numeric(costs[c], downcast="integer")
+
+    return costs.sort_values(["origin", "destination"])
+
+
 def get_costs(cost_file: Path,
               mode: str,
               zone_system: str,
@@ -643,68 +752,19 @@ def get_costs(cost_file: Path,
     ValueError
         If any expected columns are missing.
     """
-    # Init
-    mode = mode.lower()
-
-    # Try to load costs - let user know which columns are missing if cant
-    try:
-        costs = pd.read_csv(cost_file, usecols=ec.COST_LOOKUP[mode].values())
-    except ValueError as e:
-        loc = str(e).find("columns expected")
-        e_str = str(e)[loc:] if loc != -1 else str(e)
-        raise ValueError(f"Columns missing from {mode} cost, {e_str}") from e
-
-    # Rename columns to standard format across modes
-    costs.rename(
-        columns={v: k for k, v in ec.COST_LOOKUP[mode].items()},
-        inplace=True,
-    )
-
-    # Figure out the number of zeroes in the costs
-    cost_cols = costs.columns.tolist()
-    cost_cols.remove("origin")
-    cost_cols.remove("destination")
-    # total_zeros = (costs[cost_cols] <= 0).all(axis=1).sum()
-    # print(
-    #     f"{total_zeros} ({total_zeros / len(costs):.2%}) "
-    #     f"OD pairs are 0 for {mode} for costs"
-    # )
+    costs = read_costs(cost_file, mode)
 
     # Convert zone system if required
     if zone_system != ec.COMMON_ZONE_SYSTEM:
-        # Get the translation
         lookup = du.get_zone_translation(
             import_dir=zone_translation_folder,
             from_zone=zone_system,
             to_zone=ec.COMMON_ZONE_SYSTEM,
             return_dataframe=True,
         )
+        costs = translate_costs(costs, zone_system, lookup, translation_weights)
 
-        # Check that weights are the right type
-        if not isinstance(translation_weights, pd.DataFrame):
-            raise TypeError(
-                "'demand' is '%s', expected 'DataFrame'"
-                % type(translation_weights).__name__
-            )
-
-        # Translate with weights!
-        zone_systems = [zone_system, ec.COMMON_ZONE_SYSTEM]
-        zone_cols = ["%s_zone_id" % x for x in zone_systems]
-        costs, _ = zt.translate_matrix(
-            matrix=costs,
-            lookup=lookup,
-            lookup_cols=zone_cols,
-            square_format=False,
-            zone_cols=["origin", "destination"],
-            aggregation_method="weighted_average",
-            weights=zt.square_to_list(translation_weights),
-        )
-
-    # Convert origin/destination columns to integers
-    for c in ("origin", "destination"):
-        costs[c] = pd.to_numeric(costs[c], downcast="integer")
-
-    return costs.sort_values(["origin", "destination"])
+    return costs
 
 
 def gen_cost_mode(costs: Union[pd.DataFrame, float],
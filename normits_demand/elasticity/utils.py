@@ -101,8 +101,10 @@ def read_elasticity_file(data: Union[nd.PathLike, pd.DataFrame],
         "p": purpose,
         "market_share": market_share,
     }
-    df = du.filter_df(df, filters).reset_index(drop=True)
-    return df
+    filters = {k: v for k, v in filters.items() if v is not None}
+    if filters:
+        df = du.filter_df(df, filters)
+    return df.reset_index(drop=True)
 
 
 def get_constraint_mats(folder: nd.PathLike,
@@ -536,7 +536,6 @@ class DistributionModel(DistributionModelExportPaths):
             matrices_path.
         """
         # Init
-        translation_weight_col = 'weight'
         filename_kwargs = {
             "trip_origin": self.trip_origin,
             "year": str(self.year),
@@ -566,11 +565,12 @@ class DistributionModel(DistributionModelExportPaths):
         if not file_ops.is_old_cache(original=in_paths, cache=out_paths):
             return out_dir
 
-        # Get the translations
-        pop_trans, emp_trans = translation.get_long_pop_emp_translations(
+        # Build the translation once, for all matrices
+        translator = translation.MatrixTranslator.from_zoning_systems(
             from_zoning_system=current_zoning,
             to_zoning_system=self.compile_zoning_system,
-            weight_col_name=translation_weight_col
+            row_weighting="population",
+            col_weighting="employment",
         )
 
         desc = "Translating matrices for compilation"
@@ -588,16 +588,7 @@ class DistributionModel(DistributionModelExportPaths):
             df.columns = df.columns.astype(df.index.dtype)
 
             # Translate
-            df = translation.pandas_matrix_zone_translation(
-                matrix=df,
-                row_translation=pop_trans,
-                col_translation=emp_trans,
-                from_zone_col=current_zoning.col_name,
-                to_zone_col=self.compile_zoning_system.col_name,
-                factors_col=translation_weight_col,
-                from_unique_zones=current_zoning.unique_zones,
-                to_unique_zones=self.compile_zoning_system.unique_zones,
-            )
+            df = translator.translate_df(df)
 
             # Write new matrix out
             file_ops.write_df(df, os.path.join(out_dir, fname))
@@ -12,12 +12,13 @@ Module containing the functions for applying elasticities to demand matrices.
 """
 # Built-in imports
 import copy
+import dataclasses
 import functools
 import operator
 
 from pathlib import Path
-from collections import defaultdict
 
+from typing import Any
 from typing import List
 from typing import Dict
 from typing import Tuple
@@ -36,9 +37,177 @@ from normits_demand.utils import general as du
 from normits_demand.utils import file_ops
 from normits_demand.models import efs_zone_translator as zt
 from normits_demand.concurrency import multiprocessing
+from normits_demand.concurrency import communication
 from normits_demand.elasticity import utils as eu
 from normits_demand.elasticity import generalised_costs as gc
 from normits_demand.elasticity import constants as ec
+from normits_demand.elasticity import engine as elasticity_engine
+
+
+@dataclasses.dataclass
+class ElasticityInputCache:
+    """Inputs shared by every segment of an elasticity run.
+
+    The constraint matrices and base costs are copied into shared memory
+    once, so each segment only needs to read its own demand. The cache can
+    be pickled and sent to other processes, only the process that built
+    it owns the shared memory and should call `unlink()`.
+
+    Attributes
+    ----------
+    elasticities:
+        All of the elasticity values, to be filtered with
+        `eu.read_elasticity_file`.
+
+    constraint_matrices:
+        Shared memory info for each constraint matrix, by name.
+
+    costs:
+        Shared memory info for the base costs, keyed by
+        (mode, purpose, zone_system). Costs are in the zone system
+        they were read in, see `gc.translate_costs`.
+
+    cost_dtypes:
+        The original column dtypes of `costs`, as the values
+        are held in shared memory with a single dtype.
+
+    translation_lookups:
+        Zone translations from each cost zone system to the
+        `COMMON_ZONE_SYSTEM`.
+    """
+    elasticities: pd.DataFrame
+    constraint_matrices: Dict[str, communication.SharedArrayInfo]
+    costs: Dict[Tuple[str, str, str], communication.SharedDataFrameInfo]
+    cost_dtypes: Dict[Tuple[str, str, str], Dict[str, Any]]
+    translation_lookups: Dict[str, pd.DataFrame]
+    _helpers: List[communication.SharedNumpyArrayHelper] = dataclasses.field(
+        default_factory=list, repr=False, compare=False,
+    )
+
+    @classmethod
+    def from_data(cls,
+                  elasticities: pd.DataFrame,
+                  constraint_matrices: Dict[str, np.ndarray],
+                  costs: Dict[Tuple[str, str, str], pd.DataFrame],
+                  translation_lookups: Dict[str, pd.DataFrame] = None,
+                  ) -> "ElasticityInputCache":
+        """Copies the given matrices and costs into shared memory.
+
+        Parameters
+        ----------
+        elasticities:
+            All of the elasticity values.
+
+        constraint_matrices:
+            The constraint matrices, by name.
+
+        costs:
+            The base costs keyed by (mode, purpose, zone_system), as
+            returned from `gc.read_costs`.
+
+        translation_lookups:
+            Zone translations from each cost zone system to the
+            `COMMON_ZONE_SYSTEM`.
+
+        Returns
+        -------
+        cache:
+            The cache owning the new shared memory.
+        """
+        helpers = list()
+        try:
+            matrix_infos = dict()
+            for name, mat in constraint_matrices.items():
+                helper = communication.SharedNumpyArrayHelper(
+                    name=communication.unique_shared_memory_name(),
+                    data=np.asarray(mat),
+                )
+                helpers.append(helper)
+                matrix_infos[name] = helper.info
+
+            cost_infos = dict()
+            cost_dtypes = dict()
+            for key, df in costs.items():
+                helper, cost_infos[key] = communication.dataframe_to_shared_memory(df)
+                helpers.append(helper)
+                cost_dtypes[key] = df.dtypes.to_dict()
+
+        except BaseException:
+            for helper in helpers:
+                helper.unlink_shared_array()
+            raise
+
+        return cls(
+            elasticities=elasticities,
+            constraint_matrices=matrix_infos,
+            costs=cost_infos,
+            cost_dtypes=cost_dtypes,
+            translation_lookups=dict() if translation_lookups is None else translation_lookups,
+            _helpers=helpers,
+        )
+
+    def __getstate__(self):
+        # Only the creating process owns the shared memory
+        state = self.__dict__.copy()
+        state["_helpers"] = list()
+        return state
+
+    def __enter__(self) -> "ElasticityInputCache":
+        return self
+
+    def __exit__(self, *args, **kwargs) -> None:
+        self.unlink()
+
+    def unlink(self) -> None:
+        """Releases the shared memory, once all processes are done with it."""
+        for helper in self._helpers:
+            helper.unlink_shared_array()
+        self._helpers = list()
+
+    def get_constraint_mats(self, names: List[str]) -> Dict[str, np.ndarray]:
+        """Gets local copies of the named constraint matrices.
+
+        Raises
+        ------
+        KeyError
+            If any of the names weren't cached.
+        """
+        missing = [x for x in names if x not in self.constraint_matrices]
+        if missing != list():
+            raise KeyError(f"Constraint matrices not cached: {missing}")
+
+        matrices = dict()
+        for name in names:
+            helper = communication.SharedNumpyArrayHelper.attach(
+                self.constraint_matrices[name]
+            )
+            matrices[name] = helper.get_local_copy()
+            helper.close_shared_array()
+        return matrices
+
+    def get_costs(self, mode: str, purpose: str, zone_system: str) -> pd.DataFrame:
+        """Gets a local copy of the base costs, with their original dtypes.
+
+        Raises
+        ------
+        KeyError
+            If the costs for (mode, purpose, zone_system) weren't cached.
+        """
+        key = (mode, str(purpose), zone_system)
+        if key not in self.costs:
+            raise KeyError(f"Costs not cached for {key}")
+
+        helper, df = communication.attach_shared_dataframe(self.costs[key])
+        try:
+            return df.astype(self.cost_dtypes[key], copy=True)
+        finally:
+            del df
+            try:
+                helper.close_shared_array()
+            except BufferError:
+                # Views can outlive us in tracebacks. The memory is
+                # released with the process instead
+                pass
 
 
 class ElasticityModel:
@@ -176,6 +345,13 @@ class ElasticityModel:
         # Read in the segments to loop around
         segments = eu.read_segments_file(self.import_home / self._segments_filename)
 
+        # Read the inputs shared by all segments once
+        print("Caching costs and constraint matrices...")
+        input_cache = self.build_input_cache(
+            purposes=segments["p"].astype(str).unique().tolist(),
+            constraint_names=cost_changes["adj_type"].unique().tolist(),
+        )
+
         # Set up the arguments for each iteration
         kwarg_list = list()
         print("Setting up arguments...")
@@ -215,6 +391,7 @@ class ElasticityModel:
                     'cost_changes': cost_changes.loc[cost_changes["yr"] == yr],
                     'future_year': int(yr),
                     'fname_suffix': '_int',
+                    'input_cache': input_cache,
                 })
 
         # Set up progress bar kwargs to track
@@ -227,11 +404,64 @@ class ElasticityModel:
 
         # Call the functions
         print("Running!")
-        multiprocessing.multiprocess(
-            fn=self.apply_elasticities,
-            kwargs=kwarg_list,
-            pbar_kwargs=pbar_kwargs,
-            process_count=process_count,
+        try:
+            multiprocessing.multiprocess(
+                fn=self.apply_elasticities,
+                kwargs=kwarg_list,
+                pbar_kwargs=pbar_kwargs,
+                process_count=process_count,
+            )
+        finally:
+            input_cache.unlink()
+
+    def build_input_cache(self,
+                          purposes: List[str],
+                          constraint_names: List[str],
+                          ) -> ElasticityInputCache:
+        """Reads the inputs shared by all segments into an `ElasticityInputCache`.
+
+        Parameters
+        ----------
+        purposes:
+            The purposes to read the base costs for.
+
+        constraint_names:
+            The names of the constraint matrices to read.
+
+        Returns
+        -------
+        input_cache:
+            The cache of elasticities, constraint matrices and base costs.
+            Call `unlink()` once all segments have been run.
+        """
+        elasticities = eu.read_elasticity_file(
+            self.import_home / self._elasticities_filename
+        )
+        constraint_mats = eu.get_constraint_mats(
+            self.import_home / self._constraints_folder,
+            constraint_names,
+        )
+
+        costs = dict()
+        lookups = dict()
+        for m, zone in ec.MODE_ZONE_SYSTEM.items():
+            for p in purposes:
+                fname = self._base_costs_fname.format(mode=m, purpose=p)
+                costs[(m, str(p), zone)] = gc.read_costs(self.cost_dirs[m] / fname, m)
+
+            if zone != ec.COMMON_ZONE_SYSTEM and zone not in lookups:
+                lookups[zone] = du.get_zone_translation(
+                    import_dir=self.zone_translation_folder,
+                    from_zone=zone,
+                    to_zone=ec.COMMON_ZONE_SYSTEM,
+                    return_dataframe=True,
+                )
+
+        return ElasticityInputCache.from_data(
+            elasticities=elasticities,
+            constraint_matrices=constraint_mats,
+            costs=costs,
+            translation_lookups=lookups,
         )
 
     def apply_all(self):
@@ -325,6 +555,7 @@ class ElasticityModel:
                            cost_changes: pd.DataFrame,
                            future_year: int,
                            fname_suffix: str = None,
+                           input_cache: ElasticityInputCache = None,
                            ) -> Dict[str, pd.DataFrame]:
         """Performs elasticity calculation for a single EFS segment.
 
@@ -382,16 +613,22 @@ class ElasticityModel:
             An optional suffix to add onto the filename when searching for
             the demand to read in.
 
+        input_cache:
+            Elasticities, constraint matrices and base costs shared by
+            all segments, see `build_input_cache`. If None, they are
+            read from file.
+
         Returns
         -------
         Dict[str, pd.DataFrame]
             The adjusted demand for all modes.
         """
         # Init
-        elasticities = eu.read_elasticity_file(
-            self.import_home / self._elasticities_filename,
-            **elasticity_params,
-        )
+        if input_cache is None:
+            elasticities = self.import_home / self._elasticities_filename
+        else:
+            elasticities = input_cache.elasticities
+        elasticities = eu.read_elasticity_file(elasticities, **elasticity_params)
 
         # ## CHECK THE ELASTICITIES WE WANT EXIST ## #
         to_use = cost_changes["e_type"].unique()
@@ -405,9 +642,12 @@ class ElasticityModel:
             )
 
         # ## LOAD IN THE CONSTRAINT MATRICES ## #
-        path = self.import_home / self._constraints_folder
         needed_mats = cost_changes["adj_type"].unique().tolist()
-        constraint_mats = eu.get_constraint_mats(path, needed_mats)
+        if input_cache is None:
+            path = self.import_home / self._constraints_folder
+            constraint_mats = eu.get_constraint_mats(path, needed_mats)
+        else:
+            constraint_mats = input_cache.get_constraint_mats(needed_mats)
 
         # ## LOAD IN DEMAND FOR THIS SEGMENT ## #
         # common format and retain the translations to get back to original formats
@@ -425,44 +665,26 @@ class ElasticityModel:
         }
         base_costs = self._get_costs(
             purpose=demand_params["purpose"],
-            translation_weights=translation_weights
+            translation_weights=translation_weights,
+            input_cache=input_cache,
         )
         del car_original_mat
 
         # GC for each mode in the base year - all adjustments based from this
         base_year_gc = gc.calculate_gen_costs(base_costs, base_year_gc_params)
 
-        # Loop setup
-        cols = [
-            "mode",
-            "cost_component",
-            "e_type",
-            "adj_type",
-            "change",
-        ]
-        iterator = cost_changes[cols].itertuples(index=False, name=None)
-        demand_adjustment = defaultdict(list)
-
-        # Loop through cost changes file and calculate demand adjustment
-        for mode, cost, elast_type, cstr_name, change in iterator:
-            adj_dem = calculate_own_cost_adjustment(
-                demand=base_demand,
-                base_costs=base_costs,
-                base_year_gc=base_year_gc,
-                elasticities=elasticities[elasticities["type"] == elast_type],
-                changing_mode=mode,
-                changing_cost=cost,
-                elasticity_type=elast_type,
-                cost_constraint=constraint_mats[cstr_name],
-                cost_change=change,
-                future_scalar_costs=future_gc_params,
-                base_year=self.base_year,
-                future_year=future_year,
-            )
-
-            # Store all our demand by affected mode
-            for mode in adj_dem.keys():
-                demand_adjustment[mode].append(adj_dem[mode])
+        # Calculate the demand adjustments for all cost changes at once
+        engine = elasticity_engine.ElasticityEngine(
+            demand=base_demand,
+            base_costs=base_costs,
+            base_year_gc=base_year_gc,
+            future_gc_params=future_gc_params,
+        )
+        demand_adjustment = engine.adjust_demand(
+            cost_changes=cost_changes,
+            elasticities=elasticities,
+            constraint_mats=constraint_mats,
+        )
 
         # Multiply base demand by adjustments for rail and car and convert to dataframe
         adjusted_demand = dict()
@@ -475,8 +697,7 @@ class ElasticityModel:
                 )
 
             # Adjust our base demand
-            full_adjustment = np.prod(demand_adjustment[mode], axis=0)
-            adjusted_demand[mode] = base_vals * full_adjustment
+            adjusted_demand[mode] = base_vals * demand_adjustment[mode]
 
         # Split rail demand back into CA/NCA
         for nm, df in rail_ca_split_factors.items():
@@ -718,6 +939,7 @@ class ElasticityModel:
     def _get_costs(self,
                    purpose: int,
                    translation_weights: Dict[str, pd.DataFrame],
+                   input_cache: ElasticityInputCache = None,
                    ) -> Dict[str, pd.DataFrame]:
         """Read the cost files for each mode in `ec.MODE_ZONE_SYSTEM`.
 
@@ -732,6 +954,11 @@ class ElasticityModel:
         translation_weights : Dict[str, pd.DataFrame]
             Weights for zone translation.
 
+        input_cache : ElasticityInputCache, optional
+            Cache to get the base costs from, instead of reading them.
+            Costs are still translated here as the weights are
+            specific to each segment.
+
         Returns
         -------
         Dict[str, pd.DataFrame]
@@ -739,6 +966,17 @@ class ElasticityModel:
         """
         costs = dict()
         for m, zone in ec.MODE_ZONE_SYSTEM.items():
+            if input_cache is not None:
+                costs[m] = input_cache.get_costs(m, purpose, zone)
+                if zone != ec.COMMON_ZONE_SYSTEM:
+                    costs[m] = gc.translate_costs(
+                        costs[m],
+                        zone,
+                        input_cache.translation_lookups[zone],
+                        translation_weights.get(m),
+                    )
+                continue
+
             # Get the path for this mode and purpose
             fname = self._base_costs_fname.format(mode=m, purpose=purpose)
             path = self.cost_dirs[m] / fname
@@ -2,18 +2,20 @@
 """EDGE Replicant process to grow demand."""
 # ## IMPORTS ## #
 # Standard imports
+import dataclasses
 import logging
 import itertools
 import pathlib
 
 # Third party imports
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 # Local imports
 # pylint: disable=import-error,wrong-import-position
 from normits_demand.utils import timing
 from normits_demand.utils import file_ops
+from normits_demand.concurrency import multiprocessing
 from normits_demand.models.forecasting import forecast_cnfg
 from normits_demand.matrices.cube_mat_converter import CUBEMatConverter
 # pylint: enable=import-error,wrong-import-position
@@ -21,696 +23,595 @@ from normits_demand.matrices.cube_mat_converter import CUBEMatConverter
 # ## CONSTANTS ## #
 LOG = logging.getLogger(__name__)
 
-# ## CLASSES ## #
-
-# ## FUNCTIONS ## #
-
-
-def add_tlc2stations_matrix(mx_df: pd.DataFrame, stn_tlc: pd.DataFrame) -> pd.DataFrame:
-    """Add station TLCs to the stations matrix.
-
-    Parameters
-    ----------
-    mx_df : pd.DataFrame
-        stn 2 stn matrix dataframe.
-    stn_tlc : pd.DataFrame
-        station zone ID to TLC lookup.
-
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        matrix with TLCs.
-
-    """
-    # add TLCs
-    mx_df = mx_df.merge(
-        stn_tlc, how="left", left_on=["from_stn_zone_id"], right_on=["stn_zone_id"]
-    )
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "to_stn_zone_id",
-            "userclass",
-            "Distance",
-            "Demand",
-            "STATIONCODE",
-            "STATIONNAME",
-        ]
-    ]
-    # rename column
-    mx_df = mx_df.rename(columns={"STATIONCODE": "O_TLC", "STATIONNAME": "O_StnName"})
-    # add TLCs
-    mx_df = mx_df.merge(
-        stn_tlc, how="left", left_on=["to_stn_zone_id"], right_on=["stn_zone_id"]
-    )
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "O_TLC",
-            "O_StnName",
-            "to_stn_zone_id",
-            "STATIONCODE",
-            "STATIONNAME",
-            "userclass",
-            "Distance",
-            "Demand",
-        ]
-    ]
-    # rename column
-    mx_df = mx_df.rename(columns={"STATIONCODE": "D_TLC", "STATIONNAME": "D_StnName"})
-
-    return mx_df
-
-
-def prepare_stn2stn_matrix(
-    demand_mx: pd.DataFrame,
-    irsj_props: pd.DataFrame,
-    dist_mx: pd.DataFrame,
-    stn_tlc: pd.DataFrame,
-    to_home: bool = False,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Prepare stn 2 stn matrix with TLCs and distances from ij matrix.
-
-    Parameters
-    ----------
-    demand_mx : pd.DataFrame
-        demand matrix dataframe
-    irsj_props : pd.DataFrame
-        iRSj split probabilities dataframe
-    dist_mx : pd.DataFrame
-        stn2stn distance matrix
-    stn_tlc : pd.DataFrame
-        station zone id to TLC lookup dataframe
-    to_home : bool
-        True if the demand is a ToHome demand
-
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        demand matrix with added attributes of Distances and TLCs
-    unassigned_demand : pd.DataFrame
-        demand movements that are not assigned
-
-    """
-    # if ToHome demand then transpose matrix
-    if to_home:
-        demand_mx = transpose_matrix(demand_mx)
-    # merge demand matrix to iRSj probabilities
-    mx_df = demand_mx.merge(
-        irsj_props,
-        how="outer",
-        on=["from_model_zone_id", "to_model_zone_id", "userclass"],
-        indicator=True,
-    )
-    # get unassigned demand
-    unassigned_demand = mx_df.loc[mx_df["_merge"] == "left_only"]
-    # keep needed columns
-    unassigned_demand = unassigned_demand[["from_model_zone_id", "to_model_zone_id", "Demand"]]
-    # keep only assigned demand in the matrix to carry forward to growth
-    mx_df = mx_df.loc[mx_df["_merge"] == "both"]
-    # drop _merge column
-    mx_df = mx_df.drop(["_merge"], axis=1)
-    # calculate movement demand proportion
-    mx_df.loc[:, "Demand"] = mx_df["Demand"] * mx_df["proportion"]
-    # group by stn2stn
-    mx_df = (
-        mx_df.groupby(
-            [
-                "from_model_zone_id",
-                "to_model_zone_id",
-                "from_stn_zone_id",
-                "to_stn_zone_id",
-                "userclass",
-            ]
-        )["Demand"]
-        .sum()
-        .reset_index()
-    )
-    # remove records of zero stations
-    mx_df = mx_df.loc[mx_df["from_stn_zone_id"] != 0].reset_index()
-    # add distance matrix to get stn2stn distance
-    mx_df = mx_df.merge(dist_mx, how="left", on=["from_stn_zone_id", "to_stn_zone_id"])
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "to_stn_zone_id",
-            "userclass",
-            "tran_distance",
-            "Demand",
-        ]
-    ]
-    # rename column
-    mx_df = mx_df.rename(columns={"tran_distance": "Distance"})
-    # add TLCs
-    mx_df = add_tlc2stations_matrix(mx_df, stn_tlc)
-
-    return mx_df, unassigned_demand
-
-
-def assign_edge_flow(
-    flows_file: pd.DataFrame, flows_lookup: pd.DataFrame, mx_df: pd.DataFrame
-) -> pd.DataFrame:
-    """Assign EDGE flow to each stn2stn movement.
-
-    Parameters
-    ----------
-    flows_file : pd.DataFrame
-        EDGE flows lookup dataframe
-    flows_lookup: pd.DataFrame
-        lookup dataframe between EDGE flows and TAG non-distance flows
-    mx_df : pd.DataFrame
-        stn2stn matrix to assign flows to
-
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        demand matrix with added EDGE flows
-    """
-    # rename column
-    edge_flows = flows_file.rename(
-        columns={"FromCaseZoneID": "O_TLC", "ToCaseZoneID": "D_TLC"}
-    )
-    # keep needed columns
-    edge_flows = edge_flows[["O_TLC", "D_TLC", "FlowCatID", "FlowCatName"]]
-    # merge to matrix
-    mx_df = mx_df.merge(edge_flows, how="left", on=["O_TLC", "D_TLC"])
-    # add TAG flows
-    mx_df = mx_df.merge(flows_lookup, how="left", on=["FlowCatName"])
-
-    return mx_df
-
-
-def assign_purposes(mx_df: pd.DataFrame) -> pd.DataFrame:
-    """Assign Journey Purpose based on userclass.
-
-    Add purpose category to a dataframe based on userclass as below:
-        1-3: EB
-        4-6: Com
-        7-9: Oth
-
-    Parameters
-    ----------
-    mx_df : pd.DataFrame
-        dataframe with userclass info to add purpose info to
+PERIODS = ("AM", "IP", "PM", "OP")
+TICKET_TYPES = ("F", "R", "S")
+
+# TAG flows split by distance (miles)
+#   (non-distance TAG flow, distance from, distance to, TAG flow)
+TAG_DISTANCE_FLOWS = (
+    ("Outside South East", -np.inf, 25, "Outside South East <25 miles"),
+    ("Outside South East", 25, 100, "Outside South East 25 to 100 miles"),
+    ("Outside South East", 100, np.inf, "Outside South East  100 + miles - adjusted"),
+    (
+        "Outside South East to/from London",
+        -np.inf,
+        100,
+        "Outside South East to/from London < 100 miles",
+    ),
+    (
+        "Outside South East to/from London",
+        100,
+        np.inf,
+        "Outside South East to/from London 100 + miles",
+    ),
+)
 
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        dataframe with added userclass info
-    """
-    # assign journey purpose to userclasses
-    userclass_lookup = {
-        **dict.fromkeys((1, 2, 3), "Business"),
-        **dict.fromkeys((4, 5, 6), "Commuting"),
-        **dict.fromkeys((7, 8, 9), "Leisure"),
-    }
-    mx_df.loc[:, "Purpose"] = mx_df["userclass"].replace(userclass_lookup)
-
-    return mx_df
-
-
-def add_distance_band_tag_flow(mx_df: pd.DataFrame) -> pd.DataFrame:
-    """Add TAGs distance band based on distance.
+# ## CLASSES ## #
+@dataclasses.dataclass
+class EDGEPeriodResults:
+    """Grown demand, and reporting, for all demand segments in a time period.
 
-    Parameters
+    Attributes
     ----------
-    mx_df : pd.DataFrame
-        prepared matrix with flows
-
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        dataframe with added new TAG flow
+    period : str
+        time period the results are for
+    matrices : dict[str, pd.DataFrame]
+        grown zone2zone demand matrix for each demand segment
+    growth_summary : pd.DataFrame
+        base and grown demand totals for each demand segment
+    stn2stn_report : pd.DataFrame
+        stn2stn level base and grown demand for each demand segment
+    other_tickets : pd.DataFrame
+        movements where factors of other ticket types were used
+    no_factors : pd.DataFrame
+        movements with no factor at all
+    filled_factors : pd.DataFrame
+        factors filled in from other ticket types
+    demand_total : float
+        sum of all input demand
     """
-    # set new flow to match the non-distance flow to begin with
-    mx_df.loc[:, "TAG_Flow"] = mx_df["TAG_NonDist"]
-    # Outside South East
-    mx_df.loc[
-        (mx_df["TAG_NonDist"] == "Outside South East") & (mx_df["Distance"] < 25), "TAG_Flow"
-    ] = "Outside South East <25 miles"
-    mx_df.loc[
-        (mx_df["TAG_NonDist"] == "Outside South East")
-        & (mx_df["Distance"] >= 25)
-        & (mx_df["Distance"] < 100),
-        "TAG_Flow",
-    ] = "Outside South East 25 to 100 miles"
-    mx_df.loc[
-        (mx_df["TAG_NonDist"] == "Outside South East") & (mx_df["Distance"] >= 100), "TAG_Flow"
-    ] = "Outside South East  100 + miles - adjusted"
-    # Outside South East to/from London
-    mx_df.loc[
-        (mx_df["TAG_NonDist"] == "Outside South East to/from London")
-        & (mx_df["Distance"] < 100),
-        "TAG_Flow",
-    ] = "Outside South East to/from London < 100 miles"
-    mx_df.loc[
-        (mx_df["TAG_NonDist"] == "Outside South East to/from London")
-        & (mx_df["Distance"] >= 100),
-        "TAG_Flow",
-    ] = "Outside South East to/from London 100 + miles"
-
-    return mx_df
-
-
-def apply_ticket_splits(mx_df: pd.DataFrame) -> pd.DataFrame:
-    """Split demand by ticket type.
-
-    Parameters
-    ----------
-    mx_df : pd.DataFrame
-        prepared demand matrix with ticket split proportions
 
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        demand matrix by flow, ticket type and purpose
+    period: str
+    matrices: dict[str, pd.DataFrame]
+    growth_summary: pd.DataFrame
+    stn2stn_report: pd.DataFrame
+    other_tickets: pd.DataFrame
+    no_factors: pd.DataFrame
+    filled_factors: pd.DataFrame
+    demand_total: float
+
+
+class EDGEGrowthEngine:
+    """Apply EDGE growth factors to all demand segments of a time period at once.
+
+    Stations, EDGE flows, ticket types and purposes are coded as integers
+    once, when the engine is built for a forecast year. The growth for all
+    demand segments of a time period is then applied with array lookups,
+    rather than merging the flows, ticket splits and factors for each
+    segment.
+
+    Factors for movements missing a ticket type in EDGE are filled in from
+    the first ticket type given in EDGE for the same movement and purpose.
+    All missing factors are filled in before any growth is applied, so the
+    factors used don't depend on the order of the demand segments.
     """
-    # re-balance proportion to adjust any possible loss due to precision
-    for c in ("F", "R", "S"):
-        mx_df.loc[:, c + "_Adj"] = mx_df[c] / (mx_df["F"] + mx_df["R"] + mx_df["S"])
-
-    # apply split proportions by ticket type
-    for c in ("F", "R", "S"):
-        mx_df.loc[:, c] = mx_df[c + "_Adj"] * mx_df["Demand"]
 
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "O_TLC",
-            "to_stn_zone_id",
-            "D_TLC",
-            "userclass",
-            "Purpose",
-            "F",
-            "R",
-            "S",
+    def __init__(
+        self,
+        forecast_year: int,
+        demand_segments: pd.DataFrame,
+        ticket_type_splits: pd.DataFrame,
+        flow_cats: pd.DataFrame,
+        norms_to_edge_stns: pd.DataFrame,
+        edge_flows: pd.DataFrame,
+        edge_growth_factors: pd.DataFrame,
+        internal_zone_limit: int = 1157,
+    ) -> None:
+        """Build the integer lookups for a forecast year.
+
+        Parameters
+        ----------
+        forecast_year : int
+            forecast year the growth factors are for
+        demand_segments : pd.DataFrame
+            demand segments to grow, with their userclass, purpose
+            and growth method
+        ticket_type_splits : pd.DataFrame
+            ticket type split proportions by TAG flow and purpose
+        flow_cats : pd.DataFrame
+            lookup between EDGE flows and TAG non-distance flows
+        norms_to_edge_stns : pd.DataFrame
+            station zone ID to TLC lookup
+        edge_flows : pd.DataFrame
+            EDGE flows lookup
+        edge_growth_factors : pd.DataFrame
+            EDGE growth factors by flow, ticket type and purpose
+        internal_zone_limit : int
+            last zone in the internal range of zones
+        """
+        self.forecast_year = forecast_year
+        self.internal_zone_limit = internal_zone_limit
+
+        # demand segment details, by segment position
+        self.segments = demand_segments["Segment"].to_numpy()
+        self._userclasses = demand_segments["Userclass"].to_numpy()
+        self._to_home = demand_segments["ToHome"].to_numpy().astype(bool)
+        self._growth_methods = demand_segments["Growth_Method"].to_numpy()
+
+        # code stations, and station zones to their station
+        stn_tlc = norms_to_edge_stns.drop_duplicates(subset=["stn_zone_id"])
+        self._stations = pd.Index(stn_tlc["STATIONCODE"].unique())
+        self._stn_zones = pd.Index(stn_tlc["stn_zone_id"])
+        self._stn_zone_stations = self._stations.get_indexer(stn_tlc["STATIONCODE"])
+        n_stations = len(self._stations)
+
+        # code purposes
+        self._purposes = pd.Index(
+            pd.concat([demand_segments["Purpose"], ticket_type_splits["Purpose"]]).unique()
+        )
+        self._segment_purposes = self._purposes.get_indexer(demand_segments["Purpose"])
+
+        # code TAG flows, including those split by distance
+        self._tag_flows = pd.Index(
+            pd.concat(
+                [
+                    flow_cats["TAG_NonDist"],
+                    ticket_type_splits["TAG_Flow"],
+                    pd.Series([x[-1] for x in TAG_DISTANCE_FLOWS]),
+                ]
+            )
+            .dropna()
+            .unique()
+        )
+        self._distance_flows = [
+            (self._tag_flows.get_loc(non_dist), lower, upper, self._tag_flows.get_loc(flow))
+            for non_dist, lower, upper, flow in TAG_DISTANCE_FLOWS
+            if non_dist in self._tag_flows
         ]
-    ]
 
-    return mx_df
+        # TAG non-distance flow of each stn2stn movement
+        flows = edge_flows.merge(
+            flow_cats[["FlowCatName", "TAG_NonDist"]], how="left", on=["FlowCatName"]
+        )
+        from_stn = self._stations.get_indexer(flows["FromCaseZoneID"])
+        to_stn = self._stations.get_indexer(flows["ToCaseZoneID"])
+        valid = (from_stn >= 0) & (to_stn >= 0)
+        self._stn_tag_flows = np.full((n_stations, n_stations), -1, dtype=np.int32)
+        self._stn_tag_flows[from_stn[valid], to_stn[valid]] = self._tag_flows.get_indexer(
+            flows.loc[valid, "TAG_NonDist"]
+        )
 
+        # re-balanced ticket splits by TAG flow and purpose
+        splits = ticket_type_splits[list(TICKET_TYPES)].to_numpy(dtype=float)
+        self._ticket_splits = np.full(
+            (len(self._tag_flows), len(self._purposes), len(TICKET_TYPES)), np.nan
+        )
+        self._ticket_splits[
+            self._tag_flows.get_indexer(ticket_type_splits["TAG_Flow"]),
+            self._purposes.get_indexer(ticket_type_splits["Purpose"]),
+        ] = splits / splits.sum(axis=1, keepdims=True)
+
+        # EDGE factors, keyed by purpose, ticket type and movement
+        edge_factors = edge_growth_factors.loc[
+            ~edge_growth_factors["Demand_rate"].isna()
+            & edge_growth_factors["ZoneCodeFrom"].isin(self._stations)
+            & edge_growth_factors["ZoneCodeTo"].isin(self._stations)
+        ]
+        # Flag = 1 if the factor comes directly from EDGE
+        self.edge_factors = edge_factors.assign(Flag=1)[
+            ["ZoneCodeFrom", "ZoneCodeTo", "purpose", "TicketType", "Demand_rate", "Flag"]
+        ]
+        purpose = self._purposes.get_indexer(edge_factors["purpose"])
+        ticket = pd.Index(TICKET_TYPES).get_indexer(edge_factors["TicketType"])
+        from_stn = self._stations.get_indexer(edge_factors["ZoneCodeFrom"])
+        to_stn = self._stations.get_indexer(edge_factors["ZoneCodeTo"])
+        rates = edge_factors["Demand_rate"].to_numpy(dtype=float)
+        valid = (purpose >= 0) & (ticket >= 0)
+        purpose, ticket, from_stn, to_stn, rates = (
+            x[valid] for x in (purpose, ticket, from_stn, to_stn, rates)
+        )
 
-def create_factors_for_missing_moira_movements(
-    to_home: bool,
-    mx_df: pd.DataFrame,
-    edge_factors: pd.DataFrame,
-    other_tickets_df: pd.DataFrame,
-    no_factors_df: pd.DataFrame,
-    internal_zone_limit: int = 1157,
-) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """Produce Factors for missing movements/purposes/ticket types from other movements.
+        self._factor_keys, first = np.unique(
+            self._factor_key(purpose, ticket, from_stn, to_stn), return_index=True
+        )
+        self._factor_rates = rates[first]
 
+        # first available ticket type for each movement and purpose
+        self._fill_keys, first = np.unique(
+            self._movement_key(purpose, from_stn, to_stn), return_index=True
+        )
+        self._fill_rates = rates[first]
+        self._fill_tickets = ticket[first]
+
+    def _movement_key(
+        self, purpose: np.ndarray, from_stn: np.ndarray, to_stn: np.ndarray
+    ) -> np.ndarray:
+        """Integer key for purpose and stn2stn movement."""
+        n_stations = len(self._stations)
+        return (purpose.astype(np.int64) * n_stations + from_stn) * n_stations + to_stn
+
+    def _factor_key(
+        self,
+        purpose: np.ndarray,
+        ticket: np.ndarray,
+        from_stn: np.ndarray,
+        to_stn: np.ndarray,
+    ) -> np.ndarray:
+        """Integer key for purpose, ticket type and stn2stn movement."""
+        purpose_ticket = purpose.astype(np.int64) * len(TICKET_TYPES) + ticket
+        return self._movement_key(purpose_ticket, from_stn, to_stn)
+
+    @staticmethod
+    def _search(sorted_keys: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Find the position of `keys` in `sorted_keys`, and whether they were found."""
+        if len(sorted_keys) == 0:
+            return np.zeros(len(keys), dtype=int), np.zeros(len(keys), dtype=bool)
+        pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        return pos, sorted_keys[pos] == keys
+
+    def lookup_factors(
+        self,
+        purpose: np.ndarray,
+        ticket: int,
+        from_stn: np.ndarray,
+        to_stn: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Get growth factors for stn2stn movements.
+
+        Parameters
+        ----------
+        purpose : np.ndarray
+            purpose codes of the movements
+        ticket : int
+            position of the ticket type in TICKET_TYPES
+        from_stn : np.ndarray
+            station codes the movements are from, -1 if unknown
+        to_stn : np.ndarray
+            station codes the movements are to, -1 if unknown
+
+        Returns
+        -------
+        rates : np.ndarray
+            growth factors, nan where no factor was found
+        filled_from : np.ndarray
+            position of the ticket type the factor was filled from,
+            -1 where the factor came directly from EDGE or there is no factor
+        """
+        valid = (from_stn >= 0) & (to_stn >= 0)
+        rates = np.full(len(from_stn), np.nan)
+        filled_from = np.full(len(from_stn), -1)
+
+        pos, found = self._search(
+            self._factor_keys, self._factor_key(purpose, ticket, from_stn, to_stn)
+        )
+        found &= valid
+        rates[found] = self._factor_rates[pos[found]]
+
+        pos, fill = self._search(self._fill_keys, self._movement_key(purpose, from_stn, to_stn))
+        fill &= valid & ~found
+        rates[fill] = self._fill_rates[pos[fill]]
+        filled_from[fill] = self._fill_tickets[pos[fill]]
+        return rates, filled_from
+
+    def _station_codes(self, stn_zone_ids: pd.Series) -> np.ndarray:
+        """Get the station code of station zones, -1 if unknown."""
+        pos = self._stn_zones.get_indexer(stn_zone_ids)
+        return np.where(pos >= 0, self._stn_zone_stations[pos], -1)
+
+    def _tag_flow_codes(
+        self, from_stn: np.ndarray, to_stn: np.ndarray, distance: np.ndarray
+    ) -> np.ndarray:
+        """Get the TAG flow code of stn2stn movements, -1 if unknown."""
+        valid = (from_stn >= 0) & (to_stn >= 0)
+        non_dist = np.where(valid, self._stn_tag_flows[from_stn, to_stn], -1)
+        tag_flows = non_dist.copy()
+        for non_dist_code, lower, upper, flow_code in self._distance_flows:
+            in_band = (non_dist == non_dist_code) & (distance >= lower) & (distance < upper)
+            tag_flows[in_band] = flow_code
+        return tag_flows
+
+    def filled_factors_table(self, filled_factors: pd.DataFrame) -> pd.DataFrame:
+        """Add factors filled in from other ticket types to the EDGE factors.
+
+        Parameters
+        ----------
+        filled_factors : pd.DataFrame
+            factors filled in from other ticket types, from EDGEPeriodResults
+
+        Returns
+        -------
+        upd_edge_factors : pd.DataFrame
+            EDGE factors with added records for missing movements/tickets
+        """
+        upd_edge_factors = pd.concat([self.edge_factors, filled_factors], axis=0)
+        return upd_edge_factors.drop_duplicates(
+            subset=["ZoneCodeFrom", "ZoneCodeTo", "purpose", "TicketType"]
+        )
 
-    some movements don't have factors for specific ticket types or purposes given these do not
-    appear in MOIRA, hence this function populate growth factor records for missing
-    movements/ticket types with available ticket types/purposes for the same movement
+    def _empty_results(self, period: str, matrices: dict, demand_total: float):
+        """Results for a time period without any demand to grow."""
+        return EDGEPeriodResults(
+            period=period,
+            matrices=matrices,
+            growth_summary=pd.DataFrame(),
+            stn2stn_report=pd.DataFrame(),
+            other_tickets=pd.DataFrame(),
+            no_factors=pd.DataFrame(),
+            filled_factors=pd.DataFrame(),
+            demand_total=demand_total,
+        )
 
-    Parameters
-    ----------
-    to_home : bool
-        bool to flag whether or not the segment is a ToHome segment
-    mx_df : pd.DataFrame
-        prepared stn2stn matrix by flow, ticket type and purpose
-    edge_factors : pd.DataFrame
-        EDGE growth factors by flow, ticket type and purpose
-    other_tickets_df : pd.DataFrame
-        dataframe to record movements where other ticket types where used to fill
-        for missing ticket types
-    no_factors_df : pd.DataFrame
-        dataframe to record movements where no factor was found at all
-    internal_zone_limit : int
-        last zone in the internal range of zones
-    Returns
-    -------
-    upd_edge_factors : pd.DataFrame
-        updated edge factors dataframe with added records for missing movements/tickets
-    other_tickets_df: pd.DataFrame
-        movements where factor of other tickets was used
-    no_factors_df: pd.DataFrame
-        movements with no factor at all
-    """
-    # keep needed columns
-    edge_factors = edge_factors[
-        ["ZoneCodeFrom", "ZoneCodeTo", "purpose", "TicketType", "Demand_rate", "Flag"]
-    ]
-    # remove records with growth of nan
-    edge_factors = edge_factors[~edge_factors["Demand_rate"].isna()]
-    # copy of factors dataframe
-    upd_edge_factors = edge_factors.copy()
-    # melt Matrix
-    mx_df = pd.melt(
-        mx_df,
-        id_vars=[
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "O_TLC",
-            "to_stn_zone_id",
-            "D_TLC",
-            "userclass",
-            "Purpose",
-        ],
-        value_vars=["F", "R", "S"],
-    )
-    # rename column
-    mx_df = mx_df.rename(
-        columns={
-            "value": "T_Demand",
-            "variable": "TicketType",
-            "O_TLC": "ZoneCodeFrom",
-            "D_TLC": "ZoneCodeTo",
-            "Purpose": "purpose",
-        }
-    )
-    # for ToHome segments, transpose the stations directionality
-    if to_home:
-        # rename column
-        mx_df = mx_df.rename(
-            columns={
-                "ZoneCodeFrom": "ZoneCodeTo",
-                "ZoneCodeTo": "ZoneCodeFrom",
-            }
+    def grow_period(self, period: str, matrices_dir: pathlib.Path) -> EDGEPeriodResults:
+        """Grow the demand of all demand segments for a time period.
+
+        Parameters
+        ----------
+        period : str
+            time period to grow
+        matrices_dir : pathlib.Path
+            folder containing the demand matrices, stn2stn costs and
+            iRSj probabilities for the time period
+
+        Returns
+        -------
+        EDGEPeriodResults
+            grown demand matrices and reporting for the time period
+        """
+        zone_cols = ["from_model_zone_id", "to_model_zone_id"]
+        stn_cols = ["from_stn_zone_id", "to_stn_zone_id"]
+
+        # read distance matrix
+        dist_mx = file_ops.read_df(matrices_dir / f"{period}_stn2stn_costs.csv")
+        # read iRSj props
+        irsj_props = pd.read_hdf(matrices_dir / f"{period}_iRSj_probabilities.h5", key="iRSj")
+
+        # read all demand segments into a single matrix
+        matrices = {}
+        base_totals = np.zeros(len(self.segments))
+        demand_mxs = []
+        for seg_id, segment in enumerate(self.segments):
+            demand_mx = file_ops.read_df(matrices_dir / f"{period}_{segment}.csv")
+            # sum total demand
+            base_totals[seg_id] = round(demand_mx["Demand"].sum())
+            # if demand matrix is zero, move on
+            if base_totals[seg_id] == 0:
+                matrices[segment] = demand_mx.rename(columns={"Demand": f"{period}_Demand"})
+                continue
+            # keep non-zero demand records
+            demand_mx = demand_mx.loc[demand_mx["Demand"] > 0, zone_cols + ["Demand"]]
+            # if ToHome demand then transpose matrix
+            if self._to_home[seg_id]:
+                demand_mx = transpose_matrix(demand_mx)
+            demand_mx["segment_id"] = seg_id
+            demand_mx["userclass"] = self._userclasses[seg_id]
+            demand_mxs.append(demand_mx)
+
+        demand_total = base_totals.sum()
+        if len(demand_mxs) == 0:
+            return self._empty_results(period, matrices, demand_total)
+
+        # merge demand matrix to iRSj probabilities
+        demand = pd.concat(demand_mxs, ignore_index=True).merge(
+            irsj_props, how="left", on=zone_cols + ["userclass"], indicator=True
+        )
+        # get unassigned demand
+        assigned = demand["_merge"] == "both"
+        unassigned = demand.loc[~assigned, ["segment_id"] + zone_cols + ["Demand"]]
+        # calculate stn2stn movement demand
+        demand = demand.loc[assigned]
+        demand = (
+            demand.assign(Demand=demand["Demand"] * demand["proportion"])
+            .groupby(["segment_id"] + zone_cols + stn_cols)["Demand"]
+            .sum()
+            .reset_index()
+        )
+        # remove records of zero stations
+        demand = demand.loc[demand["from_stn_zone_id"] != 0]
+        # add distance matrix to get stn2stn distance
+        demand = demand.merge(
+            dist_mx[stn_cols + ["tran_distance"]], how="left", on=stn_cols
         )
-    # merge factors to matrix
-    mx_df = mx_df.merge(
-        edge_factors, how="left", on=["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"]
-    )
 
-    # get records of movements missing in MOIRA
-    missing_moira = mx_df[mx_df["Demand_rate"].isna()].reset_index(drop=True)
-    # copy with zonal info
-    missing_moira_zonal = missing_moira.copy()
-    # add internal flag
-    missing_moira_zonal["Internal"] = 0
-    missing_moira_zonal.loc[
-        (missing_moira_zonal["from_model_zone_id"] <= internal_zone_limit)
-        & (missing_moira_zonal["to_model_zone_id"] <= internal_zone_limit),
-        "Internal",
-    ] = 1
-
-    # group to stn2stn
-    missing_moira = (
-        missing_moira.groupby(["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"])[
-            "T_Demand"
-        ]
-        .sum()
-        .reset_index()
-    )
+        # code each movement
+        seg_ids = demand["segment_id"].to_numpy()
+        to_home = self._to_home[seg_ids]
+        purpose = self._segment_purposes[seg_ids]
+        from_stn = self._station_codes(demand["from_stn_zone_id"])
+        to_stn = self._station_codes(demand["to_stn_zone_id"])
+        internal = (
+            (demand["from_model_zone_id"].to_numpy() <= self.internal_zone_limit)
+            & (demand["to_model_zone_id"].to_numpy() <= self.internal_zone_limit)
+        ).astype(int)
+
+        # split demand by ticket type
+        tag_flows = self._tag_flow_codes(from_stn, to_stn, demand["tran_distance"].to_numpy())
+        splits = self._ticket_splits[tag_flows, purpose]
+        splits[tag_flows < 0] = np.nan
+        t_demand = splits * demand["Demand"].to_numpy()[:, np.newaxis]
+
+        # factors are checked for missing movements in the direction of travel
+        check_from = np.where(to_home, to_stn, from_stn)
+        check_to = np.where(to_home, from_stn, to_stn)
+
+        rates = np.ones_like(t_demand)
+        other_tickets = []
+        no_factors = []
+        for ticket, ticket_type in enumerate(TICKET_TYPES):
+            forward, forward_filled = self.lookup_factors(purpose, ticket, from_stn, to_stn)
+            back, back_filled = self.lookup_factors(purpose, ticket, to_stn, from_stn)
+
+            # method 1: factors applied on P=O and A=D level
+            method1 = np.where(to_home, back, forward)
+            # method 2: average factor of the two directions
+            both = np.stack([forward, back])
+            n_factors = np.sum(~np.isnan(both), axis=0)
+            method2 = np.divide(
+                np.nansum(both, axis=0),
+                n_factors,
+                out=np.full(len(n_factors), np.nan),
+                where=n_factors > 0,
+            )
+            ticket_rates = np.where(self._growth_methods[seg_ids] == 1, method1, method2)
+            # nan means no factor was found hence no growth
+            rates[:, ticket] = np.where(np.isnan(ticket_rates), 1, ticket_rates)
+
+            # record movements using other tickets, or without any factor
+            filled_from = np.where(to_home, back_filled, forward_filled)
+            filled = filled_from >= 0
+            other_tickets.append(
+                pd.DataFrame(
+                    {
+                        "ZoneCodeFrom": self._stations[check_from[filled]],
+                        "ZoneCodeTo": self._stations[check_to[filled]],
+                        "purpose": self._purposes[purpose[filled]],
+                        "Missing_TicketType": ticket_type,
+                        "Available_TicketType": np.asarray(TICKET_TYPES)[
+                            filled_from[filled]
+                        ],
+                        "Internal": internal[filled],
+                        "Demand_rate": method1[filled],
+                        "T_Demand": t_demand[filled, ticket],
+                    }
+                )
+            )
+            missing = np.isnan(method1) & (check_from >= 0) & (check_to >= 0)
+            no_factors.append(
+                pd.DataFrame(
+                    {
+                        "ZoneCodeFrom": self._stations[check_from[missing]],
+                        "ZoneCodeTo": self._stations[check_to[missing]],
+                        "Internal": internal[missing],
+                        "T_Demand": t_demand[missing, ticket],
+                    }
+                )
+            )
 
-    # merge factors
-    missing_moira = missing_moira.merge(
-        edge_factors, how="left", on=["ZoneCodeFrom", "ZoneCodeTo", "purpose"]
-    )
-    missing_moira_zonal = missing_moira_zonal.merge(
-        edge_factors, how="left", on=["ZoneCodeFrom", "ZoneCodeTo", "purpose"]
-    )
-    # rename column
-    missing_moira = missing_moira.rename(
-        columns={"TicketType_y": "Available_TicketType", "TicketType_x": "Missing_TicketType"}
-    )
-    missing_moira_zonal = missing_moira_zonal.rename(
-        columns={"TicketType_y": "Available_TicketType", "TicketType_x": "Missing_TicketType"}
-    )
-    # keep those that have available records
-    available_ticket = missing_moira[~missing_moira["Available_TicketType"].isna()]
-    # keep one ticket type
-    available_ticket = available_ticket.drop_duplicates(
-        subset=["ZoneCodeFrom", "ZoneCodeTo", "Missing_TicketType", "purpose"]
-    )
-    # keep needed columns
-    available_ticket = available_ticket[
-        [
-            "ZoneCodeFrom",
-            "ZoneCodeTo",
-            "purpose",
-            "Missing_TicketType",
-            "Available_TicketType",
-            "Demand_rate",
-        ]
-    ]
-    # rename columns
-    available_ticket = available_ticket.rename(columns={"Missing_TicketType": "TicketType"})
-    # create flag with '0' indicating it's a populated factor
-    available_ticket["Flag"] = 0
-    # add to EDGE factors
-    upd_edge_factors = pd.concat([upd_edge_factors, available_ticket], axis=0)
-
-    # logging DFs
-    # keep those that have available records
-    available_ticket_log = missing_moira_zonal[
-        ~missing_moira_zonal["Available_TicketType"].isna()
-    ]
-    available_ticket_log = (
-        available_ticket_log.groupby(
+        # apply growth
+        n_demand = t_demand * rates
+
+        other_tickets = pd.concat(other_tickets, ignore_index=True)
+        filled_factors = other_tickets.drop_duplicates(
+            subset=["ZoneCodeFrom", "ZoneCodeTo", "purpose", "Missing_TicketType"]
+        )
+        filled_factors = filled_factors.rename(columns={"Missing_TicketType": "TicketType"})
+        # create flag with '0' indicating it's a populated factor
+        filled_factors = filled_factors.assign(Flag=0)[
             [
                 "ZoneCodeFrom",
                 "ZoneCodeTo",
                 "purpose",
-                "Missing_TicketType",
+                "TicketType",
                 "Available_TicketType",
-                "Internal",
+                "Demand_rate",
+                "Flag",
             ]
-        )["T_Demand"]
-        .sum()
-        .reset_index()
-    )
-    # log these movements to main dataframe
-    other_tickets_df = pd.concat([other_tickets_df, available_ticket_log], axis=0)
-
-    # check missing tickets for current purpose in different purposes
-    missing_ticket = missing_moira_zonal[missing_moira_zonal["Available_TicketType"].isna()]
-    # keep needed columns
-    missing_ticket = (
-        missing_ticket.groupby(["ZoneCodeFrom", "ZoneCodeTo", "Internal"])["T_Demand"]
-        .sum()
-        .reset_index()
-    )
-    # log these movements to main dataframe
-    no_factors_df = pd.concat([no_factors_df, missing_ticket], axis=0)
-
-    return upd_edge_factors, other_tickets_df, no_factors_df
-
-
-def apply_edge_growth_method1(
-    mx_df: pd.DataFrame, edge_factors: pd.DataFrame, to_home: bool = False
-) -> pd.DataFrame:
-    """Grow demand by factoring it by EDGE factors using method 1.
-
-    using method 1 where the factors are applied on P=O and A=D level
-
-    Parameters
-    ----------
-    mx_df : pd.DataFrame
-        prepared stn2stn matrix by flow, ticket type and purpose
-    edge_factors : pd.DataFrame
-        EDGE growth factors by flow, ticket type and purpose
-    to_home : bool
-        True if the matrix is a ToHome matrix
-
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        grown stn2stn demand matrix
-    reporting_df : pd.DataFrame
-        stn2stn level grouped demand or reporting purposes
-    """
-    # melt Matrix
-    mx_df = pd.melt(
-        mx_df,
-        id_vars=[
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "O_TLC",
-            "to_stn_zone_id",
-            "D_TLC",
-            "userclass",
-            "Purpose",
-        ],
-        value_vars=["F", "R", "S"],
-    )
-    # rename column
-    mx_df = mx_df.rename(
-        columns={
-            "value": "T_Demand",
-            "variable": "TicketType",
-            "O_TLC": "ZoneCodeFrom",
-            "D_TLC": "ZoneCodeTo",
-            "Purpose": "purpose",
-        }
-    )
-    # merge new factors file to matrix
-    if to_home:
-        mx_df = mx_df.merge(
-            edge_factors,
-            how="left",
-            left_on=["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"],
-            right_on=["ZoneCodeTo", "ZoneCodeFrom", "TicketType", "purpose"],
+        ]
+        other_tickets = (
+            other_tickets.groupby(
+                [
+                    "ZoneCodeFrom",
+                    "ZoneCodeTo",
+                    "purpose",
+                    "Missing_TicketType",
+                    "Available_TicketType",
+                    "Internal",
+                ]
+            )["T_Demand"]
+            .sum()
+            .reset_index()
+        )
+        no_factors = (
+            pd.concat(no_factors, ignore_index=True)
+            .groupby(["ZoneCodeFrom", "ZoneCodeTo", "Internal"])["T_Demand"]
+            .sum()
+            .reset_index()
         )
 
-        mx_df = mx_df.rename(
-            columns={
-                "ZoneCodeFrom_x": "ZoneCodeFrom",
-                "ZoneCodeTo_x": "ZoneCodeTo",
+        # create reporting dataframe by grouping the demand to stn2stn level
+        n_tickets = len(TICKET_TYPES)
+        stn2stn_report = pd.DataFrame(
+            {
+                "segment_id": np.repeat(seg_ids, n_tickets),
+                "from_stn_zone_id": np.repeat(demand["from_stn_zone_id"].to_numpy(), n_tickets),
+                "to_stn_zone_id": np.repeat(demand["to_stn_zone_id"].to_numpy(), n_tickets),
+                "userclass": np.repeat(self._userclasses[seg_ids], n_tickets),
+                "purpose": np.repeat(self._purposes[purpose], n_tickets),
+                "TicketType": np.tile(TICKET_TYPES, len(seg_ids)),
+                "T_Demand": t_demand.ravel(),
+                "N_Demand": n_demand.ravel(),
             }
         )
-
-    else:
-        mx_df = mx_df.merge(
-            edge_factors,
-            how="left",
-            on=["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"],
+        stn2stn_report = (
+            stn2stn_report.groupby(
+                ["segment_id"] + stn_cols + ["userclass", "purpose", "TicketType"]
+            )[["T_Demand", "N_Demand"]]
+            .sum()
+            .reset_index()
         )
-    # Records with nan means no factor was found hence no growth therefore fill nan with 1
-    mx_df.loc[:, "Demand_rate"] = mx_df["Demand_rate"].fillna(1)
-    # fill nan flag with zero as it doesn't exist in the input EDGE factors
-    mx_df.loc[:, "Flag"] = mx_df["Flag"].fillna(0)
-    # apply growth
-    mx_df.loc[:, "N_Demand"] = mx_df["T_Demand"] * mx_df["Demand_rate"]
-    # create reporting dataframe by grouping the demand to stn2stn level
-    reporting_df = (
-        mx_df.groupby(
-            ["from_stn_zone_id", "to_stn_zone_id", "userclass", "purpose", "TicketType"]
-        )[["T_Demand", "N_Demand"]]
-        .sum()
-        .reset_index()
-    )
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "ZoneCodeFrom",
-            "to_stn_zone_id",
-            "ZoneCodeTo",
-            "userclass",
-            "purpose",
-            "TicketType",
-            "T_Demand",
-            "N_Demand",
-        ]
-    ]
-
-    return mx_df, reporting_df
+        stn2stn_report["Period"] = period
+        stn2stn_report["Segment"] = self.segments[stn2stn_report.pop("segment_id")]
+
+        # move back to zone2zone matrix
+        grown = (
+            demand[["segment_id"] + zone_cols]
+            .assign(N_Demand=np.nansum(n_demand, axis=1))
+            .groupby(["segment_id"] + zone_cols)["N_Demand"]
+            .sum()
+            .reset_index()
+        )
+        grown_totals = grown.groupby("segment_id")["N_Demand"].sum()
+        grown_totals = grown_totals.reindex(range(len(self.segments)), fill_value=0)
 
+        # reinstate unassigned demand
+        grown = unassigned.merge(
+            grown, how="outer", on=["segment_id"] + zone_cols, indicator=True
+        )
+        grown.loc[grown["_merge"] == "left_only", "N_Demand"] = grown["Demand"]
+        grown = grown.rename(columns={"N_Demand": f"{period}_Demand"})
+        grown_mxs = dict(iter(grown.groupby("segment_id")))
 
-def apply_edge_growth_method2(mx_df: pd.DataFrame, edge_factors: pd.DataFrame) -> pd.DataFrame:
-    """Grow demand by factoring it by EDGE factors using method 2.
+        LOG.debug(
+            f"{'Time_Period':>12}{'Demand_Segment':>15}"
+            f"{'Base_Demand':>12}{f'{self.forecast_year}_Demand':>12}"
+        )
+        summary = []
+        for seg_id, segment in enumerate(self.segments):
+            if base_totals[seg_id] == 0:
+                LOG.debug(f"{period:>12}{segment:>15}" f"{0:>12}{0:>12}")
+                continue
+            tot_output_demand = round(grown_totals[seg_id])
+            LOG.debug(
+                f"{period:>12}{segment:>15}"
+                f"{int(base_totals[seg_id]):>12}{tot_output_demand:>12}"
+            )
+            summary.append((period, segment, base_totals[seg_id], tot_output_demand))
+            matrices[segment] = grown_mxs.get(seg_id, grown.iloc[:0])[
+                zone_cols + [f"{period}_Demand"]
+            ].reset_index(drop=True)
 
-    using method 2 where an average factor of the two directions is applied.
+        growth_summary = pd.DataFrame(
+            summary,
+            columns=[
+                "Time_Period",
+                "Demand_Segment",
+                "Base_Demand",
+                f"{self.forecast_year}_Demand",
+            ],
+        )
 
-    Parameters
-    ----------
-    mx_df : pd.DataFrame
-        prepared stn2stn matrix by flow, ticket type and purpose
-    edge_factors : pd.DataFrame
-        EDGE growth factors by flow, ticket type and purpose
+        return EDGEPeriodResults(
+            period=period,
+            matrices={segment: matrices[segment] for segment in self.segments},
+            growth_summary=growth_summary,
+            stn2stn_report=stn2stn_report,
+            other_tickets=other_tickets,
+            no_factors=no_factors,
+            filled_factors=filled_factors,
+            demand_total=demand_total,
+        )
 
-    Returns
-    -------
-    mx_df : pd.DataFrame
-        grown stn2stn demand matrix
-    reporting_df : pd.DataFrame
-        stn2stn level grouped demand or reporting purposes
-    """
-    # melt Matrix
-    mx_df = pd.melt(
-        mx_df,
-        id_vars=[
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "O_TLC",
-            "to_stn_zone_id",
-            "D_TLC",
-            "userclass",
-            "Purpose",
-        ],
-        value_vars=["F", "R", "S"],
-    )
-    # rename column
-    mx_df = mx_df.rename(
-        columns={
-            "value": "T_Demand",
-            "variable": "TicketType",
-            "O_TLC": "ZoneCodeFrom",
-            "D_TLC": "ZoneCodeTo",
-            "Purpose": "purpose",
-        }
-    )
-    # merge new factors file to matrix on first direction O>D
-    mx_df = mx_df.merge(
-        edge_factors, how="left", on=["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"]
-    )
-    # rename growth column to indicate first merge
-    # rename column
-    mx_df = mx_df.rename(columns={"Demand_rate": "1st_Dir_Growth"})
-    # merge new factors file to matrix on second direction O>D
-    mx_df = mx_df.merge(
-        edge_factors,
-        how="left",
-        left_on=["ZoneCodeFrom", "ZoneCodeTo", "TicketType", "purpose"],
-        right_on=["ZoneCodeTo", "ZoneCodeFrom", "TicketType", "purpose"],
-    )
-    # rename growth column to indicate second merge
-    # rename column
-    mx_df = mx_df.rename(
-        columns={
-            "ZoneCodeFrom_x": "ZoneCodeFrom",
-            "ZoneCodeTo_x": "ZoneCodeTo",
-            "Demand_rate": "2nd_Dir_Growth",
-        }
-    )
-    # get average growth for both directions
-    mx_df.loc[:, "Demand_rate"] = mx_df[["1st_Dir_Growth", "2nd_Dir_Growth"]].mean(axis=1)
-    # Records with nan means no factor was found hence no growth therefore fill nan with 1
-    mx_df.loc[:, "Demand_rate"] = mx_df[["Demand_rate"]].fillna(1)
-    # fill nan flag with zero as it doesn't exist in the input EDGE factors
-    mx_df.loc[:, "Flag_x"] = mx_df[["Flag_x"]].fillna(0)
-    mx_df.loc[:, "Flag_y"] = mx_df[["Flag_y"]].fillna(0)
-    mx_df["Flag"] = 0
-    mx_df.loc[(mx_df["Flag_x"] == 1) & (mx_df["Flag_y"] == 1), "Flag"] = 1
-    # apply growth
-    mx_df.loc[:, "N_Demand"] = mx_df["T_Demand"] * mx_df["Demand_rate"]
-    # create reporting dataframe by grouping the demand to stn2stn level
-    reporting_df = (
-        mx_df.groupby(
-            ["from_stn_zone_id", "to_stn_zone_id", "userclass", "purpose", "TicketType"]
-        )[["T_Demand", "N_Demand"]]
-        .sum()
-        .reset_index()
-    )
-    # keep needed columns
-    mx_df = mx_df[
-        [
-            "from_model_zone_id",
-            "to_model_zone_id",
-            "from_stn_zone_id",
-            "ZoneCodeFrom",
-            "to_stn_zone_id",
-            "ZoneCodeTo",
-            "userclass",
-            "purpose",
-            "TicketType",
-            "T_Demand",
-            "N_Demand",
-        ]
-    ]
 
-    return mx_df, reporting_df
+# ## FUNCTIONS ## #
 
 
 def prepare_logging_info(
@@ -1056,44 +957,19 @@ def convert_csv_2_mat(
     )
 
 
-def reintsate_unassigned_demand(
-    unassigned_demand_mx: pd.DataFrame,
-    grown_mx: pd.DataFrame,
-) -> pd.DataFrame:
-    """Reinstate unassigned demand to the grown matrix from the base matrix.
-
-    Parameters
-    ----------
-    unassigned_demand_mx : pd.DataFrame
-        input base matrix movements that are not assigned
-    grown_mx : pd.DataFrame
-        forecasted matrix
+def run_edge_growth(params: forecast_cnfg.EDGEParameters) -> None:
+    """Run Growth Process.
 
-    Returns
-    -------
-    filled_mx : pd.DataFrame
-        grown matrix with reinstated unassigned demand
+    Growth is applied to all demand segments of a time period at once
+    by `EDGEGrowthEngine`, time periods are grown in parallel when
+    `params.process_count` is not 0.
     """
-    # join base matrix to grown matrix
-    filled_mx = unassigned_demand_mx.merge(
-        grown_mx, how="outer", on=["from_model_zone_id", "to_model_zone_id"], indicator=True
-    )
-    # update Demand for un-grown movements
-    filled_mx.loc[filled_mx["_merge"] == "left_only", "N_Demand"] = filled_mx["Demand"]
-    # keep needed columns
-    filled_mx = filled_mx[["from_model_zone_id", "to_model_zone_id", "N_Demand"]]
-
-    return filled_mx
-
-
-def run_edge_growth(params: forecast_cnfg.EDGEParameters) -> None:
-    """Run Growth Process."""
     LOG.info("#" * 80)
     LOG.info("Started Process @ %s", timing.get_datetime())
     LOG.info("#" * 80)
 
     # Process Fixed objects
-    periods = ["AM", "IP", "PM", "OP"]
+    periods = list(PERIODS)
 
     # ## READ INPUT FILES ## #
     # Custom input files
@@ -1121,178 +997,47 @@ def run_edge_growth(params: forecast_cnfg.EDGEParameters) -> None:
         edge_growth_factors = file_ops.read_df(
             params.edge_growth_dir / params.forecast_years[forecast_year]
         )
-        # create list of used stations
-        used_stations = norms_to_edge_stns["STATIONCODE"].to_list()
-        # filter factors file to keep only used stations
-        edge_growth_factors = edge_growth_factors.loc[
-            (edge_growth_factors["ZoneCodeFrom"].isin(used_stations))
-            & (edge_growth_factors["ZoneCodeTo"].isin(used_stations))
-        ]
-        # Add Flag = 1 for all input factors in EDGE
-        #    i.e. Flag = 1 if the factor comes directly from EDGE
-        edge_growth_factors.loc[:, "Flag"] = 1
+        # pre-index stations, flows, ticket types and purposes for the year
+        engine = EDGEGrowthEngine(
+            forecast_year,
+            demand_segments,
+            ticket_type_splits,
+            flow_cats,
+            norms_to_edge_stns,
+            edge_flows_file,
+            edge_growth_factors,
+        )
+
+        # grow all demand segments, optionally with a process per period
+        period_results: list[EDGEPeriodResults] = multiprocessing.multiprocess(
+            fn=engine.grow_period,
+            kwargs=[
+                {"period": period, "matrices_dir": params.matrices_to_grow_dir}
+                for period in periods
+            ],
+            process_count=params.process_count,
+            in_order=True,
+            pbar_kwargs={
+                "desc": "Time Periods Loop ",
+                "unit": " Period",
+                "colour": "cyan",
+            },
+        )
 
         # factored matrices dictionary
-        factored_matrices = {}
+        factored_matrices = {res.period: res.matrices for res in period_results}
         factored_24hr_matrices = {}
-        # empty stn2stn demand reporting dataframe
-        stn2stn_reporting_df = pd.DataFrame()
-
-        # empty DFs for recording missing factors
-        other_tickets_df = pd.DataFrame()
-        no_factors_df = pd.DataFrame()
-        # empty dataframe for growth summary
-        growth_summary = pd.DataFrame(
-            {
-                "Time_Period": [],
-                "Demand_Segment": [],
-                "Base_Demand": [],
-                f"{forecast_year}_Demand": [],
-            }
+        # combine reporting from all periods
+        growth_summary = pd.concat([res.growth_summary for res in period_results], axis=0)
+        stn2stn_reporting_df = pd.concat(
+            [res.stn2stn_report for res in period_results], axis=0
         )
-        # set demand total to 0
-        demand_total = 0
-
-        # loop over periods
-        for period in tqdm(periods, desc="Time Periods Loop ", unit=" Period", colour="cyan"):
-            LOG.info(
-                "-- Processing Time Period %s @ %s",
-                period,
-                timing.get_datetime(),
-            )
-            # read distance matrix
-            dist_mx = file_ops.read_df(
-                params.matrices_to_grow_dir / f"{period}_stn2stn_costs.csv"
-            )
-            # read iRSj props
-            irsj_props = pd.read_hdf(
-                params.matrices_to_grow_dir / f"{period}_iRSj_probabilities.h5", key="iRSj"
-            )
-            # period dictionary
-            factored_matrices[period] = {}
-            LOG.debug(
-                f"{'Time_Period':>12}{'Demand_Segment':>15}"
-                f"{'Base_Demand':>12}{f'{forecast_year}_Demand':>12}"
-            )
-            # loop over demand segments
-            for i, row in tqdm(
-                demand_segments.iterrows(),
-                desc="    Demand Segments Loop ",
-                unit=" Segment",
-                colour="cyan",
-                total=len(demand_segments),
-            ):
-                # get current segment's details
-                segment = row["Segment"]
-                to_home = row["ToHome"]
-                growth_method = row["Growth_Method"]
-                userclass = row["Userclass"]
-                purpose = row["Purpose"]
-
-                # filter probabilities dataframe to the current userclass
-                irsj_props_segment = irsj_props.loc[
-                    irsj_props["userclass"] == userclass
-                ].reset_index(drop=True)
-                # demand matrices
-                demand_mx = file_ops.read_df(
-                    params.matrices_to_grow_dir / f"{period}_{segment}.csv"
-                )
-                # sum total demand
-                tot_input_demand = round(demand_mx["Demand"].sum())
-                # if demand matrix is zero, move on
-                if tot_input_demand == 0:
-                    demand_mx = demand_mx.rename(columns={"Demand": f"{period}_Demand"})
-                    factored_matrices[period][segment] = demand_mx
-                    LOG.debug(f"{period:>12}{segment:>15}" f"{0:>12}{0:>12}")
-                    continue
-                # sum total demand
-                demand_total = demand_total + tot_input_demand
-                # add UCs to demand based on demand segment
-                demand_mx.loc[:, "userclass"] = userclass
-                # keep needed columns
-                demand_mx = demand_mx[
-                    ["from_model_zone_id", "to_model_zone_id", "userclass", "Demand"]
-                ]
-                # keep non-zero demand records
-                demand_mx = demand_mx.loc[demand_mx["Demand"] > 0].reset_index(drop=True)
-                # prepare demand matrix
-                demand_mx, unassigned_demand_mx = prepare_stn2stn_matrix(
-                    demand_mx, irsj_props_segment, dist_mx, norms_to_edge_stns, to_home
-                )
-                # assign EDGE flows
-                demand_mx = assign_edge_flow(edge_flows_file, flow_cats, demand_mx)
-                # add TAG flows
-                demand_mx = add_distance_band_tag_flow(demand_mx)
-                # add purposes to matrix
-                demand_mx.loc[:, "Purpose"] = purpose
-                # add ticket splits props
-                demand_mx = demand_mx.merge(
-                    ticket_type_splits, how="left", on=["TAG_Flow", "Purpose"]
-                )
-                # apply Ticket Splits
-                demand_mx = apply_ticket_splits(demand_mx)
-                # Get factors for missing movements if any
-                (
-                    edge_growth_factors,
-                    other_tickets_df,
-                    no_factors_df,
-                ) = create_factors_for_missing_moira_movements(
-                    to_home, demand_mx, edge_growth_factors, other_tickets_df, no_factors_df
-                )
-                # apply factoring based on demand segment
-                if growth_method == 1:
-                    demand_mx, stn2stn_rep_df = apply_edge_growth_method1(
-                        demand_mx, edge_growth_factors, to_home
-                    )
-                else:
-                    demand_mx, stn2stn_rep_df = apply_edge_growth_method2(
-                        demand_mx, edge_growth_factors
-                    )
-
-                # add id columns to reporting df
-                stn2stn_rep_df["Period"] = period
-                stn2stn_rep_df["Segment"] = segment
-                # append to main reporting dataframe
-                stn2stn_reporting_df = pd.concat(
-                    [stn2stn_reporting_df, stn2stn_rep_df], axis=0
-                )
-                # move back to zone2zone matrix
-                demand_mx = (
-                    demand_mx.groupby(["from_model_zone_id", "to_model_zone_id"])[
-                        ["T_Demand", "N_Demand"]
-                    ]
-                    .sum()
-                    .reset_index()
-                )
-                tot_output_demand = round(demand_mx["N_Demand"].sum())
-                # create logging line
-                LOG.debug(
-                    f"{period:>12}{segment:>15}"
-                    f"{tot_input_demand:>12}{tot_output_demand:>12}"
-                )
-
-                # empty dataframe for growth summary
-                temp_growth_summary = pd.DataFrame(
-                    {
-                        "Time_Period": [period],
-                        "Demand_Segment": [segment],
-                        "Base_Demand": [tot_input_demand],
-                        f"{forecast_year}_Demand": [tot_output_demand],
-                    }
-                )
-                # add growth stats to growth summary df
-                growth_summary = pd.concat([growth_summary, temp_growth_summary], axis=0)
-
-                # reinstate unassigned demand if needed
-                if len(unassigned_demand_mx > 0):
-                    demand_mx = reintsate_unassigned_demand(
-                        unassigned_demand_mx,
-                        demand_mx,
-                    )
-                # rename demand column
-                demand_mx = demand_mx.rename(columns={"N_Demand": f"{period}_Demand"})
-                # store in grown matrices dictionary
-                factored_matrices[period][segment] = demand_mx
+        other_tickets_df = pd.concat([res.other_tickets for res in period_results], axis=0)
+        no_factors_df = pd.concat([res.no_factors for res in period_results], axis=0)
+        edge_growth_factors = engine.filled_factors_table(
+            pd.concat([res.filled_factors for res in period_results], axis=0)
+        )
+        demand_total = sum(res.demand_total for res in period_results)
 
         # get logging stats
         (
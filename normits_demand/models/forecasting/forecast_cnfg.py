@@ -227,6 +227,9 @@ class EDGEParameters(config_base.BaseConfig):
     # EDGE outputs
     edge_growth_dir: Path
 
+    # Number of processes to grow time periods in parallel, 0 to not multiprocess
+    process_count: int = 0
+
     _export_path_fmt: str = pydantic.PrivateAttr(EXPORT_PATH_FORMAT)
 
     @classmethod
@@ -14,8 +14,10 @@ import pandas as pd
 # Local imports
 import normits_demand as nd
 from normits_demand.utils import file_ops, vehicle_occupancy
+from normits_demand import constants as consts
 from normits_demand import logging as nd_log
 from normits_demand import core as nd_core
+from normits_demand.concurrency import communication, multiprocessing
 from normits_demand.distribution import furness
 from normits_demand.models.forecasting.tempro_trip_ends import (
     NTEMForecastError,
@@ -352,10 +354,10 @@ def tempro_growth(
 
 def _trip_end_totals(
     name: str,
-    row_targets: pd.Series,
-    col_targets: pd.Series,
+    row_targets: np.ndarray,
+    col_targets: np.ndarray,
     tolerance: float = 1e-7,
-) -> Dict[str, pd.Series]:
+) -> Dict[str, np.ndarray]:
     """Compare `row_targets` and `col_targets` sum totals and factor if needed.
 
     If the totals for either of the targets differ by more than
@@ -367,16 +369,16 @@ def _trip_end_totals(
     name : str
         Name of the trip end totals being factored,
         used in log messages.
-    row_targets : pd.Series
+    row_targets : np.ndarray
         Target trip ends for the rows.
-    col_targets : pd.Series
+    col_targets : np.ndarray
         Target trip ends for the columns.
     tolerance: float, default 1e-7
         Tolerance allowed when comparing the trip end totals.
 
     Returns
     -------
-    Dict[str, pd.Series]
+    Dict[str, np.ndarray]
         Dictionary containing both targets with
         keys: 'row_targets' and 'col_targets'.
     """
@@ -435,6 +437,109 @@ def _check_matrix(
         LOG.error(err)
 
 
+def _internal_indices(zones: pd.Index, internals: np.ndarray) -> np.ndarray:
+    """Get the positions of the `internals` zones in `zones`.
+
+    Parameters
+    ----------
+    zones : pd.Index
+        Zones of the matrix, in matrix order.
+    internals : np.ndarray
+        Internal zone numbers.
+
+    Returns
+    -------
+    np.ndarray
+        Positions of each internal zone in `zones`,
+        in the same order as `internals`.
+
+    Raises
+    ------
+    NTEMForecastError
+        If any of the `internals` aren't in `zones`.
+    """
+    internal_idx = zones.get_indexer(internals)
+    if (internal_idx < 0).any():
+        missing = np.asarray(internals)[internal_idx < 0]
+        raise NTEMForecastError(
+            f"matrix is missing {len(missing)} internal zones: {missing[:10]}"
+        )
+    return internal_idx
+
+
+def _grow_matrix_values(
+    base: np.ndarray,
+    internal_idx: np.ndarray,
+    row_growth: np.ndarray,
+    col_growth: np.ndarray,
+    segment_name: str,
+) -> np.ndarray:
+    """Grow `base` matrix values based on given growth factors.
+
+    Internal growth is done using a 2D furness and
+    external growth is done by factoring the rows,
+    then the columns, to the targets.
+
+    Parameters
+    ----------
+    base : np.ndarray
+        Trip matrix for base year.
+    internal_idx : np.ndarray
+        Positions of the internal zones in `base`.
+    row_growth : np.ndarray
+        Growth factors for the rows (productions),
+        in the same zone order as `base`.
+    col_growth : np.ndarray
+        Growth factors for the columns (attractions),
+        in the same zone order as `base`.
+    segment_name : str
+        Name of the segment being grown, used in log messages.
+
+    Returns
+    -------
+    np.ndarray
+        Trip matrix grown to match the growth targets.
+    """
+    # Calculate internal-internal target trip ends by
+    # applying growth to matrix trip ends
+    internal_mesh = np.ix_(internal_idx, internal_idx)
+    int_base = base[internal_mesh]
+    int_targets = _trip_end_totals(
+        segment_name,
+        row_targets=int_base.sum(axis=1) * row_growth[internal_idx],
+        col_targets=int_base.sum(axis=0) * col_growth[internal_idx],
+    )
+
+    # Distribute internal demand with 2D furnessing, infill
+    # and normalise seed the same as `furness_pandas_wrapper`
+    seed = np.where(int_base <= 0, 1e-3, int_base)
+    int_future, iters, rms = furness.doubly_constrained_furness(
+        seed_vals=seed / seed.sum(),
+        tol=1e-4,
+        max_iters=3000,
+        **int_targets,
+    )
+    int_future = np.round(int_future, consts.DEFAULT_ROUNDING)
+    LOG.debug(
+        "Furnessed internal trips with %s iterations and RMS = %.1e",
+        iters,
+        rms,
+    )
+
+    # Factor external demand to row and column targets
+    with np.errstate(divide="ignore", invalid="ignore"):
+        future = base * col_growth
+        # Calculate additional growth to meet row growth target
+        row_factor = future.sum(axis=1) / base.sum(axis=1)
+        future *= (row_growth / row_factor)[:, np.newaxis]
+
+    # Zones without any base trips can't be grown
+    future[np.isnan(future)] = 0
+    # Replace internal zones in factored matrix with internal furnessed
+    future[internal_mesh] = int_future
+    return future
+
+
 def grow_matrix(
     matrix: pd.DataFrame,
     output_path: Path,
@@ -471,63 +576,61 @@ def grow_matrix(
         Trip `matrix` grown to match target `attractions`
         and `productions`.
     """
-    # Calculate internal-internal target trip ends by
-    # applying growth to matrix trip ends
-    internals = attractions.zoning_system.internal_zones
-    int_targets = {}
-    growth = {}
-    dvectors = (("row_targets", productions), ("col_targets", attractions))
-    for nm, dvec in dvectors:
-        mat_te = matrix.loc[internals, internals].sum(axis=1 if nm == "row_targets" else 0)
-        mat_te.name = "base_trips"
-        mat_te.index.name = "model_zone_id"
-        growth[nm] = pd.Series(
-            dvec.get_segment_data(segment_name),
-            index=dvec.zoning_system.unique_zones,
-            name="growth",
-        )
-        growth[nm].index.name = "model_zone_id"
-        int_targets[nm] = pd.concat([growth[nm], mat_te], axis=1)
-        int_targets[nm].loc[:, "trips"] = (
-            int_targets[nm]["growth"] * int_targets[nm]["base_trips"]
-        )
-        int_targets[nm] = int_targets[nm].loc[internals, "trips"]
-
-    # Distribute internal demand with 2D furnessing, targets
-    # converted to DataFrames for this function
-    int_targets = _trip_end_totals(segment_name, **int_targets)
-    int_future, iters, rms = furness.furness_pandas_wrapper(
-        matrix.loc[internals, internals],
-        **{nm: data.reset_index() for nm, data in int_targets.items()},
-        tol=1e-4,
-        max_iters=3000,
+    matrix = matrix.sort_index().sort_index(axis=1)
+    internal_idx = _internal_indices(
+        matrix.index, attractions.zoning_system.internal_zones
     )
-    LOG.debug(
-        "Furnessed internal trips with %s iterations and RMS = %.1e",
-        iters,
-        rms,
+    return _grow_and_write_matrix(
+        base=matrix.values,
+        zones=matrix.index,
+        internal_idx=internal_idx,
+        row_growth=_segment_growth(productions, segment_name, matrix.index),
+        col_growth=_segment_growth(attractions, segment_name, matrix.index),
+        output_path=output_path,
+        segment_name=segment_name,
+    )
+
+
+def _segment_growth(
+    dvec: nd_core.DVector, segment_name: str, zones: pd.Index
+) -> np.ndarray:
+    """Get growth factors for `segment_name` in the order of `zones`."""
+    growth = pd.Series(
+        dvec.get_segment_data(segment_name),
+        index=dvec.zoning_system.unique_zones,
     )
-    # Factor external demand to row and column targets, make sure
-    # row and column targets have the same totals
-    ext_future = matrix.mul(growth["col_targets"], axis="columns")
-    # Calculate additional growth to meet row growth target
-    row_growth = ext_future.sum(axis=1) / matrix.sum(axis=1)
-    additional_growth = growth["row_targets"] / row_growth
-    ext_future = ext_future.mul(additional_growth, axis="index")
-    # Set internal zones in factored matrix to 0 and add internal furnessed
-    ext_future.loc[internals, internals] = 0
-    combined_future = pd.concat([int_future, ext_future], axis=0)
-    combined_future = combined_future.groupby(level=0).sum()
-    combined_future.rename(columns={i: int(i) for i in combined_future.columns}, inplace=True)
-    combined_future.sort_index(axis=1, inplace=True)
+    return growth.reindex(zones).values
+
+
+def _grow_and_write_matrix(
+    base: np.ndarray,
+    zones: pd.Index,
+    internal_idx: np.ndarray,
+    row_growth: np.ndarray,
+    col_growth: np.ndarray,
+    output_path: Path,
+    segment_name: str,
+) -> pd.DataFrame:
+    """Grow a single matrix and write it, and its growth comparison, to file.
+
+    See `_grow_matrix_values` for a description of the parameters.
+    """
+    future = _grow_matrix_values(base, internal_idx, row_growth, col_growth, segment_name)
+    combined_future = pd.DataFrame(future, index=zones, columns=zones)
     _check_matrix(combined_future, output_path.stem)
     # Write future to file
     file_ops.write_df(combined_future, output_path)
     LOG.info("Written: %s", output_path)
     _pa_growth_comparison(
-        {"base": matrix, "forecast": combined_future},
-        {"attractions": growth["col_targets"], "productions": growth["row_targets"]},
-        internals,
+        {
+            "base": pd.DataFrame(base, index=zones, columns=zones),
+            "forecast": combined_future,
+        },
+        {
+            "attractions": pd.Series(col_growth, index=zones),
+            "productions": pd.Series(row_growth, index=zones),
+        },
+        zones[internal_idx],
         output_path.with_name(
             file_ops.remove_suffixes(output_path).stem + "-growth_comparison.xlsx"
         ),
@@ -535,6 +638,27 @@ def grow_matrix(
     return combined_future
 
 
+def _grow_and_write_shared_matrix(
+    base: communication.SharedDataFrameInfo, **kwargs
+) -> None:
+    """Attach to a `base` matrix in shared memory, then grow and write it.
+
+    See `_grow_and_write_matrix` for a description of the other parameters.
+    """
+    helper, base_df = communication.attach_shared_dataframe(base)
+    try:
+        _grow_and_write_matrix(base=base_df.values, zones=base_df.index, **kwargs)
+
+    finally:
+        del base_df
+        try:
+            helper.close_shared_array()
+        except BufferError:
+            # Views can outlive us in tracebacks. The memory is
+            # released with the process instead
+            pass
+
+
 def _pa_growth_comparison(
     matrices: Dict[str, pd.DataFrame],
     growth_data: Dict[str, pd.Series],
@@ -642,9 +766,14 @@ def grow_all_matrices(
     matrices: NTEMImportMatrices,
     growth: TEMProTripEnds,
     output_folder: Path,
+    process_count: int = consts.PROCESS_COUNT,
 ) -> None:
     """Grow all base year `matrices` to all forecast years in `trip_ends`.
 
+    Each base year matrix is read in once, and placed in shared
+    memory, then all forecast years for that matrix are grown in
+    parallel.
+
     Parameters
     ----------
     matrices : NTEMImportMatrices
@@ -657,6 +786,10 @@ def grow_all_matrices(
         Name of the model e.g. 'noham'.
     output_folder : Path
         Path to folder for saving the output matrices.
+    process_count : int, default consts.PROCESS_COUNT
+        The number of processes to use when growing the forecast
+        years of each matrix. See `multiprocessing.multiprocess`
+        for full documentation.
 
     Raises
     ------
@@ -686,21 +819,44 @@ def grow_all_matrices(
             LOG.info("Reading base year matrix: %s", path)
             base = file_ops.read_df(path, find_similar=True, index_col=0)
             base.columns = pd.to_numeric(base.columns, downcast="integer")
-            for yr, attr in attractions.items():
-                LOG.info("Growing %s to %s", path.stem, yr)
-                try:
-                    prod = productions[yr]
-                except KeyError as err:
-                    raise NTEMForecastError(
-                        f"production trip ends doesn't contain year {yr}"
-                    ) from err
-                grow_matrix(
-                    base,
-                    output_folder / matrices.output_filename(hb, purp, yr),
-                    f"{purp}_{matrices.mode}",
-                    attr,
-                    prod,
+            base = base.sort_index().sort_index(axis=1)
+            segment_name = f"{purp}_{matrices.mode}"
+
+            # Internal zone lookup only needs doing once for all years
+            zoning_system = next(iter(attractions.values())).zoning_system
+            internal_idx = _internal_indices(base.index, zoning_system.internal_zones)
+
+            # Share the base matrix, rather than copying it to every year
+            base_helper, base_info = communication.dataframe_to_shared_memory(base)
+            try:
+                kwarg_list = []
+                for yr, attr in attractions.items():
+                    try:
+                        prod = productions[yr]
+                    except KeyError as err:
+                        raise NTEMForecastError(
+                            f"production trip ends doesn't contain year {yr}"
+                        ) from err
+                    output_path = output_folder / matrices.output_filename(hb, purp, yr)
+                    kwarg_list.append(
+                        {
+                            "base": base_info,
+                            "internal_idx": internal_idx,
+                            "row_growth": _segment_growth(prod, segment_name, base.index),
+                            "col_growth": _segment_growth(attr, segment_name, base.index),
+                            "output_path": output_path,
+                            "segment_name": segment_name,
+                        }
+                    )
+
+                LOG.info("Growing %s to %s", path.stem, list(attractions.keys()))
+                multiprocessing.multiprocess(
+                    fn=_grow_and_write_shared_matrix,
+                    kwargs=kwarg_list,
+                    process_count=process_count,
                 )
+            finally:
+                base_helper.unlink_shared_array()
 
 
 def convert_to_od(
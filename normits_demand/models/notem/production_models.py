@@ -283,31 +283,37 @@ class HBProductionModel(HBProductionModelPaths):
                 )
 
             # ## SPLIT PURE DEMAND BY MODE AND TIME ## #
+            # Lazy, so the fully segmented productions are only built
+            # if they're being exported
             self._logger.info("Splitting by mode and time")
             fully_segmented = self._split_by_tp_and_mode(pure_demand)
 
-            # ## PRODUCTIONS TOTAL CHECK ## #
-            if not pure_demand.sum_is_close(fully_segmented):
-                msg = (
-                    "The production totals before and after mode time split are not same.\n"
-                    "Expected %f\n"
-                    "Got %f"
-                    % (pure_demand.sum(), fully_segmented.sum())
-                )
-                self._logger.warning(msg)
-                warnings.warn(msg)
-
             # Output productions before any aggregation
             if export_fully_segmented:
+                # Continue from the evaluated productions, rather than
+                # evaluating the split again when aggregating
                 self._logger.info("Exporting fully segmented productions to disk.")
+                fully_segmented = fully_segmented.evaluate()
                 fully_segmented.save(self.export_paths.fully_segmented[year])
+                fully_segmented = fully_segmented.lazy()
 
             # ## AGGREGATE INTO RETURN SEGMENTATION ## #
             return_seg = nd.get_segmentation_level(self._return_segmentation_name)
             productions = fully_segmented.aggregate(
                 out_segmentation=return_seg,
                 split_tfntt_segmentation=True
-            )
+            ).evaluate()
+
+            # ## PRODUCTIONS TOTAL CHECK ## #
+            if not pure_demand.sum_is_close(productions):
+                msg = (
+                    "The production totals before and after mode time split are not same.\n"
+                    "Expected %f\n"
+                    "Got %f"
+                    % (pure_demand.sum(), productions.sum())
+                )
+                self._logger.warning(msg)
+                warnings.warn(msg)
 
             if self.adjustment_factors is not None:
                 self._logger.info("Exporting pre-adjustment notem segmented demand to disk")
@@ -438,7 +444,7 @@ class HBProductionModel(HBProductionModelPaths):
 
     def _split_by_tp_and_mode(self,
                               pure_demand: nd.DVector,
-                              ) -> nd.DVector:
+                              ) -> nd.LazyDVector:
         """
         Applies time period and mode splits to the given pure demand.
 
@@ -450,7 +456,8 @@ class HBProductionModel(HBProductionModelPaths):
         Returns
         -------
         full_segmented_demand:
-            A DVector containing pure_demand split by mode and time.
+            A LazyDVector of pure_demand split by mode and time. Call
+            `evaluate()` to build the DVector.
         """
         # Define the segmentation we want to use
         m_tp_splits_seg = nd.get_segmentation_level('notem_hb_productions_full_tfnat')
@@ -471,10 +478,7 @@ class HBProductionModel(HBProductionModelPaths):
             val_col="split",
         )
 
-        return pure_demand.multiply_and_aggregate(
-            other=mode_time_splits_dvec,
-            out_segmentation=full_seg,
-        )
+        return (pure_demand.lazy() * mode_time_splits_dvec).aggregate(full_seg)
 
     def _trip_end_adjustment(self, trip_ends: nd.DVector) -> nd.DVector:
         """Multiply `trip_ends` by `adjustment_factors`.
@@ -765,35 +769,30 @@ class NHBProductionModel(NHBProductionModelPaths):
                 )
 
             # ## SPLIT NHB PURE DEMAND BY TIME ## #
+            # Lazy, so the fully segmented productions are only built
+            # if they're being exported
             self._logger.info("Splitting by time")
             fully_segmented = self._split_by_tp(pure_nhb_demand)
 
-            # ## PRODUCTIONS TOTAL CHECK ## #
-            if not pure_nhb_demand.sum_is_close(fully_segmented):
-                msg = (
-                    "The NHB production totals before and after time split are not same.\n"
-                    "Expected %f\n"
-                    "Got %f"
-                    % (pure_nhb_demand.sum(), fully_segmented.sum())
-                )
-                self._logger.warning(msg)
-                warnings.warn(msg)
-
             if export_fully_segmented:
+                # Continue from the evaluated demand, rather than
+                # evaluating the split again when renaming
                 self._logger.info("Exporting fully segmented demand to disk")
+                fully_segmented = fully_segmented.evaluate()
                 fully_segmented.save(self.export_paths.fully_segmented[year])
+                fully_segmented = fully_segmented.lazy()
 
             # Renaming
-            notem_segmented = self._rename(fully_segmented)
+            notem_segmented = self._rename(fully_segmented).evaluate()
 
             # ## PRODUCTIONS TOTAL CHECK ## #
-            if not fully_segmented.sum_is_close(notem_segmented):
+            if not pure_nhb_demand.sum_is_close(notem_segmented):
                 msg = (
-                    "The NHB production totals before and after rename to "
-                    "output segmentation are not same.\n"
+                    "The NHB production totals before and after time split and "
+                    "rename to output segmentation are not same.\n"
                     "Expected %f\n"
                     "Got %f"
-                    % (pure_nhb_demand.sum(), fully_segmented.sum())
+                    % (pure_nhb_demand.sum(), notem_segmented.sum())
                 )
                 self._logger.warning(msg)
                 warnings.warn(msg)
@@ -955,7 +954,7 @@ class NHBProductionModel(NHBProductionModelPaths):
 
     def _split_by_tp(self,
                      pure_nhb_demand: nd.DVector,
-                     ) -> nd.DVector:
+                     ) -> nd.LazyDVector:
         """
         Applies time period splits to the given pure nhb demand.
 
@@ -967,7 +966,8 @@ class NHBProductionModel(NHBProductionModelPaths):
         Returns
         -------
         full_segmented_demand:
-            A DVector containing pure_demand split by time.
+            A LazyDVector of pure_demand split by time. Call
+            `evaluate()` to build the DVector.
         """
         # Define the segmentation we want to use
         nhb_time_splits_seg = nd.get_segmentation_level('notem_nhb_tfnat_p_m_tp')
@@ -990,12 +990,9 @@ class NHBProductionModel(NHBProductionModelPaths):
         )
 
         # Multiply together #
-        return pure_nhb_demand.multiply_and_aggregate(
-            other=time_splits_dvec,
-            out_segmentation=full_seg,
-        )
+        return (pure_nhb_demand.lazy() * time_splits_dvec).aggregate(full_seg)
 
-    def _rename(self, full_segmentation: nd.DVector) -> nd.DVector:
+    def _rename(self, full_segmentation: nd.LazyDVector) -> nd.LazyDVector:
         """
         Renames nhb_p and nhb_m as m and p respectively in full segmentation
 
@@ -1007,7 +1004,8 @@ class NHBProductionModel(NHBProductionModelPaths):
         Returns
         -------
         notem_segmented:
-            Returns the notem segmented NHB production DVector
+            Returns the notem segmented NHB productions, still to be
+            evaluated.
         """
         nhb_prod_seg = nd.get_segmentation_level(self._return_segmentation_name)
         return full_segmentation.aggregate(nhb_prod_seg)
@@ -121,7 +121,6 @@ class DMArgumentBuilderBase(abc.ABC):
     defined functions/properties to pick up new import files.
     """
 
-    _translation_weight_col = 'weight'
     _external_suffix = 'ext'
 
     # Cache
@@ -152,12 +151,13 @@ class DMArgumentBuilderBase(abc.ABC):
         self.lower_zoning_system = lower_zoning_system
         self.lower_running_zones = lower_running_zones
 
-    def _get_translations(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Get the translations between upper and lower zoning"""
-        return translation.get_long_pop_emp_translations(
+    def _get_translator(self) -> translation.MatrixTranslator:
+        """Get the translator between upper and lower zoning"""
+        return translation.MatrixTranslator.from_zoning_systems(
             from_zoning_system=self.upper_zoning_system,
             to_zoning_system=self.lower_zoning_system,
-            weight_col_name=self._translation_weight_col
+            row_weighting="population",
+            col_weighting="employment",
         )
 
     def _save_external_demand(self,
@@ -256,10 +256,9 @@ class DMArgumentBuilderBase(abc.ABC):
 
         # Don't need any translations if same
         if self.upper_zoning_system != self.lower_zoning_system:
-            pop_trans, emp_trans = self._get_translations()
+            translator = self._get_translator()
         else:
-            pop_trans = None
-            emp_trans = None
+            translator = None
 
         # Convert upper matrices into a efficient dataframes
         eff_df_list = list()
@@ -282,17 +281,8 @@ class DMArgumentBuilderBase(abc.ABC):
             df.columns = df.columns.astype(df.index.dtype)
 
             # Translate to lower zoning
-            if not(pop_trans is None or emp_trans is None):
-                df = translation.pandas_matrix_zone_translation(
-                    matrix=df,
-                    row_translation=pop_trans,
-                    col_translation=emp_trans,
-                    from_zone_col=self.upper_zoning_system.col_name,
-                    to_zone_col=self.lower_zoning_system.col_name,
-                    factors_col=self._translation_weight_col,
-                    from_unique_zones=self.upper_zoning_system.unique_zones,
-                    to_unique_zones=self.lower_zoning_system.unique_zones,
-                )
+            if translator is not None:
+                df = translator.translate_df(df)
 
             # Split into the internal and external demand for lower model
             internal_mask = pd_utils.get_wide_mask(df=df, zones=self.lower_running_zones)
@@ -5,13 +5,34 @@ https://medium.com/better-programming/load-fast-load-big-with-compressed-pickles
 For further research!
 """
 # Builtins
+import io
+import os
 import bz2
+import gzip
+import lzma
+import struct
 import _pickle as cPickle
 import pathlib
+import collections
+import concurrent.futures
 
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Callable
+from typing import Optional
+from typing import NamedTuple
 
 # Third party
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
 
 
 # Local imports
@@ -45,14 +66,239 @@ Out as 56mb
 """
 
 
+# ## CONSTANTS ## #
+# All block compressed files start with this header, followed by the
+# format version and the name of the codec used
+_MAGIC = b"NDCOMP"
+_FORMAT_VERSION = 1
+
+# bz2 files are written without the header, as concatenated bz2 streams,
+# so they can still be read by anything that can read a bz2 file
+_LEGACY_BZ2_MAGIC = b"BZh"
+_BZ2_CODEC = "bz2"
+_BZ2_SUFFIXES = (".bz2", ".pbz2")
+
+# Other codecs use the block format, which needs its own suffix
+BLOCK_COMPRESSION_SUFFIX = ".pblk"
+
+# Codecs to use for block format files when none is given, fastest first
+_BLOCK_CODEC_PREFERENCE = ("zstd", "lz4", "gzip")
+
+# Each compressed block is prefixed with its length
+_BLOCK_LEN = struct.Struct("<Q")
+
+DEFAULT_CODEC = _BZ2_CODEC
+DEFAULT_BLOCK_SIZE = 2 ** 22
+
+
+# ## CODECS ## #
+class Codec(NamedTuple):
+    """Functions to compress and decompress a single block of bytes"""
+    compress: Callable[[bytes, int], bytes]
+    decompress: Callable[[bytes], bytes]
+    default_level: int
+
+
+def _zstd_compress(data: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _zstd_decompress(data: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def _lz4_compress(data: bytes, level: int) -> bytes:
+    return lz4.frame.compress(data, compression_level=level)
+
+
+def _get_codecs() -> Dict[str, Codec]:
+    """Builds a dictionary of all the codecs that are installed"""
+    codecs = {
+        "bz2": Codec(bz2.compress, bz2.decompress, 9),
+        "gzip": Codec(gzip.compress, gzip.decompress, 3),
+        "lzma": Codec(lambda d, level: lzma.compress(d, preset=level), lzma.decompress, 1),
+    }
+
+    # Optional dependencies
+    if zstandard is not None:
+        codecs["zstd"] = Codec(_zstd_compress, _zstd_decompress, 3)
+
+    if lz4 is not None:
+        codecs["lz4"] = Codec(_lz4_compress, lz4.frame.decompress, 0)
+
+    return codecs
+
+
+def available_codecs() -> List[str]:
+    """Returns the names of all the codecs that can be used on this system"""
+    return list(_get_codecs().keys())
+
+
+def default_block_codec() -> str:
+    """Returns the fastest installed codec that uses the block format"""
+    codecs = _get_codecs()
+    return next(name for name in _BLOCK_CODEC_PREFERENCE if name in codecs)
+
+
+def _get_codec(name: str) -> Codec:
+    """Gets the codec called name, raising a helpful error if it's missing"""
+    codecs = _get_codecs()
+    if name not in codecs:
+        raise ValueError(
+            "Codec '%s' is not available. Available codecs: %s. "
+            "'zstd' and 'lz4' need the zstandard and lz4 packages installing."
+            % (name, list(codecs.keys()))
+        )
+    return codecs[name]
+
+
+def _get_thread_count(threads: Optional[int]) -> int:
+    if threads is None:
+        return os.cpu_count() or 1
+    return max(1, threads)
+
+
+# ## BLOCK STREAMS ## #
+class _BlockCompressWriter(io.RawIOBase):
+    """Splits everything written into blocks and compresses them in parallel
+
+    Blocks are written out to fileobj in order, each prefixed with its
+    compressed length unless prefix_lengths is False.
+    """
+
+    def __init__(self,
+                 fileobj: io.RawIOBase,
+                 codec: Codec,
+                 level: int,
+                 executor: concurrent.futures.Executor,
+                 max_pending: int,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 prefix_lengths: bool = True,
+                 ):
+        super().__init__()
+        self._fileobj = fileobj
+        self._codec = codec
+        self._level = level
+        self._executor = executor
+        self._max_pending = max_pending
+        self._block_size = block_size
+        self._prefix_lengths = prefix_lengths
+
+        self._buffer = bytearray()
+        self._pending = collections.deque()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        view = memoryview(b).cast("B")
+        n_bytes = len(view)
+        pos = 0
+
+        # Top up any partial block first
+        if len(self._buffer) > 0:
+            pos = min(n_bytes, self._block_size - len(self._buffer))
+            self._buffer += view[:pos]
+            if len(self._buffer) < self._block_size:
+                return n_bytes
+            self._submit(bytes(self._buffer))
+            self._buffer = bytearray()
+
+        # Submit whole blocks straight from the given data
+        while n_bytes - pos >= self._block_size:
+            self._submit(bytes(view[pos:pos + self._block_size]))
+            pos += self._block_size
+
+        self._buffer += view[pos:]
+        return n_bytes
+
+    def _submit(self, block: bytes) -> None:
+        future = self._executor.submit(self._codec.compress, block, self._level)
+        self._pending.append(future)
+        while len(self._pending) > self._max_pending:
+            self._write_next()
+
+    def _write_next(self) -> None:
+        data = self._pending.popleft().result()
+        if self._prefix_lengths:
+            self._fileobj.write(_BLOCK_LEN.pack(len(data)))
+        self._fileobj.write(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            if len(self._buffer) > 0:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+
+            while len(self._pending) > 0:
+                self._write_next()
+        super().close()
+
+
+class _BlockDecompressReader(io.RawIOBase):
+    """Reads compressed blocks from fileobj, decompressing ahead in parallel"""
+
+    def __init__(self,
+                 fileobj: io.RawIOBase,
+                 codec: Codec,
+                 executor: concurrent.futures.Executor,
+                 max_pending: int,
+                 ):
+        super().__init__()
+        self._fileobj = fileobj
+        self._codec = codec
+        self._executor = executor
+        self._max_pending = max_pending
+
+        self._pending = collections.deque()
+        self._current = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _fill(self) -> None:
+        while not self._eof and len(self._pending) < self._max_pending:
+            header = self._fileobj.read(_BLOCK_LEN.size)
+            if len(header) < _BLOCK_LEN.size:
+                self._eof = True
+                break
+
+            data = self._fileobj.read(_BLOCK_LEN.unpack(header)[0])
+            self._pending.append(self._executor.submit(self._codec.decompress, data))
+
+    def readinto(self, b) -> int:
+        if len(self._current) == 0:
+            self._fill()
+            if len(self._pending) == 0:
+                return 0
+            self._current = memoryview(self._pending.popleft().result())
+
+        n_bytes = min(len(b), len(self._current))
+        b[:n_bytes] = self._current[:n_bytes]
+        self._current = self._current[n_bytes:]
+        return n_bytes
+
+
+# ## FUNCTIONS ## #
 def write_out(o: Any,
               path: nd.PathLike,
-              overwrite_suffix: bool = True
+              overwrite_suffix: bool = True,
+              codec: str = DEFAULT_CODEC,
+              level: Optional[int] = None,
+              threads: Optional[int] = None,
               ) -> pathlib.Path:
     """
     Write the given object o to disk at the given out_path
 
-    The written object will be compressed on write out.
+    The written object will be compressed on write out. The object is
+    pickled, split into blocks, and the blocks compressed in parallel.
+
+    With the default bz2 codec the blocks are written as concatenated bz2
+    streams, so the file can be read by `bz2.BZ2File` and older releases.
+    Any other codec uses the block format, with a header so the codec can
+    be detected by `read_in()`, and must be written to a
+    `BLOCK_COMPRESSION_SUFFIX` file.
 
     Parameters
     ----------
@@ -60,41 +306,136 @@ def write_out(o: Any,
         The object to write to disk. Must be serializable.
 
     path:
-        The path to write out to. If no filetype suffix is provided .pbz2
-        is added.
+        The path to write out to. If no filetype suffix is provided the
+        default compression suffix is added for bz2, and
+        `BLOCK_COMPRESSION_SUFFIX` for any other codec.
 
     overwrite_suffix:
         Whether to overwrite the filetype suffix of the given path to the
-        default compression suffix or not.
+        default suffix for codec or not.
+
+    codec:
+        The name of the codec to compress with. Must be one of
+        `available_codecs()`. Defaults to DEFAULT_CODEC.
+
+    level:
+        The compression level to use. If left as None, a default is
+        chosen for each codec that favours speed.
+
+    threads:
+        The number of threads to compress with. If left as None,
+        os.cpu_count() is used.
 
     Returns
     -------
     out_path:
         The output path that o was written to.
+
+    Raises
+    ------
+    ValueError:
+        If codec is not available, or a codec other than bz2 is used to
+        write to a bz2 suffixed path.
     """
     # Init
     if not isinstance(path, pathlib.Path):
         path = pathlib.Path(path)
-    path = file_ops.maybe_add_suffix(path, consts.COMPRESSION_SUFFIX, overwrite_suffix)
 
-    with bz2.BZ2File(path, 'w') as f:
-        cPickle.dump(o, f)
+    codec_fns = _get_codec(codec)
+    is_bz2 = codec == _BZ2_CODEC
+    suffix = consts.COMPRESSION_SUFFIX if is_bz2 else BLOCK_COMPRESSION_SUFFIX
+    path = file_ops.maybe_add_suffix(path, suffix, overwrite_suffix)
+
+    if not is_bz2 and path.suffix in _BZ2_SUFFIXES:
+        raise ValueError(
+            "Cannot write %s using the '%s' codec, only bz2 can be written "
+            "to %s files. Use a '%s' suffix instead."
+            % (path, codec, _BZ2_SUFFIXES, BLOCK_COMPRESSION_SUFFIX)
+        )
+
+    level = codec_fns.default_level if level is None else level
+    threads = _get_thread_count(threads)
+
+    with open(path, 'wb') as f:
+        # Write the header
+        if not is_bz2:
+            header = bytes([_FORMAT_VERSION, len(codec)]) + codec.encode("ascii")
+            f.write(_MAGIC + header)
+
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            writer = _BlockCompressWriter(
+                fileobj=f,
+                codec=codec_fns,
+                level=level,
+                executor=executor,
+                max_pending=threads * 2,
+                block_size=DEFAULT_BLOCK_SIZE,
+                prefix_lengths=not is_bz2,
+            )
+            with writer:
+                cPickle.dump(o, writer, protocol=-1)
 
     return path
 
 
-def read_in(path: nd.PathLike) -> Any:
+def read_in(path: nd.PathLike, threads: Optional[int] = None) -> Any:
     """
     Reads the data at path, decompresses, and returns the object.
 
+    The codec is detected from the file header. bz2 files, including
+    those written before codecs were selectable, are read as a bz2 stream.
+
     Parameters
     ----------
     path:
         The full path to the object to read
 
+    threads:
+        The number of threads to decompress with. If left as None,
+        os.cpu_count() is used. Ignored for bz2 files.
+
     Returns
     -------
     object:
         The object that was read in from disk.
+
+    Raises
+    ------
+    ValueError:
+        If the file at path was not written by `write_out()`, or was
+        written using a codec that isn't available on this system.
     """
-    return cPickle.load(bz2.BZ2File(path, 'rb'))
+    with open(path, 'rb') as f:
+        magic = f.read(len(_MAGIC))
+
+        # bz2 files are one or more concatenated bz2 streams
+        if magic.startswith(_LEGACY_BZ2_MAGIC):
+            f.seek(0)
+            with bz2.BZ2File(f, 'rb') as bz2_file:
+                return cPickle.load(bz2_file)
+
+        if magic != _MAGIC:
+            raise ValueError(
+                "Cannot read %s, it was not written by compress.write_out()"
+                % path
+            )
+
+        version, name_len = f.read(2)
+        if version > _FORMAT_VERSION:
+            raise ValueError(
+                "Cannot read %s, it was written in compression format version "
+                "%s, but only up to version %s is supported."
+                % (path, version, _FORMAT_VERSION)
+            )
+        codec_fns = _get_codec(f.read(name_len).decode("ascii"))
+        threads = _get_thread_count(threads)
+
+        with concurrent.futures.ThreadPoolExecutor(threads) as executor:
+            reader = _BlockDecompressReader(
+                fileobj=f,
+                codec=codec_fns,
+                executor=executor,
+                max_pending=threads * 2,
+            )
+            with io.BufferedReader(reader, buffer_size=DEFAULT_BLOCK_SIZE) as buffered:
+                return cPickle.load(buffered)
@@ -35,6 +35,7 @@ import normits_demand as nd
 from normits_demand import constants as consts
 from normits_demand.concurrency import multiprocessing, multithreading
 from normits_demand.utils import compress
+from normits_demand.utils import matrix_store
 from normits_demand.utils import general as du
 from normits_demand.utils import pandas_utils as pd_utils
 
@@ -43,6 +44,8 @@ from normits_demand.utils.general import list_files
 
 # CONSTANTS
 PD_COMPRESSION = {".zip", ".gzip", ".bz2", ".zstd", ".csv.bz2"}
+MATRIX_STORE_KWARGS = {"complib", "complevel"}
+COMPRESS_KWARGS = {"codec", "level", "threads"}
 
 
 class WriteDfThread(multithreading.ReturnOrErrorThread):
@@ -311,7 +314,7 @@ def read_df(
     find_similar:
         If True and the given file at path cannot be found, files with the
         same name but different extensions will be looked for and read in
-        instead. Will check for: '.csv', '.pbz2'
+        instead. Will check for: '.h5', '.csv', '.pbz2', '.pblk'
 
     Returns
     -------
@@ -326,8 +329,12 @@ def read_df(
         path = find_filename(path)
 
     # Determine how to read in df
-    if pathlib.Path(path).suffix == ".pbz2":
-        df = compress.read_in(path)
+    compressed_suffixes = (".pbz2", compress.BLOCK_COMPRESSION_SUFFIX)
+    if pathlib.Path(path).suffix in compressed_suffixes + (matrix_store.MATRIX_STORE_SUFFIX,):
+        if pathlib.Path(path).suffix in compressed_suffixes:
+            df = compress.read_in(path)
+        else:
+            df = matrix_store.read_matrix_store(path)
 
         # Optionally try and set the index
         if index_col is not None and not is_index_set(df):
@@ -349,7 +356,9 @@ def read_df(
 
     raise ValueError(
         f"Cannot determine the filetype of the given path. "
-        f"Expected either '.csv' or '{consts.COMPRESSION_SUFFIX}'\n"
+        f"Expected either '.csv', '{consts.COMPRESSION_SUFFIX}', "
+        f"'{compress.BLOCK_COMPRESSION_SUFFIX}' or "
+        f"'{matrix_store.MATRIX_STORE_SUFFIX}'\n"
         f"Got path: {path}"
     )
 
@@ -367,7 +376,13 @@ def write_df(df: pd.DataFrame, path: nd.PathLike, **kwargs) -> None:
         The full path to the dataframe to read in
 
     **kwargs:
-        Any arguments to pass to the underlying write function.
+        Any arguments to pass to the underlying write function. When
+        writing a '.h5' matrix store, only `complib` and `complevel` are
+        passed to `matrix_store.write_matrix_store()`, any pandas writing
+        arguments, such as `index`, are ignored. Similarly, only `codec`,
+        `level` and `threads` are passed to `compress.write_out()` when
+        writing a '.pbz2' or '.pblk' file. '.pblk' files are written
+        with `compress.default_block_codec()` if no `codec` is given.
 
     Returns
     -------
@@ -378,8 +393,17 @@ def write_df(df: pd.DataFrame, path: nd.PathLike, **kwargs) -> None:
     path = pathlib.Path(path)
 
     # Determine how to read in df
+    compress_kwargs = {k: v for k, v in kwargs.items() if k in COMPRESS_KWARGS}
     if pathlib.Path(path).suffix == ".pbz2":
-        compress.write_out(df, path)
+        compress.write_out(df, path, **compress_kwargs)
+
+    elif pathlib.Path(path).suffix == compress.BLOCK_COMPRESSION_SUFFIX:
+        compress_kwargs.setdefault("codec", compress.default_block_codec())
+        compress.write_out(df, path, overwrite_suffix=False, **compress_kwargs)
+
+    elif pathlib.Path(path).suffix == matrix_store.MATRIX_STORE_SUFFIX:
+        store_kwargs = {k: v for k, v in kwargs.items() if k in MATRIX_STORE_KWARGS}
+        matrix_store.write_matrix_store(df, path, **store_kwargs)
 
     elif pathlib.Path(path).suffix == ".csv":
         df.to_csv(path, **kwargs)
@@ -390,7 +414,9 @@ def write_df(df: pd.DataFrame, path: nd.PathLike, **kwargs) -> None:
     else:
         raise ValueError(
             f"Cannot determine the filetype of the given path. Expected "
-            f"either '.csv' or '{consts.COMPRESSION_SUFFIX}'"
+            f"either '.csv', '{consts.COMPRESSION_SUFFIX}', "
+            f"'{compress.BLOCK_COMPRESSION_SUFFIX}' or "
+            f"'{matrix_store.MATRIX_STORE_SUFFIX}'"
         )
 
 
@@ -480,7 +506,7 @@ def find_filename(
 
     alt_types:
         A list of alternate filetypes to consider. By default, will be:
-        ['.pbz2', '.csv']
+        ['.h5', '.pbz2', '.pblk', '.csv'] and any pandas compression types.
 
     return_full_path:
         If False, will only return the name of the file, and not the full path
@@ -507,7 +533,12 @@ def find_filename(
         return ret_path.name
 
     if alt_types is None:
-        alt_types = [".pbz2", ".csv"] + list(PD_COMPRESSION)
+        alt_types = [
+            matrix_store.MATRIX_STORE_SUFFIX,
+            ".pbz2",
+            compress.BLOCK_COMPRESSION_SUFFIX,
+            ".csv",
+        ] + list(PD_COMPRESSION)
 
     # Make sure they all start with a dot
     temp_alt_types = list()
@@ -1567,12 +1598,14 @@ def read_matrix(
     find_similar : bool, default False
         If True and the given file at path cannot be found, files with the
         same name but different extensions will be looked for and read in
-        instead. Will check for: '.csv', '.pbz2'
+        instead. Will check for: '.h5', '.csv', '.pbz2', '.pblk'
 
     Returns
     -------
     pd.DataFrame
-        Matrix file in square format with sorted columns and indices
+        Matrix file in square format with sorted columns and indices.
+        Binary matrix stores ('.h5') are read straight in, and are only
+        re-sorted if they weren't written sorted.
 
     Raises
     ------
@@ -1580,6 +1613,12 @@ def read_matrix(
         If the `format` cannot be determined by reading the file
         or an invalid `format` is given.
     """
+    if find_similar and not os.path.exists(path):
+        path = find_filename(path)
+
+    if pathlib.Path(path).suffix == matrix_store.MATRIX_STORE_SUFFIX:
+        return _sort_matrix_zones(matrix_store.read_matrix_store(path))
+
     header = 0
     if format_ is None:
         # Determine format by reading top few lines of file
@@ -1615,6 +1654,14 @@ def read_matrix(
     matrix.columns = pd.to_numeric(matrix.columns, errors="ignore", downcast="integer")
     matrix.index = pd.to_numeric(matrix.index, errors="ignore", downcast="integer")
 
+    return _sort_matrix_zones(matrix)
+
+
+def _sort_matrix_zones(matrix: pd.DataFrame) -> pd.DataFrame:
+    """Sort matrix index and columns, making sure they're the same."""
+    if matrix.index.is_monotonic_increasing and matrix.index.equals(matrix.columns):
+        return matrix
+
     matrix = matrix.sort_index(axis=0).sort_index(axis=1)
     if (matrix.index != matrix.columns).any():
         # Reindex index to match columns then columns to match index
@@ -1622,3 +1669,91 @@ def read_matrix(
         matrix = matrix.reindex(matrix.index, axis=1)
 
     return matrix
+
+
+def convert_to_matrix_store(
+    path: os.PathLike,
+    out_path: Optional[os.PathLike] = None,
+    format_: Optional[str] = None,
+    remove_original: bool = False,
+) -> pathlib.Path:
+    """Convert an existing matrix file into a binary matrix store.
+
+    Parameters
+    ----------
+    path : os.PathLike
+        Path to the matrix to convert, any format `read_matrix` can read.
+    out_path : os.PathLike, optional
+        Path to write the matrix store to, defaults to `path` with
+        all suffixes replaced with '.h5'.
+    format_ : str, optional
+        Format of the matrix at `path`, see `read_matrix`.
+    remove_original : bool, default False
+        If True, `path` is deleted once the matrix store has been
+        written.
+
+    Returns
+    -------
+    pathlib.Path
+        Path to the new matrix store.
+    """
+    path = pathlib.Path(path)
+    if out_path is None:
+        out_path = remove_suffixes(path).with_suffix(matrix_store.MATRIX_STORE_SUFFIX)
+
+    if path.suffix in (".pbz2", compress.BLOCK_COMPRESSION_SUFFIX):
+        # Compressed pickles already hold the index, so no format to detect
+        matrix = _sort_matrix_zones(read_df(path, index_col=0))
+    else:
+        matrix = read_matrix(path, format_=format_)
+
+    out_path = matrix_store.write_matrix_store(matrix, out_path)
+    if remove_original:
+        path.unlink()
+
+    return out_path
+
+
+def convert_folder_to_matrix_store(
+    folder: os.PathLike,
+    suffixes: Optional[list[str]] = None,
+    recursive: bool = False,
+    remove_original: bool = False,
+    process_count: int = consts.PROCESS_COUNT,
+) -> list[pathlib.Path]:
+    """Convert all matrix files in a folder into binary matrix stores.
+
+    Parameters
+    ----------
+    folder : os.PathLike
+        Folder containing the matrices to convert.
+    suffixes : list[str], optional
+        Suffixes of the files to convert, defaults to
+        `consts.VALID_MAT_FTYPES`, '.pbz2' and '.pblk'.
+    recursive : bool, default False
+        Search recursively in sub-folders.
+    remove_original : bool, default False
+        If True, each original file is deleted once it has been
+        converted.
+    process_count : int, default consts.PROCESS_COUNT
+        Number of processes to convert the files with, see
+        `multiprocessing.multiprocess`.
+
+    Returns
+    -------
+    list[pathlib.Path]
+        Paths to all the new matrix stores.
+    """
+    if suffixes is None:
+        suffixes = consts.VALID_MAT_FTYPES + [".pbz2", compress.BLOCK_COMPRESSION_SUFFIX]
+
+    kwarg_list = [
+        {"path": path, "remove_original": remove_original}
+        for path in iterate_files(folder, suffixes=suffixes, recursive=recursive)
+    ]
+
+    return multiprocessing.multiprocess(
+        fn=convert_to_matrix_store,
+        kwargs=kwarg_list,
+        process_count=process_count,
+    )
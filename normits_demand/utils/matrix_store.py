@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing functionality for reading and writing matrices to
+    a binary matrix store.
+
+    The store is a HDF5 file holding the matrix values as a single chunked,
+    lightly compressed array, alongside the zone index metadata. Reading
+    one back is a straight copy of the float array, with no text parsing
+    and no re-sorting of the index.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import os
+import pathlib
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import tables
+
+# Local imports
+from normits_demand import logging as nd_log
+
+##### CONSTANTS #####
+LOG = nd_log.get_logger(__name__)
+
+MATRIX_STORE_SUFFIX = ".h5"
+FORMAT_NAME = "NORMITS_MATRIX"
+FORMAT_VERSION = 1
+
+DEFAULT_COMPLIB = "blosc:lz4"
+DEFAULT_COMPLEVEL = 1
+
+_VALUES_NODE = "values"
+_INDEX_NODE = "index"
+_COLUMNS_NODE = "columns"
+
+
+##### FUNCTIONS #####
+def _index_to_array(index: pd.Index) -> np.ndarray:
+    """Converts a pandas Index into an array that HDF5 can store."""
+    if isinstance(index, pd.MultiIndex):
+        raise ValueError("cannot write a MultiIndex to a matrix store")
+
+    if pd.api.types.is_numeric_dtype(index.dtype):
+        return np.asarray(index)
+
+    # Strings are stored as fixed width UTF-8 bytes
+    return np.char.encode(np.asarray(index.astype(str), dtype=str), "utf-8")
+
+
+def _array_to_index(array: np.ndarray, name: str) -> pd.Index:
+    """Converts an array read from a matrix store back into a pandas Index."""
+    if array.dtype.kind == "S":
+        array = np.char.decode(array, "utf-8").astype(object)
+    return pd.Index(array, name=name)
+
+
+def is_matrix_store(path: os.PathLike) -> bool:
+    """Checks whether the file at `path` is a matrix store.
+
+    Parameters
+    ----------
+    path : os.PathLike
+        Path to the file to check.
+
+    Returns
+    -------
+    bool
+        True if `path` is a HDF5 file written by `write_matrix_store`.
+    """
+    if not tables.is_hdf5_file(path):
+        return False
+
+    with tables.open_file(path, mode="r") as h5_file:
+        return getattr(h5_file.root._v_attrs, "FORMAT", None) == FORMAT_NAME
+
+
+def write_matrix_store(
+    df: pd.DataFrame,
+    path: os.PathLike,
+    complib: str = DEFAULT_COMPLIB,
+    complevel: int = DEFAULT_COMPLEVEL,
+) -> pathlib.Path:
+    """Writes a matrix DataFrame to a binary matrix store at `path`.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Matrix to write, the index and columns are stored as the zone
+        metadata. All columns must be numeric.
+    path : os.PathLike
+        Path to write to, conventionally ending in `MATRIX_STORE_SUFFIX`.
+    complib : str, default DEFAULT_COMPLIB
+        Compression library to use, any library supported by
+        `tables.Filters`.
+    complevel : int, default DEFAULT_COMPLEVEL
+        Compression level from 0 (no compression) to 9.
+
+    Returns
+    -------
+    pathlib.Path
+        Path the matrix was written to.
+
+    Raises
+    ------
+    ValueError
+        If `df` contains non-numeric columns or a MultiIndex.
+    """
+    path = pathlib.Path(path)
+    non_numeric = [c for c, t in df.dtypes.items() if not pd.api.types.is_numeric_dtype(t)]
+    if non_numeric:
+        raise ValueError(
+            f"matrix store can only hold numeric values, found non-numeric "
+            f"columns: {non_numeric}"
+        )
+
+    index = _index_to_array(df.index)
+    columns = _index_to_array(df.columns)
+    filters = tables.Filters(complevel=complevel, complib=complib, shuffle=True)
+
+    with tables.open_file(path, mode="w") as h5_file:
+        h5_file.root._v_attrs.FORMAT = FORMAT_NAME
+        h5_file.root._v_attrs.VERSION = FORMAT_VERSION
+
+        h5_file.create_carray(
+            h5_file.root, _VALUES_NODE, obj=df.to_numpy(), filters=filters
+        )
+        for node_name, array, name in (
+            (_INDEX_NODE, index, df.index.name),
+            (_COLUMNS_NODE, columns, df.columns.name),
+        ):
+            node = h5_file.create_array(h5_file.root, node_name, array)
+            node.attrs.NAME = name
+
+    return path
+
+
+def read_matrix_store(path: os.PathLike) -> pd.DataFrame:
+    """Reads a matrix DataFrame from the binary matrix store at `path`.
+
+    Parameters
+    ----------
+    path : os.PathLike
+        Path to a file written by `write_matrix_store`.
+
+    Returns
+    -------
+    pd.DataFrame
+        The matrix, with the same index and columns it was written with.
+
+    Raises
+    ------
+    ValueError
+        If the file at `path` is not a matrix store.
+    """
+    with tables.open_file(path, mode="r") as h5_file:
+        if getattr(h5_file.root._v_attrs, "FORMAT", None) != FORMAT_NAME:
+            raise ValueError(f"{path} is not a matrix store")
+
+        version = h5_file.root._v_attrs.VERSION
+        if version > FORMAT_VERSION:
+            LOG.warning(
+                "Matrix store %s is version %s, expected %s or lower",
+                path,
+                version,
+                FORMAT_VERSION,
+            )
+
+        values = h5_file.get_node(h5_file.root, _VALUES_NODE).read()
+        index_node = h5_file.get_node(h5_file.root, _INDEX_NODE)
+        columns_node = h5_file.get_node(h5_file.root, _COLUMNS_NODE)
+        index = _array_to_index(index_node.read(), index_node.attrs.NAME)
+        columns = _array_to_index(columns_node.read(), columns_node.attrs.NAME)
+
+    return pd.DataFrame(values, index=index, columns=columns)
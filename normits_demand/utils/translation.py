@@ -10,6 +10,8 @@ Other updates made by:
 File purpose:
 
 """
+from __future__ import annotations
+
 # Built-Ins
 import warnings
 
@@ -21,6 +23,7 @@ from typing import Union
 # Third Party
 import numpy as np
 import pandas as pd
+from scipy import sparse
 
 # Local Imports
 import normits_demand as nd
@@ -28,83 +31,306 @@ import normits_demand as nd
 from normits_demand import core as nd_core
 from normits_demand.utils import math_utils
 from normits_demand.utils import pandas_utils as pd_utils
-from normits_demand.concurrency import multiprocessing
 
 
-def _lower_memory_row_translation(vector_chunk: np.array,
-                                  row_translation: np.array,
-                                  ) -> np.array:
-    """Internal MP functionality of _lower_memory_matrix_zone_translation()"""
-    # Translate the rows
-    row_translated = list()
-    for vector in np.hsplit(vector_chunk, vector_chunk.shape[1]):
-        vector = vector.flatten()
-        vector = np.broadcast_to(np.expand_dims(vector, axis=1), row_translation.shape)
-        vector = vector * row_translation
-        vector = vector.sum(axis=0)
-        row_translated.append(vector)
+class MatrixTranslator:
+    """Translates matrices from one zoning system to another
 
-    return row_translated
+    The row and column translations are converted into sparse matrices
+    once, on creation, so translating many matrices with the same
+    translation only costs a pair of sparse matrix products per matrix.
+    A whole stack of matrices can be translated in a single call.
 
+    Attributes
+    ----------
+    row_translation:
+        A sparse (n_in, n_out) matrix of the factors to use to translate
+        the rows of a matrix.
 
-def _lower_memory_col_translation(vector_chunk: np.array,
-                                  col_translation: np.array,
-                                  ) -> np.array:
-    """Internal MP functionality of _lower_memory_matrix_zone_translation()"""
-    # Translate the columns
-    col_translated = list()
-    for vector in np.vsplit(vector_chunk, vector_chunk.shape[0]):
-        vector = vector.flatten()
-        vector = np.broadcast_to(np.expand_dims(vector, axis=1), col_translation.shape)
-        vector = vector * col_translation
-        vector = vector.sum(axis=0)
-        col_translated.append(vector)
-
-    return col_translated
-
-
-def _lower_memory_matrix_zone_translation(matrix: np.array,
-                                          row_translation: np.array,
-                                          col_translation: np.array,
-                                          chunk_size: int,
-                                          ) -> np.array:
-    # Translate the rows
-    kwargs = list()
-    n_splits = matrix.shape[1] / chunk_size
-    n_splits = 1 if n_splits <= 0 else n_splits
-    for vector_chunk in np.array_split(matrix, n_splits, axis=1):
-        kwargs.append({
-            'vector_chunk': vector_chunk,
-            'row_translation': row_translation,
-        })
-
-    row_translated = multiprocessing.multiprocess(
-        fn=_lower_memory_row_translation,
-        kwargs=kwargs,
-        process_count=nd.constants.PROCESS_COUNT,
-        in_order=True,
-    )
+    col_translation:
+        A sparse (n_in, n_out) matrix of the factors to use to translate
+        the columns of a matrix.
 
-    row_translated = np.vstack(row_translated).T
-
-    # Translate the rows
-    kwargs = list()
-    n_splits = row_translated.shape[0] / chunk_size
-    n_splits = 1 if n_splits <= 0 else n_splits
-    for vector_chunk in np.array_split(row_translated, n_splits, axis=0):
-        kwargs.append({
-            'vector_chunk': vector_chunk,
-            'col_translation': col_translation,
-        })
-
-    full_translated = multiprocessing.multiprocess(
-        fn=_lower_memory_col_translation,
-        kwargs=kwargs,
-        process_count=nd.constants.PROCESS_COUNT,
-        in_order=True,
-    )
+    dtype:
+        The numpy datatype the translation is carried out in.
+
+    from_zones:
+        The zones a matrix is in before translating. Only needed to
+        translate pandas DataFrames.
+
+    to_zones:
+        The zones a matrix is in after translating. Only needed to
+        translate pandas DataFrames.
+    """
+
+    def __init__(self,
+                 row_translation: Union[np.ndarray, sparse.spmatrix],
+                 col_translation: Union[np.ndarray, sparse.spmatrix] = None,
+                 dtype: np.dtype = None,
+                 from_zones: List[Any] = None,
+                 to_zones: List[Any] = None,
+                 ):
+        """
+        Parameters
+        ----------
+        row_translation:
+            The (n_in, n_out) factors to use to translate the rows of a
+            matrix.
+
+        col_translation:
+            The (n_in, n_out) factors to use to translate the columns of a
+            matrix. If None, row_translation is used.
+
+        dtype:
+            The numpy datatype to do the translation in. Defaults to
+            np.float64. Where such high precision isn't needed, np.float32
+            can be used to halve the memory used.
+
+        from_zones:
+            The n_in zones a matrix is in before translating. Only needed
+            to translate pandas DataFrames.
+
+        to_zones:
+            The n_out zones a matrix is in after translating. Only needed
+            to translate pandas DataFrames.
+        """
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self.row_translation = sparse.csr_matrix(row_translation, dtype=self.dtype)
+        if col_translation is None or col_translation is row_translation:
+            self.col_translation = self.row_translation
+        else:
+            self.col_translation = sparse.csr_matrix(col_translation, dtype=self.dtype)
+
+        if self.row_translation.shape != self.col_translation.shape:
+            raise ValueError(
+                "Row and column translations are not the same shape. "
+                "Both need to be (n_in, n_out) shape.\n"
+                "Row shape: %s\n"
+                "Column shape: %s"
+                % (self.row_translation.shape, self.col_translation.shape)
+            )
+
+        for zones, n_zones, name in (
+            (from_zones, self.n_in, "from_zones"),
+            (to_zones, self.n_out, "to_zones"),
+        ):
+            if zones is not None and len(zones) != n_zones:
+                raise ValueError(
+                    "Expected %s to have %s zones to match the translation, "
+                    "got %s"
+                    % (name, n_zones, len(zones))
+                )
 
-    return np.vstack(full_translated)
+        self.from_zones = from_zones
+        self.to_zones = to_zones
+
+        # Rows are translated with the transpose, store in an efficient layout
+        self._row_translation_t = self.row_translation.T.tocsr()
+
+    @classmethod
+    def from_zoning_systems(cls,
+                            from_zoning_system: nd_core.ZoningSystem,
+                            to_zoning_system: nd_core.ZoningSystem,
+                            row_weighting: str = None,
+                            col_weighting: str = None,
+                            dtype: np.dtype = None,
+                            ) -> MatrixTranslator:
+        """Builds a translator between two zoning systems
+
+        Parameters
+        ----------
+        from_zoning_system:
+            The zoning system matrices will be in before translating.
+
+        to_zoning_system:
+            The zoning system to translate matrices into.
+
+        row_weighting:
+            The weighting to use when translating the rows of a matrix.
+
+        col_weighting:
+            The weighting to use when translating the columns of a matrix.
+
+        dtype:
+            The numpy datatype to do the translation in.
+
+        Returns
+        -------
+        translator:
+            A MatrixTranslator from from_zoning_system to to_zoning_system.
+        """
+        row_translation = from_zoning_system.translate_sparse(to_zoning_system, row_weighting)
+        col_translation = from_zoning_system.translate_sparse(to_zoning_system, col_weighting)
+        return cls(
+            row_translation=row_translation,
+            col_translation=col_translation,
+            dtype=dtype,
+            from_zones=from_zoning_system.unique_zones,
+            to_zones=to_zoning_system.unique_zones,
+        )
+
+    @property
+    def n_in(self) -> int:
+        """The number of zones a matrix has before translating"""
+        return self.row_translation.shape[0]
+
+    @property
+    def n_out(self) -> int:
+        """The number of zones a matrix has after translating"""
+        return self.row_translation.shape[1]
+
+    def translate(self,
+                  matrices: np.ndarray,
+                  check_totals: bool = False,
+                  ) -> np.ndarray:
+        """Translates a matrix, or a stack of matrices
+
+        Parameters
+        ----------
+        matrices:
+            A single (n_in, n_in) matrix, or a (n_matrices, n_in, n_in)
+            stack of matrices to translate.
+
+        check_totals:
+            Whether to check that each matrix sums to the same total
+            before and after translating.
+
+        Returns
+        -------
+        translated:
+            matrices translated into (n_out, n_out) shape, in self.dtype.
+            If a stack was given, a (n_matrices, n_out, n_out) stack is
+            returned.
+
+        Raises
+        ------
+        ValueError:
+            If matrices is not the expected shape, or if check_totals is
+            set and a total changes.
+        """
+        matrices = np.asarray(matrices)
+        if matrices.ndim not in (2, 3) or matrices.shape[-2:] != (self.n_in, self.n_in):
+            raise ValueError(
+                "Expected a (%s, %s) matrix, or a stack of them, to match "
+                "the translation. Got shape %s"
+                % (self.n_in, self.n_in, matrices.shape)
+            )
+
+        stack = matrices[np.newaxis] if matrices.ndim == 2 else matrices
+        if stack.dtype != self.dtype:
+            _check_dtype_range(stack, self.dtype)
+            stack = stack.astype(self.dtype)
+
+        # Translate the rows of every matrix at once
+        n_matrices = len(stack)
+        rows_done = stack.transpose(1, 0, 2).reshape(self.n_in, n_matrices * self.n_in)
+        rows_done = self._row_translation_t @ rows_done
+
+        # Then the columns
+        rows_done = rows_done.reshape(self.n_out * n_matrices, self.n_in)
+        translated = np.asarray(rows_done @ self.col_translation)
+        translated = translated.reshape(self.n_out, n_matrices, self.n_out).transpose(1, 0, 2)
+        translated = np.ascontiguousarray(translated)
+
+        if check_totals:
+            before = stack.sum(axis=(1, 2))
+            after = translated.sum(axis=(1, 2))
+            for matrix_before, matrix_after in zip(before, after):
+                if not math_utils.is_almost_equal(matrix_before, matrix_after):
+                    raise ValueError(
+                        "Some values seem to have been dropped during the "
+                        "translation. Check the given translation matrix "
+                        "isn't unintentionally dropping values. If the "
+                        "difference is small, it's likely a rounding error.\n"
+                        "Before: %s\n"
+                        "After: %s"
+                        % (matrix_before, matrix_after)
+                    )
+
+        if matrices.ndim == 2:
+            return translated[0]
+        return translated
+
+    def translate_df(self,
+                     matrix: pd.DataFrame,
+                     matrix_infill: float = 0.0,
+                     check_totals: bool = False,
+                     ) -> pd.DataFrame:
+        """Translates a wide pandas DataFrame matrix
+
+        Parameters
+        ----------
+        matrix:
+            The matrix to translate. The index and columns need to be
+            self.from_zones. Any zones not in self.from_zones are
+            dropped, and any missing zones are infilled.
+
+        matrix_infill:
+            The value to use to infill any missing matrix values.
+
+        check_totals:
+            Whether to check that the matrix sums to the same total
+            before and after translating.
+
+        Returns
+        -------
+        translated_matrix:
+            matrix translated, with self.to_zones as the index and
+            columns.
+        """
+        if self.from_zones is None or self.to_zones is None:
+            raise ValueError(
+                "from_zones and to_zones need to be set to translate a "
+                "pandas DataFrame."
+            )
+
+        extra_zones = set(matrix.index) | set(matrix.columns)
+        extra_zones -= set(self.from_zones)
+        if len(extra_zones) > 0:
+            warnings.warn(
+                "There are some zones in matrix that have not been defined in "
+                "from_zones. These zones will be dropped before the "
+                "translation!\n"
+                "Additional zones count: %s"
+                % len(extra_zones)
+            )
+
+        matrix = matrix.reindex(
+            index=self.from_zones,
+            columns=self.from_zones,
+            fill_value=matrix_infill,
+        )
+        return pd.DataFrame(
+            data=self.translate(matrix.values, check_totals=check_totals),
+            index=self.to_zones,
+            columns=self.to_zones,
+        )
+
+
+def _check_dtype_range(values: np.ndarray, dtype: np.dtype) -> None:
+    """Raises a ValueError if values can't be represented in dtype"""
+    val_max = np.max(values)
+    val_min = np.min(values)
+    dtype_max = np.finfo(dtype).max
+    dtype_min = np.finfo(dtype).min
+
+    if val_max > dtype_max:
+        raise ValueError(
+            "Maximum value in matrix is greater than the given "
+            "translation_dtype can handle.\n"
+            "Maximum dtype value: %s\n"
+            "Maximum matrix value: %s"
+            % (dtype_max, val_max)
+        )
+
+    if val_min < dtype_min:
+        raise ValueError(
+            "Minimum value in matrix is less than the given "
+            "translation_dtype can handle.\n"
+            "Minimum dtype value: %s\n"
+            "Minimum matrix value: %s"
+            % (dtype_min, val_min)
+        )
 
 
 def numpy_matrix_zone_translation(matrix: np.array,
@@ -118,7 +344,9 @@ def numpy_matrix_zone_translation(matrix: np.array,
                                   ) -> np.array:
     """Translates matrix with translation
 
-    Pure numpy operations. Should be super fast!!
+    The translations are converted into sparse matrices and applied with
+    a `MatrixTranslator`. When translating many matrices with the same
+    translation, build a `MatrixTranslator` once and use that instead.
 
     Parameters
     ----------
@@ -148,9 +376,8 @@ def numpy_matrix_zone_translation(matrix: np.array,
 
     translation_dtype:
         The numpy datatype to use to do the translation. If None, then the
-        dtype of the matrix is used. As this is a 3d translation, it can
-        use a lot of memory if float64 is used. Where such high precision
-        isn't needed, a more memory efficient dtype can be passed in instead
+        dtype of the matrix is used. Where such high precision isn't
+        needed, a more memory efficient dtype can be passed in instead
         and the translation will be carried out in it.
 
     check_shapes:
@@ -165,9 +392,8 @@ def numpy_matrix_zone_translation(matrix: np.array,
         total.
 
     chunk_size:
-        The size of the chunks to use if there isn't enough memory to do a
-        3D translation. Most of the time this can be ignored unless
-        translating between two massive zoning systems.
+        No longer used. The sparse translation doesn't need to be
+        chunked. Kept for backwards compatibility.
 
     Returns
     -------
@@ -181,8 +407,8 @@ def numpy_matrix_zone_translation(matrix: np.array,
         does not have the same number of rows as matrix.
     """
     if translation is not None:
-        row_translation = translation.copy()
-        col_translation = translation.copy()
+        row_translation = translation
+        col_translation = translation
 
     if row_translation is None or col_translation is None:
         raise ValueError(
@@ -226,89 +452,17 @@ def numpy_matrix_zone_translation(matrix: np.array,
                 % (matrix.shape, row_translation.shape)
             )
 
-    # ## CONVERT DTYPES ## #
+    # ## DO THE TRANSLATION ## #
     # If not given, assumed based on the input precision
     if translation_dtype is None:
         translation_dtype = matrix.dtype
 
-    # Make sure we're not gonna introduce infs...
-    mat_max = np.max(matrix)
-    mat_min = np.min(matrix)
-    dtype_max = np.finfo(translation_dtype).max
-    dtype_min = np.finfo(translation_dtype).min
-
-    if mat_max > dtype_max:
-        raise ValueError(
-            "Maximum value in matrix is greater than the given "
-            "translation_dtype can handle.\n"
-            "Maximum dtype value: %s\n"
-            "Maximum matrix value: %s"
-            % (dtype_max, mat_max)
-        )
-
-    if mat_min < dtype_min:
-        raise ValueError(
-            "Minimum value in matrix is less than the given "
-            "translation_dtype can handle.\n"
-            "Minimum dtype value: %s\n"
-            "Minimum matrix value: %s"
-            % (dtype_min, mat_min)
-        )
-
-    # Now we know it's safe. Translate
-    matrix = matrix.astype(translation_dtype)
-    row_translation = row_translation.astype(translation_dtype)
-    col_translation = col_translation.astype(translation_dtype)
-
-    # ## DO THE TRANSLATION ## #
-    # Get the input and output shapes
-    n_in, n_out = row_translation.shape
-
-    # We might run out of memory doing it this way...
-    not_enough_memory = False
-
-    try:
-        # Translate rows
-        mult_shape = (n_in, n_in, n_out)
-        a = np.broadcast_to(np.expand_dims(matrix, axis=2), mult_shape)
-        trans_a = np.broadcast_to(np.expand_dims(row_translation, axis=1), mult_shape)
-        temp = a * trans_a
-
-        # mat is transposed, but we need it this way
-        rows_done = temp.sum(axis=0)
-
-        # Translate cols
-        mult_shape = (n_in, n_out, n_out)
-        b = np.broadcast_to(np.expand_dims(rows_done, axis=2), mult_shape)
-        trans_b = np.broadcast_to(np.expand_dims(col_translation, axis=1), mult_shape)
-        temp = b * trans_b
-        translated_matrix = temp.sum(axis=0)
-    except MemoryError:
-        not_enough_memory = True
-
-    # Try translation again, a slower way.
-    if not_enough_memory:
-        translated_matrix = _lower_memory_matrix_zone_translation(
-            matrix=matrix,
-            row_translation=row_translation,
-            col_translation=col_translation,
-            chunk_size=chunk_size,
-        )
-
-    if not check_totals:
-        return translated_matrix
-
-    if not math_utils.is_almost_equal(matrix.sum(), translated_matrix.sum()):
-        raise ValueError(
-            "Some values seem to have been dropped during the translation. "
-            "Check the given translation matrix isn't unintentionally dropping "
-            "values. If the difference is small, it's likely a rounding error.\n"
-            "Before: %s\n"
-            "After: %s"
-            % (matrix.sum(), translated_matrix.sum())
-        )
-
-    return translated_matrix
+    translator = MatrixTranslator(
+        row_translation=row_translation,
+        col_translation=col_translation,
+        dtype=translation_dtype,
+    )
+    return translator.translate(matrix, check_totals=check_totals)
 
 
 def numpy_vector_zone_translation(vector: np.array,
@@ -506,9 +660,8 @@ def pandas_matrix_zone_translation(matrix: pd.DataFrame,
 
     translation_dtype:
         The numpy datatype to use to do the translation. If None, then the
-        dtype of the translation is used. As this is a 3d translation, it can
-        use a lot of memory if float64 is used. Where such high precision
-        isn't needed, a more memory efficient dtype can be passed in instead
+        dtype of the translation is used. Where such high precision isn't
+        needed, a more memory efficient dtype can be passed in instead
         and the translation will be carried out in it.
 
     matrix_infill:
@@ -522,9 +675,8 @@ def pandas_matrix_zone_translation(matrix: pd.DataFrame,
         total.
 
     chunk_size:
-        The size of the chunks to use if there isn't enough memory to do a
-        3D translation. Most of the time this can be ignored unless
-        translating between two massive zoning systems.
+        No longer used. The sparse translation doesn't need to be
+        chunked. Kept for backwards compatibility.
 
     Returns
     -------
@@ -950,10 +1102,11 @@ def translate_matrix_zoning(
     Parameters
     ----------
     matrix:
-        The matrix to translate. If a pd.DataFrame is given,
-        `pandas_matrix_zone_translation()` is used for the translation. If a
-        np.ndarray is given `numpy_matrix_zone_translation()` is used for
-        the translation.
+        The matrix to translate. If a pd.DataFrame is given, the index and
+        columns need to be from_zoning_system zones. If a np.ndarray is
+        given, it needs to be in from_zoning_system.unique_zones order. A
+        (n_matrices, n_zones, n_zones) stack of matrices can also be given
+        as a np.ndarray.
 
     from_zoning_system:
         The zoning system that matrix is currently in.
@@ -975,51 +1128,27 @@ def translate_matrix_zoning(
 
     See Also
     --------
-    `pandas_matrix_zone_translation()`
-    `numpy_matrix_zone_translation()`
+    `MatrixTranslator`
     """
-    # Init
-    weight_col = 'weight'
-
-    # Do the pandas translation
-    if isinstance(matrix, pd.DataFrame):
-        # Try convert cols to correct type
-        matrix.columns = matrix.columns.astype(from_zoning_system.unique_zones.dtype)
-
-        kwargs = {
-            'from_zoning_system': from_zoning_system,
-            'to_zoning_system': to_zoning_system,
-            'weight_col_name': weight_col,
-        }
-
-        # Get the long translations
-        row_translation = get_long_translation(weighting=row_weighting, **kwargs)
-        col_translation = get_long_translation(weighting=col_weighting, **kwargs)
-
-        # Do the translation
-        translated_matrix = pandas_matrix_zone_translation(
-            matrix=matrix,
-            row_translation=row_translation,
-            col_translation=col_translation,
-            from_zone_col=from_zoning_system.col_name,
-            to_zone_col=to_zoning_system.col_name,
-            factors_col=weight_col,
-            from_unique_zones=from_zoning_system.unique_zones,
-            to_unique_zones=to_zoning_system.unique_zones
-        )
-
-    elif isinstance(matrix, np.ndarray):
-        raise NotImplementedError(
-            "Functionality not implemented to translate a np.ndarray in "
-            "utils.translation.translate_matrix_zoning()"
-        )
-    else:
+    if not isinstance(matrix, (pd.DataFrame, np.ndarray)):
         raise ValueError(
             "Expected matrix to be of type np.ndarray or pd.DataFrame, not %s"
             % type(matrix)
         )
 
-    return translated_matrix
+    translator = MatrixTranslator.from_zoning_systems(
+        from_zoning_system=from_zoning_system,
+        to_zoning_system=to_zoning_system,
+        row_weighting=row_weighting,
+        col_weighting=col_weighting,
+    )
+
+    if isinstance(matrix, np.ndarray):
+        return translator.translate(matrix)
+
+    # Try convert cols to correct type
+    matrix.columns = matrix.columns.astype(from_zoning_system.unique_zones.dtype)
+    return translator.translate_df(matrix)
 
 
 def get_long_translation(
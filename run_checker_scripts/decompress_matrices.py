@@ -12,6 +12,7 @@ Script to decompress TfN NorMITs Tools output matrices. Decompressed matrices
 are output into .csv files.
 
 In order to run the following python files are needed:
+normits_demand
 pandas
 tqdm
 
@@ -34,8 +35,6 @@ customise how it runs.
 """
 # Built-Ins
 import os
-import bz2
-import pickle
 import pathlib
 import argparse
 
@@ -45,8 +44,9 @@ from typing import Tuple
 import tqdm
 
 # Local Imports
+from normits_demand.utils import compress
 
-VALID_SUFFIXES = ['.pbz2']
+VALID_SUFFIXES = ['.pbz2', compress.BLOCK_COMPRESSION_SUFFIX]
 
 
 def is_path_to_file(path: pathlib.Path) -> bool:
@@ -139,7 +139,7 @@ def read_compressed_df(path: pathlib.Path):
             'following invalid filename: %s'
             % (VALID_SUFFIXES, path)
         )
-    return pickle.load(bz2.BZ2File(path, 'rb'))
+    return compress.read_in(path)
 
 
 def main():
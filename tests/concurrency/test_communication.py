@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the concurrency.communication module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.concurrency import communication
+from normits_demand.concurrency import multiprocessing
+
+
+##### FUNCTIONS #####
+def _shared_df_sum(info: communication.SharedDataFrameInfo) -> float:
+    """Attaches to a shared DataFrame in a child process and sums it."""
+    helper, df = communication.attach_shared_dataframe(info)
+    total = float(df.loc[2, "b"] + df.values.sum())
+    del df
+    helper.close_shared_array()
+    return total
+
+
+##### CLASSES #####
+class TestSharedDataFrame:
+    """Tests for sharing DataFrames through shared memory."""
+
+    @staticmethod
+    def _build_df() -> pd.DataFrame:
+        return pd.DataFrame(
+            np.arange(12, dtype=float).reshape(4, 3),
+            index=[1, 2, 3, 4],
+            columns=["a", "b", "c"],
+        )
+
+    def test_attach_same_process(self):
+        """Test attaching gives a read-only view of the same data."""
+        orig = self._build_df()
+        owner, info = communication.dataframe_to_shared_memory(orig)
+        try:
+            helper, df = communication.attach_shared_dataframe(info)
+            pd.testing.assert_frame_equal(df, orig)
+
+            # Changes by the owner are seen without copying
+            owner.get_shared_array()[0, 0] = 100
+            assert df.iloc[0, 0] == 100
+
+            with pytest.raises(ValueError):
+                df.values[0, 0] = 1
+
+            del df
+            helper.close_shared_array()
+        finally:
+            owner.unlink_shared_array()
+
+    def test_attach_other_process(self):
+        """Test child processes can read the shared data."""
+        orig = self._build_df()
+        owner, info = communication.dataframe_to_shared_memory(orig)
+        try:
+            results = multiprocessing.multiprocess(
+                fn=_shared_df_sum,
+                kwargs=[{"info": info}] * 3,
+                process_count=1,
+            )
+        finally:
+            owner.unlink_shared_array()
+
+        expected = orig.loc[2, "b"] + orig.values.sum()
+        assert results == [expected] * 3
+
+    def test_non_numeric(self):
+        """Test an error is raised for non-numeric DataFrames."""
+        with pytest.raises(ValueError):
+            communication.dataframe_to_shared_memory(pd.DataFrame({"a": ["x", "y"]}))
@@ -0,0 +1,615 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the core.data_structures module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import os
+import pickle
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+import normits_demand as nd
+from normits_demand.core import data_structures
+
+
+##### FIXTURES #####
+@pytest.fixture(autouse=True)
+def fixture_cpu_count(monkeypatch):
+    """Make sure segment names can be built with the default process count."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+
+@pytest.fixture(name="dvec_inputs", scope="module")
+def fixture_dvec_inputs():
+    """Build a segmentation, zoning system and random DVector data."""
+    segmentation = nd.get_segmentation_level("hb_p_m")
+    zoning = nd.get_zoning_system("gor")
+    rng = np.random.default_rng(1)
+    data = {
+        name: rng.random(zoning.n_zones) * 100
+        for name in segmentation.segment_names
+    }
+    return segmentation, zoning, data
+
+
+def _build_dvec(dvec_inputs, data=None, **kwargs) -> nd.DVector:
+    segmentation, zoning, default_data = dvec_inputs
+    data = default_data if data is None else data
+    return nd.DVector(
+        segmentation=segmentation,
+        zoning_system=zoning,
+        import_data={k: v.copy() for k, v in data.items()},
+        process_count=0,
+        **kwargs,
+    )
+
+
+def _random_dvec(name: str, zoning=None, seed: int = 0) -> nd.DVector:
+    segmentation = nd.get_segmentation_level(name)
+    rng = np.random.default_rng(seed)
+    if zoning is None:
+        data = {x: rng.random() for x in segmentation.segment_names}
+    else:
+        data = {x: rng.random(zoning.n_zones) for x in segmentation.segment_names}
+    return nd.DVector(
+        segmentation=segmentation,
+        zoning_system=zoning,
+        import_data=data,
+        time_format="avg_week",
+        process_count=0,
+    )
+
+
+##### CLASSES #####
+class TestSegmentStore:
+    """Tests for the `SegmentStore` class."""
+
+    @staticmethod
+    def test_from_dict(dvec_inputs):
+        """Test the store lays segments out in rows and acts like a dict."""
+        segmentation, zoning, data = dvec_inputs
+        names = segmentation.segment_names
+        store = data_structures.SegmentStore.from_dict(data, names, zoning.n_zones)
+
+        assert store.array.shape == (len(names), zoning.n_zones)
+        assert list(store) == names and len(store) == len(names)
+        np.testing.assert_array_equal(store[names[3]], data[names[3]])
+
+        # Rows are views onto the contiguous array
+        store[names[3]] = 1
+        assert np.all(store.array[3] == 1)
+
+    @staticmethod
+    def test_fixed_segments(dvec_inputs):
+        """Test segments cannot be added or removed."""
+        segmentation, zoning, data = dvec_inputs
+        store = data_structures.SegmentStore.empty(segmentation.segment_names, zoning.n_zones)
+
+        with pytest.raises(KeyError):
+            store["not_a_segment"] = 1
+        with pytest.raises(TypeError):
+            del store[segmentation.segment_names[0]]
+
+    @staticmethod
+    def test_memmap_round_trip(dvec_inputs, tmp_path):
+        """Test data written to a memmap can be re-opened and pickled."""
+        segmentation, zoning, data = dvec_inputs
+        names = segmentation.segment_names
+        path = tmp_path / "store.npy"
+        store = data_structures.SegmentStore.from_dict(data, names, zoning.n_zones, path=path)
+        assert store.is_memmap and store.path == path
+
+        reopened = data_structures.SegmentStore.open(path, names, mode="r")
+        assert reopened.is_memmap
+        np.testing.assert_array_equal(reopened.array, store.array)
+
+        unpickled = pickle.loads(pickle.dumps(reopened))
+        assert not unpickled.is_memmap and unpickled.path is None
+        np.testing.assert_array_equal(unpickled[names[5]], data[names[5]])
+
+
+class TestMemmapDVector:
+    """Tests for DVectors backed by a memmapped `SegmentStore`."""
+
+    @staticmethod
+    def test_matches_dict_dvector(dvec_inputs, tmp_path):
+        """Test a memmapped DVector gives the same results as a dict one."""
+        dvec = _build_dvec(dvec_inputs)
+        mm_dvec = _build_dvec(dvec_inputs, memmap_path=tmp_path / "dvec.npy")
+        name = dvec.segmentation.segment_names[7]
+
+        assert mm_dvec.is_memmap and not dvec.is_memmap
+        np.testing.assert_array_equal(
+            mm_dvec.get_segment_data(name), dvec.get_segment_data(name)
+        )
+        assert mm_dvec.sum() == pytest.approx(dvec.sum())
+
+        abs_dvec = abs(mm_dvec)
+        np.testing.assert_array_equal(
+            abs_dvec.get_segment_data(name), dvec.get_segment_data(name)
+        )
+
+        mm_df = mm_dvec.to_df()
+        df = dvec.to_df()
+        np.testing.assert_allclose(mm_df.values, df.values)
+
+    @staticmethod
+    def test_save_load(dvec_inputs, tmp_path):
+        """Test a memmapped DVector saves in the usual dictionary format."""
+        mm_dvec = _build_dvec(dvec_inputs).to_memmap(tmp_path / "dvec.npy")
+
+        instance_dict = mm_dvec.save()
+        assert isinstance(instance_dict["data"], dict)
+
+        loaded = nd.DVector.load(instance_dict)
+        assert not loaded.is_memmap
+        assert loaded.sum() == pytest.approx(mm_dvec.sum())
+
+    @staticmethod
+    def test_from_store(dvec_inputs, tmp_path):
+        """Test a DVector can be built from a re-opened store."""
+        segmentation, zoning, data = dvec_inputs
+        path = tmp_path / "dvec.npy"
+        _build_dvec(dvec_inputs, memmap_path=path)
+
+        dvec = nd.DVector(
+            segmentation=segmentation,
+            zoning_system=zoning,
+            import_data=data_structures.SegmentStore.open(path, segmentation.segment_names),
+            process_count=0,
+        )
+        assert dvec.is_memmap
+        assert dvec.sum() == pytest.approx(sum(x.sum() for x in data.values()))
+
+
+class TestBlockArithmetic:
+    """Tests for the vectorised DVector arithmetic."""
+
+    @staticmethod
+    def test_multiply():
+        """Test multiplying gathers the correct segments together."""
+        zoning = nd.get_zoning_system("gor")
+        a = _random_dvec("hb_p_m_sic", zoning, seed=1)
+        b = _random_dvec("sic", zoning, seed=2)
+
+        result = a * b
+        multiply_dict, _ = a.segmentation * b.segmentation
+        for out_seg, (a_seg, b_seg) in multiply_dict.items():
+            np.testing.assert_allclose(
+                result.get_segment_data(out_seg),
+                a.get_segment_data(a_seg) * b.get_segment_data(b_seg),
+            )
+
+        divided = result / b
+        np.testing.assert_allclose(divided.sum(), a.sum())
+
+    @staticmethod
+    def test_mixed_zoning():
+        """Test a zoned DVector can be multiplied by an unzoned one."""
+        zoning = nd.get_zoning_system("gor")
+        a = _random_dvec("hb_p_m", zoning, seed=1)
+        b = _random_dvec("hb_p_m", seed=2)
+
+        result = a * b
+        name = a.segmentation.segment_names[4]
+        np.testing.assert_allclose(
+            result.get_segment_data(name),
+            a.get_segment_data(name) * b.get_segment_data(name),
+        )
+
+    @staticmethod
+    def test_add_subtract():
+        """Test adding and subtracting matches segment by segment."""
+        zoning = nd.get_zoning_system("gor")
+        a = _random_dvec("hb_p_m", zoning, seed=1)
+        b = _random_dvec("hb_p_m", zoning, seed=2)
+
+        total = a + b
+        diff = a - b
+        for name in a.segmentation.segment_names:
+            a_data = a.get_segment_data(name)
+            b_data = b.get_segment_data(name)
+            np.testing.assert_allclose(total.get_segment_data(name), a_data + b_data)
+            np.testing.assert_allclose(diff.get_segment_data(name), a_data - b_data)
+
+    @staticmethod
+    def test_aggregate():
+        """Test aggregation sums the correct segments together."""
+        zoning = nd.get_zoning_system("gor")
+        dvec = _random_dvec("hb_p_m_tp_week", zoning)
+        out_seg = nd.get_segmentation_level("hb_p_m")
+
+        result = dvec.aggregate(out_seg)
+        for out_name, in_names in dvec.segmentation.aggregate(out_seg).items():
+            expected = np.sum([dvec.get_segment_data(x) for x in in_names], axis=0)
+            np.testing.assert_allclose(result.get_segment_data(out_name), expected)
+
+    @staticmethod
+    def test_multiply_and_aggregate(monkeypatch):
+        """Test multiply_and_aggregate matches multiplying then aggregating."""
+        zoning = nd.get_zoning_system("gor")
+        a = _random_dvec("hb_p_m_sic", zoning, seed=1)
+        b = _random_dvec("sic", zoning, seed=2)
+        out_seg = nd.get_segmentation_level("hb_p_m")
+
+        # Force the multiplication to be done over several chunks
+        monkeypatch.setattr(nd.DVector, "_block_chunk_size", zoning.n_zones * 7)
+        result = a.multiply_and_aggregate(b, out_seg)
+        expected = (a * b).aggregate(out_seg)
+
+        for name in out_seg.segment_names:
+            np.testing.assert_allclose(
+                result.get_segment_data(name), expected.get_segment_data(name)
+            )
+
+
+class TestTranslateZoning:
+    """Tests for `DVector.translate_zoning`."""
+
+    @staticmethod
+    def test_matches_dense_translation():
+        """Test the sparse translation matches a dense one per segment."""
+        segmentation = nd.get_segmentation_level("hb_p_m")
+        msoa = nd.get_zoning_system("msoa")
+        gor = nd.get_zoning_system("gor")
+        rng = np.random.default_rng(3)
+        dvec = nd.DVector(
+            segmentation=segmentation,
+            zoning_system=msoa,
+            import_data={x: rng.random(msoa.n_zones) for x in segmentation.segment_names},
+            process_count=0,
+        )
+
+        translated = dvec.translate_zoning(gor)
+        dense = msoa.translate(gor)
+
+        assert translated.zoning_system == gor
+        for name in segmentation.segment_names:
+            np.testing.assert_allclose(
+                translated.get_segment_data(name),
+                (dvec.get_segment_data(name)[:, np.newaxis] * dense).sum(axis=0),
+            )
+
+
+class TestDataFrameConversion:
+    """Tests for converting DVectors to and from DataFrames."""
+
+    @staticmethod
+    def test_round_trip(dvec_inputs):
+        """Test converting to a DataFrame and back gives the same DVector."""
+        dvec = _build_dvec(dvec_inputs)
+        df = dvec.to_df()
+
+        segmentation, zoning, data = dvec_inputs
+        assert list(df.columns) == [zoning.col_name, "p", "m", "val"]
+        assert len(df) == len(segmentation) * zoning.n_zones
+
+        # Rows are ordered by segment, then zone
+        name = segmentation.segment_names[3]
+        seg_dict = segmentation.get_seg_dict(name)
+        seg_df = df[(df["p"] == seg_dict["p"]) & (df["m"] == seg_dict["m"])]
+        np.testing.assert_array_equal(seg_df["val"].values, data[name])
+        np.testing.assert_array_equal(seg_df[zoning.col_name].values, zoning.unique_zones)
+
+        # Shuffle so the conversion back can't rely on row order
+        loaded = nd.DVector(
+            segmentation=segmentation,
+            zoning_system=zoning,
+            import_data=df.sample(frac=1, random_state=2),
+            process_count=0,
+        )
+        for name in segmentation.segment_names:
+            np.testing.assert_array_equal(loaded.get_segment_data(name), data[name])
+
+    @staticmethod
+    def test_infill(dvec_inputs):
+        """Test missing segments are infilled, and missing zones set to 0."""
+        segmentation, zoning, _ = dvec_inputs
+        df = _build_dvec(dvec_inputs).to_df()
+        df = df[(df["p"] != 1) & (df[zoning.col_name] != zoning.unique_zones[0])]
+
+        dvec = nd.DVector(
+            segmentation=segmentation,
+            zoning_system=zoning,
+            import_data=df,
+            infill=-1,
+            process_count=0,
+        )
+        for name in segmentation.segment_names:
+            seg_data = dvec.get_segment_data(name)
+            if segmentation.get_seg_dict(name)["p"] == 1:
+                assert np.all(seg_data == -1)
+            else:
+                assert seg_data[0] == 0 and np.all(seg_data[1:] > 0)
+
+    @staticmethod
+    def test_none_infill(dvec_inputs):
+        """Test a clear error is raised when infilling with None."""
+        segmentation, zoning, _ = dvec_inputs
+        df = _build_dvec(dvec_inputs).to_df()
+
+        with pytest.raises(ValueError, match="None"):
+            nd.DVector(
+                segmentation=segmentation,
+                zoning_system=zoning,
+                import_data=df[df["p"] != 1],
+                infill=None,
+                process_count=0,
+            )
+
+    @staticmethod
+    @pytest.mark.parametrize("bad_data", ["duplicate", "zone", "segment"])
+    def test_invalid_data(dvec_inputs, bad_data):
+        """Test an error is raised for invalid DataFrames."""
+        segmentation, zoning, _ = dvec_inputs
+        df = _build_dvec(dvec_inputs).to_df()
+        if bad_data == "duplicate":
+            df = pd.concat([df, df.iloc[:1]])
+        elif bad_data == "zone":
+            df.loc[0, zoning.col_name] = "not_a_zone"
+        else:
+            df.loc[0, "p"] = -1
+
+        with pytest.raises(ValueError):
+            nd.DVector(
+                segmentation=segmentation,
+                zoning_system=zoning,
+                import_data=df,
+                process_count=0,
+            )
+
+
+class TestBalanceAtSegments:
+    """Tests for `DVector.balance_at_segments`."""
+
+    @staticmethod
+    def _random_dvec(name: str, seed: int) -> nd.DVector:
+        segmentation = nd.get_segmentation_level(name)
+        zoning = nd.get_zoning_system("msoa")
+        rng = np.random.default_rng(seed)
+        # Include some negative values to check they're zeroed
+        data = {x: rng.random(zoning.n_zones) * 10 - 1 for x in segmentation.segment_names}
+        return nd.DVector(
+            segmentation=segmentation,
+            zoning_system=zoning,
+            import_data=data,
+            time_format="avg_week",
+            process_count=0,
+        )
+
+    def test_segment_totals(self):
+        """Test each segment total matches other after balancing."""
+        dvec = self._random_dvec("hb_p_m", 0)
+        other = self._random_dvec("hb_p_m", 1)
+        balanced = dvec.balance_at_segments(other)
+
+        for name in dvec.segmentation.segment_names:
+            seg_data = dvec.get_segment_data(name)
+            bal_data = balanced.get_segment_data(name)
+            other_data = np.where(other.get_segment_data(name) <= 0, 1e-12, other.get_segment_data(name))
+
+            assert np.all(bal_data[seg_data <= 0] == 0)
+            assert bal_data.sum() == pytest.approx(other_data.sum(), rel=1e-6)
+
+    def test_weekday_weekend(self):
+        """Test weekday and weekend time periods are balanced together."""
+        dvec = self._random_dvec("hb_p_m_tp_week", 0)
+        other = self._random_dvec("hb_p_m_tp_week", 1)
+        balanced = dvec.balance_at_segments(other, split_weekday_weekend=True)
+
+        segmentation = dvec.segmentation
+        for group in segmentation.get_grouped_weekday_segments():
+            bal_total = sum(balanced.get_segment_data(x).sum() for x in group)
+            other_total = sum(np.clip(other.get_segment_data(x), 1e-12, None).sum() for x in group)
+            assert bal_total == pytest.approx(other_total, rel=1e-6)
+
+        # Time periods within a group share a factor
+        name = segmentation.get_grouped_weekday_segments()[0][0]
+        seg_data = dvec.get_segment_data(name)
+        factors = balanced.get_segment_data(name)[seg_data > 0] / seg_data[seg_data > 0]
+        np.testing.assert_allclose(factors, factors[0])
+
+    def test_balancing_zones(self):
+        """Test segments are balanced within each of their balancing zones."""
+        dvec = self._random_dvec("hb_p_m", 0)
+        other = self._random_dvec("hb_p_m", 1)
+        segmentation = dvec.segmentation
+        gor = nd.get_zoning_system("gor")
+        lad = nd.get_zoning_system("lad_2020")
+        balance_zoning = nd.BalancingZones(
+            segmentation, gor, {x: lad for x in segmentation.segment_names[::3]}
+        )
+        balanced = dvec.balance_at_segments(other, balance_zoning=balance_zoning)
+
+        # Each zone group is balanced separately, then summed
+        msoa = dvec.zoning_system
+        for i, name in enumerate(segmentation.segment_names):
+            translation = msoa.translate(lad if i % 3 == 0 else gor)
+            seg_data = dvec.get_segment_data(name)
+            self_data = np.clip(seg_data, 1e-12, None)
+            other_data = np.clip(other.get_segment_data(name), 1e-12, None)
+
+            expected = np.zeros(msoa.n_zones)
+            for zone_mask in translation.T:
+                if zone_mask.sum() == 0:
+                    continue
+                factor = (other_data * zone_mask).sum() / (self_data * zone_mask).sum()
+                expected += self_data * zone_mask * factor * (seg_data > 0)
+
+            np.testing.assert_allclose(balanced.get_segment_data(name), expected, rtol=1e-9)
+
+    def test_ungrouped_segments(self, monkeypatch):
+        """Test segments missing from the balancing zones are left unchanged."""
+        dvec = self._random_dvec("hb_p_m", 0)
+        other = self._random_dvec("hb_p_m", 1)
+        segment_names = dvec.segmentation.segment_names
+        gor = nd.get_zoning_system("gor")
+        lad = nd.get_zoning_system("lad_2020")
+        balance_zoning = nd.BalancingZones(dvec.segmentation, gor, {})
+
+        # Only balance every other segment, with an empty group
+        grouped = segment_names[::2]
+        monkeypatch.setattr(
+            balance_zoning, "zoning_groups", lambda: iter([(lad, []), (gor, grouped)])
+        )
+        balanced = dvec.balance_at_segments(other, balance_zoning=balance_zoning)
+        expected = dvec.balance_at_segments(
+            other, balance_zoning=nd.BalancingZones(dvec.segmentation, gor, {})
+        )
+
+        for name in segment_names:
+            if name in grouped:
+                expected_data = expected.get_segment_data(name)
+            else:
+                expected_data = dvec.get_segment_data(name)
+            np.testing.assert_allclose(balanced.get_segment_data(name), expected_data)
+
+
+class TestChunkedExecution:
+    """Tests for running DVector operations out of core."""
+
+    @staticmethod
+    @pytest.fixture(name="dvec_pair")
+    def fixture_dvec_pair(tmp_path):
+        """Build in memory DVectors, and chunked copies of them."""
+        zoning = nd.get_zoning_system("msoa")
+        rng = np.random.default_rng(3)
+        dvecs = list()
+        for name in ("hb_p_m", "hb_p_m_tp_week"):
+            segmentation = nd.get_segmentation_level(name)
+            dvecs.append(nd.DVector(
+                segmentation=segmentation,
+                zoning_system=zoning,
+                import_data={x: rng.random(zoning.n_zones) for x in segmentation.segment_names},
+                time_format="avg_week",
+                process_count=0,
+            ))
+
+        # Small enough to need a chunk for every few segments
+        chunked = nd.ChunkedExecution(tmp_path, max_chunk_bytes=500_000)
+        return dvecs, [x.to_chunked(chunked) for x in dvecs]
+
+    @staticmethod
+    def _assert_same(dvec, chunked_dvec):
+        assert chunked_dvec.is_memmap and not dvec.is_memmap
+        np.testing.assert_allclose(
+            chunked_dvec._to_block(), dvec._to_block(), rtol=1e-12
+        )
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            lambda a, w: a * a,
+            lambda a, w: a / a,
+            lambda a, w: a + a - a,
+            lambda a, w: w.aggregate(nd.get_segmentation_level("hb_p_m")),
+            lambda a, w: w.multiply_and_aggregate(w, nd.get_segmentation_level("hb_p_m")),
+            lambda a, w: a.subset(nd.get_segmentation_level("hb_p_m_car")),
+            lambda a, w: a.translate_zoning(nd.get_zoning_system("lad_2020")),
+            lambda a, w: a.split_segmentation_like(w),
+            lambda a, w: a.split_segmentation_like(w, zonal_average=False),
+        ],
+    )
+    def test_matches_in_memory(self, dvec_pair, operation):
+        """Test chunked operations give the same results as in memory."""
+        dvecs, chunked_dvecs = dvec_pair
+        result = operation(*chunked_dvecs)
+        self._assert_same(operation(*dvecs), result)
+        assert result.chunked == chunked_dvecs[0].chunked
+
+    @staticmethod
+    def test_to_in_memory(dvec_pair, tmp_path):
+        """Test chunked DVectors can be brought back into memory."""
+        dvecs, chunked_dvecs = dvec_pair
+        assert len(list(tmp_path.glob("dvec_*.npy"))) == 2
+
+        dvec = chunked_dvecs[0].to_chunked(None)
+        assert dvec.chunked is None and not dvec.is_memmap
+        np.testing.assert_array_equal(dvec._to_block(), dvecs[0]._to_block())
+
+
+class TestLazyDVector:
+    """Tests for evaluating recorded DVector operations in a fused pass."""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "lazy_idx, operation",
+        [
+            (0, lambda a, s, w, u: a * s),
+            (0, lambda a, s, w, u: (a * s).aggregate(nd.get_segmentation_level("hb_p_m"))),
+            (0, lambda a, s, w, u: (
+                (a * s)
+                .translate_zoning(nd.get_zoning_system("lad_2020"))
+                .aggregate(nd.get_segmentation_level("hb_p_m"))
+                * u.translate_zoning(nd.get_zoning_system("lad_2020"))
+            )),
+            (0, lambda a, s, w, u: (
+                (a * s).aggregate(nd.get_segmentation_level("hb_p_m")) * u * u
+            ).balance_at_segments(u)),
+            (2, lambda a, s, w, u: w.aggregate(nd.get_segmentation_level("hb_p_m")) * u * u),
+            (2, lambda a, s, w, u: (
+                w.aggregate(nd.get_segmentation_level("hb_p_m"))
+                .translate_zoning(nd.get_zoning_system("gor"))
+                * u.translate_zoning(nd.get_zoning_system("gor"))
+            )),
+            (2, lambda a, s, w, u: (
+                (w * w).balance_at_segments(w, split_weekday_weekend=True)
+                .aggregate(nd.get_segmentation_level("hb_p_m"))
+            )),
+        ],
+    )
+    def test_matches_eager(monkeypatch, lazy_idx, operation):
+        """Test evaluating the recorded operations matches running them eagerly."""
+        msoa = nd.get_zoning_system("msoa")
+        dvecs = [
+            _random_dvec("hb_p_m_sic", msoa, seed=1),
+            _random_dvec("sic", seed=2),
+            _random_dvec("hb_p_m_tp_week", msoa, seed=3),
+            _random_dvec("hb_p_m", msoa, seed=4),
+        ]
+        expected = operation(*dvecs)
+
+        # Force the multiplications to be done over several chunks
+        monkeypatch.setattr(nd.DVector, "_block_chunk_size", msoa.n_zones * 7)
+        dvecs[lazy_idx] = dvecs[lazy_idx].lazy()
+        lazy = operation(*dvecs)
+        assert isinstance(lazy, nd.LazyDVector)
+        assert lazy.segmentation == expected.segmentation
+        assert lazy.zoning_system == expected.zoning_system
+
+        result = lazy.evaluate()
+        assert result.segmentation == expected.segmentation
+        assert result.zoning_system == expected.zoning_system
+        assert result.time_format == expected.time_format
+        np.testing.assert_allclose(result._to_block(), expected._to_block(), rtol=1e-10)
+
+    @staticmethod
+    def test_records_without_evaluating():
+        """Test operations are only recorded, and branches are independent."""
+        gor = nd.get_zoning_system("gor")
+        dvec = _random_dvec("hb_p_m_tp_week", gor)
+        lazy = dvec.lazy() * _random_dvec("hb_p_m_tp_week", gor, seed=1)
+        branch = lazy.aggregate(nd.get_segmentation_level("hb_p_m"))
+
+        assert lazy.operations == ["multiply"]
+        assert branch.operations == ["multiply", "segments"]
+        assert lazy.translate_zoning(gor) is lazy
+
+    @staticmethod
+    def test_invalid_operations():
+        """Test invalid operations raise when they are recorded."""
+        gor = nd.get_zoning_system("gor")
+        lazy = _random_dvec("hb_p_m", gor).lazy()
+        with pytest.raises(ValueError):
+            lazy.aggregate("hb_p_m")
+        with pytest.raises(ValueError):
+            lazy.balance_at_segments(_random_dvec("hb_p_m_tp_week", gor))
+        with pytest.raises(nd.ZoningError):
+            lazy * _random_dvec("hb_p_m", nd.get_zoning_system("msoa"))
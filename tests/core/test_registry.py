@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the core.registry module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import threading
+
+# Third party imports
+import pytest
+
+# Local imports
+import normits_demand as nd
+from normits_demand.core import registry
+from normits_demand.core import segments
+from normits_demand.core import zoning
+
+
+##### CLASSES #####
+class TestDefinitionCache:
+    """Tests for the `DefinitionCache` class."""
+
+    @staticmethod
+    @pytest.fixture(name="counting_cache")
+    def fixture_counting_cache():
+        calls = []
+
+        def loader(name):
+            calls.append(name)
+            return {"name": name}
+
+        return registry.DefinitionCache(loader), calls
+
+    @staticmethod
+    def test_loads_once(counting_cache):
+        """Test the loader is only called the first time a name is requested."""
+        cache, calls = counting_cache
+        first = cache.get("a")
+        assert cache.get("a") is first
+        assert calls == ["a"]
+        assert "a" in cache and len(cache) == 1
+
+    @staticmethod
+    def test_invalidate(counting_cache):
+        """Test invalidated names are loaded again."""
+        cache, calls = counting_cache
+        cache.get("a")
+        cache.get("b")
+        cache.invalidate("a")
+        assert cache.names() == ["b"]
+
+        cache.get("a")
+        assert calls == ["a", "b", "a"]
+
+        cache.invalidate()
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_threads_share_instance(counting_cache):
+        """Test concurrent requests only load the definition once."""
+        cache, calls = counting_cache
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("a")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert calls == ["a"]
+        assert all(x is results[0] for x in results)
+
+
+class TestGetters:
+    """Tests for the cached definition getters."""
+
+    @staticmethod
+    def test_zoning_system_cached():
+        """Test the same ZoningSystem is returned each time."""
+        assert nd.get_zoning_system("gor") is nd.get_zoning_system("gor")
+
+        old = nd.get_zoning_system("gor")
+        nd.clear_zoning_system_cache("gor")
+        new = nd.get_zoning_system("gor")
+        assert new is not old
+        assert new == old
+
+    @staticmethod
+    def test_segmentation_cached():
+        """Test the same SegmentationLevel is returned each time."""
+        assert nd.get_segmentation_level("hb_p_m") is nd.get_segmentation_level("hb_p_m")
+
+        old = nd.get_segmentation_level("hb_p_m")
+        nd.clear_segmentation_cache("hb_p_m")
+        new = nd.get_segmentation_level("hb_p_m")
+        assert new is not old
+        assert new == old
+
+
+class TestDefinitionsBundle:
+    """Tests for building and loading definitions bundles."""
+
+    @staticmethod
+    def test_round_trip(tmp_path):
+        """Test a bundle fills the caches with equal definitions."""
+        path = tmp_path / "definitions.pbz2"
+        registry.build_definitions_bundle(
+            path, zoning_names=["gor"], segmentation_names=["hb_p_m"]
+        )
+
+        expected_zoning = nd.get_zoning_system("gor")
+        expected_seg = nd.get_segmentation_level("hb_p_m")
+        nd.clear_zoning_system_cache()
+        nd.clear_segmentation_cache()
+
+        assert registry.load_definitions_bundle(path)
+        assert "gor" in zoning.ZONING_SYSTEM_CACHE
+        assert "hb_p_m" in segments.SEGMENTATION_CACHE
+        assert nd.get_zoning_system("gor") == expected_zoning
+        assert nd.get_segmentation_level("hb_p_m") == expected_seg
+
+    @staticmethod
+    def test_env_var(tmp_path, monkeypatch):
+        """Test the bundle is only loaded when the env var points to a file."""
+        monkeypatch.delenv(registry.BUNDLE_ENV_VAR, raising=False)
+        assert not registry.load_bundle_from_env()
+
+        monkeypatch.setenv(registry.BUNDLE_ENV_VAR, str(tmp_path / "missing.pbz2"))
+        assert not registry.load_bundle_from_env()
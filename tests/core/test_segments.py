@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the core.segments module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import os
+import pickle
+
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+import normits_demand as nd
+
+
+##### FIXTURES #####
+@pytest.fixture(autouse=True)
+def fixture_cpu_count(monkeypatch):
+    """Make sure segment names can be built with the default process count."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+
+##### CLASSES #####
+class TestOperationPlans:
+    """Tests for the memoised segmentation operation plans."""
+
+    @staticmethod
+    @pytest.fixture(name="hb_p_m")
+    def fixture_hb_p_m():
+        # Fresh copies so other tests' plans aren't reused
+        return nd.get_segmentation_level("hb_p_m").copy()
+
+    @staticmethod
+    def test_plans_reused(hb_p_m):
+        """Test the same plan is returned for the same pair of segmentations."""
+        sic = nd.get_segmentation_level("hb_p_m_sic").copy()
+        week = nd.get_segmentation_level("hb_p_m_tp_week").copy()
+
+        assert (sic * nd.get_segmentation_level("sic")) is (sic * nd.get_segmentation_level("sic"))
+        assert week.aggregate(hb_p_m) is week.aggregate(hb_p_m)
+        assert week.aggregate(hb_p_m) is week.aggregate(hb_p_m.copy())
+        assert week.aggregation_matrix(hb_p_m) is week.aggregation_matrix(hb_p_m)
+
+    @staticmethod
+    def test_subset_indices(hb_p_m):
+        """Test the subset indices select the subset segment names."""
+        car = nd.get_segmentation_level("hb_p_m_car")
+        subset_idx = hb_p_m.subset_indices(car)
+
+        names = np.array(hb_p_m.segment_names)[subset_idx]
+        assert names.tolist() == car.segment_names
+        assert sorted(hb_p_m.subset(car)) == sorted(car.segment_names)
+        assert not subset_idx.flags.writeable
+
+    @staticmethod
+    def test_multiply_indices(hb_p_m):
+        """Test the multiply indices match the multiply dictionary."""
+        sic = nd.get_segmentation_level("hb_p_m_sic").copy()
+        other = nd.get_segmentation_level("sic")
+        self_idx, other_idx, return_seg = sic.multiply_indices(other)
+        multiply_dict, _ = sic * other
+
+        for i, name in enumerate(return_seg.segment_names):
+            self_name, other_name = multiply_dict[name]
+            assert sic.segment_names[self_idx[i]] == self_name
+            assert other.segment_names[other_idx[i]] == other_name
+
+    @staticmethod
+    def test_pickle_drops_plans(hb_p_m):
+        """Test cached plans aren't pickled with the segmentation."""
+        hb_p_m.subset(nd.get_segmentation_level("hb_p_m_car"))
+        # pylint: disable=protected-access
+        assert len(hb_p_m._plan_cache) == 1
+
+        loaded = pickle.loads(pickle.dumps(hb_p_m))
+        assert loaded == hb_p_m
+        assert loaded._plan_cache == dict()
+
+
+class TestSegmentIds:
+    """Tests for the integer segment id lookups."""
+
+    @staticmethod
+    @pytest.fixture(name="segmentation", scope="class")
+    def fixture_segmentation():
+        return nd.get_segmentation_level("hb_p_m_sic")
+
+    @staticmethod
+    def test_round_trip(segmentation):
+        """Test names, ids and params all convert back to each other."""
+        ids = segmentation.get_segment_ids(segmentation.segment_names)
+        np.testing.assert_array_equal(ids, segmentation.segment_ids)
+        assert segmentation.get_segment_names(ids[::-1]) == segmentation.segment_names[::-1]
+
+        for seg_id, name in enumerate(segmentation.segment_names):
+            seg_dict = segmentation.get_seg_dict(name)
+            assert segmentation.get_segment_id(name) == seg_id
+            assert segmentation.get_segment_name(seg_dict) == name
+            assert segmentation.is_valid_segment_params(seg_dict)
+            assert tuple(segmentation.segment_params[seg_id]) == tuple(seg_dict.values())
+
+    @staticmethod
+    def test_seg_dict_types(segmentation):
+        """Test segment values are cast to the segment types."""
+        seg_dict = segmentation.get_seg_dict(segmentation.segment_names[0])
+        for col, col_type in segmentation.segment_types.items():
+            assert isinstance(seg_dict[col], col_type)
+
+        # Editing the returned dictionary doesn't change the segmentation
+        seg_dict["p"] = -1
+        assert segmentation.get_seg_dict(segmentation.segment_names[0])["p"] != -1
+
+    @staticmethod
+    def test_invalid_names(segmentation):
+        """Test an error is raised for segment names not in the segmentation."""
+        with pytest.raises(ValueError, match="not_a_segment"):
+            segmentation.get_segment_ids([segmentation.segment_names[0], "not_a_segment"])
+        with pytest.raises(ValueError):
+            segmentation.get_seg_dict("not_a_segment")
+        assert not segmentation.is_valid_segment_params({"p": -1, "m": 1, "sic": 1})
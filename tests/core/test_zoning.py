@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the core.zoning module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pytest
+from scipy import sparse
+
+# Local imports
+import normits_demand as nd
+from normits_demand.utils import pandas_utils as pd_utils
+
+
+##### CLASSES #####
+class TestTranslateSparse:
+    """Tests for the `ZoningSystem.translate_sparse` method."""
+
+    @staticmethod
+    @pytest.fixture(name="zoning_pair", scope="class")
+    def fixture_zoning_pair():
+        return nd.get_zoning_system("msoa"), nd.get_zoning_system("gor")
+
+    @staticmethod
+    def test_matches_definition(zoning_pair):
+        """Test the sparse translation matches the wide definition."""
+        msoa, gor = zoning_pair
+        translation = msoa.translate_sparse(gor)
+
+        # pylint: disable=protected-access
+        expected = pd_utils.long_to_wide_infill(
+            df=msoa._get_translation_definition(gor),
+            index_col="msoa_zone_id",
+            columns_col="gor_zone_id",
+            values_col="msoa_to_gor",
+            index_vals=msoa.unique_zones,
+            column_vals=gor.unique_zones,
+            infill=0,
+        ).values
+
+        assert sparse.isspmatrix_csr(translation)
+        np.testing.assert_array_equal(translation.toarray(), expected)
+        np.testing.assert_array_equal(msoa.translate(gor), expected)
+
+    @staticmethod
+    def test_cached(zoning_pair, monkeypatch):
+        """Test the translation definition is only read once."""
+        msoa, gor = zoning_pair
+        nd.ZoningSystem.clear_translation_cache()
+        first = msoa.translate_sparse(gor)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError("Translation definition read again")
+
+        monkeypatch.setattr(nd.ZoningSystem, "_get_translation_definition", _fail)
+        assert msoa.translate_sparse(gor) is first
+        assert msoa.translate(gor).shape == (msoa.n_zones, gor.n_zones)
+
+    @staticmethod
+    def test_invalid_weighting(zoning_pair):
+        """Test an error is raised for an unknown weighting."""
+        msoa, gor = zoning_pair
+        with pytest.raises(ValueError):
+            msoa.translate_sparse(gor, weighting="not_a_weighting")
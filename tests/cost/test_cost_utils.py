@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the cost.utils module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Third party imports
+import numpy as np
+import pytest
+
+# Local imports
+from normits_demand.cost import utils as cost_utils
+
+
+##### FIXTURES #####
+@pytest.fixture(name="costs", scope="module")
+def fixture_costs():
+    """Random costs, with some cells exactly on band edges."""
+    rng = np.random.default_rng(0)
+    costs = rng.random((30, 30)) * 60
+    costs[0, :5] = [0, 5, 10, 50, 55]
+    return costs
+
+
+@pytest.fixture(name="trips", scope="module")
+def fixture_trips():
+    """Random trips, with some empty cells."""
+    rng = np.random.default_rng(1)
+    return rng.random((30, 30)) * (rng.random((30, 30)) > 0.2)
+
+
+##### CLASSES #####
+class TestCostBandIndex:
+    """Tests for the `CostBandIndex` class."""
+
+    bin_edges = np.array([0, 5, 10, 20, 35, 50])
+
+    def test_band_trips(self, costs, trips):
+        """Test band trips match a histogram of the costs."""
+        band_index = cost_utils.CostBandIndex(costs, bin_edges=self.bin_edges)
+        expected, _ = np.histogram(costs, bins=self.bin_edges, weights=trips)
+
+        np.testing.assert_allclose(band_index.band_trips(trips), expected)
+        np.testing.assert_allclose(
+            cost_utils.cost_distribution(
+                trips, costs, bin_edges=self.bin_edges, band_index=band_index
+            ),
+            cost_utils.cost_distribution(trips, costs, bin_edges=self.bin_edges),
+        )
+
+    def test_cell_counts(self, costs):
+        """Test the number of cells in each band matches `cells_in_bounds`."""
+        band_index = cost_utils.CostBandIndex(costs, bin_edges=self.bin_edges)
+        expected = cost_utils.cells_in_bounds(
+            self.bin_edges[:-1], self.bin_edges[1:], costs
+        )
+        np.testing.assert_array_equal(band_index.cell_counts(), expected)
+
+        # Last edge isn't in the band when ignoring it
+        np.testing.assert_allclose(
+            band_index.band_trips(np.ones_like(costs), include_last_edge=False),
+            expected,
+        )
+
+    def test_band_mean_costs(self, costs, trips):
+        """Test average costs match `calculate_average_cost_in_bounds`."""
+        band_index = cost_utils.CostBandIndex(costs, bin_edges=self.bin_edges)
+        trips = trips.copy()
+        trips[(costs >= 20) & (costs < 35)] = 0
+
+        kwargs = dict(
+            cost_matrix=costs,
+            min_bounds=self.bin_edges[:-1],
+            max_bounds=self.bin_edges[1:],
+            trips=trips,
+        )
+        np.testing.assert_allclose(
+            cost_utils.calculate_average_cost_in_bounds(**kwargs, band_index=band_index),
+            cost_utils.calculate_average_cost_in_bounds(**kwargs),
+        )
+
+    def test_spread(self, costs):
+        """Test band values are spread back to the cells in each band."""
+        band_index = cost_utils.CostBandIndex(
+            costs, min_bounds=[5, 10, 20], max_bounds=[10, 20, 30]
+        )
+        spread = band_index.spread(np.array([1.0, 2.0, 3.0]), fill_value=-1)
+
+        assert spread.shape == costs.shape
+        np.testing.assert_array_equal(spread[(costs >= 5) & (costs < 10)], 1)
+        np.testing.assert_array_equal(spread[(costs >= 20) & (costs < 30)], 3)
+        np.testing.assert_array_equal(spread[(costs < 5) | (costs >= 30)], -1)
+
+    @staticmethod
+    def test_invalid_inputs(costs):
+        """Test an error is raised for missing or unordered bounds."""
+        with pytest.raises(ValueError):
+            cost_utils.CostBandIndex(costs)
+        with pytest.raises(ValueError):
+            cost_utils.CostBandIndex(costs, min_bounds=[10, 0], max_bounds=[20, 10])
+
+        band_index = cost_utils.CostBandIndex(costs, bin_edges=[0, 10, 20])
+        with pytest.raises(ValueError):
+            band_index.band_trips(np.ones((5, 5)))
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the distribution.furness module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pytest
+from scipy import sparse
+
+# Local imports
+from normits_demand.distribution import furness
+
+
+##### FIXTURES #####
+@pytest.fixture(name="furness_inputs")
+def fixture_furness_inputs():
+    """Build a sparse seed matrix with consistent row and column targets."""
+    rng = np.random.default_rng(42)
+    n_zones = 50
+    seed = rng.random((n_zones, n_zones))
+    seed[rng.random((n_zones, n_zones)) < 0.7] = 0
+    np.fill_diagonal(seed, 1)
+
+    row_targets = rng.random(n_zones) * 100
+    col_targets = rng.random(n_zones) * 100
+    col_targets *= row_targets.sum() / col_targets.sum()
+    return seed, row_targets, col_targets
+
+
+##### CLASSES #####
+class TestSparseFurness:
+    """Tests for the `sparse_doubly_constrained_furness` function."""
+
+    @staticmethod
+    def test_matches_dense(furness_inputs):
+        """Test the sparse furness gives the same result as the dense one."""
+        seed, row_targets, col_targets = furness_inputs
+        kwargs = {"row_targets": row_targets, "col_targets": col_targets, "tol": 1e-6}
+
+        dense_mat, dense_iters, _ = furness.doubly_constrained_furness(seed, **kwargs)
+        sparse_mat, sparse_iters, _ = furness.sparse_doubly_constrained_furness(
+            seed, **kwargs
+        )
+
+        assert isinstance(sparse_mat, np.ndarray)
+        assert dense_iters == sparse_iters
+        np.testing.assert_allclose(sparse_mat, dense_mat, rtol=1e-10)
+
+    @staticmethod
+    def test_sparse_in_sparse_out(furness_inputs):
+        """Test a sparse seed is returned as a sparse matrix, hitting targets."""
+        seed, row_targets, col_targets = furness_inputs
+
+        result, *_ = furness.sparse_doubly_constrained_furness(
+            sparse.coo_matrix(seed),
+            row_targets=row_targets,
+            col_targets=col_targets,
+            tol=1e-6,
+        )
+
+        assert sparse.isspmatrix_csr(result)
+        assert result.nnz == np.count_nonzero(seed)
+        np.testing.assert_allclose(result.toarray().sum(axis=1), row_targets, rtol=1e-5)
+        np.testing.assert_allclose(result.toarray().sum(axis=0), col_targets, rtol=1e-5)
+
+    @staticmethod
+    def test_bad_shape(furness_inputs):
+        """Test an error is raised when the seed and targets do not match."""
+        seed, row_targets, col_targets = furness_inputs
+        with pytest.raises(ValueError):
+            furness.sparse_doubly_constrained_furness(
+                seed[:-1], row_targets=row_targets, col_targets=col_targets
+            )
+
+
+class TestDoublyConstrainedFurness:
+    """Tests for the `doubly_constrained_furness` function."""
+
+    @staticmethod
+    @pytest.mark.parametrize("check_every", [1, 3, 7])
+    def test_check_every(furness_inputs, check_every: int):
+        """Test convergence is only checked on every `check_every` iteration."""
+        seed, row_targets, col_targets = furness_inputs
+
+        matrix, iters, rmse = furness.doubly_constrained_furness(
+            seed,
+            row_targets=row_targets,
+            col_targets=col_targets,
+            tol=1e-6,
+            check_every=check_every,
+        )
+
+        assert iters % check_every == 0
+        assert rmse < 1e-6
+        np.testing.assert_allclose(matrix.sum(axis=1), row_targets, rtol=1e-5)
+
+    @staticmethod
+    def test_max_iters_always_checked(furness_inputs):
+        """Test the RMSE is calculated on the final iteration."""
+        seed, row_targets, col_targets = furness_inputs
+
+        _, iters, rmse = furness.doubly_constrained_furness(
+            seed,
+            row_targets=row_targets,
+            col_targets=col_targets,
+            tol=0,
+            max_iters=5,
+            warning=False,
+            check_every=100,
+        )
+
+        assert iters == 5
+        assert np.isfinite(rmse)
+
+    @staticmethod
+    def test_invalid_check_every(furness_inputs):
+        """Test an error is raised for a non-positive `check_every`."""
+        seed, row_targets, col_targets = furness_inputs
+        with pytest.raises(ValueError):
+            furness.doubly_constrained_furness(
+                seed, row_targets=row_targets, col_targets=col_targets, check_every=0
+            )
+
+
+class TestBatchedFurness:
+    """Tests for the `batched_doubly_constrained_furness` function."""
+
+    @staticmethod
+    def _build_stack(n_segs: int = 4, n_zones: int = 20):
+        rng = np.random.default_rng(7)
+        seeds = rng.random((n_segs, n_zones, n_zones))
+        row_targets = rng.random((n_segs, n_zones)) * 100
+        col_targets = rng.random((n_segs, n_zones)) * 100
+        col_targets *= (row_targets.sum(axis=1) / col_targets.sum(axis=1))[:, np.newaxis]
+
+        # Make one segment much slower to converge
+        seeds[0] **= 8
+        return seeds, row_targets, col_targets
+
+    def test_matches_2d_furness(self):
+        """Test each segment matches running the 2D furness on its own."""
+        seeds, row_targets, col_targets = self._build_stack()
+
+        mats, iters, rmses = furness.batched_doubly_constrained_furness(
+            seeds, row_targets, col_targets, tol=1e-8
+        )
+
+        for i, seed in enumerate(seeds):
+            mat, seg_iters, seg_rmse = furness.doubly_constrained_furness(
+                seed, row_targets[i], col_targets[i], tol=1e-8
+            )
+            assert iters[i] == seg_iters
+            np.testing.assert_allclose(mats[i], mat, rtol=1e-10)
+            np.testing.assert_allclose(rmses[i], seg_rmse, rtol=1e-6)
+
+        # Check convergence masking let segments drop out at different times
+        assert len(np.unique(iters)) > 1
+
+    def test_zero_targets(self):
+        """Test segments with zero targets are returned as zeros."""
+        seeds, row_targets, col_targets = self._build_stack()
+        row_targets[1] = 0
+
+        with pytest.warns(UserWarning):
+            mats, iters, rmses = furness.batched_doubly_constrained_furness(
+                seeds, row_targets, col_targets, tol=1e-8
+            )
+
+        assert np.all(mats[1] == 0)
+        assert iters[1] == 0 and np.isinf(rmses[1])
+        np.testing.assert_allclose(mats[2].sum(axis=1), row_targets[2], rtol=1e-6)
+
+    def test_bad_shape(self):
+        """Test an error is raised when the targets do not match the seeds."""
+        seeds, row_targets, col_targets = self._build_stack()
+        with pytest.raises(ValueError):
+            furness.batched_doubly_constrained_furness(
+                seeds, row_targets[:-1], col_targets
+            )
+
+
+class TestAcceleratedFurness:
+    """Tests for the `accelerated_doubly_constrained_furness` function."""
+
+    @staticmethod
+    def _build_gravity_inputs(n_zones: int = 60, beta: float = 0.3):
+        rng = np.random.default_rng(3)
+        coords = rng.random((n_zones, 2)) * 100
+        cost = np.sqrt(((coords[:, np.newaxis] - coords[np.newaxis]) ** 2).sum(axis=-1)) + 1
+        seed = np.exp(-beta * cost)
+
+        row_targets = rng.random(n_zones) ** 3 * 1000
+        col_targets = rng.random(n_zones) ** 3 * 1000
+        row_targets[:2] = 0
+        col_targets[-2:] = 0
+        col_targets *= row_targets.sum() / col_targets.sum()
+        return seed, row_targets, col_targets
+
+    def test_matches_dense_in_fewer_iters(self):
+        """Test the result matches the plain furness, but converges faster."""
+        seed, row_targets, col_targets = self._build_gravity_inputs()
+        kwargs = {"row_targets": row_targets, "col_targets": col_targets, "tol": 1e-8}
+
+        dense_mat, dense_iters, _ = furness.doubly_constrained_furness(seed, **kwargs)
+        acc_mat, acc_iters, acc_rmse = furness.accelerated_doubly_constrained_furness(
+            seed, **kwargs
+        )
+
+        assert acc_iters < dense_iters
+        assert acc_rmse < 1e-8
+        np.testing.assert_allclose(acc_mat, dense_mat, atol=1e-5)
+        np.testing.assert_allclose(acc_mat.sum(axis=1), row_targets, atol=1e-8)
+
+    def test_sparse_in_sparse_out(self):
+        """Test a sparse seed is returned as a sparse matrix, hitting targets."""
+        seed, row_targets, col_targets = self._build_gravity_inputs()
+        seed[seed < 1e-6] = 0
+
+        result, *_ = furness.accelerated_doubly_constrained_furness(
+            sparse.csr_matrix(seed),
+            row_targets=row_targets,
+            col_targets=col_targets,
+            tol=1e-8,
+        )
+
+        assert sparse.isspmatrix_csr(result)
+        np.testing.assert_allclose(result.toarray().sum(axis=1), row_targets, atol=1e-6)
+        np.testing.assert_allclose(result.toarray().sum(axis=0), col_targets, atol=1e-6)
+
+    def test_no_iterations(self):
+        """Test the seed is returned unchanged when no iterations are allowed."""
+        seed, row_targets, col_targets = self._build_gravity_inputs()
+        result, iters, rmse = furness.accelerated_doubly_constrained_furness(
+            seed, row_targets, col_targets, max_iters=0, warning=False,
+        )
+
+        np.testing.assert_array_equal(result, seed)
+        assert iters == 0
+        assert rmse == np.inf
+
+    @staticmethod
+    def test_unreachable_row_target():
+        """Test rows without seed values are included in the RMSE."""
+        seed = np.array([[1, 1, 0], [1, 1, 0], [0, 0, 0]], dtype=float)
+        kwargs = {
+            "row_targets": np.array([5, 5, 5], dtype=float),
+            "col_targets": np.array([5, 5, 0], dtype=float),
+            "max_iters": 100,
+            "warning": False,
+        }
+
+        _, dense_iters, dense_rmse = furness.doubly_constrained_furness(seed, **kwargs)
+        result, acc_iters, acc_rmse = furness.accelerated_doubly_constrained_furness(
+            seed, **kwargs
+        )
+
+        assert dense_iters == acc_iters == 100
+        assert acc_rmse == pytest.approx(dense_rmse)
+        np.testing.assert_allclose(result.sum(axis=1), [5, 5, 0])
+
+    def test_get_furness_function(self):
+        """Test the accelerated furness takes priority when requested."""
+        fn = furness.get_furness_function(use_sparse=True, use_accelerated=True)
+        assert fn is furness.accelerated_doubly_constrained_furness
+
+
+class TestBalancingFactorCache:
+    """Tests for the `BalancingFactorCache` class."""
+
+    @staticmethod
+    def _build_inputs(beta: float, n_zones: int = 40):
+        rng = np.random.default_rng(11)
+        coords = rng.random((n_zones, 2)) * 100
+        cost = np.sqrt(((coords[:, np.newaxis] - coords[np.newaxis]) ** 2).sum(axis=-1)) + 1
+
+        row_targets = rng.random(n_zones) * 100
+        col_targets = rng.random(n_zones) * 100
+        row_targets[0] = 0
+        col_targets *= row_targets.sum() / col_targets.sum()
+        return np.exp(-beta * cost), row_targets, col_targets
+
+    def test_estimate_balancing_factors(self):
+        """Test the estimated factors rebuild the furnessed matrix."""
+        seed, row_targets, col_targets = self._build_inputs(beta=0.1)
+        matrix, *_ = furness.doubly_constrained_furness(
+            seed, row_targets, col_targets, tol=1e-8
+        )
+
+        row_factors, col_factors = furness.estimate_balancing_factors(seed, matrix)
+
+        # Rows furnessed away are left unscaled, so they can be filled later
+        assert row_factors[0] == 1
+        rebuilt = seed * row_factors[:, np.newaxis] * col_factors
+        np.testing.assert_allclose(rebuilt[1:], matrix[1:], rtol=1e-8, atol=1e-12)
+
+    def test_warm_start(self):
+        """Test a warm started furness gives the same result in fewer iters."""
+        cache = furness.BalancingFactorCache()
+        seed, row_targets, col_targets = self._build_inputs(beta=0.1)
+        kwargs = {"row_targets": row_targets, "col_targets": col_targets, "tol": 1e-8}
+
+        # Nothing cached yet
+        assert cache.warm_start(seed) is seed
+        matrix, *_ = furness.doubly_constrained_furness(seed, **kwargs)
+        cache.update(seed, matrix)
+
+        new_seed, *_ = self._build_inputs(beta=0.1001)
+        cold_mat, cold_iters, _ = furness.doubly_constrained_furness(new_seed, **kwargs)
+        warm_mat, warm_iters, _ = furness.doubly_constrained_furness(
+            cache.warm_start(new_seed), **kwargs
+        )
+
+        assert warm_iters < cold_iters
+        np.testing.assert_allclose(warm_mat, cold_mat, rtol=1e-6, atol=1e-8)
+
+    def test_failed_furness_not_cached(self):
+        """Test a failed furness clears the cache instead of poisoning it."""
+        cache = furness.BalancingFactorCache()
+        seed, row_targets, col_targets = self._build_inputs(beta=0.1)
+        matrix, *_ = furness.doubly_constrained_furness(
+            seed, row_targets, col_targets, tol=1e-8
+        )
+        cache.update(seed, matrix)
+        assert cache.row_factors is not None
+
+        # A furness that hit a NaN returns all 0's
+        cache.update(seed, np.zeros_like(seed))
+        assert cache.row_factors is None
+        assert cache.warm_start(seed) is seed
+
+        cache.update(seed, matrix, converged=False)
+        assert cache.row_factors is None
+
+        bad_matrix = matrix.copy()
+        bad_matrix[1, 1] = np.nan
+        cache.update(seed, bad_matrix)
+        assert cache.row_factors is None
+
+    def test_zero_rows_refilled(self):
+        """Test a row that was 0 in one run can be filled in the next."""
+        cache = furness.BalancingFactorCache()
+        seed, row_targets, col_targets = self._build_inputs(beta=0.1)
+        matrix, *_ = furness.doubly_constrained_furness(
+            seed, row_targets, col_targets, tol=1e-8
+        )
+        cache.update(seed, matrix)
+
+        # Now the first row has a target
+        new_rows = row_targets.copy()
+        new_rows[0] = new_rows[1:].mean()
+        new_cols = col_targets * new_rows.sum() / col_targets.sum()
+        kwargs = {"row_targets": new_rows, "col_targets": new_cols, "tol": 1e-8}
+
+        cold_mat, cold_iters, _ = furness.doubly_constrained_furness(seed, **kwargs)
+        warm_mat, warm_iters, warm_rmse = furness.doubly_constrained_furness(
+            cache.warm_start(seed), **kwargs
+        )
+
+        assert warm_rmse < 1e-8
+        assert warm_iters <= cold_iters
+        np.testing.assert_allclose(warm_mat, cold_mat, rtol=1e-6, atol=1e-8)
+
+    def test_disabled(self):
+        """Test nothing is cached or applied when disabled."""
+        cache = furness.BalancingFactorCache(enabled=False)
+        seed, row_targets, col_targets = self._build_inputs(beta=0.1)
+        matrix, *_ = furness.doubly_constrained_furness(seed, row_targets, col_targets)
+
+        cache.update(seed, matrix)
+        assert cache.row_factors is None
+        assert cache.warm_start(seed) is seed
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the distribution.gravity_model module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand import cost
+from normits_demand.distribution import furness
+from normits_demand.distribution import gravity_model
+
+
+##### CONSTANTS #####
+BIN_EDGES = np.array([0, 5, 10, 20, 40, 80, 200])
+
+
+##### FIXTURES #####
+@pytest.fixture(name="gravity_inputs", scope="module")
+def fixture_gravity_inputs():
+    """Build a cost matrix, trip ends and a target cost distribution."""
+    rng = np.random.default_rng(0)
+    n_zones = 60
+    coords = rng.random((n_zones, 2)) * 100
+    cost_matrix = np.sqrt(((coords[:, np.newaxis] - coords[np.newaxis]) ** 2).sum(axis=-1)) + 1
+
+    row_targets = rng.random(n_zones) * 100
+    col_targets = rng.random(n_zones) * 100
+    col_targets *= row_targets.sum() / col_targets.sum()
+
+    matrix, *_ = furness.doubly_constrained_furness(
+        np.exp(-0.05 * cost_matrix), row_targets, col_targets, tol=1e-10
+    )
+    trips = np.histogram(cost_matrix, BIN_EDGES, weights=matrix)[0]
+    tcd = pd.DataFrame({
+        "min": BIN_EDGES[:-1],
+        "max": BIN_EDGES[1:],
+        "trips": trips,
+        "ave_km": (BIN_EDGES[:-1] + BIN_EDGES[1:]) / 2,
+    })
+    return cost_matrix, row_targets, col_targets, tcd
+
+
+##### CLASSES #####
+class TestAnalyticJacobian:
+    """Tests for `GravityModelBase._analytic_jacobian_function`."""
+
+    @staticmethod
+    def _build_calibrator(gravity_inputs, cost_function, **kwargs):
+        cost_matrix, row_targets, col_targets, tcd = gravity_inputs
+        calibrator = gravity_model.GravityModelCalibrator(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            cost_function=cost_function,
+            cost_matrix=cost_matrix,
+            target_cost_distribution=tcd.copy(),
+            target_convergence=0.9,
+            furness_max_iters=5000,
+            furness_tol=1e-10,
+            running_log_path=None,
+            use_perceived_factors=False,
+            use_warm_start_furness=False,
+            **kwargs,
+        )
+        # pylint: disable=protected-access
+        calibrator._initialise_calibrate_params()
+        return calibrator
+
+    @pytest.mark.parametrize(
+        "cost_function, cost_args",
+        [
+            (cost.BuiltInCostFunction.TANNER, [0.3, -0.08]),
+            (cost.BuiltInCostFunction.LOG_NORMAL, [1.1, 2.5]),
+        ],
+    )
+    def test_matches_finite_difference(self, gravity_inputs, cost_function, cost_args):
+        """Test the analytic jacobian matches re-running the gravity model."""
+        # pylint: disable=protected-access
+        calibrator = self._build_calibrator(
+            gravity_inputs,
+            cost_function.get_cost_function(),
+            use_analytic_jacobian=True,
+        )
+
+        step = 1e-5
+        base_residuals = calibrator._gravity_function(cost_args, diff_step=1e-8)
+        jacobian = calibrator._analytic_jacobian_function(cost_args, diff_step=1e-8)
+
+        for i in range(len(cost_args)):
+            adj_args = list(cost_args)
+            adj_args[i] += step
+            adj_residuals = calibrator._gravity_function(adj_args, diff_step=1e-8)
+            expected = (adj_residuals - base_residuals) / step
+            np.testing.assert_allclose(jacobian[:, i], expected, atol=1e-3)
+
+        # Only the final matrix should have been kept
+        assert calibrator._jacobian_mats == dict()
+
+    def test_no_log_gradient(self, gravity_inputs):
+        """Test an error is raised if the cost function has no log gradient."""
+        cost_function = cost.CostFunction(
+            name="custom",
+            params={"beta": [0, 1]},
+            function=lambda base_cost, beta, min_return_val=0: np.exp(-beta * base_cost),
+        )
+        with pytest.raises(ValueError):
+            self._build_calibrator(gravity_inputs, cost_function, use_analytic_jacobian=True)
+
+
+class TestMultiAreaGravityModelCalibrator:
+    """Tests for `MultiAreaGravityModelCalibrator`."""
+
+    @staticmethod
+    @pytest.mark.parametrize("memory_optimised", [True, False])
+    def test_calibrate(gravity_inputs, memory_optimised, tmp_path):
+        """Test the area calibrator threads run without a balancing factor cache."""
+        cost_matrix, row_targets, col_targets, tcd = gravity_inputs
+        calibration_matrix = np.ones_like(cost_matrix, dtype=int)
+        calibration_matrix[len(cost_matrix) // 2:] = 2
+
+        calibrator = gravity_model.MultiAreaGravityModelCalibrator(
+            row_targets=row_targets,
+            col_targets=col_targets,
+            calibration_matrix=calibration_matrix,
+            cost_function=cost.BuiltInCostFunction.TANNER.get_cost_function(),
+            cost_matrix=cost_matrix,
+            target_cost_distributions={1: tcd.copy(), 2: tcd.copy()},
+            calibration_naming={1: "north", 2: "south"},
+            target_convergence=0.9,
+            furness_max_iters=1000,
+            furness_tol=1e-6,
+            running_log_path=tmp_path / "log.csv",
+            use_perceived_factors=False,
+            memory_optimised=memory_optimised,
+        )
+        optimal_params = calibrator.calibrate(
+            init_params={"alpha": 0.3, "beta": -0.08},
+            grav_max_iters=3,
+        )
+
+        assert set(optimal_params) == {1, 2}
+        assert np.isfinite(calibrator.achieved_full_distribution).all()
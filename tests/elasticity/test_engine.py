@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the elasticity engine module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from collections import defaultdict
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+import normits_demand as nd
+from normits_demand.elasticity import engine
+from normits_demand.elasticity import generalised_costs as gc
+from normits_demand.models import elasticity_model as em
+
+
+##### CONSTANTS #####
+ZONES = [1, 2, 3, 4]
+FUTURE_GC_PARAMS = {"car": {"vot": 17.2, "voc": 9.95}, "rail": {"vot": 17.4}}
+COST_CHANGES = pd.DataFrame(
+    {
+        "mode": ["car", "rail", "rail", "bus", "car", "active", "rail"],
+        "cost_component": ["time", "fare", "walk", "fare", "gc", "gc", "fare"],
+        "e_type": [
+            "car_time",
+            "rail_fare",
+            "rail_walk",
+            "bus_fare",
+            "car_gc",
+            "active_gc",
+            "rail_fare",
+        ],
+        "adj_type": ["half", "all", "half", "weights", "half", "all", "half"],
+        "change": [1.1, 0.9, 1.2, 1.15, 1.05, 0.95, 1.07],
+    }
+)
+
+
+##### FIXTURES #####
+@pytest.fixture(name="inputs", scope="module")
+def fixture_inputs():
+    """Random costs, demand, elasticities and constraints for one segment."""
+    rng = np.random.default_rng(0)
+    n = len(ZONES)
+    od = {"origin": np.repeat(ZONES, n), "destination": np.tile(ZONES, n)}
+    costs = {
+        "car": pd.DataFrame({
+            **od,
+            "time": rng.random(n * n) * 60,
+            "dist": rng.random(n * n) * 100,
+            "toll": rng.integers(0, 5, n * n),
+        }),
+        "rail": pd.DataFrame({
+            **od,
+            "walk": rng.random(n * n) * 10,
+            "wait": rng.random(n * n) * 10,
+            "ride": rng.random(n * n) * 60,
+            # Integer fares are truncated when adjusted
+            "fare": rng.integers(100, 900, n * n),
+            "num_int": rng.integers(0, 3, n * n),
+        }),
+    }
+    costs.update(dict.fromkeys(["bus", "active", "no_travel"], 1.0))
+
+    demand = {
+        m: pd.DataFrame(rng.random((n, n)), index=ZONES, columns=ZONES)
+        for m in ("car", "rail")
+    }
+    demand.update(dict.fromkeys(["bus", "active", "no_travel"], 1.0))
+
+    changes = COST_CHANGES[["e_type", "mode"]].drop_duplicates()
+    rows = [
+        (e_type, mode, aff_mode, rng.normal(-0.1, 0.2))
+        for e_type, mode in changes.itertuples(index=False)
+        for aff_mode in demand
+    ]
+    # Affected modes can be given more than once
+    rows.append(("rail_fare", "rail", "car", 0.05))
+    elasticities = pd.DataFrame(
+        rows, columns=["type", "changing_mode", "affected_mode", "elast_value"]
+    )
+
+    constraints = {
+        "all": np.ones((n, n)),
+        "half": (rng.random((n, n)) > 0.5).astype(float),
+        "weights": rng.random((n, n)) * 2,
+    }
+    base_year_gc = gc.calculate_gen_costs(
+        costs, {"car": {"vot": 16.2, "voc": 9.45}, "rail": {"vot": 16.4}}
+    )
+    return demand, costs, base_year_gc, elasticities, constraints
+
+
+##### CLASSES #####
+class TestElasticityEngine:
+    """Tests for the `ElasticityEngine` class."""
+
+    @staticmethod
+    def test_matches_own_cost_adjustment(inputs):
+        """Test the adjustments match applying each cost change separately."""
+        demand, costs, base_year_gc, elasticities, constraints = inputs
+
+        expected = defaultdict(list)
+        for mode, cost, e_type, adj_type, change in COST_CHANGES.itertuples(index=False):
+            adjustment = em.calculate_own_cost_adjustment(
+                demand=demand,
+                base_costs=costs,
+                base_year_gc=base_year_gc,
+                elasticities=elasticities[elasticities["type"] == e_type],
+                changing_mode=mode,
+                changing_cost=cost,
+                elasticity_type=e_type,
+                cost_constraint=constraints[adj_type],
+                cost_change=change,
+                future_scalar_costs=FUTURE_GC_PARAMS,
+                base_year=2018,
+                future_year=2030,
+            )
+            for aff_mode, value in adjustment.items():
+                expected[aff_mode].append(value)
+
+        elasticity_engine = engine.ElasticityEngine(
+            demand, costs, base_year_gc, FUTURE_GC_PARAMS
+        )
+        compiled = elasticity_engine.compile(COST_CHANGES, elasticities, constraints)
+        assert compiled.gc_ratios.shape == (len(COST_CHANGES), len(ZONES), len(ZONES))
+        assert compiled.elasticities.shape == (len(COST_CHANGES), 5)
+
+        adjustments = elasticity_engine.demand_adjustments(compiled)
+        assert sorted(adjustments) == sorted(expected)
+        for mode, values in expected.items():
+            np.testing.assert_allclose(adjustments[mode], np.prod(values, axis=0), rtol=1e-12)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "mode, cost, error",
+        [
+            ("car", "voc", nd.ElasticityError),
+            ("car", "toll", ValueError),
+            ("rail", "missing", KeyError),
+            ("tram", "fare", KeyError),
+        ],
+    )
+    def test_invalid_changes(inputs, mode, cost, error):
+        """Test an error is raised for cost changes which can't be applied."""
+        demand, costs, base_year_gc, elasticities, constraints = inputs
+        cost_changes = COST_CHANGES.iloc[:1].assign(mode=mode, cost_component=cost)
+
+        elasticity_engine = engine.ElasticityEngine(
+            demand, costs, base_year_gc, FUTURE_GC_PARAMS
+        )
+        with pytest.raises(error):
+            elasticity_engine.compile(cost_changes, elasticities, constraints)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the forecasting.edge_replicant module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from pathlib import Path
+
+# Third party imports
+import pandas as pd
+import pytest
+
+# Local imports
+# Needs the database drivers, via forecast_cnfg
+edge_replicant = pytest.importorskip(
+    "normits_demand.models.forecasting.edge_replicant", exc_type=ImportError
+)
+
+##### CONSTANTS #####
+PERIOD = "AM"
+FORECAST_YEAR = 2030
+STATIONS = pd.DataFrame({"stn_zone_id": [501, 502], "STATIONCODE": ["A", "B"]})
+TAG_FLOW = "London Travelcard"
+
+# Segment, ToHome, Growth_Method, Userclass, Purpose
+SEGMENTS = pd.DataFrame(
+    [
+        ("HBW", 0, 1, 4, "Commuting"),
+        ("HBW_T", 1, 1, 4, "Commuting"),
+        ("HBEB", 0, 2, 1, "Business"),
+    ],
+    columns=["Segment", "ToHome", "Growth_Method", "Userclass", "Purpose"],
+)
+
+# From, To, purpose, TicketType, Demand_rate
+EDGE_FACTORS = pd.DataFrame(
+    [
+        # Commuting A to B is missing Season tickets
+        ("A", "B", "Commuting", "F", 1.2),
+        ("A", "B", "Commuting", "R", 1.4),
+        ("B", "A", "Commuting", "F", 1.6),
+        ("B", "A", "Commuting", "R", 1.8),
+        ("B", "A", "Commuting", "S", 2.0),
+        ("A", "B", "Business", "F", 1.1),
+        ("A", "B", "Business", "R", 1.1),
+        ("A", "B", "Business", "S", 1.1),
+        # Business B to A is missing Season tickets
+        ("B", "A", "Business", "F", 1.5),
+        ("B", "A", "Business", "R", 1.7),
+    ],
+    columns=["ZoneCodeFrom", "ZoneCodeTo", "purpose", "TicketType", "Demand_rate"],
+)
+
+# Ticket splits are re-balanced to F = 0.5, R = 0.25 and S = 0.25
+TICKET_SPLITS = pd.DataFrame(
+    {
+        "TAG_Flow": TAG_FLOW,
+        "Purpose": ["Commuting", "Business"],
+        "F": [2.0, 2.0],
+        "R": [1.0, 1.0],
+        "S": [1.0, 1.0],
+    }
+)
+
+
+##### FIXTURES #####
+@pytest.fixture(name="matrices_dir", scope="module")
+def fixture_matrices_dir(tmp_path_factory) -> Path:
+    """Write demand, iRSj probabilities and stn2stn costs for one period."""
+    folder = tmp_path_factory.mktemp("edge")
+    pd.DataFrame(
+        {"from_stn_zone_id": [501, 502], "to_stn_zone_id": [502, 501], "tran_distance": 10.0}
+    ).to_csv(folder / f"{PERIOD}_stn2stn_costs.csv", index=False)
+
+    # Zones 1 to 2 travel from station A to B, zones 3 to 4 aren't assigned
+    pd.DataFrame(
+        {
+            "from_model_zone_id": 1,
+            "to_model_zone_id": 2,
+            "userclass": [1, 4],
+            "from_stn_zone_id": 501,
+            "to_stn_zone_id": 502,
+            "proportion": 1.0,
+        }
+    ).to_hdf(folder / f"{PERIOD}_iRSj_probabilities.h5", key="iRSj")
+
+    zone_cols = ["from_model_zone_id", "to_model_zone_id", "Demand"]
+    demand = {
+        "HBW": [(1, 2, 10.0), (3, 4, 5.0), (2, 1, 0.0)],
+        # To home demand is in PA format, so is transposed before growing
+        "HBW_T": [(2, 1, 10.0)],
+        "HBEB": [(1, 2, 10.0)],
+    }
+    for segment, rows in demand.items():
+        pd.DataFrame(rows, columns=zone_cols).to_csv(
+            folder / f"{PERIOD}_{segment}.csv", index=False
+        )
+    return folder
+
+
+def _build_engine(segments: pd.DataFrame) -> "edge_replicant.EDGEGrowthEngine":
+    return edge_replicant.EDGEGrowthEngine(
+        forecast_year=FORECAST_YEAR,
+        demand_segments=segments,
+        ticket_type_splits=TICKET_SPLITS,
+        flow_cats=pd.DataFrame({"FlowCatName": ["C"], "TAG_NonDist": [TAG_FLOW]}),
+        norms_to_edge_stns=STATIONS,
+        edge_flows=pd.DataFrame(
+            {"FromCaseZoneID": ["A", "B"], "ToCaseZoneID": ["B", "A"], "FlowCatName": "C"}
+        ),
+        edge_growth_factors=EDGE_FACTORS,
+    )
+
+
+def _demand(results, segment: str) -> pd.Series:
+    matrix = results.matrices[segment]
+    return matrix.set_index(["from_model_zone_id", "to_model_zone_id"])[f"{PERIOD}_Demand"]
+
+
+##### CLASSES #####
+class TestEDGEGrowthEngine:
+    """Tests for growing demand with the `EDGEGrowthEngine`."""
+
+    @staticmethod
+    def test_method1(matrices_dir: Path):
+        """Test method 1 uses the factors in the direction of travel."""
+        results = _build_engine(SEGMENTS).grow_period(PERIOD, matrices_dir)
+
+        # Season tickets are filled in from Full tickets
+        expected = 10 * (0.5 * 1.2 + 0.25 * 1.4 + 0.25 * 1.2)
+        demand = _demand(results, "HBW")
+        assert demand[(1, 2)] == pytest.approx(expected)
+        # Unassigned demand is added back in without growth
+        assert demand[(3, 4)] == pytest.approx(5.0)
+        assert len(demand) == 2
+
+    @staticmethod
+    def test_to_home(matrices_dir: Path):
+        """Test to home demand is transposed, then grown with the return factors."""
+        results = _build_engine(SEGMENTS).grow_period(PERIOD, matrices_dir)
+
+        expected = 10 * (0.5 * 1.6 + 0.25 * 1.8 + 0.25 * 2.0)
+        demand = _demand(results, "HBW_T")
+        assert demand.to_dict() == {(1, 2): pytest.approx(expected)}
+
+    @staticmethod
+    def test_method2(matrices_dir: Path):
+        """Test method 2 averages both directions, after filling missing factors."""
+        results = _build_engine(SEGMENTS).grow_period(PERIOD, matrices_dir)
+
+        # B to A Season tickets are filled from Full tickets before averaging,
+        # previously this fill was only made if a segment travelled B to A
+        expected = 10 * (0.5 * 1.3 + 0.25 * 1.4 + 0.25 * 1.3)
+        assert _demand(results, "HBEB").to_dict() == {(1, 2): pytest.approx(expected)}
+
+    @staticmethod
+    def test_filled_factors(matrices_dir: Path):
+        """Test the factors filled in from other ticket types are reported."""
+        engine = _build_engine(SEGMENTS)
+        results = engine.grow_period(PERIOD, matrices_dir)
+
+        filled = results.filled_factors.set_index(
+            ["ZoneCodeFrom", "ZoneCodeTo", "purpose", "TicketType"]
+        )
+        assert filled.loc[("A", "B", "Commuting", "S"), "Available_TicketType"] == "F"
+        assert filled.loc[("A", "B", "Commuting", "S"), "Demand_rate"] == 1.2
+        assert (filled["Flag"] == 0).all()
+
+        factors = engine.filled_factors_table(results.filled_factors)
+        assert len(factors) == len(EDGE_FACTORS) + len(filled)
+        assert results.growth_summary["Base_Demand"].tolist() == [15, 10, 10]
+
+    @staticmethod
+    def test_segment_order(matrices_dir: Path):
+        """Test the growth doesn't depend on the order of the demand segments."""
+        results = _build_engine(SEGMENTS).grow_period(PERIOD, matrices_dir)
+        reordered = _build_engine(SEGMENTS.iloc[::-1]).grow_period(PERIOD, matrices_dir)
+
+        for segment in SEGMENTS["Segment"]:
+            pd.testing.assert_series_equal(
+                _demand(results, segment).sort_index(),
+                _demand(reordered, segment).sort_index(),
+            )
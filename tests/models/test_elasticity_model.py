@@ -4,6 +4,7 @@
 """
 # ## IMPORTS ## #
 # Standard imports
+import pickle
 import shutil
 from pathlib import Path
 from typing import Tuple, Dict, List
@@ -305,6 +306,57 @@ class TestElasticityModel:
                 )
 
 
+class TestElasticityInputCache:
+    """Tests for the `ElasticityInputCache` class."""
+
+    COST_KEY = ("rail", "1", "norms")
+
+    @staticmethod
+    @pytest.fixture(name="cache")
+    def fixture_cache():
+        costs = RAIL_COSTS.rename(
+            columns={v: k for k, v in ec.COST_LOOKUP["rail"].items()}
+        )
+        cache = em.ElasticityInputCache.from_data(
+            elasticities=pd.DataFrame({"type": ["a"], "elast_value": [-0.2]}),
+            constraint_matrices=dict([CONSTRAINT_ALL, CONSTRAINT_ZEROS]),
+            costs={TestElasticityInputCache.COST_KEY: costs.astype({"walk": float})},
+        )
+        yield cache
+        cache.unlink()
+
+    def test_round_trip(self, cache: em.ElasticityInputCache):
+        """Test cached data is returned unchanged, including from a pickled copy."""
+        expected = RAIL_COSTS.rename(
+            columns={v: k for k, v in ec.COST_LOOKUP["rail"].items()}
+        ).astype({"walk": float})
+
+        for loaded in (cache, pickle.loads(pickle.dumps(cache))):
+            costs = loaded.get_costs(*self.COST_KEY)
+            pd.testing.assert_frame_equal(costs, expected)
+            # Returned costs are a local copy so can be adjusted
+            costs["fare"] *= 2
+
+            mats = loaded.get_constraint_mats(["all_trips", "no_trips"])
+            np.testing.assert_array_equal(mats["all_trips"], CONSTRAINT_ALL[1])
+            np.testing.assert_array_equal(mats["no_trips"], CONSTRAINT_ZEROS[1])
+
+        pd.testing.assert_frame_equal(cache.get_costs(*self.COST_KEY), expected)
+
+    @staticmethod
+    def test_pickle_drops_ownership(cache: em.ElasticityInputCache):
+        """Test only the creating process can unlink the shared memory."""
+        pickle.loads(pickle.dumps(cache)).unlink()
+        assert cache.get_constraint_mats(["all_trips"])["all_trips"].shape == (2, 2)
+
+    def test_missing(self, cache: em.ElasticityInputCache):
+        """Test an error is raised for data that wasn't cached."""
+        with pytest.raises(KeyError):
+            cache.get_constraint_mats(["all_trips", "missing"])
+        with pytest.raises(KeyError):
+            cache.get_costs("rail", "2", self.COST_KEY[2])
+
+
 ##### FUNCTIONS #####
 @pytest.fixture(name="cost_changes", scope="module")
 def fixture_cost_changes(tmp_path_factory: pytest.TempPathFactory) -> Path:
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the forecasting.ntem_forecast module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from pathlib import Path
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.concurrency import communication
+from normits_demand.distribution import furness
+
+# Needs the database drivers, via tempro_trip_ends
+ntem_forecast = pytest.importorskip(
+    "normits_demand.models.forecasting.ntem_forecast", exc_type=ImportError
+)
+
+##### CONSTANTS #####
+ZONES = pd.Index(np.arange(1, 11), name="model_zone_id")
+INTERNALS = np.arange(1, 7)
+SEGMENT_NAME = "1_3"
+
+
+##### FIXTURES #####
+@pytest.fixture(name="base_matrix")
+def fixture_base_matrix() -> pd.DataFrame:
+    """Random base matrix with some zones that have no trips."""
+    rng = np.random.default_rng(22)
+    values = rng.random((len(ZONES), len(ZONES))) * 100
+    matrix = pd.DataFrame(values, index=ZONES, columns=ZONES)
+    # An internal and an external zone with no trips at all
+    matrix.loc[[3, 9], :] = 0
+    matrix.loc[:, [3, 9]] = 0
+    # A zone with trips from, but not to it
+    matrix.loc[:, 8] = 0
+    # Some internal cells without trips
+    matrix.loc[1, [2, 5]] = 0
+    return matrix
+
+
+@pytest.fixture(name="growth")
+def fixture_growth() -> pd.DataFrame:
+    """Random production and attraction growth factors."""
+    rng = np.random.default_rng(23)
+    return pd.DataFrame(
+        {
+            "row_targets": rng.uniform(0.9, 1.3, len(ZONES)),
+            "col_targets": rng.uniform(0.9, 1.3, len(ZONES)),
+        },
+        index=ZONES,
+    )
+
+
+def _pandas_grow_matrix(matrix: pd.DataFrame, growth: pd.DataFrame) -> pd.DataFrame:
+    """Grow `matrix` the same way as the original pandas `grow_matrix`."""
+    int_targets = {}
+    for nm, axis in (("row_targets", 1), ("col_targets", 0)):
+        base_trips = matrix.loc[INTERNALS, INTERNALS].sum(axis=axis)
+        int_targets[nm] = growth.loc[INTERNALS, nm] * base_trips
+
+    int_targets = ntem_forecast._trip_end_totals(SEGMENT_NAME, **int_targets)
+    int_future, *_ = furness.furness_pandas_wrapper(
+        matrix.loc[INTERNALS, INTERNALS],
+        **{nm: data.rename("trips").reset_index() for nm, data in int_targets.items()},
+        tol=1e-4,
+        max_iters=3000,
+    )
+
+    ext_future = matrix.mul(growth["col_targets"], axis="columns")
+    row_growth = ext_future.sum(axis=1) / matrix.sum(axis=1)
+    ext_future = ext_future.mul(growth["row_targets"] / row_growth, axis="index")
+    ext_future.loc[INTERNALS, INTERNALS] = 0
+
+    combined = pd.concat([int_future, ext_future], axis=0).groupby(level=0).sum()
+    combined.columns = combined.columns.astype(int)
+    return combined.sort_index(axis=1)
+
+
+##### CLASSES #####
+class TestGrowMatrix:
+    """Tests for growing base matrices to forecast years."""
+
+    @staticmethod
+    def test_matches_pandas(base_matrix: pd.DataFrame, growth: pd.DataFrame):
+        """Test the numpy growth matches growing with pandas DataFrames."""
+        expected = _pandas_grow_matrix(base_matrix, growth)
+
+        future = ntem_forecast._grow_matrix_values(
+            base_matrix.values,
+            ntem_forecast._internal_indices(ZONES, INTERNALS),
+            growth["row_targets"].values,
+            growth["col_targets"].values,
+            SEGMENT_NAME,
+        )
+
+        assert np.isfinite(future).all()
+        np.testing.assert_allclose(future, expected.values, rtol=1e-9, atol=1e-9)
+        # Zones without any trips stay empty
+        assert (future[[2, 8]] == 0).all() and (future[:, [2, 8]] == 0).all()
+
+    @staticmethod
+    def test_shared_memory(base_matrix: pd.DataFrame, growth: pd.DataFrame, tmp_path: Path):
+        """Test growing from a shared base matrix writes the same matrix."""
+        internal_idx = ntem_forecast._internal_indices(ZONES, INTERNALS)
+        kwargs = {
+            "internal_idx": internal_idx,
+            "row_growth": growth["row_targets"].values,
+            "col_growth": growth["col_targets"].values,
+            "segment_name": SEGMENT_NAME,
+        }
+        expected = ntem_forecast._grow_matrix_values(base_matrix.values, **kwargs)
+
+        helper, info = communication.dataframe_to_shared_memory(base_matrix)
+        try:
+            output_path = tmp_path / "future.csv"
+            ntem_forecast._grow_and_write_shared_matrix(
+                base=info, output_path=output_path, **kwargs
+            )
+            # The shared base must be left as it was for the other years
+            np.testing.assert_array_equal(helper.get_shared_array(), base_matrix.values)
+        finally:
+            helper.unlink_shared_array()
+
+        future = pd.read_csv(output_path, index_col=0)
+        np.testing.assert_allclose(future.values, expected, rtol=1e-12)
+        assert (tmp_path / "future-growth_comparison.xlsx").is_file()
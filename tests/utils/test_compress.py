@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the utils.compress module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+import bz2
+import pickle
+from pathlib import Path
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.utils import compress
+from normits_demand.utils import file_ops
+
+
+##### FIXTURES #####
+@pytest.fixture(name="data")
+def fixture_data() -> dict:
+    """Build an object containing a reasonably sized DataFrame."""
+    rng = np.random.default_rng(9)
+    return {"name": "test", "df": pd.DataFrame(rng.random((200, 150)))}
+
+
+##### CLASSES #####
+class TestCompress:
+    """Tests for `compress.write_out` and `compress.read_in`."""
+
+    @staticmethod
+    def _assert_equal(result: dict, expected: dict):
+        assert result["name"] == expected["name"]
+        pd.testing.assert_frame_equal(result["df"], expected["df"])
+
+    @pytest.mark.parametrize("codec", compress.available_codecs())
+    def test_round_trip(self, data: dict, tmp_path: Path, codec: str, monkeypatch):
+        """Test an object is read back the same, over multiple blocks."""
+        monkeypatch.setattr(compress, "DEFAULT_BLOCK_SIZE", 10_000)
+        suffix = ".pbz2" if codec == "bz2" else compress.BLOCK_COMPRESSION_SUFFIX
+        path = compress.write_out(
+            data, tmp_path / f"data{suffix}", overwrite_suffix=False, codec=codec, threads=3
+        )
+
+        assert path == tmp_path / f"data{suffix}"
+        self._assert_equal(compress.read_in(path, threads=2), data)
+
+    def test_default_is_bz2(self, data: dict, tmp_path: Path, monkeypatch):
+        """Test the default output can be read as a plain bz2 file."""
+        monkeypatch.setattr(compress, "DEFAULT_BLOCK_SIZE", 10_000)
+        path = compress.write_out(data, tmp_path / "data.pbz2", overwrite_suffix=False)
+
+        with bz2.BZ2File(path, "rb") as file:
+            self._assert_equal(pickle.load(file), data)
+
+    @staticmethod
+    def test_block_format_bz2_suffix(data: dict, tmp_path: Path):
+        """Test other codecs can't be written to a bz2 file."""
+        with pytest.raises(ValueError):
+            compress.write_out(
+                data, tmp_path / "data.pbz2", overwrite_suffix=False, codec="gzip"
+            )
+
+    def test_legacy_bz2(self, data: dict, tmp_path: Path):
+        """Test files written as a single bz2 stream can still be read."""
+        path = tmp_path / "legacy.pbz2"
+        with bz2.BZ2File(path, "w") as file:
+            pickle.dump(data, file)
+
+        self._assert_equal(compress.read_in(path), data)
+
+    @staticmethod
+    def test_unknown_codec(data: dict, tmp_path: Path):
+        """Test an error is raised for a codec that doesn't exist."""
+        with pytest.raises(ValueError):
+            compress.write_out(data, tmp_path / "data.pbz2", codec="not_a_codec")
+
+    @staticmethod
+    def test_unknown_file(tmp_path: Path):
+        """Test an error is raised when reading a file of the wrong format."""
+        path = tmp_path / "data.pbz2"
+        path.write_bytes(b"not compressed data")
+        with pytest.raises(ValueError):
+            compress.read_in(path)
+
+
+class TestFileOpsCompress:
+    """Tests for reading and writing compressed files with `file_ops`."""
+
+    @staticmethod
+    @pytest.mark.parametrize("codec", compress.available_codecs())
+    def test_block_suffix(data: dict, tmp_path: Path, codec: str):
+        """Test file_ops reads and writes block compressed files."""
+        path = tmp_path / f"df{compress.BLOCK_COMPRESSION_SUFFIX}"
+        file_ops.write_df(data["df"], path, index=False, codec=codec)
+
+        pd.testing.assert_frame_equal(file_ops.read_df(path), data["df"])
+        assert file_ops.find_filename(tmp_path / "df.csv") == path
+
+    @staticmethod
+    def test_default_block_codec(data: dict, tmp_path: Path):
+        """Test block compressed files default to a faster codec than bz2."""
+        path = tmp_path / f"df{compress.BLOCK_COMPRESSION_SUFFIX}"
+        file_ops.write_df(data["df"], path)
+
+        assert compress.default_block_codec() != "bz2"
+        assert not path.read_bytes().startswith(b"BZh")
+        pd.testing.assert_frame_equal(file_ops.read_df(path), data["df"])
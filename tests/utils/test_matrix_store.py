@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the utils.matrix_store module, and the
+    matrix store support in utils.file_ops, tests are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Standard imports
+from pathlib import Path
+
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from normits_demand.utils import file_ops
+from normits_demand.utils import matrix_store
+
+
+##### FIXTURES #####
+@pytest.fixture(name="matrix")
+def fixture_matrix() -> pd.DataFrame:
+    """Build a small square matrix with integer zones."""
+    zones = np.arange(1, 11)
+    rng = np.random.default_rng(5)
+    return pd.DataFrame(rng.random((10, 10)), index=zones, columns=zones)
+
+
+##### CLASSES #####
+class TestMatrixStore:
+    """Tests for reading and writing matrix stores."""
+
+    @staticmethod
+    def test_round_trip(matrix: pd.DataFrame, tmp_path: Path):
+        """Test a matrix is read back exactly as it was written."""
+        path = matrix_store.write_matrix_store(matrix, tmp_path / "mat.h5")
+
+        assert matrix_store.is_matrix_store(path)
+        pd.testing.assert_frame_equal(matrix_store.read_matrix_store(path), matrix)
+
+    @staticmethod
+    def test_string_zones(tmp_path: Path):
+        """Test string zone names and index names are kept."""
+        zones = pd.Index(["a", "b", "é"], name="o")
+        matrix = pd.DataFrame(np.eye(3), index=zones, columns=zones.rename("d"))
+        path = matrix_store.write_matrix_store(matrix, tmp_path / "mat.h5")
+
+        pd.testing.assert_frame_equal(matrix_store.read_matrix_store(path), matrix)
+
+    @staticmethod
+    def test_non_numeric(tmp_path: Path):
+        """Test an error is raised for non-numeric values."""
+        df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+        with pytest.raises(ValueError):
+            matrix_store.write_matrix_store(df, tmp_path / "mat.h5")
+
+    @staticmethod
+    def test_file_ops_suffix(matrix: pd.DataFrame, tmp_path: Path):
+        """Test file_ops reads and writes matrix stores based on suffix."""
+        path = tmp_path / "mat.h5"
+        file_ops.write_df(matrix, path)
+
+        pd.testing.assert_frame_equal(file_ops.read_df(path, index_col=0), matrix)
+        pd.testing.assert_frame_equal(file_ops.read_matrix(path), matrix)
+        pd.testing.assert_frame_equal(
+            file_ops.read_matrix(tmp_path / "mat.csv", find_similar=True), matrix
+        )
+
+    @staticmethod
+    def test_file_ops_pandas_kwargs(matrix: pd.DataFrame, tmp_path: Path):
+        """Test pandas only arguments are ignored when writing a matrix store."""
+        path = tmp_path / "mat.h5"
+        file_ops.write_df(matrix, path, index=False, complevel=0)
+
+        pd.testing.assert_frame_equal(file_ops.read_matrix(path), matrix)
+
+    @staticmethod
+    def test_convert(matrix: pd.DataFrame, tmp_path: Path):
+        """Test an existing CSV matrix is converted into a matrix store."""
+        csv_path = tmp_path / "mat.csv"
+        matrix.iloc[::-1].to_csv(csv_path)
+
+        out_path = file_ops.convert_to_matrix_store(csv_path, remove_original=True)
+
+        assert out_path == tmp_path / "mat.h5"
+        assert not csv_path.exists()
+        pd.testing.assert_frame_equal(
+            file_ops.read_matrix(out_path),
+            matrix,
+            check_names=False,
+            check_index_type=False,
+            check_column_type=False,
+        )
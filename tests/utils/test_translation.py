@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+    Module containing tests for the utils.translation module, tests
+    are setup to use pytest.
+"""
+
+##### IMPORTS #####
+# Third party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+import normits_demand as nd
+from normits_demand.utils import translation
+
+
+##### FIXTURES #####
+@pytest.fixture(name="translations", scope="module")
+def fixture_translations():
+    """Random row and column translations, with every row summing to 1."""
+    rng = np.random.default_rng(0)
+    row = rng.random((12, 5)) * (rng.random((12, 5)) > 0.5)
+    col = rng.random((12, 5)) * (rng.random((12, 5)) > 0.5)
+    row[:, 0] += 0.1
+    col[:, 0] += 0.1
+    return row / row.sum(axis=1, keepdims=True), col / col.sum(axis=1, keepdims=True)
+
+
+##### CLASSES #####
+class TestMatrixTranslator:
+    """Tests for the `MatrixTranslator` class."""
+
+    @staticmethod
+    def test_matches_dense(translations):
+        """Test a single matrix matches the dense translation."""
+        row, col = translations
+        matrix = np.random.default_rng(1).random((12, 12))
+        translator = translation.MatrixTranslator(row, col)
+
+        translated = translator.translate(matrix, check_totals=True)
+        np.testing.assert_allclose(translated, row.T @ matrix @ col)
+        np.testing.assert_allclose(
+            translation.numpy_matrix_zone_translation(
+                matrix, row_translation=row, col_translation=col
+            ),
+            translated,
+        )
+
+    @staticmethod
+    def test_stack(translations):
+        """Test a stack of matrices is translated matrix by matrix."""
+        row, col = translations
+        stack = np.random.default_rng(2).random((4, 12, 12))
+        translator = translation.MatrixTranslator(row, col)
+
+        translated = translator.translate(stack)
+        assert translated.shape == (4, 5, 5)
+        for matrix, result in zip(stack, translated):
+            np.testing.assert_allclose(result, translator.translate(matrix))
+
+    @staticmethod
+    def test_float32(translations):
+        """Test the translation can be done in a lower precision."""
+        row, _ = translations
+        matrix = np.random.default_rng(3).random((12, 12))
+        translated = translation.MatrixTranslator(row, dtype=np.float32).translate(matrix)
+
+        assert translated.dtype == np.float32
+        np.testing.assert_allclose(translated, row.T @ matrix @ row, rtol=1e-5)
+
+        with pytest.raises(ValueError):
+            translation.MatrixTranslator(row, dtype=np.float32).translate(matrix * 1e300)
+
+    @staticmethod
+    def test_invalid_shapes(translations):
+        """Test an error is raised for mismatched shapes."""
+        row, col = translations
+        translator = translation.MatrixTranslator(row, col)
+        with pytest.raises(ValueError):
+            translator.translate(np.ones((5, 5)))
+        with pytest.raises(ValueError):
+            translation.MatrixTranslator(row, col[:, :3])
+        with pytest.raises(ValueError):
+            translation.MatrixTranslator(row, from_zones=list(range(3)))
+
+    @staticmethod
+    def test_dataframe(translations):
+        """Test DataFrames are reindexed to the from zones before translating."""
+        row, col = translations
+        from_zones, to_zones = list(range(1, 13)), list("abcde")
+        translator = translation.MatrixTranslator(row, col, from_zones=from_zones, to_zones=to_zones)
+
+        matrix = np.random.default_rng(4).random((12, 12))
+        matrix[:, -1] = 0
+        df = pd.DataFrame(matrix, index=from_zones, columns=from_zones)
+        # Missing zones should be infilled with 0
+        translated = translator.translate_df(df.iloc[::-1, :-1])
+
+        expected = pd.DataFrame(row.T @ matrix @ col, index=to_zones, columns=to_zones)
+        pd.testing.assert_frame_equal(translated, expected)
+
+    @staticmethod
+    def test_zoning_systems():
+        """Test translating between zoning systems matches the pandas translation."""
+        msoa = nd.get_zoning_system("msoa")
+        lad = nd.get_zoning_system("lad_2020")
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(
+            rng.random((msoa.n_zones, msoa.n_zones)),
+            index=msoa.unique_zones,
+            columns=msoa.unique_zones,
+        )
+
+        long_translation = translation.get_long_translation(msoa, lad)
+        expected = translation.pandas_matrix_zone_translation(
+            matrix=df,
+            translation=long_translation,
+            from_zone_col=msoa.col_name,
+            to_zone_col=lad.col_name,
+            factors_col="weight",
+            from_unique_zones=msoa.unique_zones,
+            to_unique_zones=lad.unique_zones,
+        )
+        translated = translation.translate_matrix_zoning(df, msoa, lad)
+        pd.testing.assert_frame_equal(translated, expected, check_names=False)
+
+        np.testing.assert_allclose(
+            translation.translate_matrix_zoning(df.values, msoa, lad),
+            expected.values,
+        )